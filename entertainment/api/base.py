@@ -4,12 +4,39 @@ import time
 import random
 from requests.exceptions import ConnectionError, Timeout
 
+from api.ratelimit import parse_retry_after
+from api.response_cache import CachedRequest
+from api.transport import session
+
 class BaseService:
+    # Shared `api.ratelimit.RateLimiter` for providers with a budget
+    rate_limiter = None
+    # `api.response_cache.FAMILIES` key for providers whose GETs are cached
+    cache_provider = None
+
     def __init__(self, base_url, api_key=None, bearer_token=None):
         self.api_key = api_key
         self.bearer_token = bearer_token
         self.base_url = base_url
 
+    def _throttle(self):
+        if self.rate_limiter:
+            self.rate_limiter.wait_if_needed()
+
+    def _rate_limited(self, response, retries, max_retries):
+        """On a 429, hold back (all workers, if limited) for Retry-After and report a retry."""
+        if response.status_code != 429 or retries >= max_retries:
+            return False
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = 2 ** retries
+        print(f"Rate limited (429). Retrying in {delay:.1f} seconds... (Attempt {retries + 1}/{max_retries})")
+        if self.rate_limiter:
+            self.rate_limiter.block(delay)
+        else:
+            time.sleep(delay)
+        return True
+
     def _get(self, endpoint, params=None, max_retries=3):
         # Ensure endpoint doesn't start with a slash to avoid double slashes
         endpoint = endpoint.lstrip('/') 
@@ -21,14 +48,24 @@ class BaseService:
             params = params or {}
             params['api_key'] = self.api_key
         
+        cached = CachedRequest(self.cache_provider, endpoint, url, params)
+        data = cached.fresh()
+        if data is not None:
+            return data
+        headers.update(cached.conditional_headers())
+        
         # Initialize retry counter
         retries = 0
         
         while retries <= max_retries:
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+                self._throttle()
+                response = session().get(url, params=params, headers=headers, timeout=10)
+                if self._rate_limited(response, retries, max_retries):
+                    retries += 1
+                    continue
                 response.raise_for_status()  # Raises exception for 4XX/5XX responses
-                return response.json()
+                return cached.resolve(response)
             except (ConnectionError, Timeout) as e:
                 retries += 1
                 if retries > max_retries:
@@ -59,7 +96,11 @@ class BaseService:
         
         while retries <= max_retries:
             try:
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                self._throttle()
+                response = session().post(url, json=data, headers=headers, timeout=10)
+                if self._rate_limited(response, retries, max_retries):
+                    retries += 1
+                    continue
                 response.raise_for_status()  # Raises exception for 4XX/5XX responses
                 return response.json()
             except (ConnectionError, Timeout) as e:
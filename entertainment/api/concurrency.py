@@ -0,0 +1,53 @@
+# Description: Run many upstream API calls concurrently
+"""Concurrent fan-out of blocking API calls.
+
+Service calls spend nearly all their time waiting on the network, so a
+thread pool overlaps them well. The shared rate limiter (`api.ratelimit`)
+still spaces them at the provider cap, and the pooled transport
+(`api.transport`) keeps one keep-alive connection per thread.
+
+Calls must not touch the database: worker threads would each open their
+own connection. Fetch here, write on the caller's thread. Each call runs in
+a copy of the submitting thread's context, so context variables such as
+`api.response_cache.bypass` carry over to the workers.
+"""
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from decouple import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = config('API_FETCH_WORKERS', default=8, cast=int)
+
+
+def executor(workers=None):
+    """A thread pool sized for upstream fetches."""
+    return ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS, thread_name_prefix='api-fetch')
+
+
+def submit_all(pool, calls):
+    """Start ``{key: zero-argument callable}`` on ``pool``; returns ``{key: future}``."""
+    return {key: pool.submit(contextvars.copy_context().run, call) for key, call in calls.items()}
+
+
+def gather(futures):
+    """Wait for `submit_all` futures; returns ``{key: result}``.
+
+    A call that raised gets None and is logged, so one bad id never sinks
+    the batch.
+    """
+    results = {}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            logger.warning(f"Upstream fetch {key} failed: {e}")
+            results[key] = None
+    return results
+
+
+def fetch_all(pool, calls):
+    """Run ``{key: zero-argument callable}`` on ``pool`` and wait for all of them."""
+    return gather(submit_all(pool, calls))
@@ -0,0 +1,159 @@
+# Description: Rate limits for external APIs, shared by every process
+"""Per-provider outbound rate limits shared across gunicorn and django-q workers.
+
+Each provider has one budget (``max_calls`` per ``period``) kept in Redis, so
+every process and thread draws from the same bucket no matter how many
+service instances exist. The bucket is a GCRA (a token bucket stored as
+one timestamp, the "theoretical arrival time"), updated by an atomic Lua
+script using the Redis clock:
+
+* `RateLimiter.wait_if_needed()` reserves the next slot and sleeps until
+  it. Callers are spaced exactly ``period / max_calls`` apart after an
+  initial ``burst``, so throughput sits at the cap and nobody polls.
+* `RateLimiter.block(seconds)` pushes the bucket forward when a provider
+  answers 429 with ``Retry-After``, pausing all workers for that long
+  instead of each one discovering the limit on its own.
+
+If the cache is not Redis (tests, local dev) or Redis is unreachable, the
+same algorithm runs in process memory. The budget is then per process
+rather than cluster-wide.
+
+Limits can be overridden in the environment, e.g. ``API_RATE_LIMIT_TMDB=30``.
+"""
+import email.utils
+import logging
+import threading
+import time
+
+from decouple import config
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# provider -> (max calls, period in seconds, burst)
+PROVIDERS = {
+    'tmdb': (config('API_RATE_LIMIT_TMDB', default=40, cast=int), 1.0, 4),
+    'hardcover': (config('API_RATE_LIMIT_HARDCOVER', default=60, cast=int), 60.0, 1),
+}
+
+# KEYS[1] = bucket; ARGV = emission interval (ms), burst, extra delay (ms).
+# Returns the milliseconds the caller must wait before its request.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + t[2] / 1000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now) + 1000)
+local wait = new_tat - now - burst * interval
+if wait < 0 then wait = 0 end
+return tostring(wait)
+"""
+
+# Same arguments; moves the bucket so the next slot opens in ARGV[3] ms.
+_BLOCK_SCRIPT = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + t[2] / 1000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local blocked = now + tonumber(ARGV[3]) + burst * interval
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if blocked > tat then
+    redis.call('SET', KEYS[1], tostring(blocked), 'PX', math.ceil(blocked - now) + 1000)
+end
+return 1
+"""
+
+_scripts = {}
+_local_lock = threading.Lock()
+_local_tat = {}
+
+
+def _redis():
+    """Raw redis client behind the default cache, or None."""
+    backend = caches['default']
+    if not isinstance(backend, RedisCache):
+        return None
+    return backend._cache.get_client(write=True)
+
+
+def _run_script(source, client, key, args):
+    script = _scripts.get(source)
+    if script is None:
+        script = _scripts[source] = client.register_script(source)
+    return float(script(keys=[key], args=args, client=client))
+
+
+def parse_retry_after(value):
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Shared budget of ``max_calls`` per ``period`` seconds for one provider."""
+
+    def __init__(self, provider, max_calls, period=1.0, burst=1):
+        self.provider = provider
+        self.interval = period / max_calls
+        self.burst = max(1, burst)
+        self.key = caches['default'].make_key(f'ratelimit:{provider}')
+
+    def _local(self, delay=None):
+        """In-process fallback: returns the wait for a reservation, or blocks."""
+        with _local_lock:
+            now = time.monotonic()
+            tat = max(_local_tat.get(self.provider, now), now)
+            if delay is not None:
+                _local_tat[self.provider] = max(tat, now + delay + self.burst * self.interval)
+                return 0.0
+            _local_tat[self.provider] = tat + self.interval
+            return max(0.0, tat + self.interval - now - self.burst * self.interval)
+
+    def _shared(self, source, delay=0.0):
+        """Run a bucket script in Redis; None if Redis is unavailable."""
+        client = _redis()
+        if client is None:
+            return None
+        try:
+            return _run_script(source, client, self.key, [self.interval * 1000, self.burst, delay * 1000]) / 1000
+        except RedisError as e:
+            logger.warning(f"Rate limiter for {self.provider} falling back to process-local budget: {e}")
+            return None
+
+    def wait_if_needed(self):
+        """Reserve the next request slot and sleep until it opens."""
+        wait = self._shared(_ACQUIRE_SCRIPT)
+        if wait is None:
+            wait = self._local()
+        if wait > 0:
+            time.sleep(wait)
+
+    def block(self, seconds):
+        """Hold every worker's next request back by ``seconds`` (Retry-After)."""
+        if self._shared(_BLOCK_SCRIPT, seconds) is None:
+            self._local(delay=seconds)
+
+
+_limiters = {}
+
+
+def limiter(provider):
+    """The `RateLimiter` for a provider listed in `PROVIDERS`."""
+    if provider not in _limiters:
+        max_calls, period, burst = PROVIDERS[provider]
+        _limiters[provider] = RateLimiter(provider, max_calls, period, burst)
+    return _limiters[provider]
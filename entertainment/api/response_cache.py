@@ -0,0 +1,225 @@
+# Description: Revalidating cache for upstream API responses
+"""Response cache for the external metadata APIs.
+
+Refreshes and imports ask TMDB / TVDB / RAWG / Hardcover the same questions
+over and over: `person/{id}` for an actor who appears in hundreds of films,
+`find/{imdb_id}` during IMDb imports, `tv/{id}/season/{n}` on every show
+refresh. Decoded JSON bodies are cached per request (URL + params, or
+GraphQL query + variables) with a TTL chosen by endpoint family:
+
+* within the TTL the cached body is returned without a request (``hit``);
+* after it, if the upstream sent ``ETag`` / ``Last-Modified``, the request
+  is sent conditionally and a 304 re-stamps the entry (``revalidated``);
+* otherwise the body is fetched and stored (``miss``).
+
+Families without a TTL, and any non-200 answer, are never cached.
+
+`bypass()` (or `uncached(func, ...)` for a queued task) skips lookups for
+forced refreshes but still stores what comes back, so the next reader
+gets the fresh body. The flag is per thread / context; tasks queued from
+inside do not inherit it unless queued through `uncached` again (as the TV
+show refresh follow-ups are, see `bypassed`).
+
+Entries live in the cache alias named by ``API_RESPONSE_CACHE_ALIAS``
+(Redis by default; point it at a FileBasedCache alias to keep them on
+disk). TTLs are overridable per family, e.g. ``API_CACHE_TTL_TMDB_PERSON``
+(seconds, 0 disables). `stats()` returns the shared hit / miss counters;
+see the ``api_cache_stats`` command.
+"""
+import contextvars
+import hashlib
+import json
+import re
+import time
+from contextlib import contextmanager
+
+from decouple import config
+from django.core.cache import caches
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Stale entries that carry a validator are kept this long past their TTL,
+# so they can still be revalidated with a conditional request.
+REVALIDATE_WINDOW = 7 * DAY
+
+# provider -> [(family, endpoint pattern, default TTL in seconds)], first match wins
+FAMILIES = {
+    'tmdb': [
+        ('changes', r'^(movie|tv|person)/\d+/changes', 0),
+        ('find', r'^find/', 7 * DAY),
+        ('person', r'^person/', DAY),
+        ('season', r'^tv/\d+/season/', 6 * HOUR),
+        ('episode_group', r'^tv/episode_group/', 6 * HOUR),
+        ('details', r'^(movie|tv|collection)/\d+', 6 * HOUR),
+        ('lists', r'^(search|trending|discover)/', HOUR),
+        ('reference', r'^(genre|configuration|watch/providers)/', 7 * DAY),
+    ],
+    'tvdb': [
+        ('series', r'^series/', 6 * HOUR),
+        ('episode', r'^episodes/', DAY),
+    ],
+    'rawg': [
+        ('details', r'^games/\d+', DAY),
+        ('lists', r'^games$', HOUR),
+    ],
+    'hardcover': [
+        ('query', r'^query', 6 * HOUR),
+    ],
+}
+
+STAT_KINDS = ('hit', 'revalidated', 'miss', 'bypass')
+
+_bypass = contextvars.ContextVar('api_response_cache_bypass', default=False)
+_compiled = {
+    provider: [
+        (family, re.compile(pattern), config(f'API_CACHE_TTL_{provider.upper()}_{family.upper()}', default=ttl, cast=int))
+        for family, pattern, ttl in families
+    ]
+    for provider, families in FAMILIES.items()
+}
+
+
+def _cache():
+    return caches[config('API_RESPONSE_CACHE_ALIAS', default='default')]
+
+
+def _bump(key):
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def _stat_key(provider, family, kind):
+    return f'api:resp:stats:{provider}:{family}:{kind}'
+
+
+def policy(provider, endpoint):
+    """``(family, ttl)`` for an endpoint, or ``(None, 0)`` if it is not cached."""
+    for family, pattern, ttl in _compiled.get(provider, ()):
+        if pattern.search(endpoint):
+            return family, ttl
+    return None, 0
+
+
+@contextmanager
+def bypass():
+    """Fetch fresh responses (and re-store them) inside this block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def bypassed():
+    """Whether the current code runs under `bypass()` (an explicit refresh)."""
+    return _bypass.get()
+
+
+def uncached(func, *args, **kwargs):
+    """Run ``func`` under `bypass()`; queue it as ``async_task(uncached, func, ...)``."""
+    with bypass():
+        return func(*args, **kwargs)
+
+
+def stats():
+    """``{provider: {family: {kind: count}}}`` for every cached family."""
+    keys = {
+        _stat_key(provider, family, kind): (provider, family, kind)
+        for provider, families in FAMILIES.items()
+        for family, _pattern, _ttl in families
+        for kind in STAT_KINDS
+    }
+    counts = _cache().get_many(list(keys))
+    result = {}
+    for key, (provider, family, kind) in keys.items():
+        result.setdefault(provider, {}).setdefault(family, {})[kind] = counts.get(key, 0)
+    return result
+
+
+def reset_stats():
+    _cache().delete_many([
+        _stat_key(provider, family, kind)
+        for provider, families in FAMILIES.items()
+        for family, _pattern, _ttl in families
+        for kind in STAT_KINDS
+    ])
+
+
+class CachedRequest:
+    """One upstream request seen through the cache.
+
+    Usage inside a service's fetch loop::
+
+        cached = CachedRequest('tmdb', endpoint, url, params)
+        data = cached.fresh()
+        if data is not None:
+            return data
+        headers.update(cached.conditional_headers())
+        response = session().get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return cached.resolve(response)
+    """
+
+    def __init__(self, provider, endpoint, url, params=None):
+        self.provider = provider
+        self.family, self.ttl = policy(provider, endpoint)
+        self.entry = None
+        if not self.ttl:
+            return
+        raw = json.dumps([url, params], sort_keys=True, default=str)
+        self.key = f'api:resp:{provider}:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}'
+        if _bypass.get():
+            self._count('bypass')
+        else:
+            self.entry = _cache().get(self.key)
+
+    def _count(self, kind):
+        _bump(_stat_key(self.provider, self.family, kind))
+
+    def fresh(self):
+        """The cached body if it is within its TTL, else None."""
+        if self.entry is not None and time.time() - self.entry['stored_at'] < self.ttl:
+            self._count('hit')
+            return self.entry['data']
+        return None
+
+    def conditional_headers(self):
+        """Validators of a stale entry, to send as ``If-None-Match`` / ``If-Modified-Since``."""
+        headers = {}
+        if self.entry is not None:
+            if self.entry.get('etag'):
+                headers['If-None-Match'] = self.entry['etag']
+            if self.entry.get('last_modified'):
+                headers['If-Modified-Since'] = self.entry['last_modified']
+        return headers
+
+    def resolve(self, response, cacheable=None):
+        """Decoded body of ``response``, refreshing or storing the entry.
+
+        ``cacheable(body)`` can veto storing a 200 (e.g. GraphQL errors).
+        """
+        if not self.ttl:
+            return response.json()
+        if response.status_code == 304 and self.entry is not None:
+            self._count('revalidated')
+            self._store(self.entry['data'], self.entry.get('etag'), self.entry.get('last_modified'))
+            return self.entry['data']
+
+        data = response.json()
+        if response.status_code == 200 and (cacheable is None or cacheable(data)):
+            if not _bypass.get():
+                self._count('miss')
+            self._store(data, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return data
+
+    def _store(self, data, etag, last_modified):
+        timeout = self.ttl + (REVALIDATE_WINDOW if etag or last_modified else 0)
+        _cache().set(
+            self.key,
+            {'data': data, 'etag': etag, 'last_modified': last_modified, 'stored_at': time.time()},
+            timeout,
+        )
@@ -1,36 +1,11 @@
 # filepath: c:\Users\Marks Sondors\Desktop\Personal projects\Entertainment-List-2.0\entertainment\api\services\books.py
 import time
-import threading
-from collections import deque
 import requests
 from decouple import config
 
-
-class RateLimiter:
-    """Rate limiter to control the number of requests per minute for Hardcover API"""
-    def __init__(self, max_calls_per_minute=60):
-        self.max_calls = max_calls_per_minute
-        self.period = 60.0  # 60 seconds
-        self.calls = deque()
-        self.lock = threading.RLock()
-
-    def wait_if_needed(self):
-        """Wait if rate limit has been reached (60 requests per minute)"""
-        with self.lock:
-            now = time.time()
-            
-            # Remove timestamps older than our period
-            while self.calls and self.calls[0] <= now - self.period:
-                self.calls.popleft()
-            
-            # If we've reached our limit, wait
-            if len(self.calls) >= self.max_calls:
-                sleep_time = self.calls[0] - (now - self.period)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-            
-            # Record this call
-            self.calls.append(time.time())
+from api.ratelimit import limiter, parse_retry_after
+from api.response_cache import CachedRequest
+from api.transport import session
 
 
 class BooksService:
@@ -47,8 +22,8 @@ class BooksService:
         self.app_version = config("APP_VERSION", default="1.0.0")
         self.contact = config("CONTACT_INFO", default="example@example.com")
         
-        # Rate limiter: 60 requests per minute
-        self.rate_limiter = RateLimiter(max_calls_per_minute=60)
+        # Hardcover budget (60 requests per minute) shared by every worker
+        self.rate_limiter = limiter('hardcover')
         
         if not self.api_token:
             print("Warning: HARDCOVER_API_TOKEN not found in environment variables")
@@ -70,9 +45,6 @@ class BooksService:
         if not self.api_token:
             raise ValueError("HARDCOVER_API_TOKEN is required")
         
-        # Apply rate limiting
-        self.rate_limiter.wait_if_needed()
-        
         payload = {
             'query': query
         }
@@ -80,18 +52,33 @@ class BooksService:
         if variables:
             payload['variables'] = variables
         
+        cached = CachedRequest('hardcover', query.lstrip(), self.base_url, payload)
+        data = cached.fresh()
+        if data is not None:
+            return data.get('data', {})
+        
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.post(
+                self.rate_limiter.wait_if_needed()
+                response = session().post(
                     self.base_url,
                     json=payload,
                     headers=self._get_headers(),
                     timeout=30  # Max timeout as per API docs
                 )
                 
+                if response.status_code == 429 and retries < max_retries:
+                    retries += 1
+                    delay = parse_retry_after(response.headers.get('Retry-After'))
+                    if delay is None:
+                        delay = 2 ** retries
+                    print(f"Rate limited (429). Retrying in {delay:.1f} seconds... (Attempt {retries}/{max_retries})")
+                    self.rate_limiter.block(delay)
+                    continue
+                
                 response.raise_for_status()
-                data = response.json()
+                data = cached.resolve(response, cacheable=lambda body: 'errors' not in body)
                 
                 # Check for GraphQL errors
                 if 'errors' in data:
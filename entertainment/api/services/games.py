@@ -1,5 +1,7 @@
 # RAWG API Service
 from api.base import BaseService
+from api.response_cache import CachedRequest
+from api.transport import session
 from decouple import config
 from datetime import datetime, timedelta
 import requests
@@ -38,12 +40,18 @@ class GamesService(BaseService):
         params = params or {}
         params['key'] = self.api_key
         
+        cached = CachedRequest('rawg', endpoint, url, params)
+        data = cached.fresh()
+        if data is not None:
+            return data
+        headers = cached.conditional_headers()
+        
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(url, params=params, timeout=10)
+                response = session().get(url, params=params, headers=headers, timeout=10)
                 response.raise_for_status()
-                return response.json()
+                return cached.resolve(response)
             except (ConnectionError, Timeout) as e:
                 retries += 1
                 if retries > max_retries:
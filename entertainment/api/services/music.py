@@ -1,4 +1,5 @@
 from api.base import BaseService
+from api.transport import session
 from decouple import config
 import requests
 
@@ -34,7 +35,7 @@ class MusicService(BaseService):
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+                response = session().get(url, params=params, headers=headers, timeout=10)
                 response.raise_for_status()
                 return response.json()
             except (requests.ConnectionError, requests.Timeout) as e:
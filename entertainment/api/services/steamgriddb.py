@@ -1,5 +1,6 @@
 # SteamGridDB API Service for game cover art
 from api.base import BaseService
+from api.transport import session
 from decouple import config
 import requests
 import time
@@ -42,7 +43,7 @@ class SteamGridDBService(BaseService):
         retries = 0
         while retries <= max_retries:
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+                response = session().get(url, params=params, headers=headers, timeout=10)
                 response.raise_for_status()
                 return response.json()
             except (ConnectionError, Timeout) as e:
@@ -10,6 +10,7 @@ class TVDBService(BaseService):
         )
         self.token = None
         self.token_expiry = 0
+        self.cache_provider = 'tvdb'
 
     def login(self):
         """Login to TVDB API to get a bearer token"""
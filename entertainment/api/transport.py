@@ -0,0 +1,84 @@
+# Description: Shared pooled HTTP transport for the external API services
+"""Connection-pooled HTTP transport shared by every service in `api/services`.
+
+Module-level ``requests.get`` / ``requests.post`` build a throwaway Session
+per call, so every TMDB / RAWG / TVDB / Hardcover request paid for a new
+TCP + TLS handshake. Services call ``session().get(...)`` instead:
+
+* one urllib3 pool per process (one `HTTPAdapter`), keyed by host, keeps
+  connections alive between calls and between services;
+* each thread gets its own `requests.Session` mounted on that adapter, so
+  cookie jars and default headers are never shared across threads while
+  the sockets are;
+* the pool is rebuilt after a fork (django-q workers), because sockets
+  inherited from the parent must not be reused by the child;
+* responses are requested gzip/deflate-compressed and decoded by urllib3.
+
+Retries stay in the services (they back off with jitter); the adapter
+itself never retries.
+
+Settings (environment / .env):
+
+    API_HTTP_POOL_CONNECTIONS  hosts kept in the pool          (default 10)
+    API_HTTP_POOL_MAXSIZE      idle connections kept per host  (default 10)
+"""
+import os
+import threading
+
+import requests
+from decouple import config
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = config("API_HTTP_POOL_CONNECTIONS", default=10, cast=int)
+POOL_MAXSIZE = config("API_HTTP_POOL_MAXSIZE", default=10, cast=int)
+
+DEFAULT_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+_lock = threading.Lock()
+_adapter = None
+_adapter_pid = None
+_local = threading.local()
+
+
+def _get_adapter():
+    """The process-wide adapter, recreated if this process was forked."""
+    global _adapter, _adapter_pid
+    pid = os.getpid()
+    if _adapter is None or _adapter_pid != pid:
+        with _lock:
+            if _adapter is None or _adapter_pid != pid:
+                # Don't close an inherited adapter: its sockets belong to the parent.
+                _adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                _adapter_pid = pid
+    return _adapter
+
+
+def session():
+    """This thread's Session, backed by the shared connection pool."""
+    adapter = _get_adapter()
+    current = getattr(_local, 'session', None)
+    if current is None or current.adapters.get('https://') is not adapter:
+        current = requests.Session()
+        current.headers.update(DEFAULT_HEADERS)
+        current.mount('https://', adapter)
+        current.mount('http://', adapter)
+        _local.session = current
+    return current
+
+
+def close():
+    """Drop pooled connections (tests, shutdown)."""
+    global _adapter, _adapter_pid
+    with _lock:
+        if _adapter is not None and _adapter_pid == os.getpid():
+            _adapter.close()
+        _adapter = None
+        _adapter_pid = None
+    _local.__dict__.clear()
@@ -51,6 +51,6 @@ class BookExplorerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 Prefetch("genres", queryset=BookGenre.objects.only("id", "name")),
             )
         )
-        qs = annotate_user_rating(qs, Book)
+        qs = annotate_user_rating(qs)
         qs = annotate_user_context(qs, Book, getattr(self.request, "user", None))
         return qs
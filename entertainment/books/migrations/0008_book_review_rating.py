@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Initial aggregates: one GROUP BY over the reviews of this type. Rows
+# without reviews keep the column defaults (0, 0, NULL).
+BACKFILL_SQL = """
+    UPDATE books_book AS target
+    SET review_count = agg.review_count,
+        review_rating_sum = agg.rating_sum,
+        review_rating_avg = agg.rating_avg
+    FROM (
+        SELECT r.object_id AS id,
+               COUNT(r.id) AS review_count,
+               SUM(r.rating) AS rating_sum,
+               AVG(r.rating) AS rating_avg
+        FROM custom_auth_review r
+        JOIN django_content_type ct ON ct.id = r.content_type_id
+        WHERE ct.app_label = 'books' AND ct.model = 'book'
+        GROUP BY r.object_id
+    ) AS agg
+    WHERE target.id = agg.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0007_book_search_vector'),
+        ('custom_auth', '0029_person_review_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='review_rating_avg',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='review_rating_sum',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(models.OrderBy(models.F('review_rating_avg'), descending=True, nulls_last=True), name='book_review_rating_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
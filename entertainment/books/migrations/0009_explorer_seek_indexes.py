@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0008_book_review_rating'),
+        ('custom_auth', '0029_person_review_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='book',
+            name='book_review_rating_idx',
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(models.OrderBy(models.F('review_rating_avg'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='book_review_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['review_rating_avg', 'id'], name='book_rating_asc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title', 'id'], name='book_title_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['published_date', 'id'], name='book_published_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(models.OrderBy(models.F('published_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='book_published_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['pages', 'id'], name='book_pages_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(models.OrderBy(models.F('pages'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='book_pages_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['date_added', 'id'], name='book_added_seek_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 from custom_auth.models import CustomUser, Media, Person, Keyword
 
 # Book-specific models
@@ -73,6 +74,30 @@ class Book(Media):
     added_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, related_name='added_books', blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True, db_index=True)
     date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='book_search_vector_idx'),
+            # Explorer seek pagination: (sort column, id) for each ordering field,
+            # plus DESC NULLS LAST variants for nullable columns.
+            models.Index(
+                models.F('review_rating_avg').desc(nulls_last=True), models.F('id').desc(),
+                name='book_review_rating_idx',
+            ),
+            models.Index(fields=['review_rating_avg', 'id'], name='book_rating_asc_seek_idx'),
+            models.Index(fields=['title', 'id'], name='book_title_seek_idx'),
+            models.Index(fields=['published_date', 'id'], name='book_published_seek_idx'),
+            models.Index(
+                models.F('published_date').desc(nulls_last=True), models.F('id').desc(),
+                name='book_published_desc_seek_idx',
+            ),
+            models.Index(fields=['pages', 'id'], name='book_pages_seek_idx'),
+            models.Index(
+                models.F('pages').desc(nulls_last=True), models.F('id').desc(),
+                name='book_pages_desc_seek_idx',
+            ),
+            models.Index(fields=['date_added', 'id'], name='book_added_seek_idx'),
+        ]
     
     def __str__(self):
         return self.title
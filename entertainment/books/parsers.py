@@ -7,6 +7,7 @@ from datetime import datetime
 from django.contrib.contenttypes.models import ContentType
 
 from api.services.books import BooksService
+from api.transport import session
 from custom_auth.models import Person, Keyword, CustomUser, Watchlist, MediaPerson
 from .models import Book, BookSeries, Publisher, BookCollection, BookGenre
 
@@ -20,7 +21,7 @@ logger = logging.getLogger(__name__)
 def get_openlibrary_author_data(openlibrary_id):
     """Fetch author data from the OpenLibrary API."""
     try:
-        response = requests.get(
+        response = session().get(
             f"https://openlibrary.org/authors/{openlibrary_id}.json",
             timeout=10,
         )
@@ -15,6 +15,7 @@ class AuthConfig(AppConfig):
 
 def _setup_custom_auth_schedules(sender, **kwargs):
     from django.db.utils import OperationalError, ProgrammingError
+    from django.utils import timezone
     from django_q.models import Schedule
 
     try:
@@ -30,6 +31,45 @@ def _setup_custom_auth_schedules(sender, **kwargs):
                 'next_run': None,
             },
         )
+
+        # Daily reconcile of the review rollups that back the network-graph
+        # temporal analytics (signals cover single-review writes).
+        Schedule.objects.get_or_create(
+            func='custom_auth.tasks.refresh_review_rollups',
+            defaults={
+                'name': 'Refresh Review Daily Rollups',
+                'schedule_type': Schedule.DAILY,
+                'repeats': -1,
+                # The scheduler only picks rows due before now
+                'next_run': timezone.now(),
+            },
+        )
+
+        # Daily reconcile of the denormalised review aggregates behind the
+        # explorer rating sort (signals cover single writes).
+        Schedule.objects.get_or_create(
+            func='custom_auth.tasks.reconcile_rating_aggregates',
+            defaults={
+                'name': 'Reconcile Rating Aggregates',
+                'schedule_type': Schedule.DAILY,
+                'repeats': -1,
+                # The scheduler only picks rows due before now
+                'next_run': timezone.now(),
+            },
+        )
+
+        # Daily rebuild of the unified search table (signals cover single
+        # saves; bulk imports skip them). Migration 0028 backfills it.
+        Schedule.objects.get_or_create(
+            func='custom_auth.tasks.rebuild_search_documents',
+            defaults={
+                'name': 'Rebuild Search Documents',
+                'schedule_type': Schedule.DAILY,
+                'repeats': -1,
+                # The scheduler only picks rows due before now
+                'next_run': timezone.now(),
+            },
+        )
     except (OperationalError, ProgrammingError):
         # DB not ready yet (first-ever migrate) — the next boot will register.
         pass
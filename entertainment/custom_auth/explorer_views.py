@@ -8,9 +8,8 @@ Optimizations:
 * No prefetch of `mediaperson_set` — role labels come from boolean flags
   which are all local columns.
 * `user_rating` — aggregate of all Reviews on media this person appears in,
-  computed via `annotate_person_rating` (correlated Subquery). Not
-  indexed; acceptable for the current dataset size. Denormalize if it
-  becomes a hot path.
+  read from the denormalized `Person.review_*` columns (see
+  custom_auth/services/rating_aggregates.py). Indexed for sorting.
 """
 from __future__ import annotations
 
@@ -21,7 +20,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from explorer.ordering import ExplorerOrderingFilter
 from explorer.pagination import ExplorerPagination
-from explorer.utils import annotate_person_rating
+from explorer.utils import annotate_user_rating
 
 from .filters import PersonFilter
 from .models import Person
@@ -62,5 +61,5 @@ class PersonExplorerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
             "is_tv_creator",
             "media_count",
         )
-        return annotate_person_rating(qs)
+        return annotate_user_rating(qs)
 
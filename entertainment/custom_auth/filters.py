@@ -42,7 +42,7 @@ class PersonFilter(django_filters.FilterSet):
         fields: list[str] = []
 
     def _filter_q(self, queryset, name, value):
-        return text_search(queryset, ["name"], value)
+        return text_search(queryset, ["name"], value, vector_field="search_vector")
 
     def _filter_user_rating_min(self, queryset, name, value):
         if value is None:
@@ -0,0 +1,30 @@
+"""Show hit / miss counters of the upstream API response cache.
+
+    python manage.py api_cache_stats
+    python manage.py api_cache_stats --reset
+"""
+from django.core.management.base import BaseCommand
+
+from api import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit / revalidated / miss / bypass counts per API endpoint family."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'family':<22}{'hit':>10}{'revalidated':>13}{'miss':>10}{'bypass':>10}{'hit rate':>10}")
+        for provider, families in response_cache.stats().items():
+            for family, counts in families.items():
+                served = counts["hit"] + counts["revalidated"]
+                total = served + counts["miss"]
+                rate = f"{served / total:.0%}" if total else "-"
+                self.stdout.write(
+                    f"{provider + '/' + family:<22}{counts['hit']:>10}{counts['revalidated']:>13}"
+                    f"{counts['miss']:>10}{counts['bypass']:>10}{rate:>10}"
+                )
+        if options["reset"]:
+            response_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,120 @@
+"""Benchmark the pooled API transport against one-off `requests.get` calls.
+
+A local fake API server answers JSON over HTTP/1.1 keep-alive. Each new
+connection is held for ``--connect-delay`` ms before it is served, standing
+in for the TCP + TLS handshake a real TMDB / RAWG / Hardcover call pays;
+pooled connections pay it once. Responses are gzip-compressed when the
+client asks for it.
+
+    python manage.py benchmark_http_transport
+    python manage.py benchmark_http_transport --requests 500 --threads 8 --connect-delay 40
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand
+
+from api import transport
+
+
+def _summary(timings: list[float]) -> str:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return (
+        f"p50 {statistics.median(timings) * 1e3:8.2f}ms  "
+        f"p95 {p95 * 1e3:8.2f}ms  max {timings[-1] * 1e3:8.2f}ms"
+    )
+
+
+def _fake_server(connect_delay: float, payload: bytes) -> ThreadingHTTPServer:
+    compressed = gzip.compress(payload)
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; with Nagle on, keep-alive
+        # responses would stall on the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            connections.append(1)
+            time.sleep(connect_delay)
+
+        def do_GET(self):
+            body = payload
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = compressed
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.connections = connections
+    return server
+
+
+class Command(BaseCommand):
+    help = "Compare per-request latency of one-off requests with the pooled API transport."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per run.")
+        parser.add_argument("--threads", type=int, default=1, help="Concurrent client threads.")
+        parser.add_argument("--connect-delay", type=float, default=25.0, help="Simulated handshake cost per new connection (ms).")
+        parser.add_argument("--results", type=int, default=20, help="Fake results per response (payload size).")
+
+    def handle(self, *args, **options):
+        payload = json.dumps({
+            "page": 1,
+            "results": [
+                {"id": i, "title": f"Title {i}", "overview": "lorem ipsum " * 40, "vote_average": 7.5}
+                for i in range(options["results"])
+            ],
+        }).encode()
+        server = _fake_server(options["connect_delay"] / 1000, payload)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/3/movie/popular"
+        self.stdout.write(
+            f"{options['requests']} requests, {options['threads']} thread(s), "
+            f"{options['connect_delay']:.0f}ms per new connection, {len(payload)} byte body"
+        )
+
+        def run(get):
+            def one(_):
+                started = time.perf_counter()
+                get(url, params={"page": 1}, timeout=10).json()
+                return time.perf_counter() - started
+
+            before = len(server.connections)
+            with ThreadPoolExecutor(options["threads"]) as pool:
+                timings = list(pool.map(one, range(options["requests"])))
+            return timings, len(server.connections) - before
+
+        try:
+            transport.close()
+            oneoff, oneoff_connections = run(requests.get)
+            pooled, pooled_connections = run(lambda *a, **kw: transport.session().get(*a, **kw))
+        finally:
+            transport.close()
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f"  requests.get : {_summary(oneoff)}  connections {oneoff_connections}")
+        self.stdout.write(f"  pooled       : {_summary(pooled)}  connections {pooled_connections}")
+        speedup = statistics.median(oneoff) / max(statistics.median(pooled), 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Median speedup: {speedup:,.1f}x"))
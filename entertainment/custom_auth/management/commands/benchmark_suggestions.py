@@ -0,0 +1,95 @@
+"""Benchmark typeahead suggestions against the `text_search` pipeline.
+
+Prefixes are sampled from indexed titles (1..N characters) and answered by
+`suggestions.suggest` (the request path: index lock plus the version-stamp
+round trip to the shared cache), by the in-memory index alone, and by
+`text_search` over the matching media table, as the search bar did per
+keystroke.
+
+    python manage.py benchmark_suggestions
+    python manage.py benchmark_suggestions --samples 500 --max-prefix 6
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from custom_auth.models import SearchDocument
+from custom_auth.services import suggestions
+from custom_auth.services.search import text_search
+
+# search-bar kind -> (model label, fields searched by the filters)
+_TEXT_SEARCH_TARGETS = {
+    'movies': ('movies.Movie', ['title', 'original_title']),
+    'tvshows': ('tvshows.TVShow', ['title', 'original_title']),
+    'games': ('games.Game', ['title', 'original_title']),
+    'books': ('books.Book', ['title', 'original_title']),
+    'people': ('custom_auth.Person', ['name']),
+}
+
+
+def _summary(timings: list[float]) -> str:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return (
+        f"p50 {statistics.median(timings) * 1e6:9.1f}us  "
+        f"p95 {p95 * 1e6:9.1f}us  max {timings[-1] * 1e6:9.1f}us"
+    )
+
+
+class Command(BaseCommand):
+    help = "Compare in-memory suggestion latency with text_search."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=200, help="Number of prefixes to time.")
+        parser.add_argument("--max-prefix", type=int, default=5, help="Longest prefix length to sample.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        titles = list(SearchDocument.objects.values_list("kind", "title"))
+        if not titles:
+            self.stdout.write(self.style.WARNING("No search documents; run rebuild_search_documents first."))
+            return
+
+        samples = []
+        for kind, title in rng.sample(titles, min(options["samples"], len(titles))):
+            normalized = suggestions.normalize(title)
+            if normalized:
+                length = rng.randint(1, min(options["max_prefix"], len(normalized)))
+                samples.append((kind, normalized[:length]))
+
+        started = time.perf_counter()
+        index = suggestions.get_index()
+        self.stdout.write(f"Index build: {len(index)} entries in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        suggest_timings, suggest_hits = [], 0
+        for kind, prefix in samples:
+            started = time.perf_counter()
+            suggest_hits += bool(suggestions.suggest(prefix, kinds=[kind]))
+            suggest_timings.append(time.perf_counter() - started)
+
+        index_timings, index_hits = [], 0
+        for kind, prefix in samples:
+            started = time.perf_counter()
+            index_hits += bool(index.search(prefix, kinds=[kind]))
+            index_timings.append(time.perf_counter() - started)
+
+        search_timings, search_hits = [], 0
+        for kind, prefix in samples:
+            label, fields = _TEXT_SEARCH_TARGETS[kind]
+            queryset = apps.get_model(label).objects.all()
+            started = time.perf_counter()
+            search_hits += bool(list(text_search(queryset, fields, prefix, vector_field="search_vector")[:suggestions.SUGGESTION_LIMIT]))
+            search_timings.append(time.perf_counter() - started)
+
+        self.stdout.write(f"{len(samples)} prefixes")
+        self.stdout.write(f"  suggest()    : {_summary(suggest_timings)}  hits {suggest_hits}")
+        self.stdout.write(f"  index only   : {_summary(index_timings)}  hits {index_hits}")
+        self.stdout.write(f"  text_search  : {_summary(search_timings)}  hits {search_hits}")
+        speedup = statistics.median(search_timings) / max(statistics.median(suggest_timings), 1e-9)
+        self.stdout.write(self.style.SUCCESS(f"Median speedup of suggest() over text_search: {speedup:,.0f}x"))
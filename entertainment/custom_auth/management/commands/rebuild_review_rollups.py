@@ -0,0 +1,31 @@
+"""Backfill (or reconcile) `ReviewDailyRollup`.
+
+Migration 0026 backfills history on first deploy; the daily
+`refresh_review_rollups` task then keeps the recent window exact.
+
+    python manage.py rebuild_review_rollups
+    python manage.py rebuild_review_rollups --days 7
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from custom_auth.services.review_rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute daily review rollups from Review rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Only rebuild the last N days (default: full history).",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(days_back=options["days"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} review rollup rows.")
+        )
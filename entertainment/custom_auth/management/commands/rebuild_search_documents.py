@@ -0,0 +1,22 @@
+"""Backfill (or reconcile) `SearchDocument`.
+
+The daily `rebuild_search_documents` task runs this; run it by hand after
+bulk imports to make new items searchable immediately.
+
+    python manage.py rebuild_search_documents
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from custom_auth.services.search_documents import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the unified search table from media and people."
+
+    def handle(self, *args, **options):
+        written = rebuild_search_documents()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} search documents.")
+        )
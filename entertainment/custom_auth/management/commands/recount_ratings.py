@@ -0,0 +1,25 @@
+"""Backfill (or reconcile) the denormalised `review_*` rating aggregates.
+
+Run once after applying the migrations that add the columns, and
+periodically as a safety net against missed signals (e.g. bulk_create
+bypasses post_save).
+
+    python manage.py recount_ratings
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from custom_auth.services.rating_aggregates import reconcile_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute review count / sum / average on media rows and Person."
+
+    def handle(self, *args, **options):
+        changed = reconcile_rating_aggregates()
+        for label, count in changed.items():
+            self.stdout.write(f"  {label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled rating aggregates on {sum(changed.values())} rows.")
+        )
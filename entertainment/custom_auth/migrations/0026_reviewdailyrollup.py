@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Review = apps.get_model('custom_auth', 'Review')
+    ReviewDailyRollup = apps.get_model('custom_auth', 'ReviewDailyRollup')
+
+    rows = (
+        Review.objects.annotate(day=TruncDate('date_added'))
+        .values('content_type_id', 'day')
+        .annotate(
+            review_count=Count('id'),
+            reviewer_count=Count('user', distinct=True),
+            item_count=Count('object_id', distinct=True),
+            rating_sum=Sum('rating'),
+            rating_sq_sum=Sum(F('rating') * F('rating')),
+        )
+        .order_by()
+    )
+    ReviewDailyRollup.objects.bulk_create(
+        [ReviewDailyRollup(**row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('custom_auth', '0025_person_explorer_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('reviewer_count', models.PositiveIntegerField(default=0)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0.0)),
+                ('rating_sq_sum', models.FloatField(default=0.0)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'day'), name='unique_review_rollup_per_day')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0026_reviewdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='person_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,157 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def _year(value):
+    return value.year if value else None
+
+
+def _alias(obj):
+    return obj.original_title if obj.original_title != obj.title else ''
+
+
+def _movie_document(movie):
+    return {
+        'kind': 'movies',
+        'title': movie.title,
+        'aliases': _alias(movie),
+        'year': _year(movie.release_date),
+        'poster': movie.poster,
+        'url': f'/movies/{movie.tmdb_id}/',
+        'extra': {'tmdb_id': movie.tmdb_id, 'rating': movie.rating},
+    }
+
+
+def _tvshow_document(tv):
+    extra = {'tmdb_id': tv.tmdb_id, 'rating': tv.rating}
+    if tv.last_air_date and tv.status in ['Ended', 'Canceled']:
+        extra['end_year'] = tv.last_air_date.year
+    return {
+        'kind': 'tvshows',
+        'title': tv.title,
+        'aliases': _alias(tv),
+        'year': _year(tv.first_air_date),
+        'poster': tv.poster,
+        'url': f'/tvshows/{tv.tmdb_id}/',
+        'extra': extra,
+    }
+
+
+def _game_document(game):
+    return {
+        'kind': 'games',
+        'title': game.title,
+        'aliases': _alias(game),
+        'year': _year(game.release_date),
+        'poster': game.poster,
+        'url': f'/games/{game.id}/',
+        'extra': {'rawg_id': game.rawg_id, 'metacritic': game.metacritic, 'rating': game.rating},
+    }
+
+
+def _book_document(book):
+    authors = [author.name for author in book.authors.all()]
+    aliases = [book.original_title] if book.original_title != book.title else []
+    return {
+        'kind': 'books',
+        'title': book.title,
+        'aliases': ' '.join(aliases + authors),
+        'year': _year(book.published_date),
+        'poster': book.image_url,
+        'url': f'/books/{book.id}/',
+        'extra': {'authors': ', '.join(authors), 'rating': book.rating},
+    }
+
+
+def _person_document(person):
+    return {
+        'kind': 'people',
+        'title': person.name,
+        'aliases': '',
+        'year': None,
+        'poster': person.profile_picture,
+        'url': f'/people/{person.id}/',
+        'extra': {'media_count': person.media_count},
+    }
+
+
+# Frozen copy of `search_documents.INDEXED_MODELS` as of this migration
+_DOCUMENTS = [
+    ('movies', 'movie', _movie_document, ()),
+    ('tvshows', 'tvshow', _tvshow_document, ()),
+    ('games', 'game', _game_document, ()),
+    ('books', 'book', _book_document, ('authors',)),
+    ('custom_auth', 'person', _person_document, ()),
+]
+
+
+def backfill_search_documents(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Review = apps.get_model('custom_auth', 'Review')
+    SearchDocument = apps.get_model('custom_auth', 'SearchDocument')
+
+    popularity = {
+        (row['content_type_id'], row['object_id']): row['count']
+        for row in Review.objects.values('content_type_id', 'object_id').annotate(count=Count('id')).order_by()
+    }
+    for app_label, model_name, builder, prefetch in _DOCUMENTS:
+        model = apps.get_model(app_label, model_name)
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name)
+        queryset = model.objects.all()
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    content_type_id=content_type.id,
+                    object_id=obj.pk,
+                    popularity=popularity.get((content_type.id, obj.pk), 0),
+                    **builder(obj),
+                )
+                for obj in queryset.iterator(chunk_size=2000)
+            ],
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('custom_auth', '0027_person_search_vector'),
+        ('movies', '0012_movie_search_vector'),
+        ('tvshows', '0017_tvshow_search_vector'),
+        ('games', '0009_game_search_vector'),
+        ('books', '0007_book_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('kind', models.CharField(max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('aliases', models.TextField(blank=True, default='')),
+                ('year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('popularity', models.PositiveIntegerField(default=0)),
+                ('poster', models.URLField(blank=True, null=True)),
+                ('url', models.CharField(max_length=255)),
+                ('extra', models.JSONField(blank=True, default=dict)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('search_vector', models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('aliases', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField())),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='search_doc_vector_idx'), django.contrib.postgres.indexes.GinIndex(fields=['title'], name='search_doc_title_trgm_idx', opclasses=['gin_trgm_ops']), django.contrib.postgres.indexes.GinIndex(fields=['aliases'], name='search_doc_aliases_trgm_idx', opclasses=['gin_trgm_ops'])],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='unique_search_document_per_object')],
+            },
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:09
+
+from django.db import migrations, models
+
+# Initial aggregates: every review on media a person appears in, counted
+# once however many roles they had. People without reviews keep the column
+# defaults (0, 0, NULL).
+BACKFILL_SQL = """
+    UPDATE custom_auth_person AS target
+    SET review_count = agg.review_count,
+        review_rating_sum = agg.rating_sum,
+        review_rating_avg = agg.rating_avg
+    FROM (
+        SELECT mp.person_id AS id,
+               COUNT(r.id) AS review_count,
+               SUM(r.rating) AS rating_sum,
+               AVG(r.rating) AS rating_avg
+        FROM (
+            SELECT DISTINCT person_id, content_type_id, object_id
+            FROM custom_auth_mediaperson
+        ) mp
+        JOIN custom_auth_review r
+          ON r.content_type_id = mp.content_type_id AND r.object_id = mp.object_id
+        GROUP BY mp.person_id
+    ) AS agg
+    WHERE target.id = agg.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0028_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='review_rating_avg',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='review_rating_sum',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(models.OrderBy(models.F('review_rating_avg'), descending=True, nulls_last=True), name='person_review_rating_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
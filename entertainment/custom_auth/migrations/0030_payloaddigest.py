@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('custom_auth', '0029_person_review_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayloadDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('resource', models.CharField(max_length=32)),
+                ('digest', models.CharField(max_length=64)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id', 'resource'), name='unique_payload_digest_per_resource')],
+            },
+        ),
+    ]
@@ -5,7 +5,9 @@ import secrets
 
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import pre_delete, post_save, post_delete
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models.signals import pre_delete, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 
 
@@ -92,15 +94,9 @@ class CustomUser(AbstractUser):
         return self.watched_episodes.filter(episode__season=season)
 
     def get_watch_progress(self, tv_show):
-        """Get the watch progress for a TV show (percentage of episodes watched)."""
-        from django.apps import apps
-        Episode = apps.get_model('tvshows', 'Episode')
-        
-        total_episodes = Episode.objects.filter(season__show=tv_show).exclude(season__season_number=0).count()
-        if total_episodes == 0:
-            return 0
-        watched_episodes = self.watched_episodes.filter(episode__season__show=tv_show).count()
-        return (watched_episodes / total_episodes) * 100
+        """Get the watch progress for a TV show (percentage of aired episodes watched)."""
+        progress = self.show_progress.filter(show=tv_show).only('watched_count', 'aired_count').first()
+        return progress.percentage if progress else 0
 
 class Genre(models.Model):
     name = models.CharField(max_length=100)
@@ -202,6 +198,26 @@ class Person(models.Model):
     #: cheap `ORDER BY media_count` in the file explorer.
     media_count = models.PositiveIntegerField(default=0, db_index=True)
 
+    #: Aggregates over every Review of media this person appears in (each
+    #: review counted once), maintained by Review / MediaPerson signals and
+    #: `recount_ratings`. Backs the explorer's indexed `user_rating` sort.
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    review_rating_sum = models.FloatField(default=0, editable=False)
+    review_rating_avg = models.FloatField(blank=True, null=True, editable=False)
+
+    #: Stored full-text vector over ``name``, maintained by PostgreSQL.
+    search_vector = models.GeneratedField(
+        expression=SearchVector('name', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='person_search_vector_idx'),
+            models.Index(models.F('review_rating_avg').desc(nulls_last=True), name='person_review_rating_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -210,6 +226,21 @@ class Media(models.Model):
     original_title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
 
+    #: Stored full-text vector over both titles, maintained by PostgreSQL so
+    #: searches hit a GIN index instead of running to_tsvector per row.
+    search_vector = models.GeneratedField(
+        expression=SearchVector('title', 'original_title', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    #: Aggregates over every Review of this item (season / episode-group
+    #: reviews included), maintained by Review signals and `recount_ratings`.
+    #: Backs the explorer's indexed `user_rating` sort.
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    review_rating_sum = models.FloatField(default=0, editable=False)
+    review_rating_avg = models.FloatField(blank=True, null=True, editable=False)
+
     class Meta:
         abstract = True
 
@@ -343,6 +374,111 @@ class Review(models.Model):
         
         super().save(*args, **kwargs)
 
+class ReviewDailyRollup(models.Model):
+    """Per-day review aggregates for one content type.
+
+    Maintained by Review signals and the daily `refresh_review_rollups` task
+    (see `custom_auth/services/review_rollups.py`). Temporal analytics read
+    a few hundred of these rows instead of aggregating the Review table per
+    period.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    day = models.DateField()
+
+    review_count = models.PositiveIntegerField(default=0)
+    reviewer_count = models.PositiveIntegerField(default=0)
+    item_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0.0)
+    rating_sq_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'day'],
+                name='unique_review_rollup_per_day'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} {self.day}: {self.review_count} reviews"
+
+class SearchDocument(models.Model):
+    """Denormalised search row for one media item or person.
+
+    One table covering every searchable type lets the search bar rank all
+    of them in a single query. Rows are maintained by post_save/post_delete
+    signals and the daily `rebuild_search_documents` task (see
+    `custom_auth/services/search_documents.py`).
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    media = GenericForeignKey('content_type', 'object_id')
+
+    #: Search-bar tab key: movies, tvshows, games, books or people.
+    kind = models.CharField(max_length=20)
+    title = models.CharField(max_length=255)
+    #: Alternative names (original title, author names), space separated.
+    aliases = models.TextField(blank=True, default='')
+    year = models.PositiveSmallIntegerField(blank=True, null=True)
+    #: Number of reviews; used as a tie-breaker in ranking.
+    popularity = models.PositiveIntegerField(default=0)
+    poster = models.URLField(blank=True, null=True)
+    url = models.CharField(max_length=255)
+    #: Type-specific display fields (tmdb_id, end_year, metacritic, authors).
+    extra = models.JSONField(default=dict, blank=True)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('aliases', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id'],
+                name='unique_search_document_per_object'
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_doc_vector_idx'),
+            GinIndex(fields=['title'], name='search_doc_title_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['aliases'], name='search_doc_aliases_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+class PayloadDigest(models.Model):
+    """Hash of the upstream payload last applied to an object, per sub-resource.
+
+    Lets the metadata refresh tasks skip all work (and the follow-up tasks)
+    for payloads that did not change (see
+    `custom_auth/services/payload_digests.py`).
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    #: Sub-resource the payload came from: details, credits, seasons, ...
+    resource = models.CharField(max_length=32)
+    digest = models.CharField(max_length=64)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id', 'resource'],
+                name='unique_payload_digest_per_resource'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} {self.resource}"
+
 class UserSettings(models.Model):
     """User settings and preferences"""
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='settings')
@@ -417,6 +553,99 @@ def invalidate_stats_on_watchlist_delete(sender, instance, **kwargs):
     invalidate_stats_cache(instance.user_id)
 
 
+# --- ReviewDailyRollup maintenance -------------------------------------------
+# Re-aggregates the (content type, day) bucket a review lands in so temporal
+# analytics never have to scan the Review table.
+
+@receiver(post_save, sender=Review)
+def refresh_rollup_on_review_save(sender, instance, **kwargs):
+    from custom_auth.services.review_rollups import refresh_rollup_for_review
+    refresh_rollup_for_review(instance)
+
+
+@receiver(post_delete, sender=Review)
+def refresh_rollup_on_review_delete(sender, instance, **kwargs):
+    from custom_auth.services.review_rollups import refresh_rollup_for_review
+    refresh_rollup_for_review(instance)
+
+
+# --- Review rating aggregates -------------------------------------------------
+# Recomputes `review_*` on the reviewed item and its credited people so the
+# explorer can sort by rating off an index (see services/rating_aggregates.py).
+
+@receiver(post_save, sender=Review)
+def refresh_rating_aggregates_on_review_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from custom_auth.services.rating_aggregates import refresh_ratings_for_media
+    refresh_ratings_for_media(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_delete, sender=Review)
+def refresh_rating_aggregates_on_review_delete(sender, instance, **kwargs):
+    from custom_auth.services.rating_aggregates import refresh_ratings_for_media
+    refresh_ratings_for_media(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_save, sender=MediaPerson)
+def refresh_person_rating_on_credit_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        from custom_auth.services.rating_aggregates import refresh_ratings_for_person
+        refresh_ratings_for_person(instance.person_id)
+
+
+@receiver(post_delete, sender=MediaPerson)
+def refresh_person_rating_on_credit_delete(sender, instance, **kwargs):
+    from custom_auth.services.rating_aggregates import refresh_ratings_for_person
+    refresh_ratings_for_person(instance.person_id)
+
+
+# --- SearchDocument maintenance -----------------------------------------------
+# Global receivers (like `remove_from_watchlist`) because the indexed models
+# live in apps that import this module. The label check keeps them cheap.
+
+@receiver(post_save)
+def index_search_document(sender, instance, raw=False, **kwargs):
+    from custom_auth.services.search_documents import INDEXED_MODELS, index_instance
+    if not raw and sender._meta.label_lower in INDEXED_MODELS:
+        index_instance(instance)
+
+
+@receiver(post_delete)
+def remove_search_document(sender, instance, **kwargs):
+    from custom_auth.services.search_documents import INDEXED_MODELS, remove_instance
+    if sender._meta.label_lower in INDEXED_MODELS:
+        remove_instance(instance)
+
+
+@receiver(m2m_changed)
+def reindex_search_document_on_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """Book aliases include author names, which are set after the first save."""
+    from custom_auth.services.search_documents import ALIAS_THROUGH_MODELS, index_instance
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if sender._meta.label_lower not in ALIAS_THROUGH_MODELS:
+        return
+    if not reverse:
+        index_instance(instance)
+    elif pk_set:
+        for obj in model.objects.filter(pk__in=pk_set):
+            index_instance(obj)
+
+
+@receiver(post_save, sender=Review)
+def refresh_search_popularity_on_review_save(sender, instance, created, **kwargs):
+    if created:
+        from custom_auth.services.search_documents import refresh_popularity
+        refresh_popularity(instance.content_type_id, instance.object_id)
+
+
+@receiver(post_delete, sender=Review)
+def refresh_search_popularity_on_review_delete(sender, instance, **kwargs):
+    from custom_auth.services.search_documents import refresh_popularity
+    refresh_popularity(instance.content_type_id, instance.object_id)
+
+
 # --- Person.media_count maintenance ------------------------------------------
 # Keeps the denormalized appearance count in sync so the file-explorer People
 # view can sort by `-media_count` without a GROUP BY join.
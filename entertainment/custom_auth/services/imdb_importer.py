@@ -1,13 +1,115 @@
+"""IMDb ratings / watchlist import.
+
+The preview used to look up every CSV row with its own Movie / TVShow /
+Review / Watchlist query, and the import wrote one `Review.objects.create`
+(plus a second save to backdate it) or `get_or_create` per item, then the
+background task resolved unknown titles one `find/` call, one title creation
+and one review at a time. The import is now set-based:
+
+* `ImdbImporter` filters the CSV with pandas and resolves every IMDb id
+  against the local ``imdb_id`` columns, the user's reviews and watchlist
+  with one query each;
+* `write_imports` inserts reviews and watchlist entries with `bulk_create`
+  (dates backdated with one `bulk_update`) and does once per call what the
+  Review / Watchlist save signals would have done per row;
+* `import_items` (the `import_imdb_data` task) works through unknown ids in
+  batches: ``find/`` lookups and title details are fetched concurrently on
+  the shared, rate-limited thread pool, matching titles are found by TMDB id
+  with one query, and the missing ones are created as stubs in bulk. Movie
+  stubs are enriched by the usual per-movie task; TV stubs are filled in by
+  one `refresh_tvshows_bulk` task (seasons, credits, TVDB air dates).
+
+Progress is kept in the cache (`get_progress`) for the settings page to poll.
+
+Imported reviews are history, so they do not notify followers like a new
+review does. Explorer folder counts of new stubs (Movie / TVShow post_save
+and the genre m2m signals) are left to the daily `rebuild_explorer_tree`.
+"""
+
+import logging
+from datetime import datetime, time
+from functools import partial
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
 import pandas as pd
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django_q.tasks import async_task
+
+from api.concurrency import executor, fetch_all, gather, submit_all
+from api.services.movies import MoviesService
+from api.services.tvshows import TVShowsService
+from custom_auth.models import MediaPerson, Review, Watchlist
+from custom_auth.services import ingest
+from custom_auth.services.rating_aggregates import refresh_media_ratings, refresh_person_ratings
+from custom_auth.services.review_rollups import refresh_rollup_days
+from custom_auth.services.search_documents import index_instances, refresh_popularities
+from custom_auth.services.statistics import invalidate_stats_cache
 from movies.models import Movie
+from movies.parsers import extract_movie_data
 from tvshows.models import TVShow
-from custom_auth.models import Review, Watchlist
-from django.contrib.contenttypes.models import ContentType
-import logging
+from tvshows.parsers import extract_tvshow_data
 
 logger = logging.getLogger(__name__)
 
+MOVIE_TYPES = ['movie', 'tvmovie', 'video', 'short', 'tv movie']
+TV_TYPES = ['tvseries', 'tvminiseries', 'tvspecial', 'tv series', 'tv mini series', 'tv special']
+
+IMPORTED_REVIEW_TEXT = "Imported from IMDb"
+
+# Unknown ids resolved (and written) per batch
+BATCH_SIZE = 100
+
+# Rows per INSERT / UPDATE statement
+WRITE_BATCH_SIZE = 500
+
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+# ========================================
+# PROGRESS
+# ========================================
+
+def _progress_key(user_id) -> str:
+    return f'imdb_import:progress:{user_id}'
+
+
+def set_progress(user_id, **values) -> Dict:
+    """Merge ``values`` into the user's import progress."""
+    progress = {**(cache.get(_progress_key(user_id)) or {}), **values}
+    cache.set(_progress_key(user_id), progress, PROGRESS_TIMEOUT)
+    return progress
+
+
+def get_progress(user_id) -> Optional[Dict]:
+    """``{'status', 'total', 'done', 'imported', 'failed'}`` of the user's last import, if any."""
+    return cache.get(_progress_key(user_id))
+
+
+# ========================================
+# PREVIEW
+# ========================================
+
+def _records(df, columns) -> List[Dict]:
+    """Rows of ``df`` as dicts of plain Python values (previews live in the session)."""
+    df = df.reindex(columns=columns)
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _by_imdb_id(model, imdb_ids) -> Dict[str, object]:
+    """``{imdb_id: object}`` in one query, keeping the oldest row per id."""
+    objects = {}
+    if len(imdb_ids):
+        for obj in model.objects.filter(imdb_id__in=list(imdb_ids)).only('id', 'title', 'imdb_id').order_by('id'):
+            objects.setdefault(obj.imdb_id, obj)
+    return objects
+
+
 class ImdbImporter:
     def __init__(self, user):
         self.user = user
@@ -25,6 +127,22 @@ class ImdbImporter:
             logger.error(f"Error parsing CSV: {e}")
             return None
 
+    def _skip_types(self, df, results, allowed):
+        """Record rows of other title types as skipped; returns the remaining rows."""
+        df = df.assign(type=df['title type'].astype(str).str.lower())
+        ignored = df[~df['type'].isin(allowed)]
+        results['skipped'].extend(
+            {'title': row['title'] or 'Unknown', 'reason': f"Ignored type: {row['type']}"}
+            for row in _records(ignored, ['title', 'type'])
+        )
+        return df[df['type'].isin(allowed)]
+
+    def _existing(self, model, object_ids):
+        """The user's Review / Watchlist rows for any of ``object_ids``."""
+        if not object_ids:
+            return model.objects.none()
+        return model.objects.filter(user=self.user, object_id__in=object_ids)
+
     def process_ratings(self, file):
         df = self.parse_csv(file)
         if df is None:
@@ -37,68 +155,56 @@ class ImdbImporter:
             'skipped': [],   # duplicates (same rating) or ignored (TV shows)
             'to_fetch': [],  # not in DB, will be fetched
         }
-        
+
         # Check required columns
         required = ['const', 'your rating', 'title type', 'title']
         if not all(col in df.columns for col in required):
              return {'error': f'Missing required columns. Found: {list(df.columns)}'}
 
         # Check if date rated column exists (it's usually 'date rated')
-        date_column = 'date rated' if 'date rated' in df.columns else None
-
-        for _, row in df.iterrows():
-            imdb_id = row['const']
-            title_type = str(row['title type']).lower() # Ensure string and lowercase for comparison
-            title = row.get('title', 'Unknown')
-            rating = row['your rating']
-            review_date = row[date_column] if date_column else None
-
-            # Ignore TV show RATINGS as per requirement
-            # Updated to include space variants
-            if title_type not in ['movie', 'tvmovie', 'video', 'short', 'tv movie']:
-                results['skipped'].append({
-                    'title': title,
-                    'reason': f'Ignored type: {title_type}'
-                })
-                continue
-            
-            # Find movie in DB
-            movie = Movie.objects.filter(imdb_id=imdb_id).first()
+        if 'date rated' not in df.columns:
+            df = df.assign(**{'date rated': None})
+
+        # Ignore TV show RATINGS as per requirement
+        df = self._skip_types(df, results, MOVIE_TYPES)
+        rows = _records(df, ['const', 'title', 'your rating', 'date rated'])
+
+        movies = _by_imdb_id(Movie, df['const'].unique())
+        local_ratings = {}
+        for object_id, rating in self._existing(Review, [movie.id for movie in movies.values()]).filter(
+            content_type=self.movie_ct
+        ).order_by('id').values_list('object_id', 'rating'):
+            local_ratings.setdefault(object_id, rating)
+
+        for row in rows:
+            imdb_id, rating, review_date = row['const'], row['your rating'], row['date rated']
+            movie = movies.get(imdb_id)
             if not movie:
                 # Add to fetch list
                 results['to_fetch'].append({
                     'imdb_id': imdb_id,
-                    'title': title,
+                    'title': row['title'] or 'Unknown',
                     'rating': rating,
                     'type': 'movie',
                     'date': review_date
                 })
                 continue
-            
-            # Check existing review
-            existing_review = Review.objects.filter(
-                user=self.user,
-                content_type=self.movie_ct,
-                object_id=movie.id
-            ).first()
-
-            if existing_review:
-                if abs(existing_review.rating - rating) > 0.1: # float comparison
-                    # Conflict
+
+            local_rating = local_ratings.get(movie.id)
+            if local_rating is not None:
+                if abs(local_rating - rating) > 0.1: # float comparison
                     results['conflicts'].append({
                         'title': movie.title,
-                        'local_rating': existing_review.rating,
+                        'local_rating': local_rating,
                         'imdb_rating': rating,
                         'imdb_id': imdb_id
                     })
                 else:
-                    # Match
                     results['skipped'].append({
                         'title': movie.title,
                         'reason': 'Already rated (matches)'
                     })
             else:
-                # To Import
                 results['imported'].append({
                     'object_id': movie.id,
                     'title': movie.title,
@@ -107,7 +213,7 @@ class ImdbImporter:
                     'type': 'movie',
                     'date': review_date
                 })
-        
+
         return results
 
     def process_watchlist(self, file):
@@ -121,51 +227,38 @@ class ImdbImporter:
             'skipped': [],
             'to_fetch': []
         }
-        
+
         if 'const' not in df.columns or 'title type' not in df.columns:
              return {'error': 'Missing required columns (const, Title Type)'}
+        if 'title' not in df.columns:
+            df = df.assign(title=None)
 
-        for _, row in df.iterrows():
-            imdb_id = row['const']
-            title_type = str(row['title type']).lower() # Ensure string and lowercase
-            title = row.get('title', 'Unknown')
-            
-            content_object = None
-            ct = None
-            media_type = None
-            
-            if title_type in ['movie', 'tvmovie', 'video', 'short', 'tv movie']:
-                content_object = Movie.objects.filter(imdb_id=imdb_id).first()
-                ct = self.movie_ct
-                media_type = 'movie'
-            elif title_type in ['tvseries', 'tvminiseries', 'tvspecial', 'tv series', 'tv mini series', 'tv special']:
-                content_object = TVShow.objects.filter(imdb_id=imdb_id).first()
-                ct = self.tv_ct
-                media_type = 'tv'
-            else:
-                 # Skip other types (episodes, games etc if any)
-                 results['skipped'].append({
-                     'title': title,
-                     'reason': f'Ignored type: {title_type}'
-                 })
-                 continue
-            
+        # Skip other types (episodes, games etc if any)
+        df = self._skip_types(df, results, MOVIE_TYPES + TV_TYPES)
+        df = df.assign(media_type=df['type'].isin(TV_TYPES).map({True: 'tv', False: 'movie'}))
+        rows = _records(df, ['const', 'title', 'media_type'])
+
+        found = {
+            'movie': _by_imdb_id(Movie, df.loc[df['media_type'] == 'movie', 'const'].unique()),
+            'tv': _by_imdb_id(TVShow, df.loc[df['media_type'] == 'tv', 'const'].unique()),
+        }
+        content_types = {'movie': self.movie_ct, 'tv': self.tv_ct}
+        object_ids = [obj.id for objects in found.values() for obj in objects.values()]
+        listed = set(self._existing(Watchlist, object_ids).values_list('content_type_id', 'object_id'))
+
+        for row in rows:
+            imdb_id, media_type = row['const'], row['media_type']
+            content_object = found[media_type].get(imdb_id)
             if not content_object:
                 results['to_fetch'].append({
                     'imdb_id': imdb_id,
-                    'title': title,
+                    'title': row['title'] or 'Unknown',
                     'type': media_type
                 })
                 continue
 
-            # Check if already in watchlist
-            exists = Watchlist.objects.filter(
-                user=self.user,
-                content_type=ct,
-                object_id=content_object.id
-            ).exists()
-            
-            if exists:
+            ct = content_types[media_type]
+            if (ct.id, content_object.id) in listed:
                 results['skipped'].append({
                     'title': content_object.title,
                     'reason': 'Already in watchlist'
@@ -178,5 +271,380 @@ class ImdbImporter:
                     'imdb_id': imdb_id,
                     'type': media_type
                 })
-                
+
         return results
+
+
+# ========================================
+# WRITING REVIEWS AND WATCHLIST ENTRIES
+# ========================================
+
+def _date_added(value) -> Optional[datetime]:
+    """Aware datetime for an IMDb date ("2023-05-01" or a full timestamp), or None."""
+    if not value:
+        return None
+    value = str(value)
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value[:10])
+        if day is None:
+            return None
+        moment = datetime.combine(day, time.min)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def _keys_filter(keys: Iterable[Tuple[int, int]]) -> Q:
+    """``Q`` matching the given ``(content_type_id, object_id)`` pairs."""
+    by_type = {}
+    for content_type_id, object_id in keys:
+        by_type.setdefault(content_type_id, set()).add(object_id)
+    query = Q(pk__in=[])
+    for content_type_id, object_ids in by_type.items():
+        query |= Q(content_type_id=content_type_id, object_id__in=object_ids)
+    return query
+
+
+def _by_content_type(rows) -> Dict[int, set]:
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.content_type_id, set()).add(row.object_id)
+    return grouped
+
+
+def _backdate(model, rows, dates) -> None:
+    """Set ``date_added`` (auto_now_add, so overwritten by the insert) where a date is known."""
+    dated = []
+    for row, date_added in zip(rows, dates):
+        if date_added:
+            row.date_added = date_added
+            dated.append(row)
+    if dated:
+        model.objects.bulk_update(dated, ['date_added'], batch_size=WRITE_BATCH_SIZE)
+
+
+def write_imports(user, ratings: Iterable[Dict] = (), watchlist: Iterable[Dict] = ()) -> Tuple[int, int]:
+    """Insert imported reviews and watchlist entries for ``user``.
+
+    ``ratings`` are ``{'content_type_id', 'object_id', 'rating', 'date'}``
+    (movies only: a TV review needs a season), ``watchlist`` entries
+    ``{'content_type_id', 'object_id', 'date'}``. Items the user already
+    reviewed are skipped, and so are watchlist entries already listed or
+    reviewed; rating a movie removes it from the watchlist, as
+    `Review.save` does. Returns ``(reviews, watchlist entries)`` written.
+    """
+    ratings, watchlist = list(ratings), list(watchlist)
+    keys = {(item['content_type_id'], item['object_id']) for item in chain(ratings, watchlist)}
+    if not keys:
+        return 0, 0
+    query = _keys_filter(keys)
+    reviewed = set(Review.objects.filter(query, user=user).values_list('content_type_id', 'object_id'))
+    listed = set(Watchlist.objects.filter(query, user=user).values_list('content_type_id', 'object_id'))
+
+    reviews, review_dates = [], []
+    for item in ratings:
+        key = (item['content_type_id'], item['object_id'])
+        if key in reviewed:
+            continue
+        reviewed.add(key)
+        reviews.append(Review(
+            user=user,
+            content_type_id=key[0],
+            object_id=key[1],
+            rating=item['rating'],
+            review_text=IMPORTED_REVIEW_TEXT,
+        ))
+        review_dates.append(_date_added(item.get('date')))
+
+    entries, entry_dates = [], []
+    for item in watchlist:
+        key = (item['content_type_id'], item['object_id'])
+        if key in reviewed or key in listed:
+            continue
+        listed.add(key)
+        entries.append(Watchlist(user=user, content_type_id=key[0], object_id=key[1]))
+        entry_dates.append(_date_added(item.get('date')))
+
+    if not reviews and not entries:
+        return 0, 0
+
+    with transaction.atomic():
+        Review.objects.bulk_create(reviews, batch_size=WRITE_BATCH_SIZE)
+        _backdate(Review, reviews, review_dates)
+        if reviews:
+            Watchlist.objects.filter(
+                _keys_filter((review.content_type_id, review.object_id) for review in reviews), user=user
+            ).delete()
+        Watchlist.objects.bulk_create(entries, batch_size=WRITE_BATCH_SIZE)
+        _backdate(Watchlist, entries, entry_dates)
+
+    _after_write(user, reviews)
+    return len(reviews), len(entries)
+
+
+def _after_write(user, reviews: List[Review]) -> None:
+    """What the Review / Watchlist post_save receivers do, once per batch."""
+    from explorer.tree_counts import invalidate_user as invalidate_tree_counts
+    from stremio.cache import invalidate_user as invalidate_stremio
+
+    invalidate_stats_cache(user.id)
+    invalidate_tree_counts(user.id)
+    invalidate_stremio(user.id)
+
+    for content_type_id, object_ids in _by_content_type(reviews).items():
+        try:
+            refresh_media_ratings(content_type_id, object_ids)
+            refresh_person_ratings(
+                MediaPerson.objects.filter(content_type_id=content_type_id, object_id__in=object_ids)
+                .values_list('person_id', flat=True)
+                .distinct()
+            )
+            refresh_popularities(content_type_id, object_ids)
+            refresh_rollup_days(
+                content_type_id, {timezone.localdate(review.date_added) for review in reviews
+                                  if review.content_type_id == content_type_id}
+            )
+        except Exception as e:
+            # Never fail an import because of denormalised counters; the
+            # daily reconcile tasks repair them.
+            logger.error(f"Failed to refresh aggregates after IMDb import for user {user.id}: {e}")
+
+
+# ========================================
+# FETCHING AND CREATING NEW TITLES
+# ========================================
+
+def _movie_metadata(details):
+    return (
+        details.get('genres', []),
+        details.get('production_countries', []),
+        details.get('keywords', {}).get('keywords', []),
+    )
+
+
+def _tvshow_metadata(details):
+    return (
+        details.get('genres', []),
+        [{'iso_3166_1': code} for code in details.get('origin_country', [])],
+        details.get('keywords', {}).get('results', []),
+    )
+
+
+def _movie_row(details):
+    row = extract_movie_data(details)
+    row['release_date'] = row['release_date'] or None
+    row['runtime'] = row['runtime'] or 0
+    row['rating'] = row['rating'] or 0
+    return row
+
+
+def _tvshow_row(details):
+    row = extract_tvshow_data(details)
+    row['first_air_date'] = row['first_air_date'] or None
+    row['last_air_date'] = row['last_air_date'] or None
+    return row
+
+
+class _MediaKind(NamedTuple):
+    """How titles of one media type are looked up and created."""
+    model: type
+    #: key of the TMDB ``find/`` response listing matches of this type
+    results_key: str
+    #: ``(services, tmdb_id) -> details``
+    details: Callable
+    #: details -> model field values
+    row: Callable
+    #: details -> (genres, countries, keywords) payloads
+    metadata: Callable
+
+
+_KINDS = {
+    'movie': _MediaKind(
+        Movie, 'movie_results',
+        lambda services, tmdb_id: services['movie'].get_movie_details(tmdb_id, append_to_response='videos,keywords,release_dates'),
+        _movie_row, _movie_metadata,
+    ),
+    'tv': _MediaKind(
+        TVShow, 'tv_results',
+        lambda services, tmdb_id: services['tv'].get_show_details(tmdb_id, append_to_response='videos,keywords,external_ids'),
+        _tvshow_row, _tvshow_metadata,
+    ),
+}
+
+
+def _link(model, field_name, pairs) -> None:
+    """Insert m2m rows ``(object_id, related_id)`` straight into the through table."""
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+    through.objects.bulk_create(
+        [through(**{source: object_id, target: related_id}) for object_id, related_id in set(pairs)],
+        batch_size=WRITE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def _create_titles(kind: _MediaKind, payloads: List[Dict], user) -> Dict[int, int]:
+    """Bulk create stubs for TMDB detail payloads; returns ``{tmdb_id: pk}``.
+
+    Genres, countries and keywords of the whole batch are resolved together.
+    Run inside a transaction.
+    """
+    metadata = [kind.metadata(details) for details in payloads]
+    genres = {genre.tmdb_id: genre for genre in ingest.resolve_genres(chain.from_iterable(m[0] for m in metadata))}
+    countries = {country.iso_3166_1: country for country in ingest.resolve_countries(chain.from_iterable(m[1] for m in metadata))}
+    keywords = ingest.resolve_keywords(chain.from_iterable(m[2] for m in metadata))
+    keywords_by_id = {keyword.tmdb_id: keyword for keyword in keywords}
+    keywords_by_name = {keyword.name.lower(): keyword for keyword in keywords}
+
+    objects = kind.model.objects.bulk_create(
+        [kind.model(**kind.row(details), added_by=user) for details in payloads],
+        batch_size=WRITE_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['tmdb_id'],
+        update_fields=['imdb_id'],
+    )
+
+    genre_pairs, country_pairs, keyword_pairs = [], [], []
+    for obj, (title_genres, title_countries, title_keywords) in zip(objects, metadata):
+        genre_pairs.extend((obj.pk, genres[genre['id']].pk) for genre in title_genres if genre.get('id') in genres)
+        country_pairs.extend(
+            (obj.pk, countries[country['iso_3166_1']].pk) for country in title_countries
+            if country.get('iso_3166_1') in countries
+        )
+        for keyword in title_keywords:
+            match = keywords_by_id.get(keyword.get('id')) or keywords_by_name.get((keyword.get('name') or '').lower())
+            if match:
+                keyword_pairs.append((obj.pk, match.pk))
+    _link(kind.model, 'genres', genre_pairs)
+    _link(kind.model, 'countries', country_pairs)
+    _link(kind.model, 'keywords', keyword_pairs)
+
+    created = {obj.tmdb_id: obj.pk for obj in objects}
+    # Reload so dates are dates rather than the payload's strings
+    index_instances(kind.model.objects.filter(pk__in=created.values()))
+    return created
+
+
+def _resolve_tmdb_ids(kind: _MediaKind, wanted: Dict[str, int], user, services, pool) -> Tuple[Dict[str, int], List[int]]:
+    """``({imdb_id: pk}, new pks)`` for ``{imdb_id: tmdb_id}``, creating missing titles.
+
+    Titles already stored under the TMDB id get the IMDb id if they lack one;
+    details of the missing ones are fetched concurrently on ``pool``.
+    """
+    existing = {}
+    for obj in kind.model.objects.filter(tmdb_id__in=set(wanted.values())).only('id', 'tmdb_id', 'imdb_id'):
+        existing[obj.tmdb_id] = obj
+    backfill = []
+    for imdb_id, tmdb_id in wanted.items():
+        obj = existing.get(tmdb_id)
+        if obj is not None and not obj.imdb_id:
+            obj.imdb_id = imdb_id
+            backfill.append(obj)
+    if backfill:
+        kind.model.objects.bulk_update(backfill, ['imdb_id'], batch_size=WRITE_BATCH_SIZE)
+
+    missing = sorted({tmdb_id for tmdb_id in wanted.values() if tmdb_id not in existing})
+    created = {}
+    if missing:
+        details = fetch_all(pool, {tmdb_id: partial(kind.details, services, tmdb_id) for tmdb_id in missing})
+        payloads = [details[tmdb_id] for tmdb_id in missing if details.get(tmdb_id)]
+        if payloads:
+            with transaction.atomic():
+                created = _create_titles(kind, payloads, user)
+
+    pks = {tmdb_id: obj.pk for tmdb_id, obj in existing.items()}
+    pks.update(created)
+    resolved = {imdb_id: pks[tmdb_id] for imdb_id, tmdb_id in wanted.items() if tmdb_id in pks}
+    return resolved, list(created.values())
+
+
+def _write_items(user, items, resolved, content_types) -> int:
+    """Write the reviews / watchlist entries of resolved ``items``; returns how many resolved."""
+    ratings, watchlist, count = [], [], 0
+    for item in items:
+        object_id = resolved.get((item['type'], item['imdb_id']))
+        if object_id is None:
+            continue
+        count += 1
+        entry = {'content_type_id': content_types[item['type']], 'object_id': object_id, 'date': item.get('date')}
+        if item.get('rating'):
+            # Force strictly no watchlist if rated
+            ratings.append({**entry, 'rating': item['rating']})
+        elif item.get('watchlist'):
+            watchlist.append(entry)
+    write_imports(user, ratings, watchlist)
+    return count
+
+
+def import_items(user, items: List[Dict], workers: Optional[int] = None) -> Tuple[int, int]:
+    """Import fetched IMDb items for ``user``; returns ``(succeeded, failed)``.
+
+    ``items`` are ``{'imdb_id', 'type' ('movie' | 'tv'), 'rating'?, 'date'?,
+    'watchlist'?}``. Progress is reported through `set_progress` after every
+    batch.
+    """
+    items = [item for item in items if item.get('imdb_id') and item.get('type') in _KINDS]
+    content_types = {media_type: ContentType.objects.get_for_model(kind.model).id for media_type, kind in _KINDS.items()}
+    progress = partial(set_progress, user.id, total=len(items))
+    succeeded = failed = 0
+    progress(status='running', done=0, imported=0, failed=0)
+
+    # Titles stored under their IMDb id: one query per type
+    resolved = {}
+    for media_type, kind in _KINDS.items():
+        imdb_ids = {item['imdb_id'] for item in items if item['type'] == media_type}
+        resolved.update(((media_type, imdb_id), obj.pk) for imdb_id, obj in _by_imdb_id(kind.model, imdb_ids).items())
+    known = [item for item in items if (item['type'], item['imdb_id']) in resolved]
+    succeeded += _write_items(user, known, resolved, content_types)
+    progress(done=succeeded, imported=succeeded)
+
+    unknown = [item for item in items if (item['type'], item['imdb_id']) not in resolved]
+    batches = [unknown[i:i + BATCH_SIZE] for i in range(0, len(unknown), BATCH_SIZE)]
+    services = {'movie': MoviesService(), 'tv': TVShowsService()}
+    find = services['movie'].find_by_external_id
+    new_movies, new_tvshows = [], []
+
+    with executor(workers) as pool:
+        pending = submit_all(pool, {item['imdb_id']: partial(find, item['imdb_id']) for item in batches[0]}) if batches else {}
+        for index, batch in enumerate(batches):
+            found = gather(pending)
+            # Look the next batch up while this one is written.
+            if index + 1 < len(batches):
+                pending = submit_all(pool, {item['imdb_id']: partial(find, item['imdb_id']) for item in batches[index + 1]})
+
+            for media_type, kind in _KINDS.items():
+                wanted = {}
+                for item in batch:
+                    hits = (found.get(item['imdb_id']) or {}).get(kind.results_key) if item['type'] == media_type else None
+                    if hits:
+                        wanted[item['imdb_id']] = hits[0]['id']
+                    elif item['type'] == media_type:
+                        logger.warning(f"Could not find {media_type} for IMDb ID {item['imdb_id']}")
+                if not wanted:
+                    continue
+                try:
+                    batch_resolved, created = _resolve_tmdb_ids(kind, wanted, user, services, pool)
+                except Exception as e:
+                    logger.error(f"Error creating {media_type} titles for IMDb import of user {user.id}: {e}")
+                    continue
+                resolved.update(((media_type, imdb_id), pk) for imdb_id, pk in batch_resolved.items())
+                (new_movies if media_type == 'movie' else new_tvshows).extend(created)
+
+            try:
+                written = _write_items(user, batch, resolved, content_types)
+            except Exception as e:
+                logger.error(f"Error writing IMDb import batch for user {user.id}: {e}")
+                written = 0
+            succeeded += written
+            failed += len(batch) - written
+            progress(done=succeeded + failed, imported=succeeded, failed=failed)
+            logger.info(f"IMDb import for user {user.id}: {succeeded + failed}/{len(items)} ({failed} failed)")
+
+    # Same follow-up as `create_movie_fast`: cast, crew, collection, companies
+    for movie_id in new_movies:
+        async_task('movies.tasks.enrich_movie_task', movie_id, hook='movies.tasks.movie_enrichment_complete_hook')
+    if new_tvshows:
+        async_task('tvshows.tasks.refresh_tvshows_bulk', new_tvshows, update_people=True)
+
+    progress(status='complete', done=len(items), imported=succeeded, failed=failed)
+    return succeeded, failed
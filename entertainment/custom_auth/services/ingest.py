@@ -0,0 +1,301 @@
+"""Bulk ingestion of TMDB metadata for new movies and TV shows.
+
+Creating a title used to cost one `get_or_create` per genre, country,
+keyword and production company, plus a lookup, `get_or_create`, `save()`
+and `MediaPerson.objects.create` per credit, so a show with long aggregate
+credits ran thousands of queries. Here each lookup type is resolved with one
+``IN`` query and its missing rows are inserted with one `bulk_create`:
+
+* `resolve_genres` / `resolve_countries` / `resolve_keywords` /
+  `resolve_companies` return instances in payload order;
+* `prepare_people` loads the credited people in one query and fetches the
+  unknown ones from TMDB concurrently. It writes nothing, so call it
+  before opening the title's transaction;
+* `write_credits` upserts the new people, sets their role flags, inserts
+  every credit in one `bulk_create` and does the bookkeeping the
+  MediaPerson / Person signals would have done (``media_count``, rating
+  aggregates, search documents).
+
+Person and ProductionCompany have a unique ``tmdb_id`` and are inserted with
+``update_conflicts``, so a concurrent import of the same person cannot fail
+the batch. Genre, Country and Keyword have no unique key to conflict on;
+their missing rows are plain inserts, exactly as racy as the
+`get_or_create` calls they replace.
+"""
+
+import logging
+from collections import Counter
+from functools import partial
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Lower
+
+from api.concurrency import executor, fetch_all
+from custom_auth.models import Country, Genre, Keyword, MediaPerson, Person, ProductionCompany
+from custom_auth.services.rating_aggregates import refresh_person_ratings
+from custom_auth.services.search_documents import index_instances
+
+logger = logging.getLogger(__name__)
+
+TMDB_IMAGE_URL = 'https://image.tmdb.org/t/p/original'
+
+#: MediaPerson role -> Person flag it sets
+ROLE_FLAGS = {
+    'Actor': 'is_actor',
+    'Director': 'is_director',
+    'Screenplay': 'is_screenwriter',
+    'Writer': 'is_writer',
+    'Story': 'is_story',
+    'Original Story': 'is_original_story',
+    'Novel': 'is_novelist',
+    'Comic Book': 'is_comic_artist',
+    'Graphic Novel': 'is_graphic_novelist',
+    'Book': 'is_book',
+    'Original Music Composer': 'is_original_music_composer',
+    'Creator': 'is_tv_creator',
+}
+
+
+class Credit(NamedTuple):
+    """One MediaPerson row to write, keyed by the person's TMDB id."""
+    tmdb_id: int
+    role: str
+    character_name: Optional[str] = None
+    order: int = 0
+
+
+class People(NamedTuple):
+    """Credited people resolved by `prepare_people`."""
+    #: TMDB id -> Person (saved, or new and not yet inserted)
+    by_tmdb_id: Dict[int, Person]
+    #: New people built from TMDB details
+    new: List[Person]
+    #: Known people that got a wikidata id
+    wikidata: List[Person]
+
+
+def _image(path: Optional[str]) -> Optional[str]:
+    return f"{TMDB_IMAGE_URL}{path}" if path else None
+
+
+def _first_by(queryset, field: str) -> Dict[Any, Any]:
+    """``{value: row}`` keeping the oldest row when a value is duplicated."""
+    rows = {}
+    for row in queryset.order_by('id'):
+        rows.setdefault(getattr(row, field), row)
+    return rows
+
+
+# ========================================
+# LOOKUPS
+# ========================================
+
+def resolve_genres(genres: Iterable[Dict]) -> List[Genre]:
+    """Genres for TMDB ``[{'id', 'name'}]``, creating the missing ones."""
+    wanted = {genre['id']: genre.get('name') or '' for genre in genres if genre.get('id') is not None}
+    if not wanted:
+        return []
+    found = _first_by(Genre.objects.filter(tmdb_id__in=wanted), 'tmdb_id')
+    missing = [Genre(tmdb_id=tmdb_id, name=name) for tmdb_id, name in wanted.items() if tmdb_id not in found]
+    for genre in Genre.objects.bulk_create(missing):
+        found[genre.tmdb_id] = genre
+    return [found[tmdb_id] for tmdb_id in wanted]
+
+
+def resolve_countries(countries: Iterable[Dict]) -> List[Country]:
+    """Countries for ``[{'iso_3166_1', 'name'}]``, creating the missing ones."""
+    wanted = {country['iso_3166_1']: country.get('name') or '' for country in countries if country.get('iso_3166_1')}
+    if not wanted:
+        return []
+    found = _first_by(Country.objects.filter(iso_3166_1__in=wanted), 'iso_3166_1')
+    missing = [Country(iso_3166_1=code, name=name) for code, name in wanted.items() if code not in found]
+    for country in Country.objects.bulk_create(missing):
+        found[country.iso_3166_1] = country
+    return [found[code] for code in wanted]
+
+
+def resolve_keywords(keywords: Iterable[Dict]) -> List[Keyword]:
+    """Keywords for TMDB ``[{'id', 'name'}]``, creating the missing ones.
+
+    Matched by TMDB id first, then by name (RAWG and Hardcover keywords share
+    the table); a name match without a TMDB id is given this one.
+    """
+    wanted = {}
+    for keyword in keywords:
+        if keyword.get('name'):
+            wanted.setdefault(keyword.get('id'), keyword['name'].lower())
+    if not wanted:
+        return []
+
+    found = _first_by(Keyword.objects.filter(tmdb_id__in=[i for i in wanted if i is not None]), 'tmdb_id')
+    unmatched = {tmdb_id: name for tmdb_id, name in wanted.items() if tmdb_id not in found}
+    if unmatched:
+        by_name = _first_by(
+            Keyword.objects.annotate(lower_name=Lower('name')).filter(lower_name__in=set(unmatched.values())),
+            'lower_name',
+        )
+        backfill, new = [], {}
+        for tmdb_id, name in unmatched.items():
+            keyword = by_name.get(name)
+            if keyword is None:
+                # Keyword.save() lowercases names; bulk_create skips it
+                keyword = new.setdefault(name, Keyword(name=name, tmdb_id=tmdb_id))
+            elif not keyword.tmdb_id and tmdb_id is not None:
+                keyword.tmdb_id = tmdb_id
+                backfill.append(keyword)
+            found[tmdb_id] = keyword
+        if backfill:
+            Keyword.objects.bulk_update(backfill, ['tmdb_id'])
+        Keyword.objects.bulk_create(list(new.values()))
+
+    return list({keyword.pk: keyword for keyword in (found[tmdb_id] for tmdb_id in wanted)}.values())
+
+
+def resolve_companies(companies: Iterable[Dict]) -> List[ProductionCompany]:
+    """Production companies for TMDB ``[{'id', 'name', 'logo_path', 'origin_country'}]``.
+
+    New companies are linked to their origin country if it already exists.
+    """
+    wanted = {company['id']: company for company in companies if company.get('id') is not None}
+    if not wanted:
+        return []
+    found = {company.tmdb_id: company for company in ProductionCompany.objects.filter(tmdb_id__in=wanted)}
+    missing = [company for tmdb_id, company in wanted.items() if tmdb_id not in found]
+    if missing:
+        codes = {company.get('origin_country') for company in missing} - {None, ''}
+        countries = _first_by(Country.objects.filter(iso_3166_1__in=codes), 'iso_3166_1') if codes else {}
+        created = ProductionCompany.objects.bulk_create(
+            [
+                ProductionCompany(
+                    tmdb_id=company['id'],
+                    name=company.get('name') or '',
+                    logo_path=_image(company.get('logo_path')),
+                    country=countries.get(company.get('origin_country')),
+                )
+                for company in missing
+            ],
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=['name'],
+        )
+        for company in created:
+            found[company.tmdb_id] = company
+    return [found[tmdb_id] for tmdb_id in wanted]
+
+
+# ========================================
+# PEOPLE AND CREDITS
+# ========================================
+
+def prepare_people(tmdb_ids: Iterable[int], service, workers: Optional[int] = None) -> People:
+    """Load the people behind ``tmdb_ids`` and fetch the unknown ones from TMDB.
+
+    One query for the known people; details and external ids of new people,
+    and external ids of known people still missing a wikidata id, are
+    fetched concurrently through ``service`` (a `MoviesService`). Nothing is
+    written. People whose details cannot be fetched are left out.
+    """
+    tmdb_ids = {tmdb_id for tmdb_id in tmdb_ids if tmdb_id is not None}
+    known = {person.tmdb_id: person for person in Person.objects.filter(tmdb_id__in=tmdb_ids)} if tmdb_ids else {}
+
+    calls = {}
+    for tmdb_id in tmdb_ids:
+        person = known.get(tmdb_id)
+        if person is None:
+            calls[('details', tmdb_id)] = partial(service.get_person_details, tmdb_id)
+        if person is None or not person.wikidata_id:
+            calls[('external_ids', tmdb_id)] = partial(service.get_person_external_ids, tmdb_id)
+    results = {}
+    if calls:
+        with executor(workers) as pool:
+            results = fetch_all(pool, calls)
+
+    people = People(dict(known), [], [])
+    for tmdb_id in tmdb_ids:
+        wikidata_id = (results.get(('external_ids', tmdb_id)) or {}).get('wikidata_id')
+        person = known.get(tmdb_id)
+        if person is not None:
+            if wikidata_id:
+                person.wikidata_id = wikidata_id
+                people.wikidata.append(person)
+            continue
+        details = results.get(('details', tmdb_id))
+        if not details:
+            logger.warning(f"Skipping credits of TMDB person {tmdb_id}: no details")
+            continue
+        person = Person(
+            tmdb_id=tmdb_id,
+            name=details.get('name') or '',
+            profile_picture=_image(details.get('profile_path')),
+            date_of_birth=details.get('birthday') or None,
+            date_of_death=details.get('deathday') or None,
+            bio=details.get('biography'),
+            imdb_id=details.get('imdb_id'),
+            wikidata_id=wikidata_id,
+        )
+        people.by_tmdb_id[tmdb_id] = person
+        people.new.append(person)
+    return people
+
+
+def write_credits(obj, credits: Iterable[Credit], people: People) -> List[MediaPerson]:
+    """Write ``credits`` of ``obj`` and everything they imply; run inside a transaction.
+
+    Inserts the new people, fills in wikidata ids, sets role flags (one
+    UPDATE per flag), inserts the credits, and bumps ``media_count``,
+    rating aggregates and search documents of everyone credited.
+    """
+    if people.new:
+        Person.objects.bulk_create(
+            people.new,
+            update_conflicts=True,
+            unique_fields=['tmdb_id'],
+            update_fields=['name'],
+        )
+    if people.wikidata:
+        Person.objects.bulk_update(people.wikidata, ['wikidata_id'])
+
+    credits = [credit for credit in credits if credit.tmdb_id in people.by_tmdb_id]
+    if not credits:
+        return []
+
+    flagged = {}
+    for credit in credits:
+        flag = ROLE_FLAGS.get(credit.role)
+        if flag:
+            flagged.setdefault(flag, set()).add(people.by_tmdb_id[credit.tmdb_id])
+    for flag, persons in flagged.items():
+        Person.objects.filter(pk__in=[person.pk for person in persons], **{flag: False}).update(**{flag: True})
+        for person in persons:
+            setattr(person, flag, True)
+
+    content_type = ContentType.objects.get_for_model(obj)
+    media_people = MediaPerson.objects.bulk_create([
+        MediaPerson(
+            content_type=content_type,
+            object_id=obj.pk,
+            person=people.by_tmdb_id[credit.tmdb_id],
+            role=credit.role,
+            character_name=credit.character_name,
+            order=credit.order,
+        )
+        for credit in credits
+    ])
+
+    # What the per-row MediaPerson post_save receivers do, once per batch
+    appearances = Counter(media_person.person_id for media_person in media_people)
+    Person.objects.filter(pk__in=appearances).update(
+        media_count=F('media_count') + Case(
+            *[When(pk=person_id, then=Value(count)) for person_id, count in appearances.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    refresh_person_ratings(appearances)
+    credited = {person.pk: person for person in people.by_tmdb_id.values() if person.pk in appearances}
+    for person_id, person in credited.items():
+        person.media_count += appearances[person_id]
+    index_instances(credited.values())
+    return media_people
@@ -0,0 +1,134 @@
+"""Content hashes of upstream payloads, to skip no-op metadata refreshes.
+
+The refresh tasks (`update_single_movie`, `update_single_tvshow`,
+`update_single_person` and the season / episode group / TVDB follow-ups)
+compare every field, walk every credit and queue their follow-ups on each
+run, although the payload is usually exactly what they applied last time.
+A `PayloadDigest` row stores a stable hash of the normalised payload per
+object and sub-resource; when a freshly fetched payload hashes the same, the
+work that depends on it is skipped entirely.
+
+Keys that change on every fetch without being stored anywhere
+(`VOLATILE_KEYS`) are left out of the hash. A digest older than
+``PAYLOAD_DIGEST_MAX_AGE_DAYS`` never matches, so every object still gets a
+full refresh now and then, and nothing matches under
+`api.response_cache.bypass()` (explicit refreshes). Digests are saved only
+after the work they stand for succeeded. Hit / miss counts are logged per
+object and kept in the cache (`stats`).
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Tuple
+
+from decouple import config
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.utils import timezone
+
+from api.response_cache import bypassed
+from custom_auth.models import PayloadDigest
+
+logger = logging.getLogger(__name__)
+
+#: Payload keys ignored when hashing: they drift daily and nothing stores them
+VOLATILE_KEYS = frozenset({'popularity', 'vote_count'})
+
+#: Sub-resources digests are kept for
+RESOURCES = ('details', 'credits', 'seasons', 'episode_groups')
+
+MAX_AGE = timedelta(days=config('PAYLOAD_DIGEST_MAX_AGE_DAYS', default=30, cast=int))
+
+
+def _normalise(value):
+    if isinstance(value, dict):
+        return {key: _normalise(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(item) for item in value]
+    return value
+
+
+def digest(payload: Any) -> str:
+    """Stable SHA-256 of ``payload`` (key order and volatile keys ignored)."""
+    encoded = json.dumps(_normalise(payload), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _stat_key(resource: str, kind: str) -> str:
+    return f'payload_digest:stats:{resource}:{kind}'
+
+
+def _bump(key: str, count: int) -> None:
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        cache.add(key, count, timeout=None)
+
+
+def stats(resources: Iterable[str] = RESOURCES) -> Dict[str, Dict[str, int]]:
+    """``{resource: {'unchanged': n, 'changed': n}}`` counted so far."""
+    keys = {_stat_key(resource, kind): (resource, kind) for resource in resources for kind in ('unchanged', 'changed')}
+    counts = {resource: {'unchanged': 0, 'changed': 0} for resource in resources}
+    for key, value in cache.get_many(keys).items():
+        resource, kind = keys[key]
+        counts[resource][kind] = value
+    return counts
+
+
+class PayloadDigests:
+    """Stored digests of some objects, loaded in one query and saved in one upsert.
+
+    Call `save` once the changed payloads have been applied.
+    """
+
+    def __init__(self, objects: Iterable[Any]):
+        self._stored: Dict[Tuple[int, int, str], PayloadDigest] = {}
+        self._pending: Dict[Tuple[int, int, str], str] = {}
+        self._counts: Dict[Tuple[str, str], int] = {}
+        by_type = {}
+        for obj in objects:
+            by_type.setdefault(ContentType.objects.get_for_model(obj).id, set()).add(obj.pk)
+        for content_type_id, object_ids in by_type.items():
+            for row in PayloadDigest.objects.filter(content_type_id=content_type_id, object_id__in=object_ids):
+                self._stored[(row.content_type_id, row.object_id, row.resource)] = row
+
+    def unchanged(self, obj, resource: str, payload: Any, record: bool = True) -> bool:
+        """Whether ``payload`` hashes like the last one applied to ``obj``.
+
+        A changed digest is stored by the next `save` unless ``record`` is
+        False (the work it stands for is left to a follow-up task, which
+        records it itself).
+        """
+        key = (ContentType.objects.get_for_model(obj).id, obj.pk, resource)
+        value = digest(payload)
+        row = self._stored.get(key)
+        fresh = row is not None and row.date_updated >= timezone.now() - MAX_AGE and not bypassed()
+        kind = 'unchanged' if fresh and row.digest == value else 'changed'
+        self._counts[(resource, kind)] = self._counts.get((resource, kind), 0) + 1
+        logger.debug(f"Payload digest {obj._meta.label} {obj.pk} {resource}: {kind}")
+        if kind == 'changed' and record:
+            self._pending[key] = value
+        return kind == 'unchanged'
+
+    def save(self) -> None:
+        """Store the digests of the changed payloads and count hits / misses."""
+        if self._pending:
+            PayloadDigest.objects.bulk_create(
+                [
+                    PayloadDigest(content_type_id=content_type_id, object_id=object_id, resource=resource, digest=value)
+                    for (content_type_id, object_id, resource), value in self._pending.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['content_type', 'object_id', 'resource'],
+                update_fields=['digest', 'date_updated'],
+            )
+            self._pending = {}
+        for (resource, kind), count in self._counts.items():
+            _bump(_stat_key(resource, kind), count)
+        if self._counts:
+            logger.info("Payload digests: " + ", ".join(
+                f"{resource} {kind} {count}" for (resource, kind), count in sorted(self._counts.items())
+            ))
+        self._counts = {}
@@ -0,0 +1,191 @@
+"""Denormalised review aggregates on media rows and `Person`.
+
+Every `Media` subclass and `Person` carry `review_count`, `review_rating_sum`
+and `review_rating_avg`, indexed on ``review_rating_avg DESC NULLS LAST`` so
+the explorer's `user_rating` sort is an index scan instead of a correlated
+subquery evaluated for every row.
+
+A media item aggregates every Review on it; a person aggregates every Review
+on media they appear in, counting each review once however many roles they
+had. Review and MediaPerson signals recompute the affected rows; the
+`recount_ratings` command / daily task re-derives everything to absorb
+drift from paths that skip signals (bulk_create, queryset.update).
+
+Rows are always recomputed from the Review table rather than adjusted by
+deltas, so rating edits need no pre-save bookkeeping and concurrent writes
+converge.
+
+The same columns double as the community top-rated ranking: `ranked_ids`
+walks ``<model>_review_rating_idx`` from the top, so a page of top-rated
+items costs O(skip + page) index entries instead of a GROUP BY over every
+review.
+"""
+
+import logging
+from typing import Collection, Iterable, List, Optional
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import F
+
+from custom_auth.models import Media, MediaPerson
+
+logger = logging.getLogger(__name__)
+
+_CHANGED = """
+    WHERE target.id = agg.id
+      AND (target.review_count, target.review_rating_sum, target.review_rating_avg)
+          IS DISTINCT FROM (agg.review_count, agg.rating_sum, agg.rating_avg)
+"""
+
+_MEDIA_SQL = """
+    UPDATE {table} AS target
+    SET review_count = agg.review_count,
+        review_rating_sum = agg.rating_sum,
+        review_rating_avg = agg.rating_avg
+    FROM (
+        SELECT m.id,
+               COUNT(r.id) AS review_count,
+               COALESCE(SUM(r.rating), 0) AS rating_sum,
+               AVG(r.rating) AS rating_avg
+        FROM {table} m
+        LEFT JOIN custom_auth_review r
+               ON r.content_type_id = %s AND r.object_id = m.id
+        {where}
+        GROUP BY m.id
+    ) AS agg
+""" + _CHANGED
+
+_PERSON_SQL = """
+    UPDATE custom_auth_person AS target
+    SET review_count = agg.review_count,
+        review_rating_sum = agg.rating_sum,
+        review_rating_avg = agg.rating_avg
+    FROM (
+        SELECT p.id,
+               COUNT(r.id) AS review_count,
+               COALESCE(SUM(r.rating), 0) AS rating_sum,
+               AVG(r.rating) AS rating_avg
+        FROM custom_auth_person p
+        LEFT JOIN (
+            SELECT DISTINCT person_id, content_type_id, object_id
+            FROM custom_auth_mediaperson
+            {mp_where}
+        ) mp ON mp.person_id = p.id
+        LEFT JOIN custom_auth_review r
+               ON r.content_type_id = mp.content_type_id AND r.object_id = mp.object_id
+        {where}
+        GROUP BY p.id
+    ) AS agg
+""" + _CHANGED
+
+
+def _rated_model(content_type_id: int):
+    """The `Media` subclass for a content type, or None if it has no aggregates."""
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    if model is None or not issubclass(model, Media):
+        return None
+    return model
+
+
+def refresh_media_ratings(content_type_id: int, object_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute aggregates for the given items (all of that type if None).
+
+    Returns the number of rows whose stored values changed.
+    """
+    model = _rated_model(content_type_id)
+    if model is None:
+        return 0
+    params = [content_type_id]
+    where = ''
+    if object_ids is not None:
+        object_ids = list(object_ids)
+        if not object_ids:
+            return 0
+        where = 'WHERE m.id = ANY(%s)'
+        params.append(object_ids)
+    sql = _MEDIA_SQL.format(table=connection.ops.quote_name(model._meta.db_table), where=where)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def refresh_person_ratings(person_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute aggregates for the given people (everyone if None)."""
+    params = []
+    mp_where = where = ''
+    if person_ids is not None:
+        person_ids = list(person_ids)
+        if not person_ids:
+            return 0
+        mp_where = 'WHERE person_id = ANY(%s)'
+        where = 'WHERE p.id = ANY(%s)'
+        params = [person_ids, person_ids]
+    with connection.cursor() as cursor:
+        cursor.execute(_PERSON_SQL.format(mp_where=mp_where, where=where), params)
+        return cursor.rowcount
+
+
+def refresh_ratings_for_media(content_type_id: int, object_id: int) -> None:
+    """Signal entry point: refresh an item and everyone credited on it."""
+    try:
+        refresh_media_ratings(content_type_id, [object_id])
+        person_ids = (
+            MediaPerson.objects.filter(content_type_id=content_type_id, object_id=object_id)
+            .values_list('person_id', flat=True)
+            .distinct()
+        )
+        refresh_person_ratings(person_ids)
+    except Exception as e:
+        # Never fail a review write because of denormalised counters; the
+        # daily reconcile repairs the rows.
+        logger.error(f"Failed to refresh rating aggregates for {content_type_id}:{object_id}: {e}")
+
+
+def refresh_ratings_for_person(person_id: int) -> None:
+    """Signal entry point: a credit was added or removed."""
+    try:
+        refresh_person_ratings([person_id])
+    except Exception as e:
+        logger.error(f"Failed to refresh rating aggregates for person {person_id}: {e}")
+
+
+def reconcile_rating_aggregates() -> dict:
+    """Re-derive every aggregate; returns changed row counts per model label."""
+    changed = {}
+    for model in apps.get_models():
+        if issubclass(model, Media):
+            content_type_id = ContentType.objects.get_for_model(model).pk
+            changed[model._meta.label] = refresh_media_ratings(content_type_id)
+    changed['custom_auth.Person'] = refresh_person_ratings()
+    logger.info(f"Reconciled rating aggregates: {changed}")
+    return changed
+
+
+def ranked(queryset):
+    """Rated rows of `queryset` in community rating order (index order)."""
+    return queryset.filter(review_rating_avg__isnull=False).order_by(
+        F('review_rating_avg').desc(nulls_last=True), '-id'
+    )
+
+
+def ranked_ids(queryset, exclude_ids: Collection[int] = (), skip: int = 0, limit: int = 100,
+               chunk_size: int = 500) -> List[int]:
+    """Ids at positions ``skip .. skip + limit`` of the ranking of `queryset`.
+
+    Excluded ids (e.g. what the user already reviewed) are skipped while
+    walking the ranking rather than sent to the database as a NOT IN list;
+    the walk stops as soon as the page is full.
+    """
+    ids = []
+    for pk in ranked(queryset).values_list('id', flat=True).iterator(chunk_size=chunk_size):
+        if pk in exclude_ids:
+            continue
+        if skip:
+            skip -= 1
+            continue
+        ids.append(pk)
+        if len(ids) >= limit:
+            break
+    return ids
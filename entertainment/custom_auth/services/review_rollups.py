@@ -0,0 +1,209 @@
+"""Daily review rollups backing the network-graph temporal analytics.
+
+One `ReviewDailyRollup` row per (content type, local day) stores the review
+count, distinct reviewers, distinct items, and the rating sum / sum of
+squares. Review signals re-aggregate the single bucket a review touches.
+Bulk writers that skip the signals repair the days they touch with
+`refresh_rollup_days`, as the IMDb importer does for the (possibly old) days
+it backdates reviews to. The daily `refresh_review_rollups` task re-derives
+recent days in one GROUP BY to catch any other drift there.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from custom_auth.models import Review, ReviewDailyRollup
+
+logger = logging.getLogger(__name__)
+
+_ROLLUP_FIELDS = ['review_count', 'reviewer_count', 'item_count', 'rating_sum', 'rating_sq_sum']
+
+
+def _day_bounds(day: date):
+    """Aware [start, end) datetimes for a local calendar day."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _rollup_aggregates():
+    return {
+        'review_count': Count('id'),
+        'reviewer_count': Count('user', distinct=True),
+        'item_count': Count('object_id', distinct=True),
+        'rating_sum': Sum('rating'),
+        'rating_sq_sum': Sum(F('rating') * F('rating')),
+    }
+
+
+def refresh_rollup_day(content_type_id: int, day: date) -> None:
+    """Recompute one (content type, day) bucket from the Review table."""
+    start, end = _day_bounds(day)
+    totals = Review.objects.filter(
+        content_type_id=content_type_id,
+        date_added__gte=start,
+        date_added__lt=end,
+    ).aggregate(**_rollup_aggregates())
+
+    if not totals['review_count']:
+        ReviewDailyRollup.objects.filter(content_type_id=content_type_id, day=day).delete()
+        return
+
+    ReviewDailyRollup.objects.update_or_create(
+        content_type_id=content_type_id,
+        day=day,
+        defaults={
+            'review_count': totals['review_count'],
+            'reviewer_count': totals['reviewer_count'],
+            'item_count': totals['item_count'],
+            'rating_sum': totals['rating_sum'] or 0.0,
+            'rating_sq_sum': totals['rating_sq_sum'] or 0.0,
+        },
+    )
+
+
+def refresh_rollup_days(content_type_id: int, days: Iterable[date]) -> int:
+    """Recompute several (content type, day) buckets in one GROUP BY.
+
+    For bulk writers that skip the Review signals. Returns the number of
+    rollup rows written.
+    """
+    days = set(days)
+    if not days:
+        return 0
+    start, _ = _day_bounds(min(days))
+    _, end = _day_bounds(max(days))
+    rows = (
+        Review.objects.filter(content_type_id=content_type_id, date_added__gte=start, date_added__lt=end)
+        .annotate(day=TruncDate('date_added'))
+        .filter(day__in=days)
+        .values('day')
+        .annotate(**_rollup_aggregates())
+        .order_by()
+    )
+    rollups = [
+        ReviewDailyRollup(
+            content_type_id=content_type_id,
+            day=row['day'],
+            review_count=row['review_count'],
+            reviewer_count=row['reviewer_count'],
+            item_count=row['item_count'],
+            rating_sum=row['rating_sum'] or 0.0,
+            rating_sq_sum=row['rating_sq_sum'] or 0.0,
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        ReviewDailyRollup.objects.filter(content_type_id=content_type_id, day__in=days).exclude(
+            day__in=[rollup.day for rollup in rollups]
+        ).delete()
+        ReviewDailyRollup.objects.bulk_create(
+            rollups,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['content_type', 'day'],
+            update_fields=_ROLLUP_FIELDS,
+        )
+    return len(rollups)
+
+
+def refresh_rollup_for_review(review: Review) -> None:
+    """Signal entry point: refresh the bucket the given review belongs to."""
+    day = timezone.localdate(review.date_added) if review.date_added else timezone.localdate()
+    try:
+        refresh_rollup_day(review.content_type_id, day)
+    except Exception as e:
+        # Never fail a review write because of analytics bookkeeping; the
+        # daily task will reconcile the bucket.
+        logger.error(f"Failed to refresh review rollup for review {review.pk}: {e}")
+
+
+def rebuild_rollups(days_back: Optional[int] = None) -> int:
+    """Re-derive rollups in a single GROUP BY over Review.
+
+    Args:
+        days_back: Only rebuild the last N local days. ``None`` rebuilds the
+            whole history (initial backfill).
+
+    Returns:
+        Number of rollup rows written.
+    """
+    reviews = Review.objects.all()
+    stale = ReviewDailyRollup.objects.all()
+    if days_back is not None:
+        first_day = timezone.localdate() - timedelta(days=days_back)
+        start, _ = _day_bounds(first_day)
+        reviews = reviews.filter(date_added__gte=start)
+        stale = stale.filter(day__gte=first_day)
+
+    rows = (
+        reviews.annotate(day=TruncDate('date_added'))
+        .values('content_type_id', 'day')
+        .annotate(**_rollup_aggregates())
+        .order_by()
+    )
+    rollups = [
+        ReviewDailyRollup(
+            content_type_id=row['content_type_id'],
+            day=row['day'],
+            review_count=row['review_count'],
+            reviewer_count=row['reviewer_count'],
+            item_count=row['item_count'],
+            rating_sum=row['rating_sum'] or 0.0,
+            rating_sq_sum=row['rating_sq_sum'] or 0.0,
+        )
+        for row in rows
+    ]
+
+    # Days that no longer have any review must disappear from the rollup.
+    with transaction.atomic():
+        stale.delete()
+        ReviewDailyRollup.objects.bulk_create(
+            rollups,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['content_type', 'day'],
+            update_fields=_ROLLUP_FIELDS,
+        )
+    logger.info(f"Rebuilt {len(rollups)} review rollup rows (days_back={days_back})")
+    return len(rollups)
+
+
+def get_daily_rollups(content_type_id: int, start_day: date, end_day: date) -> Dict[date, Dict]:
+    """Load rollups for ``[start_day, end_day)`` keyed by day (one query)."""
+    rows = ReviewDailyRollup.objects.filter(
+        content_type_id=content_type_id,
+        day__gte=start_day,
+        day__lt=end_day,
+    ).values('day', *_ROLLUP_FIELDS)
+    return {row['day']: row for row in rows}
+
+
+def get_distinct_counts(content_type_id: int, periods: Sequence[Tuple[date, date]]) -> List[Dict[str, int]]:
+    """Distinct reviewers and items for each ``[start_day, end_day)`` period (one query).
+
+    Per-day distinct counts cannot be added up across days, so multi-day
+    periods count straight from Review: one filtered ``COUNT(DISTINCT)`` per
+    period in a single aggregate over the whole window.
+    """
+    if not periods:
+        return []
+    aggregates = {}
+    for index, (start_day, end_day) in enumerate(periods):
+        in_period = Q(date_added__gte=_day_bounds(start_day)[0], date_added__lt=_day_bounds(end_day)[0])
+        aggregates[f'reviewer_count_{index}'] = Count('user', distinct=True, filter=in_period)
+        aggregates[f'item_count_{index}'] = Count('object_id', distinct=True, filter=in_period)
+    totals = Review.objects.filter(
+        content_type_id=content_type_id,
+        date_added__gte=_day_bounds(min(start_day for start_day, _ in periods))[0],
+        date_added__lt=_day_bounds(max(end_day for _, end_day in periods))[0],
+    ).aggregate(**aggregates)
+    return [
+        {'reviewer_count': totals[f'reviewer_count_{index}'], 'item_count': totals[f'item_count_{index}']}
+        for index in range(len(periods))
+    ]
@@ -8,10 +8,15 @@ Wraps the three-tier fallback used by `search_bar_discover`:
 Every layer returns the queryset with an annotated ordering column, and the
 caller receives the queryset annotated + ordered so it can be paged/filtered
 further by DRF.
+
+Media models and `Person` carry a stored, GIN-indexed ``search_vector``
+generated column; pass ``vector_field="search_vector"`` so tier 1 matches
+against it instead of running to_tsvector over every row. Tier 2 prefilters
+with the ``%`` operator so the ``gin_trgm_ops`` title indexes are used.
 """
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Iterator, List, Optional
 
 from django.contrib.postgres.search import (
     SearchQuery,
@@ -19,12 +24,58 @@ from django.contrib.postgres.search import (
     SearchVector,
     TrigramSimilarity,
 )
-from django.db.models import Q, QuerySet
+from django.db.models import F, Q, QuerySet
 
 
 TRIGRAM_THRESHOLD = 0.3
 
 
+def _search_tiers(
+    queryset: QuerySet,
+    fields: List[str],
+    term: str,
+    *,
+    config: str,
+    trigram_threshold: float,
+    vector_field: Optional[str],
+) -> Iterator[QuerySet]:
+    """Yield the FTS, trigram and icontains querysets in fallback order."""
+    query = SearchQuery(term, config=config)
+    if vector_field:
+        yield (
+            queryset.filter(**{vector_field: query})
+            .annotate(rank=SearchRank(F(vector_field), query))
+            .order_by("-rank")
+        )
+    else:
+        vector = SearchVector(*fields, config=config)
+        yield (
+            queryset.annotate(rank=SearchRank(vector, query))
+            .filter(rank__gt=0)
+            .order_by("-rank")
+        )
+
+    # `%` (pg_trgm.similarity_threshold, default 0.3) is what the trigram
+    # GIN indexes can answer; the summed similarity then ranks the survivors.
+    candidates = Q()
+    similarity = None
+    for field in fields:
+        candidates |= Q(**{f"{field}__trigram_similar": term})
+        component = TrigramSimilarity(field, term)
+        similarity = component if similarity is None else similarity + component
+    yield (
+        queryset.filter(candidates)
+        .annotate(similarity=similarity)
+        .filter(similarity__gt=trigram_threshold)
+        .order_by("-similarity")
+    )
+
+    icontains_q = Q()
+    for field in fields:
+        icontains_q |= Q(**{f"{field}__icontains": term})
+    yield queryset.filter(icontains_q)
+
+
 def text_search(
     queryset: QuerySet,
     fields: Iterable[str],
@@ -32,6 +83,7 @@ def text_search(
     *,
     config: str = "english",
     trigram_threshold: float = TRIGRAM_THRESHOLD,
+    vector_field: Optional[str] = None,
 ) -> QuerySet:
     """Filter+rank a queryset with FTS → trigram → icontains fallback.
 
@@ -46,31 +98,41 @@ def text_search(
     if not fields:
         return queryset.none()
 
-    vector = SearchVector(*fields, config=config)
-    query = SearchQuery(term, config=config)
+    tiers = list(_search_tiers(
+        queryset, fields, term,
+        config=config, trigram_threshold=trigram_threshold, vector_field=vector_field,
+    ))
+    for tier in tiers[:-1]:
+        if tier.exists():
+            return tier
+    return tiers[-1]
 
-    fts_qs = (
-        queryset.annotate(rank=SearchRank(vector, query))
-        .filter(rank__gt=0)
-        .order_by("-rank")
-    )
-    if fts_qs.exists():
-        return fts_qs
 
-    similarity = None
-    for field in fields:
-        component = TrigramSimilarity(field, term)
-        similarity = component if similarity is None else similarity + component
+def search_top(
+    queryset: QuerySet,
+    fields: Iterable[str],
+    term: str,
+    *,
+    limit: int = 10,
+    config: str = "english",
+    trigram_threshold: float = TRIGRAM_THRESHOLD,
+    vector_field: Optional[str] = None,
+) -> list:
+    """Return the first ``limit`` hits of the first tier that matches.
 
-    trigram_qs = (
-        queryset.annotate(similarity=similarity)
-        .filter(similarity__gt=trigram_threshold)
-        .order_by("-similarity")
-    )
-    if trigram_qs.exists():
-        return trigram_qs
+    Unlike `text_search` there is no ``exists()`` probe: each tier is fetched
+    once with LIMIT, so a first-tier hit costs a single query.
+    """
+    term = (term or "").strip()
+    fields = list(fields)
+    if not term or not fields:
+        return []
 
-    icontains_q = Q()
-    for field in fields:
-        icontains_q |= Q(**{f"{field}__icontains": term})
-    return queryset.filter(icontains_q)
+    for tier in _search_tiers(
+        queryset, fields, term,
+        config=config, trigram_threshold=trigram_threshold, vector_field=vector_field,
+    ):
+        results = list(tier[:limit])
+        if results:
+            return results
+    return []
@@ -0,0 +1,387 @@
+"""Unified cross-media search over `SearchDocument`.
+
+Every movie, TV show, game, book and person has one `SearchDocument` row
+(title, aliases, year, popularity and the display fields the search bar
+needs). Signals in `custom_auth/models.py` keep rows current on save/delete;
+the daily `rebuild_search_documents` task rebuilds the table to absorb writes
+that skip signals (bulk_create, queryset.update()).
+
+`unified_search` ranks all types in one FTS + trigram query, keeping the top
+``per_kind`` hits per tab with a window function, then loads the per-user
+overlays (watchlist, own rating, averages) in one query each.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import transaction
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, Window
+from django.db.models.functions import Cast, Coalesce, Greatest, Ln, RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from custom_auth.models import MediaPerson, Review, SearchDocument, Watchlist
+from custom_auth.services import suggestions
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULTS_PER_KIND = 10
+
+# Weight of log(1 + review count) in the ranking score
+POPULARITY_WEIGHT = 0.05
+
+
+def _year(value) -> Optional[int]:
+    # Freshly parsed instances still hold TMDB's 'YYYY-MM-DD' strings
+    if isinstance(value, str):
+        try:
+            value = parse_date(value)
+        except ValueError:
+            value = None
+    return value.year if value else None
+
+
+def _movie_document(movie) -> Dict[str, Any]:
+    return {
+        'kind': 'movies',
+        'title': movie.title,
+        'aliases': movie.original_title if movie.original_title != movie.title else '',
+        'year': _year(movie.release_date),
+        'poster': movie.poster,
+        'url': f'/movies/{movie.tmdb_id}/',
+        'extra': {'tmdb_id': movie.tmdb_id, 'rating': movie.rating},
+    }
+
+
+def _tvshow_document(tv) -> Dict[str, Any]:
+    extra = {'tmdb_id': tv.tmdb_id, 'rating': tv.rating}
+    # Add end year if the show has ended
+    if tv.last_air_date and tv.status in ['Ended', 'Canceled']:
+        extra['end_year'] = _year(tv.last_air_date)
+    return {
+        'kind': 'tvshows',
+        'title': tv.title,
+        'aliases': tv.original_title if tv.original_title != tv.title else '',
+        'year': _year(tv.first_air_date),
+        'poster': tv.poster,
+        'url': f'/tvshows/{tv.tmdb_id}/',
+        'extra': extra,
+    }
+
+
+def _game_document(game) -> Dict[str, Any]:
+    return {
+        'kind': 'games',
+        'title': game.title,
+        'aliases': game.original_title if game.original_title != game.title else '',
+        'year': _year(game.release_date),
+        'poster': game.poster,
+        'url': f'/games/{game.id}/',
+        'extra': {'rawg_id': game.rawg_id, 'metacritic': game.metacritic, 'rating': game.rating},
+    }
+
+
+def _book_document(book) -> Dict[str, Any]:
+    authors = [author.name for author in book.authors.all()]
+    aliases = [book.original_title] if book.original_title != book.title else []
+    return {
+        'kind': 'books',
+        'title': book.title,
+        'aliases': ' '.join(aliases + authors),
+        'year': _year(book.published_date),
+        'poster': book.image_url,
+        'url': f'/books/{book.id}/',
+        'extra': {'authors': ', '.join(authors), 'rating': book.rating},
+    }
+
+
+def _person_document(person) -> Dict[str, Any]:
+    return {
+        'kind': 'people',
+        'title': person.name,
+        'aliases': '',
+        'year': None,
+        'poster': person.profile_picture,
+        'url': f'/people/{person.id}/',
+        'extra': {'media_count': person.media_count},
+    }
+
+
+#: model label -> (document builder, related fields to prefetch on rebuild)
+INDEXED_MODELS: Dict[str, Tuple[Callable[[Any], Dict[str, Any]], Tuple[str, ...]]] = {
+    'movies.movie': (_movie_document, ()),
+    'tvshows.tvshow': (_tvshow_document, ()),
+    'games.game': (_game_document, ()),
+    'books.book': (_book_document, ('authors',)),
+    'custom_auth.person': (_person_document, ()),
+}
+
+#: M2M through tables whose changes alter a document's aliases
+ALIAS_THROUGH_MODELS = {'books.book_authors'}
+
+
+# ========================================
+# MAINTENANCE
+# ========================================
+
+def index_instance(instance) -> None:
+    """Create or update the document for one saved object."""
+    try:
+        index_instances([instance])
+    except Exception as e:
+        # Never fail a media write because of search bookkeeping; the daily
+        # rebuild will pick the object up.
+        logger.error(f"Failed to index {instance._meta.label} {instance.pk} for search: {e}")
+
+
+def index_instances(instances: Iterable[Any]) -> int:
+    """Create or update documents, e.g. for objects written without signals (bulk_create).
+
+    One upsert for the whole batch; review popularity of existing rows is kept.
+    Returns the number of documents written.
+    """
+    documents = []
+    for instance in instances:
+        builder, _ = INDEXED_MODELS[instance._meta.label_lower]
+        documents.append(SearchDocument(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_id=instance.pk,
+            **builder(instance),
+        ))
+    if not documents:
+        return 0
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['content_type', 'object_id'],
+        update_fields=['kind', 'title', 'aliases', 'year', 'poster', 'url', 'extra', 'date_updated'],
+    )
+    suggestions.documents_updated()
+    return len(documents)
+
+
+def remove_instance(instance) -> None:
+    """Drop the document of a deleted object."""
+    content_type = ContentType.objects.get_for_model(instance)
+    SearchDocument.objects.filter(content_type=content_type, object_id=instance.pk).delete()
+    suggestions.document_removed(content_type.id, instance.pk)
+
+
+def refresh_popularity(content_type_id: int, object_id: int) -> None:
+    """Recount reviews for one document after a review is added/removed."""
+    count = Review.objects.filter(content_type_id=content_type_id, object_id=object_id).count()
+    updated = SearchDocument.objects.filter(
+        content_type_id=content_type_id, object_id=object_id
+    ).update(popularity=count, date_updated=timezone.now())
+    if updated:
+        suggestions.documents_updated()
+
+
+def refresh_popularities(content_type_id: int, object_ids: Iterable[int]) -> int:
+    """`refresh_popularity` for many objects of one type in a single UPDATE."""
+    object_ids = list(object_ids)
+    if not object_ids:
+        return 0
+    count = (
+        Review.objects.filter(content_type_id=content_type_id, object_id=OuterRef('object_id'))
+        .order_by()
+        .values('object_id')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    updated = SearchDocument.objects.filter(
+        content_type_id=content_type_id, object_id__in=object_ids
+    ).update(popularity=Coalesce(Subquery(count), 0), date_updated=timezone.now())
+    if updated:
+        suggestions.documents_updated()
+    return updated
+
+
+def rebuild_search_documents(batch_size: int = 2000) -> int:
+    """Rebuild every document from the source tables.
+
+    Returns:
+        Number of documents written.
+    """
+    popularity = {
+        (row['content_type_id'], row['object_id']): row['count']
+        for row in Review.objects.values('content_type_id', 'object_id').annotate(count=Count('id')).order_by()
+    }
+
+    documents = []
+    for label, (builder, prefetch) in INDEXED_MODELS.items():
+        model = apps.get_model(label)
+        content_type = ContentType.objects.get_for_model(model)
+        queryset = model.objects.all()
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        for obj in queryset.iterator(chunk_size=batch_size):
+            documents.append(SearchDocument(
+                content_type=content_type,
+                object_id=obj.pk,
+                popularity=popularity.get((content_type.id, obj.pk), 0),
+                **builder(obj),
+            ))
+
+    with transaction.atomic():
+        # Objects deleted without signals (queryset.delete is covered, raw
+        # SQL is not) must disappear from search.
+        SearchDocument.objects.all().delete()
+        SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+    suggestions.documents_rebuilt()
+    logger.info(f"Rebuilt {len(documents)} search documents")
+    return len(documents)
+
+
+# ========================================
+# SEARCH
+# ========================================
+
+def _rank_documents(term: str, per_kind: int, kinds: Optional[Iterable[str]]) -> List[SearchDocument]:
+    """Top ``per_kind`` documents per kind, ranked by FTS + trigram + popularity."""
+    query = SearchQuery(term, config='english')
+    score = (
+        SearchRank(F('search_vector'), query)
+        + Greatest(TrigramSimilarity('title', term), TrigramSimilarity('aliases', term))
+        + Ln(Cast(F('popularity'), FloatField()) + Value(1.0)) * Value(POPULARITY_WEIGHT)
+    )
+    documents = SearchDocument.objects.filter(
+        Q(search_vector=query) | Q(title__trigram_similar=term) | Q(aliases__trigram_similar=term)
+    )
+    if kinds is not None:
+        documents = documents.filter(kind__in=list(kinds))
+    ranked = documents.annotate(
+        score=score,
+        position=Window(RowNumber(), partition_by=[F('kind')], order_by=score.desc()),
+    ).filter(position__lte=per_kind).order_by('kind', '-score')
+    results = list(ranked)
+    if results:
+        return results
+
+    # Very short or partial input: plain substring match on titles
+    fallback = SearchDocument.objects.filter(Q(title__icontains=term) | Q(aliases__icontains=term))
+    if kinds is not None:
+        fallback = fallback.filter(kind__in=list(kinds))
+    return list(fallback.annotate(
+        position=Window(RowNumber(), partition_by=[F('kind')], order_by=F('popularity').desc()),
+    ).filter(position__lte=per_kind).order_by('kind', '-popularity'))
+
+
+def _media_overlays(user, documents: List[SearchDocument]) -> Dict[str, Dict]:
+    """Batch-load watchlist / rating overlays for all media documents."""
+    content_type_ids = {doc.content_type_id for doc in documents}
+    object_ids = {doc.object_id for doc in documents}
+    wanted = {(doc.content_type_id, doc.object_id) for doc in documents}
+    scope = {'content_type_id__in': content_type_ids, 'object_id__in': object_ids}
+
+    overlays = {
+        'in_watchlist': set(),
+        'user_rating': {},
+        'avg_rating': {},
+        'rating_count': {},
+        'watchlist_users': defaultdict(list),
+    }
+    if not documents:
+        return overlays
+
+    # The IN filters can cross-match ids between types; keep exact pairs only.
+    for item in Watchlist.objects.filter(**scope).values('content_type_id', 'object_id', 'user_id', 'user__username'):
+        key = (item['content_type_id'], item['object_id'])
+        if key in wanted:
+            overlays['watchlist_users'][key].append(item['user__username'])
+            if item['user_id'] == user.id:
+                overlays['in_watchlist'].add(key)
+
+    for ct_id, object_id, rating in Review.objects.filter(user=user, **scope).values_list(
+        'content_type_id', 'object_id', 'rating'
+    ):
+        overlays['user_rating'][(ct_id, object_id)] = rating
+
+    for item in Review.objects.filter(**scope).values('content_type_id', 'object_id').annotate(
+        avg_rating=Avg('rating'), count=Count('id')
+    ).order_by():
+        key = (item['content_type_id'], item['object_id'])
+        if key in wanted:
+            overlays['avg_rating'][key] = round(item['avg_rating'], 1)
+            overlays['rating_count'][key] = item['count']
+    return overlays
+
+
+def _people_ratings(person_ids: List[int]) -> Dict[int, Tuple[float, int]]:
+    """``(average rating, rating count)`` of each person's work (two queries for all people)."""
+    if not person_ids:
+        return {}
+    credits = defaultdict(set)
+    for person_id, ct_id, object_id in MediaPerson.objects.filter(person_id__in=person_ids).values_list(
+        'person_id', 'content_type_id', 'object_id'
+    ):
+        credits[(ct_id, object_id)].add(person_id)
+    if not credits:
+        return {}
+
+    totals = defaultdict(lambda: [0.0, 0])
+    for item in Review.objects.filter(
+        content_type_id__in={ct_id for ct_id, _ in credits},
+        object_id__in={object_id for _, object_id in credits},
+    ).values('content_type_id', 'object_id').annotate(total=Sum('rating'), count=Count('id')).order_by():
+        for person_id in credits.get((item['content_type_id'], item['object_id']), ()):
+            totals[person_id][0] += item['total']
+            totals[person_id][1] += item['count']
+    return {person_id: (round(total / count, 1), count) for person_id, (total, count) in totals.items() if count}
+
+
+def unified_search(
+    user,
+    term: str,
+    *,
+    per_kind: int = SEARCH_RESULTS_PER_KIND,
+    kinds: Optional[Iterable[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Search every indexed type at once.
+
+    Returns:
+        Dict mapping kind (movies, tvshows, games, books, people) to result
+        dicts shaped like the per-type `search_bar_discover` responses.
+    """
+    term = (term or '').strip()
+    if not term:
+        return {}
+
+    documents = _rank_documents(term, per_kind, kinds)
+    media_documents = [doc for doc in documents if doc.kind != 'people']
+    overlays = _media_overlays(user, media_documents)
+    people_ratings = _people_ratings([doc.object_id for doc in documents if doc.kind == 'people'])
+
+    results = defaultdict(list)
+    for doc in documents:
+        if doc.kind == 'people':
+            avg_rating, rating_count = people_ratings.get(doc.object_id, (None, 0))
+            results['people'].append({
+                'id': doc.object_id,
+                'name': doc.title,
+                'profile_picture': doc.poster,
+                'url': doc.url,
+                'avg_rating': avg_rating,
+                'rating_count': rating_count,
+            })
+            continue
+
+        key = (doc.content_type_id, doc.object_id)
+        results[doc.kind].append({
+            'id': doc.object_id,
+            'title': doc.title,
+            'poster': doc.poster,
+            'year': doc.year,
+            'url': doc.url,
+            **doc.extra,
+            'in_watchlist': key in overlays['in_watchlist'],
+            'user_rating': overlays['user_rating'].get(key),
+            'avg_rating': overlays['avg_rating'].get(key),
+            'rating_count': overlays['rating_count'].get(key, 0),
+            'watchlist_users': overlays['watchlist_users'].get(key, []),
+        })
+    return dict(results)
@@ -0,0 +1,290 @@
+"""In-process prefix index for search-bar typeahead suggestions.
+
+Suggestions must come back on every keystroke, so they are answered from
+memory instead of the FTS/trigram pipeline. The index is a flattened trie:
+one sorted array of ``(normalised key, entry)`` pairs, where every prefix's
+subtree is a contiguous slice found with two bisects. Top-N lists for wide
+slices (short or very common prefixes) are cached until a key under them
+changes, so every lookup touches at most a few hundred keys.
+
+Entries are loaded from `SearchDocument` in one query on first use. Each
+title contributes a key per word suffix ("the matrix", "matrix") so mid-title
+words match too. The weight blends review count, catalogue rating and
+`Person.media_count`.
+
+Every worker process holds its own copy. Document writes bump a version
+stamp in the shared cache; every worker, the writing one included, sees the
+new stamp on its next lookup and pulls rows changed since its last sync.
+Deletions are applied to the local copy at once and reach other workers at
+the next periodic full rebuild.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from custom_auth.models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_LIMIT = 8
+# Slices wider than this have their top-N list cached
+WIDE_SLICE = 256
+CACHED_TOP_N = 32
+# Keys are truncated; longer prefixes are already selective
+MAX_KEY_LENGTH = 32
+MAX_WORD_SUFFIXES = 4
+# Full reload interval (propagates deletions between workers)
+FULL_REBUILD_SECONDS = 3600
+
+VERSION_CACHE_KEY = 'search_suggestions:version'
+GENERATION_CACHE_KEY = 'search_suggestions:generation'
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_KEY_END = '\U0010ffff'
+
+EntryKey = Tuple[int, int]  # (content_type_id, object_id)
+
+
+class Suggestion(NamedTuple):
+    kind: str
+    id: int
+    title: str
+    url: str
+    poster: Optional[str]
+    year: Optional[int]
+    weight: float
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    text = text or ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+def _keys_for(*names: str) -> List[str]:
+    """Index keys for a document: each name plus its later word suffixes."""
+    keys = []
+    for name in names:
+        words = normalize(name).split()
+        for start in range(min(len(words), MAX_WORD_SUFFIXES)):
+            key = ' '.join(words[start:])[:MAX_KEY_LENGTH]
+            if key and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def _weight(popularity: int, extra: Dict) -> float:
+    return (
+        math.log1p(popularity or 0)
+        + (extra.get('rating') or 0) / 10.0
+        + math.log1p(extra.get('media_count') or 0)
+    )
+
+
+class PrefixIndex:
+    """Sorted-array trie mapping normalised prefixes to weighted entries."""
+
+    def __init__(self):
+        self._keys: List[Tuple[str, int]] = []
+        self._slots: Dict[EntryKey, int] = {}
+        self._entries: List[Optional[Suggestion]] = []
+        self._entry_keys: List[List[str]] = []
+        # prefix -> kinds filter -> top slots
+        self._top_cache: Dict[str, Dict[Optional[FrozenSet[str]], List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple]) -> 'PrefixIndex':
+        """Bulk-load from ``(ct_id, obj_id, kind, title, aliases, year, url, poster, popularity, extra)`` rows."""
+        index = cls()
+        for row in rows:
+            index._store(row)
+        index._keys.sort()
+        index._warm()
+        return index
+
+    def _warm(self) -> None:
+        """Precompute one- and two-character prefixes, overall and per kind.
+
+        Those are the widest slices; warming them costs one pass over the keys.
+        """
+        groups: Dict[Tuple[str, Optional[FrozenSet[str]]], set] = {}
+        for key, slot in self._keys:
+            kind = frozenset((self._entries[slot].kind,))
+            for prefix in {key[:1], key[:2]}:
+                groups.setdefault((prefix, None), set()).add(slot)
+                groups.setdefault((prefix, kind), set()).add(slot)
+        weight = lambda slot: self._entries[slot].weight
+        for (prefix, kinds), slots in groups.items():
+            self._top_cache.setdefault(prefix, {})[kinds] = heapq.nlargest(CACHED_TOP_N, slots, key=weight)
+
+    def _store(self, row: Tuple) -> Tuple[int, List[str]]:
+        ct_id, obj_id, kind, title, aliases, year, url, poster, popularity, extra = row
+        slot = len(self._entries)
+        self._slots[(ct_id, obj_id)] = slot
+        self._entries.append(Suggestion(kind, obj_id, title, url, poster, year, _weight(popularity, extra or {})))
+        keys = _keys_for(title, aliases or '')
+        self._entry_keys.append(keys)
+        self._keys.extend((key, slot) for key in keys)
+        return slot, keys
+
+    def upsert(self, row: Tuple) -> None:
+        self.remove((row[0], row[1]))
+        keys_before = len(self._keys)
+        slot, keys = self._store(row)
+        # `_store` appended unsorted; move the new pairs into place
+        del self._keys[keys_before:]
+        for key in keys:
+            bisect.insort(self._keys, (key, slot))
+        self._invalidate(keys)
+
+    def remove(self, entry_key: EntryKey) -> None:
+        slot = self._slots.pop(entry_key, None)
+        if slot is None:
+            return
+        keys = self._entry_keys[slot]
+        for key in keys:
+            i = bisect.bisect_left(self._keys, (key, slot))
+            if i < len(self._keys) and self._keys[i] == (key, slot):
+                del self._keys[i]
+        self._entries[slot] = None
+        self._entry_keys[slot] = []
+        self._invalidate(keys)
+
+    def _invalidate(self, keys: List[str]) -> None:
+        if not self._top_cache:
+            return
+        for key in keys:
+            for length in range(1, len(key) + 1):
+                self._top_cache.pop(key[:length], None)
+
+    def search(self, prefix: str, limit: int = SUGGESTION_LIMIT, kinds: Optional[Iterable[str]] = None) -> List[Suggestion]:
+        prefix = normalize(prefix)[:MAX_KEY_LENGTH]
+        if not prefix:
+            return []
+        kinds = frozenset(kinds) if kinds is not None else None
+
+        cached = self._top_cache.get(prefix, {}).get(kinds)
+        if cached is not None and limit <= CACHED_TOP_N:
+            return [self._entries[slot] for slot in cached[:limit]]
+
+        lo = bisect.bisect_left(self._keys, (prefix,))
+        hi = bisect.bisect_left(self._keys, (prefix + _KEY_END,), lo)
+        slots = {slot for _, slot in self._keys[lo:hi]}
+        if kinds is not None:
+            slots = {slot for slot in slots if self._entries[slot].kind in kinds}
+        wide = hi - lo > WIDE_SLICE and limit <= CACHED_TOP_N
+        top = heapq.nlargest(CACHED_TOP_N if wide else limit, slots, key=lambda slot: self._entries[slot].weight)
+        if wide:
+            self._top_cache.setdefault(prefix, {})[kinds] = top
+        return [self._entries[slot] for slot in top[:limit]]
+
+
+# ========================================
+# PROCESS-WIDE INDEX
+# ========================================
+
+_DOCUMENT_FIELDS = (
+    'content_type_id', 'object_id', 'kind', 'title', 'aliases',
+    'year', 'url', 'poster', 'popularity', 'extra',
+)
+
+_lock = threading.Lock()
+_index: Optional[PrefixIndex] = None
+_built_at = 0.0
+_synced_until: Optional[datetime] = None
+_version = None
+_generation = None
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def _rebuild(generation) -> PrefixIndex:
+    global _index, _built_at, _synced_until, _version, _generation
+    started = time.perf_counter()
+    _generation = generation
+    _version = cache.get(VERSION_CACHE_KEY)
+    _synced_until = timezone.now()
+    _index = PrefixIndex.build(SearchDocument.objects.values_list(*_DOCUMENT_FIELDS).iterator(chunk_size=5000))
+    _built_at = time.monotonic()
+    logger.info(f"Built suggestion index: {len(_index)} entries in {time.perf_counter() - started:.2f}s")
+    return _index
+
+
+def _sync(version) -> None:
+    """Apply documents other workers changed since our last sync."""
+    global _synced_until, _version
+    since = _synced_until - timedelta(seconds=5)  # tolerate clock skew between writers
+    _version = version
+    _synced_until = timezone.now()
+    for row in SearchDocument.objects.filter(date_updated__gte=since).values_list(*_DOCUMENT_FIELDS):
+        _index.upsert(row)
+
+
+def _current_index() -> PrefixIndex:
+    """This process's index, built or synced when stale. Call with `_lock` held."""
+    stamps = cache.get_many([GENERATION_CACHE_KEY, VERSION_CACHE_KEY])
+    generation = stamps.get(GENERATION_CACHE_KEY)
+    if (
+        _index is None
+        or generation != _generation
+        or time.monotonic() - _built_at > FULL_REBUILD_SECONDS
+    ):
+        return _rebuild(generation)
+    version = stamps.get(VERSION_CACHE_KEY)
+    if version != _version:
+        _sync(version)
+    return _index
+
+
+def get_index() -> PrefixIndex:
+    """Return this process's index, building or syncing it when stale."""
+    with _lock:
+        return _current_index()
+
+
+def suggest(prefix: str, limit: int = SUGGESTION_LIMIT, kinds: Optional[Iterable[str]] = None) -> List[Suggestion]:
+    """Top weighted suggestions whose title (or a later word of it) starts with ``prefix``."""
+    # Searches fill the top-N cache and read arrays that signal hooks edit in
+    # place, so they hold the lock too; a lookup touches a few hundred keys.
+    with _lock:
+        return _current_index().search(prefix, limit=limit, kinds=kinds)
+
+
+def document_removed(content_type_id: int, object_id: int) -> None:
+    """Signal hook: drop the entry from this worker's copy and tell the others."""
+    with _lock:
+        if _index is not None:
+            _index.remove((content_type_id, object_id))
+    _bump(VERSION_CACHE_KEY)
+
+
+def documents_updated() -> None:
+    """Rows were upserted or changed via queryset.update(); workers pull them on next lookup."""
+    _bump(VERSION_CACHE_KEY)
+
+
+def documents_rebuilt() -> None:
+    """The table was rebuilt wholesale; every worker reloads its index."""
+    _bump(GENERATION_CACHE_KEY)
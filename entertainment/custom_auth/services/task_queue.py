@@ -0,0 +1,94 @@
+"""Deduplicated enqueueing of background refreshes.
+
+The same object is often queued for the same refresh several times in one
+night: `update_ongoing_tvshows` and `update_random_tvshows` overlap, a show
+queues its seasons from two branches, and every movie credit queues
+`update_single_person`, so a prolific actor is queued dozens of times.
+
+`enqueue_once(func, *args)` claims a cache key for ``(func, args)`` before
+queueing; while the claim lasts (``TASK_DEDUP_WINDOW_SECONDS``, 6 hours by
+default) further calls with the same function and arguments are coalesced
+into the task already queued. `claim` does the same for work that is run in
+bulk rather than queued one task per object (see
+`tvshows.services.bulk_refresh`), so a bulk refresh and single-object tasks
+coalesce with each other.
+
+Claims expire rather than being released when the task finishes: within the
+window a refresh that already ran is as good as a new one. Functions may be
+given as callables or dotted paths; both produce the same key. Explicit,
+user-triggered refreshes should keep calling ``async_task`` directly.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from decouple import config
+from django.core.cache import cache
+from django_q.tasks import async_task
+
+logger = logging.getLogger(__name__)
+
+WINDOW = config('TASK_DEDUP_WINDOW_SECONDS', default=6 * 60 * 60, cast=int)
+
+
+def _name(value: Any) -> Any:
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    return value
+
+
+def task_key(func, *args) -> str:
+    """Cache key claimed for ``func(*args)``."""
+    raw = json.dumps([_name(func), *map(_name, args)], default=str)
+    return 'task_once:' + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _stat_key(kind: str) -> str:
+    return f'task_once:stats:{kind}'
+
+
+def _bump(kind: str, count: int = 1) -> None:
+    if not count:
+        return
+    try:
+        cache.incr(_stat_key(kind), count)
+    except ValueError:
+        cache.add(_stat_key(kind), count, timeout=None)
+
+
+def stats() -> Dict[str, int]:
+    """``{'queued': n, 'coalesced': n}`` counted so far."""
+    counts = cache.get_many([_stat_key('queued'), _stat_key('coalesced')])
+    return {kind: counts.get(_stat_key(kind), 0) for kind in ('queued', 'coalesced')}
+
+
+def enqueue_once(func, *args, window: Optional[int] = None, **options) -> Optional[str]:
+    """``async_task(func, *args, **options)`` unless it is already queued.
+
+    Only ``func`` and ``args`` make up the key; ``options`` (``hook``,
+    ``timeout``, ...) are passed through. Returns the task id, or None when
+    the call was coalesced into a pending one.
+    """
+    key = task_key(func, *args)
+    if not cache.add(key, 1, timeout=window or WINDOW):
+        _bump('coalesced')
+        logger.debug(f"Coalesced duplicate task {_name(func)}{args}")
+        return None
+    try:
+        task_id = async_task(func, *args, **options)
+    except Exception:
+        cache.delete(key)
+        raise
+    _bump('queued')
+    return task_id
+
+
+def claim(func, items: Iterable[Tuple], window: Optional[int] = None) -> List[Tuple]:
+    """Claim ``func(*args)`` for each args tuple; returns those not already claimed."""
+    items = list(items)
+    claimed = [args for args in items if cache.add(task_key(func, *args), 1, timeout=window or WINDOW)]
+    _bump('queued', len(claimed))
+    _bump('coalesced', len(items) - len(claimed))
+    return claimed
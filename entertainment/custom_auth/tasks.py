@@ -2,7 +2,6 @@
 Background tasks for custom_auth using Django Q2.
 """
 import logging
-from django.contrib.contenttypes.models import ContentType
 
 logger = logging.getLogger(__name__)
 
@@ -143,10 +142,72 @@ def reconcile_person_media_counts():
     return summary
 
 
+def refresh_review_rollups(days_back=7):
+    """Daily reconcile of `ReviewDailyRollup` for the recent window.
+
+    Review signals keep the rollup current; writes that skip them must
+    repair their own days, as the IMDb importer does through
+    `review_rollups.refresh_rollup_days` for the (possibly old) days it
+    backdates reviews to. Re-deriving the last `days_back` days in one
+    GROUP BY catches recent buckets any other unsignalled write left stale.
+
+    Registered as a DAILY Django Q schedule in `custom_auth/apps.py`.
+    """
+    from django.core.management import call_command
+    from io import StringIO
+
+    out = StringIO()
+    call_command("rebuild_review_rollups", days=days_back, stdout=out)
+    summary = out.getvalue().strip()
+    logger.info("refresh_review_rollups: %s", summary)
+    return summary
+
+
+def reconcile_rating_aggregates():
+    """Daily safety net for the `review_*` rating aggregates.
+
+    Review and MediaPerson signals keep the columns current, but writes
+    through `bulk_create`, `queryset.update()` or raw SQL skip them. Runs
+    the `recount_ratings` reconciliation so explorer rating sorts converge.
+    The initial values are backfilled by the ``*_review_rating`` migrations.
+
+    Registered as a DAILY Django Q schedule in `custom_auth/apps.py`.
+    """
+    from django.core.management import call_command
+    from io import StringIO
+
+    out = StringIO()
+    call_command("recount_ratings", stdout=out)
+    summary = out.getvalue().strip()
+    logger.info("reconcile_rating_aggregates: %s", summary)
+    return summary
+
+
+def rebuild_search_documents():
+    """Daily rebuild of the `SearchDocument` table.
+
+    Media/Person signals keep documents current for ordinary saves; imports
+    that use `bulk_create` or `queryset.update()` skip them, so the table is
+    re-derived once a day. Migration 0028 backfills it on deploy.
+
+    Registered as a DAILY Django Q schedule in `custom_auth/apps.py`.
+    """
+    from django.core.management import call_command
+    from io import StringIO
+
+    out = StringIO()
+    call_command("rebuild_search_documents", stdout=out)
+    summary = out.getvalue().strip()
+    logger.info("rebuild_search_documents: %s", summary)
+    return summary
+
+
 def import_imdb_data(user_id, items):
     """
     Background task to import IMDb data (fetch new items + create reviews/watchlist).
-    
+
+    See `custom_auth.services.imdb_importer.import_items`.
+
     Args:
         user_id: ID of the user
         items: List of dictionaries with keys:
@@ -156,17 +217,10 @@ def import_imdb_data(user_id, items):
                - watchlist (boolean, optional - implied if not rating)
     """
     from django.contrib.auth import get_user_model
-    from movies.models import Movie
-    from tvshows.models import TVShow
-    from custom_auth.models import Review, Watchlist
-    from api.services.movies import MoviesService
-    from django.contrib.contenttypes.models import ContentType
-    
-    # We need to import create functions here to avoid circular imports if they assume models are ready
-    from movies.tasks import create_movie_fast
-    
+    from custom_auth.services.imdb_importer import import_items, set_progress
+
     logger.info(f"Starting IMDb import for user {user_id} with {len(items)} items")
-    
+
     User = get_user_model()
     try:
         user = User.objects.get(id=user_id)
@@ -174,125 +228,11 @@ def import_imdb_data(user_id, items):
         logger.error(f"User {user_id} not found for IMDb import")
         return
 
-    movie_service = MoviesService()
-    movie_ct = ContentType.objects.get_for_model(Movie)
-    tv_ct = ContentType.objects.get_for_model(TVShow)
-    
-    success_count = 0
-    failed_count = 0
-    
-    for item in items:
-        imdb_id = item.get('imdb_id')
-        media_type = item.get('type') # 'movie' or 'tv'
-        rating = item.get('rating')
-        is_watchlist = item.get('watchlist', False)
-        
-        if not imdb_id:
-            continue
-            
-        try:
-            # 1. Resolve IMDb ID -> TMDB ID if needed
-            tmdb_id = None
-            media_object = None
-            ct = None
-            
-            if media_type == 'movie':
-                ct = movie_ct
-                # Check if exists locally first
-                media_object = Movie.objects.filter(imdb_id=imdb_id).first()
-                
-                if not media_object:
-                    # Fetch TMDB ID
-                    # Use _get directly to avoid potential worker reload issues with new methods
-                    results = movie_service._get(f'find/{imdb_id}', params={'external_source': 'imdb_id'})
-                    movie_results = results.get('movie_results', []) if results else []
-                    if movie_results:
-                        tmdb_id = movie_results[0]['id']
-                        # Create Movie
-                        media_object = create_movie_fast(tmdb_id, user_id=user.id, add_to_watchlist=False)
-                    else:
-                        logger.warning(f"Could not find movie for IMDb ID {imdb_id}")
-                        failed_count += 1
-                        continue
-            
-            elif media_type == 'tv':
-                ct = tv_ct
-                # Check if exists locally
-                media_object = TVShow.objects.filter(imdb_id=imdb_id).first()
-                
-                if not media_object:
-                    # Fetch TMDB ID
-                    # Use _get directly to avoid potential worker reload issues with new methods
-                    results = movie_service._get(f'find/{imdb_id}', params={'external_source': 'imdb_id'})
-                    tv_results = results.get('tv_results', []) if results else []
-                    
-                    if tv_results:
-                        tmdb_id = tv_results[0]['id']
-                        
-                        # Check if TV Show already exists by TMDb ID
-                        media_object = TVShow.objects.filter(tmdb_id=tmdb_id).first()
-                        
-                        if media_object:
-                            # Update IMDb ID if missing
-                            if not media_object.imdb_id:
-                                media_object.imdb_id = imdb_id
-                                media_object.save(update_fields=['imdb_id'])
-                        else:
-                            # Try to create TV Show inline using logic similar to tasks
-                            try:
-                                from tvshows.parsers import create_tvshow
-                                media_object = create_tvshow(tmdb_id, user_id=user.id, add_to_watchlist=False)
-                            except ImportError:
-                                logger.error("Could not import create_tvshow from tvshows.parsers")
-                                failed_count += 1
-                                continue
-                            except Exception as e:
-                                logger.error(f"Error creating TV Show {tmdb_id}: {e}")
-                                failed_count += 1
-                                continue
-                    else:
-                        logger.warning(f"Could not find TV show for IMDb ID {imdb_id}")
-                        failed_count += 1
-                        continue
-
-            if not media_object:
-                failed_count += 1
-                continue
-
-            # 2. Add Rating (Review)
-            if rating:
-                # Force strictly no watchlist if rated
-                is_watchlist = False 
-                
-                # Only if Review doesn't exist
-                if not Review.objects.filter(user=user, content_type=ct, object_id=media_object.id).exists():
-                    review = Review.objects.create(
-                        user=user,
-                        content_type=ct,
-                        object_id=media_object.id,
-                        rating=rating,
-                        review_text="Imported from IMDb"
-                    )
-                    if item.get('date'):
-                        review.date_added = item['date']
-                        review.save(update_fields=['date_added'])
-
-            # 3. Add to Watchlist
-            if is_watchlist:
-                 watchlist_item, created = Watchlist.objects.get_or_create(
-                    user=user,
-                    content_type=ct,
-                    object_id=media_object.id
-                )
-                 if item.get('date'):
-                    watchlist_item.date_added = item['date']
-                    watchlist_item.save(update_fields=['date_added'])
-            
-            success_count += 1
-            
-        except Exception as e:
-            logger.error(f"Error processing IMDb import item {imdb_id}: {e}")
-            failed_count += 1
+    try:
+        success_count, failed_count = import_items(user, items)
+    except Exception:
+        set_progress(user_id, status='failed')
+        raise
 
     from notifications.utils import send_notification_to_user
     send_notification_to_user(
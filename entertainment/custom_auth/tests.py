@@ -1,3 +1,168 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.services.movies import MoviesService
+from api.services.tvshows import TVShowsService
+from custom_auth.models import Keyword, MediaPerson, Person, SearchDocument
+from custom_auth.services import task_queue
+from custom_auth.services.task_queue import claim, enqueue_once
+
+
+def _person(person_id):
+    return {'id': person_id, 'name': f'Person {person_id}', 'profile_path': None, 'biography': ''}
+
+
+def _movie_details(movie_id, size):
+    """TMDB movie payload with ``size`` genres/keywords/companies and ``size`` cast + crew credits."""
+    return {
+        'id': movie_id,
+        'title': f'Movie {movie_id}',
+        'original_title': f'Movie {movie_id}',
+        'release_date': '2020-01-01',
+        'runtime': 120,
+        'vote_average': 7.5,
+        'genres': [{'id': i, 'name': f'Genre {i}'} for i in range(size)],
+        'production_countries': [{'iso_3166_1': 'US', 'name': 'United States'}],
+        'keywords': {'keywords': [{'id': i, 'name': f'Keyword {i}'} for i in range(size)]},
+        'production_companies': [
+            {'id': i, 'name': f'Company {i}', 'logo_path': None, 'origin_country': 'US'} for i in range(size)
+        ],
+        'credits': {
+            'cast': [{'id': 1000 + i, 'character': f'Role {i}', 'order': i} for i in range(size)],
+            'crew': [
+                {'id': 2000 + i, 'department': 'Writing', 'job': 'Screenplay'} for i in range(size)
+            ] + [{'id': 1000, 'department': 'Directing', 'job': 'Director'}],
+        },
+    }
+
+
+def _tvshow_details(tvshow_id, size):
+    return {
+        'id': tvshow_id,
+        'name': f'Show {tvshow_id}',
+        'original_name': f'Show {tvshow_id}',
+        'genres': [{'id': i, 'name': f'Genre {i}'} for i in range(size)],
+        'origin_country': ['US', 'GB'],
+        'keywords': {'results': [{'id': i, 'name': f'Keyword {i}'} for i in range(size)]},
+        'created_by': [{'id': 3000}],
+        'external_ids': {},
+        'seasons': [],
+    }
+
+
+def _tvshow_credits(size):
+    return {
+        'cast': [{'id': 1000 + i, 'roles': [{'character': f'Role {i}'}], 'order': i} for i in range(size)],
+        'crew': [{'id': 2000 + i, 'jobs': [{'job': 'Novel'}]} for i in range(size)],
+    }
+
+
+class BulkIngestQueryCountTests(TestCase):
+    """Creating a title costs a fixed number of queries, however long its credits are."""
+
+    MAX_QUERIES = 40
+
+    def setUp(self):
+        for method, result in (
+            ('get_person_details', lambda person_id: _person(person_id)),
+            ('get_person_external_ids', lambda person_id: {'wikidata_id': f'Q{person_id}'}),
+            ('get_collection_details', lambda collection_id: None),
+        ):
+            patcher = patch.object(MoviesService, method, side_effect=result)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _count_queries(self, create):
+        ContentType.objects.clear_cache()
+        with CaptureQueriesContext(connection) as queries:
+            create()
+        return len(queries)
+
+    def _create_movie(self, movie_id, size):
+        from movies.parsers import create_movie
+        with patch.object(MoviesService, 'get_movie_details', return_value=_movie_details(movie_id, size)):
+            return create_movie(movie_id)
+
+    def _create_tvshow(self, tvshow_id, size):
+        from tvshows.parsers import create_tvshow
+        with patch.object(TVShowsService, 'get_show_details', return_value=_tvshow_details(tvshow_id, size)), \
+                patch.object(TVShowsService, 'get_show_credits', return_value=_tvshow_credits(size)):
+            return create_tvshow(tvshow_id)
+
+    def test_movie_queries_do_not_grow_with_credits(self):
+        small = self._count_queries(lambda: self._create_movie(1, 2))
+        Person.objects.all().delete()
+        large = self._count_queries(lambda: self._create_movie(2, 60))
+
+        self.assertLessEqual(large, small)
+        self.assertLessEqual(large, self.MAX_QUERIES)
+
+    def test_tvshow_queries_do_not_grow_with_credits(self):
+        small = self._count_queries(lambda: self._create_tvshow(1, 2))
+        Person.objects.all().delete()
+        large = self._count_queries(lambda: self._create_tvshow(2, 60))
+
+        self.assertLessEqual(large, small)
+        self.assertLessEqual(large, self.MAX_QUERIES)
+
+    def test_movie_credits_and_people(self):
+        movie = self._create_movie(1, 3)
+
+        self.assertEqual(movie.genres.count(), 3)
+        self.assertEqual(movie.keywords.count(), 3)
+        self.assertEqual(movie.production_companies.count(), 3)
+        self.assertEqual(MediaPerson.objects.filter(object_id=movie.id).count(), 7)
+
+        director = Person.objects.get(tmdb_id=1000)
+        self.assertTrue(director.is_actor)
+        self.assertTrue(director.is_director)
+        self.assertEqual(director.media_count, 2)
+        self.assertEqual(director.wikidata_id, 'Q1000')
+        self.assertTrue(Person.objects.get(tmdb_id=2000).is_screenwriter)
+
+    def test_new_movie_is_indexed_for_search(self):
+        movie = self._create_movie(1, 2)
+
+        document = SearchDocument.objects.get(kind='movies', object_id=movie.id)
+        self.assertEqual(document.year, 2020)
+
+    def test_existing_rows_are_reused(self):
+        Keyword.objects.create(name='Keyword 1')
+        self._create_movie(1, 3)
+        self._create_movie(2, 3)
+
+        self.assertEqual(Keyword.objects.count(), 3)
+        self.assertEqual(Keyword.objects.get(name='keyword 1').tmdb_id, 1)
+        self.assertEqual(Person.objects.count(), 6)
+        self.assertEqual(Person.objects.get(tmdb_id=1001).media_count, 2)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TaskDedupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_pending_duplicates_are_coalesced(self):
+        from movies.tasks import update_single_person
+
+        with patch('custom_auth.services.task_queue.async_task', return_value='task') as queued:
+            self.assertEqual(enqueue_once(update_single_person, 1), 'task')
+            self.assertIsNone(enqueue_once(update_single_person, 1))
+            self.assertIsNone(enqueue_once('movies.tasks.update_single_person', 1))
+            enqueue_once(update_single_person, 2)
+        self.assertEqual(queued.call_count, 2)
+        self.assertEqual(task_queue.stats(), {'queued': 2, 'coalesced': 2})
+
+    def test_claims_coalesce_with_queued_tasks(self):
+        from tvshows.tasks import update_single_tvshow
+
+        with patch('custom_auth.services.task_queue.async_task') as queued:
+            enqueue_once(update_single_tvshow, 1, True)
+            self.assertEqual(claim(update_single_tvshow, [(1, True), (2, True), (1, False)]), [(2, True), (1, False)])
+            enqueue_once(update_single_tvshow, 2, True)
+        self.assertEqual(queued.call_count, 1)
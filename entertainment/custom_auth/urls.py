@@ -6,6 +6,7 @@ urlpatterns = [    # discover page
     path('discover/', views.discover_page, name='discover_page'),
     # api endpoint for discover page
     path('discover/search/', views.search_bar_discover, name='discover_search'),
+    path('discover/suggest/', views.search_suggestions, name='discover_suggest'),
     path('discover/genres/', views.discover_genres, name='discover_genres'),
 
     # login page
@@ -31,6 +32,7 @@ urlpatterns = [    # discover page
     path('settings/import/imdb/', views_imdb.imdb_import_page, name='imdb_import_page'),
     path('settings/import/imdb/preview/', views_imdb.imdb_import_preview, name='imdb_import_preview'),
     path('settings/import/imdb/confirm/', views_imdb.imdb_import_confirm, name='imdb_import_confirm'),
+    path('settings/import/imdb/status/', views_imdb.imdb_import_status, name='imdb_import_status'),
     path('settings/stremio/', views.stremio_addon_page, name='stremio_addon_page'),
 
     # watchlist
@@ -40,6 +40,9 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .services.cross_media_recommendation import CrossMediaRecommender
+from .services.search import search_top
+from .services.search_documents import unified_search
+from .services.suggestions import suggest
 
 logger = logging.getLogger(__name__)
 
@@ -100,27 +103,24 @@ def search_bar_discover(request):
     search_type = request.GET.get('type', 'movies')  # Default to movies if not specified
     if not search_query:
         return JsonResponse({'error': 'Search query cannot be empty'}, status=400)
+
+    if search_type == 'all':
+        # One ranked query over SearchDocument covering every media tab
+        results = unified_search(request.user, search_query)
+        return JsonResponse({
+            'success': True,
+            'results': results,
+            'search_type': search_type,
+            'query': search_query,
+            'count': sum(len(items) for items in results.values())
+        })
     
     if search_type == 'movies':
-        search_query_obj = SearchQuery(search_query, config='english')
-        
-        # Primary search using full-text search
-        movies = Movie.objects.annotate(
-            search=SearchVector('title', 'original_title', config='english'),
-            rank=SearchRank(SearchVector('title', 'original_title', config='english'), search_query_obj)
-        ).filter(search=search_query_obj).order_by('-rank')[:10]
-        
-        # If no results, try fuzzy matching with trigrams
-        if not movies:
-            movies = Movie.objects.annotate(
-                similarity=TrigramSimilarity('title', search_query) + TrigramSimilarity('original_title', search_query)
-            ).filter(similarity__gt=0.5).order_by('-similarity')[:10]
-        
-        # If still no results, try partial case-insensitive matching
-        if not movies:
-            movies = Movie.objects.filter(
-                Q(title__icontains=search_query) | Q(original_title__icontains=search_query)
-            )[:10]
+        # Full-text on the stored search_vector, then trigram, then icontains
+        movies = search_top(
+            Movie.objects.all(), ['title', 'original_title'], search_query,
+            trigram_threshold=0.5, vector_field='search_vector',
+        )
         
         # Get content type for movies
         movie_content_type = ContentType.objects.get_for_model(Movie)
@@ -186,25 +186,11 @@ def search_bar_discover(request):
             results.append(result)
             
     elif search_type == 'tvshows':
-        search_query_obj = SearchQuery(search_query, config='english')
-        
-        # Primary search using full-text search
-        tv_shows = TVShow.objects.annotate(
-            search=SearchVector('title', 'original_title', config='english'),
-            rank=SearchRank(SearchVector('title', 'original_title', config='english'), search_query_obj)
-        ).filter(search=search_query_obj).order_by('-rank')[:10]
-        
-        # If no results, try fuzzy matching with trigrams
-        if not tv_shows:
-            tv_shows = TVShow.objects.annotate(
-                similarity=TrigramSimilarity('title', search_query) + TrigramSimilarity('original_title', search_query)
-            ).filter(similarity__gt=0.5).order_by('-similarity')[:10]
-        
-        # If still no results, try partial case-insensitive matching
-        if not tv_shows:
-            tv_shows = TVShow.objects.filter(
-                Q(title__icontains=search_query) | Q(original_title__icontains=search_query)
-            )[:10]
+        # Full-text on the stored search_vector, then trigram, then icontains
+        tv_shows = search_top(
+            TVShow.objects.all(), ['title', 'original_title'], search_query,
+            trigram_threshold=0.5, vector_field='search_vector',
+        )
         
         # Get content type for TV shows
         tv_content_type = ContentType.objects.get_for_model(TVShow)
@@ -273,23 +259,10 @@ def search_bar_discover(request):
             results.append(result)
             
     elif search_type == 'people':
-        search_query_obj = SearchQuery(search_query, config='english')
-        
-        # Primary search using full-text search
-        people = Person.objects.annotate(
-            search=SearchVector('name', config='english'),
-            rank=SearchRank(SearchVector('name', config='english'), search_query_obj)
-        ).filter(search=search_query_obj).order_by('-rank')[:10]
-        
-        # If no results, try fuzzy matching with trigrams
-        if not people:
-            people = Person.objects.annotate(
-                similarity=TrigramSimilarity('name', search_query)
-            ).filter(similarity__gt=0.3).order_by('-similarity')[:10]
-        
-        # If still no results, try partial case-insensitive matching
-        if not people:
-            people = Person.objects.filter(name__icontains=search_query)[:10]
+        # Full-text on the stored search_vector, then trigram, then icontains
+        people = search_top(
+            Person.objects.all(), ['name'], search_query, vector_field='search_vector',
+        )
         
         # Get ratings for people's work
         results = []
@@ -350,23 +323,10 @@ def search_bar_discover(request):
         
         results = [{'id': user.id, 'username': user.username, 'url': f'/profile/{user.username}/'} for user in users]
     elif search_type == 'games':
-        search_query_obj = SearchQuery(search_query, config='english')
-        
-        # Primary search using full-text search
-        games = Game.objects.annotate(
-            search=SearchVector('title', config='english'),
-            rank=SearchRank(SearchVector('title', config='english'), search_query_obj)
-        ).filter(search=search_query_obj).order_by('-rank')[:10]
-        
-        # If no results, try fuzzy matching with trigrams
-        if not games:
-            games = Game.objects.annotate(
-                similarity=TrigramSimilarity('title', search_query)
-            ).filter(similarity__gt=0.3).order_by('-similarity')[:10]
-        
-        # If still no results, try partial case-insensitive matching
-        if not games:
-            games = Game.objects.filter(title__icontains=search_query)[:10]
+        # Full-text on the stored search_vector, then trigram, then icontains
+        games = search_top(
+            Game.objects.all(), ['title'], search_query, vector_field='search_vector',
+        )
         
         # Get content type for games
         game_content_type = ContentType.objects.get_for_model(Game)
@@ -480,6 +440,24 @@ def search_bar_discover(request):
         'count': len(results)
     })
 
+@login_required
+def search_suggestions(request):
+    """Typeahead suggestions answered from the in-memory prefix index."""
+    prefix = request.GET.get('q', '').strip()
+    kinds = request.GET.getlist('type') or None
+    suggestions = [
+        {
+            'kind': item.kind,
+            'id': item.id,
+            'title': item.title,
+            'url': item.url,
+            'poster': item.poster,
+            'year': item.year,
+        }
+        for item in suggest(prefix, kinds=kinds)
+    ]
+    return JsonResponse({'success': True, 'query': prefix, 'suggestions': suggestions})
+
 @login_required
 def discover_genres(request):
     """
@@ -1082,39 +1060,13 @@ def watchlist_page(request):
         # Get all TV show IDs
         tv_show_ids = [item.object_id for item in tv_shows_items]
         
-        # Get all episodes for these shows
-        from tvshows.models import Episode
-        total_episodes = Episode.objects.filter(
-            season__show_id__in=tv_show_ids,
-            season__season_number__gt=0,
-            air_date__isnull=False,
-            air_date__lte=timezone.now()
-        ).values('season__show_id').annotate(
-            count=models.Count('id')
-        )
-        
-        # Get all watched episodes for these shows by this user
-        from tvshows.models import WatchedEpisode
-        watched_episodes = WatchedEpisode.objects.filter(
-            user=user,
-            episode__season__show_id__in=tv_show_ids,
-            episode__season__season_number__gt=0 
-        ).values('episode__season__show_id').annotate(
-            count=models.Count('id')
-        )
-        
-        # Create mappings for fast lookup
-        total_episodes_map = {item['season__show_id']: item['count'] for item in total_episodes}
-        watched_episodes_map = {item['episode__season__show_id']: item['count'] for item in watched_episodes}
+        # Per-show progress from the ShowProgress table
+        from tvshows.services.progress import progress_map
+        watch_progress_map = progress_map(user, tv_show_ids)
         
         # Now categorize TV shows with the pre-fetched data
         for item in tv_shows_items:
-            show_id = item.object_id
-            total = total_episodes_map.get(show_id, 0)
-            watched = watched_episodes_map.get(show_id, 0)
-            
-            # Calculate progress percentage
-            progress = (watched / total * 100) if total > 0 else 0
+            progress = watch_progress_map.get(item.object_id, 0)
             
             # Categorize based on progress
             if progress >= 100:
@@ -1372,56 +1324,19 @@ def _api_watchlist_continue_only(user, tv_ct):
     """Fast path for the discover page: returns only in-progress TV shows.
 
     Skips movies entirely, only fetches TV shows that have at least one watched
-    episode but aren't 100% complete. Avoids the expensive Movie IN-list and the
-    cross-content-type review query.
+    episode but aren't 100% complete, read from the `ShowProgress` table.
+    Avoids the expensive Movie IN-list and the cross-content-type review query.
     """
-    from tvshows.models import Episode, WatchedEpisode
-
-    tv_watchlist = list(
-        Watchlist.objects.filter(user=user, content_type=tv_ct)
-        .values('id', 'object_id', 'date_added')
-    )
-    if not tv_watchlist:
-        return JsonResponse({
-            'continue_watching': [],
-            'havent_started': [],
-            'finished_shows': [],
-            'movies': [],
-        })
-
-    tv_show_ids = [w['object_id'] for w in tv_watchlist]
-
-    total_episodes_map = {
-        row['season__show_id']: row['count']
-        for row in Episode.objects.filter(
-            season__show_id__in=tv_show_ids,
-            season__season_number__gt=0,
-            air_date__isnull=False,
-            air_date__lte=timezone.now(),
-        ).values('season__show_id').annotate(count=models.Count('id'))
-    }
-    watched_episodes_map = {
-        row['episode__season__show_id']: row['count']
-        for row in WatchedEpisode.objects.filter(
-            user=user,
-            episode__season__show_id__in=tv_show_ids,
-            episode__season__season_number__gt=0,
-        ).values('episode__season__show_id').annotate(count=models.Count('id'))
+    from tvshows.services.progress import continue_watching as in_progress_shows
+
+    progress_map = {
+        row['show_id']: row['progress']
+        for row in in_progress_shows(
+            user,
+            Watchlist.objects.filter(user=user, content_type=tv_ct).values('object_id'),
+        ).values('show_id', 'progress')
     }
-
-    in_progress_show_ids = []
-    progress_map = {}
-    for show_id in tv_show_ids:
-        watched = watched_episodes_map.get(show_id, 0)
-        if watched <= 0:
-            continue
-        total = total_episodes_map.get(show_id, 0)
-        if total <= 0 or watched >= total:
-            continue
-        in_progress_show_ids.append(show_id)
-        progress_map[show_id] = (watched / total) * 100
-
-    if not in_progress_show_ids:
+    if not progress_map:
         return JsonResponse({
             'continue_watching': [],
             'havent_started': [],
@@ -1429,6 +1344,12 @@ def _api_watchlist_continue_only(user, tv_ct):
             'movies': [],
         })
 
+    in_progress_show_ids = list(progress_map)
+    tv_watchlist = list(
+        Watchlist.objects.filter(user=user, content_type=tv_ct, object_id__in=in_progress_show_ids)
+        .values('id', 'object_id', 'date_added')
+    )
+
     tvshows_by_id = {
         t.id: t for t in TVShow.objects.filter(id__in=in_progress_show_ids).only(
             'id', 'title', 'poster', 'tmdb_id', 'first_air_date'
@@ -1552,7 +1473,7 @@ def api_watchlist(request):
     
     # Apply search filter if provided
     if search_query:
-        from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+        from django.contrib.postgres.search import SearchQuery
         
         # Get media objects for search
         movie_items = items_by_content_type.get(movie_ct.id, [])
@@ -1566,10 +1487,9 @@ def api_watchlist(request):
         # Search movies with PostgreSQL full-text search
         movie_matches = set()
         if movie_ids:
-            movie_matches = set(Movie.objects.filter(id__in=movie_ids).annotate(
-                search=SearchVector('title', 'original_title', config='english'),
-                rank=SearchRank(SearchVector('title', 'original_title', config='english'), search_query_obj)
-            ).filter(search=search_query_obj).values_list('id', flat=True))
+            movie_matches = set(Movie.objects.filter(
+                id__in=movie_ids, search_vector=search_query_obj
+            ).values_list('id', flat=True))
             
             # Fallback search if no results
             if not movie_matches:
@@ -1583,10 +1503,9 @@ def api_watchlist(request):
         # Search TV shows with PostgreSQL full-text search
         tv_matches = set()
         if tv_ids:
-            tv_matches = set(TVShow.objects.filter(id__in=tv_ids).annotate(
-                search=SearchVector('title', 'original_title', config='english'),
-                rank=SearchRank(SearchVector('title', 'original_title', config='english'), search_query_obj)
-            ).filter(search=search_query_obj).values_list('id', flat=True))
+            tv_matches = set(TVShow.objects.filter(
+                id__in=tv_ids, search_vector=search_query_obj
+            ).values_list('id', flat=True))
             
             # Fallback search if no results
             if not tv_matches:
@@ -1696,30 +1615,9 @@ def api_watchlist(request):
         # Get all TV show IDs
         tv_show_ids = [item.object_id for item in tv_shows_items]
         
-        # Get all episodes for these shows that have aired
-        from tvshows.models import Episode
-        total_episodes = Episode.objects.filter(
-            season__show_id__in=tv_show_ids,
-            season__season_number__gt=0,
-            air_date__isnull=False,
-            air_date__lte=timezone.now()
-        ).values('season__show_id').annotate(
-            count=models.Count('id')
-        )
-        
-        # Get all watched episodes for these shows by this user
-        from tvshows.models import WatchedEpisode
-        watched_episodes = WatchedEpisode.objects.filter(
-            user=user,
-            episode__season__show_id__in=tv_show_ids,
-            episode__season__season_number__gt=0
-        ).values('episode__season__show_id').annotate(
-            count=models.Count('id')
-        )
-        
-        # Create mappings for fast lookup
-        total_episodes_map = {item['season__show_id']: item['count'] for item in total_episodes}
-        watched_episodes_map = {item['episode__season__show_id']: item['count'] for item in watched_episodes}
+        # Per-show progress from the ShowProgress table
+        from tvshows.services.progress import progress_map
+        watch_progress_map = progress_map(user, tv_show_ids)
         
         # Now categorize TV shows with the pre-fetched data
         for item in tv_shows_items:
@@ -1727,12 +1625,7 @@ def api_watchlist(request):
             if not media:
                 continue
                 
-            show_id = item.object_id
-            total = total_episodes_map.get(show_id, 0)
-            watched = watched_episodes_map.get(show_id, 0)
-            
-            # Calculate progress percentage
-            progress = (watched / total * 100) if total > 0 else 0
+            progress = watch_progress_map.get(item.object_id, 0)
             
             # Serialize with bulk-fetched media
             serialized = serialize_watchlist_item(item, media)
@@ -1,9 +1,9 @@
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .forms_imdb import ImdbImportForm
-from .services.imdb_importer import ImdbImporter
-from .models import Review, Watchlist
+from .services.imdb_importer import ImdbImporter, get_progress, set_progress, write_imports
 from movies.models import Movie
 from tvshows.models import TVShow
 from django.contrib.contenttypes.models import ContentType
@@ -62,55 +62,31 @@ def imdb_import_confirm(request):
         return redirect('imdb_import_page')
 
     from django_q.tasks import async_task
-    
-    # Collect all existing items
-    existing_items = []
-    
-    # Track items being rated to avoid adding them to watchlist
-    # Key: (content_type_id, object_id)
-    being_rated_ids = set()
-    
+
     movie_ct = ContentType.objects.get_for_model(Movie)
     tv_ct = ContentType.objects.get_for_model(TVShow)
-    
-    # Process Ratings first
+
+    # Existing items: ratings first, so rated titles are not added to the watchlist
+    ratings, watchlist = [], []
     if data.get('ratings'):
-        # Existing
         for item in data['ratings']['imported']:
-             existing_items.append({
-                 'type': 'rating',
-                 'object_id': item['object_id'],
-                 'rating': item['rating'],
-                 'media_type': 'movie', # ratings only movie
-                 'date': item.get('date')
-             })
-             # Track this as rated
-             being_rated_ids.add((movie_ct.id, item['object_id']))
-
-    # Process Watchlist
+            ratings.append({
+                'content_type_id': movie_ct.id, # ratings only movie
+                'object_id': item['object_id'],
+                'rating': item['rating'],
+                'date': item.get('date')
+            })
     if data.get('watchlist'):
-        # Existing
         for item in data['watchlist']['imported']:
-             ct = movie_ct if item['type'] == 'movie' else tv_ct
-             
-             # Skip if being rated in this batch
-             if (ct.id, item['object_id']) in being_rated_ids:
-                 continue
-                 
-             # Skip if already rated in DB
-             if Review.objects.filter(content_type=ct, object_id=item['object_id'], user=request.user).exists():
-                 continue
-                 
-             existing_items.append({
-                 'type': 'watchlist',
-                 'object_id': item['object_id'],
-                 'media_type': item['type'],
-                 'date': item.get('date')
-             })
+            watchlist.append({
+                'content_type_id': movie_ct.id if item['type'] == 'movie' else tv_ct.id,
+                'object_id': item['object_id'],
+                'date': item.get('date')
+            })
 
     # Prepare fetch items with deduplication
     fetch_map = {} # imdb_id -> dict
-    
+
     # Ratings to fetch
     if data.get('ratings'):
         for item in data['ratings']['to_fetch']:
@@ -129,47 +105,23 @@ def imdb_import_confirm(request):
             if imdb_id in fetch_map:
                 # Already fetching as rated item -> Ignore watchlist request
                 continue
-            
+
             fetch_map[imdb_id] = {
                 'imdb_id': imdb_id,
                 'type': item['type'],
                 'watchlist': True,
                 'date': item.get('date')
             }
-            
+
     to_fetch_items = list(fetch_map.values())
 
-    # 1. Process existing items immediately
-    count_existing = 0
-    for item in existing_items:
-        ct = movie_ct if item['media_type'] == 'movie' else tv_ct
-        
-        if item['type'] == 'rating':
-            review = Review.objects.create(
-                user=request.user,
-                content_type=ct,
-                object_id=item['object_id'],
-                rating=item['rating'],
-                review_text="Imported from IMDb"
-            )
-            if item.get('date'):
-                 # Need to manually update date_added since it's auto_now_add
-                 review.date_added = item['date']
-                 review.save(update_fields=['date_added'])
-                 
-        elif item['type'] == 'watchlist':
-            watchlist_item, created = Watchlist.objects.get_or_create(
-                user=request.user,
-                content_type=ct,
-                object_id=item['object_id']
-            )
-            if item.get('date'):
-                watchlist_item.date_added = item['date']
-                watchlist_item.save(update_fields=['date_added'])
-        count_existing += 1
-            
+    # 1. Write existing items immediately
+    reviews_count, watchlist_count = write_imports(request.user, ratings, watchlist)
+    count_existing = reviews_count + watchlist_count
+
     # 2. Queue task for new items
     if to_fetch_items:
+        set_progress(request.user.id, status='queued', total=len(to_fetch_items), done=0, imported=0, failed=0)
         async_task('custom_auth.tasks.import_imdb_data', request.user.id, to_fetch_items, timeout=3600)
         messages.success(request, f"Imported {count_existing} existing items. {len(to_fetch_items)} new items are being fetched in the background. You will receive a notification when complete.")
     else:
@@ -177,5 +129,10 @@ def imdb_import_confirm(request):
 
     # Clear session
     del request.session['imdb_import_data']
-    
+
     return redirect('settings_page')
+
+@login_required
+def imdb_import_status(request):
+    """Progress of the user's background IMDb import, polled by the settings page."""
+    return JsonResponse(get_progress(request.user.id) or {'status': 'idle'})
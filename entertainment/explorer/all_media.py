@@ -1,17 +1,27 @@
 """Unified "All Media" endpoint.
 
-Not a true SQL UNION — instead, we fetch a top slice per media type in
-parallel using each type's own filter/ordering, tag each item with its
-`media_type`, and merge-sort them client-side (in Python). This keeps each
-type's filtering pluggable and avoids brittle heterogeneous SQL.
-
-Pagination is a slice over the merged buffer. "Page 2" is a re-merge —
-documented tradeoff.
+Not a true SQL UNION — each media type keeps its own filterset, and the
+per-type streams are merged in Python. Every type's queryset is read in
+keyset order (sort column, then pk, NULLs last) and `heapq.merge` interleaves
+the heads of the streams; only the `page_size` winners are loaded and
+serialised.
+
+Pagination is cursor based. The opaque `cursor` records, per type, the sort
+value and pk of the last row that type contributed, so each request reads at
+most `page_size + 1` keys per type wherever it is in the result set: page N
+costs the same as page 1 and pages never overlap or skip rows.
+
+String sort keys are compared in the "C" collation so PostgreSQL and Python
+agree on the interleave across types.
 """
 from __future__ import annotations
 
-from itertools import chain
+import heapq
+from itertools import islice
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField, F, TextField, Value
+from django.db.models.functions import Collate
 from django.http import HttpRequest
 from rest_framework.decorators import (
     api_view,
@@ -22,17 +32,25 @@ from rest_framework.authentication import (
     BasicAuthentication,
     SessionAuthentication,
 )
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from books.explorer_views import BookExplorerViewSet
 from custom_auth.explorer_views import PersonExplorerViewSet
+from explorer.ordering import ExplorerOrderingFilter
+from explorer.pagination import decode_cursor, encode_cursor, seek_rows
 from games.explorer_views import GameExplorerViewSet
 from movies.explorer_views import MovieExplorerViewSet
 from tvshows.explorer_views import TVShowExplorerViewSet
 
 
-ALL_MEDIA_MAX_PER_TYPE = 100
+DEFAULT_ORDERING = "-rating"
+DEFAULT_PAGE_SIZE = 48
+MAX_PAGE_SIZE = 200
+CURSOR_QUERY_PARAM = "cursor"
+SORT_ANNOTATION = "merge_sort_value"
 
 
 TYPE_VIEWSETS = {
@@ -43,6 +61,13 @@ TYPE_VIEWSETS = {
     "people": PersonExplorerViewSet,
 }
 
+# Ordering keys whose column is named differently on some types. Types with
+# no matching column sort as NULL (i.e. after everything else).
+SORT_COLUMN_ALIASES = {
+    "title": {"people": "name"},
+    "release_date": {"tvshows": "first_air_date", "books": "published_date"},
+}
+
 
 def _instantiate(viewset_cls, request: HttpRequest):
     """Simulate DRF's viewset dispatch enough to run filter_backends."""
@@ -54,32 +79,68 @@ def _instantiate(viewset_cls, request: HttpRequest):
     return view
 
 
-def _sort_key(item: dict, key: str, descending: bool):
-    """Merge-sort key with None-tolerance (None sinks to the end regardless
-    of direction)."""
-    val = item.get(key)
-    if val is None:
-        return (1, 0)
-    if descending:
-        # invert numeric/date values by wrapping in a tuple that reverses order
-        return (0, _NegatingWrapper(val))
-    return (0, val)
+def _filtered_queryset(view):
+    """Apply the viewset's filter backends, minus its ordering filter."""
+    queryset = view.get_queryset()
+    for backend in view.filter_backends:
+        if issubclass(backend, ExplorerOrderingFilter):
+            continue
+        queryset = backend().filter_queryset(view.request, queryset, view)
+    return queryset
 
 
-class _NegatingWrapper:
-    """Wraps a value so sort() orders it descending. Works for numbers,
-    dates, and strings alike."""
-
-    __slots__ = ("value",)
-
-    def __init__(self, value):
-        self.value = value
+def _allowed_sort_keys(types: list[str]) -> set[str]:
+    keys = {DEFAULT_ORDERING.lstrip("-")}
+    for media_type in types:
+        keys.update(TYPE_VIEWSETS[media_type].ordering_fields)
+    return keys
 
-    def __lt__(self, other):
-        return self.value > other.value
 
-    def __eq__(self, other):
-        return self.value == other.value
+def _sort_expression(queryset, media_type: str, sort_key: str):
+    """Expression for `sort_key` on this type's queryset, or a typed NULL."""
+    column = SORT_COLUMN_ALIASES.get(sort_key, {}).get(media_type, sort_key)
+    if column in queryset.query.annotations:
+        return F(column)
+    try:
+        field = queryset.model._meta.get_field(column)
+    except FieldDoesNotExist:
+        return Value(None, output_field=CharField())
+    if field.is_relation:
+        return Value(None, output_field=CharField())
+    if isinstance(field, (CharField, TextField)):
+        return Collate(F(column), "C")
+    return F(column)
+
+
+def _key_stream(queryset, media_type: str, sort_key: str, rank: int, descending: bool, position, limit: int):
+    """Yield ``(merge_key, media_type, value, pk)`` in this type's keyset order.
+
+    `position` is the ``[value, pk]`` of the last row already emitted for
+    this type, or ``None`` to start from the top. The merge key orders NULLs
+    last in both directions: `heapq.merge` is run with ``reverse=True`` for
+    descending sorts, so NULLs get the lowest rank there and the highest
+    rank otherwise.
+    """
+    queryset = queryset.annotate(**{SORT_ANNOTATION: _sort_expression(queryset, media_type, sort_key)})
+    rows = seek_rows(queryset.values_list(SORT_ANNOTATION, "pk"), SORT_ANNOTATION, descending, position, limit)
+    null_rank = 0 if descending else 1
+    for value, pk in rows:
+        if value is None:
+            key = (null_rank, 0, pk, rank)
+        else:
+            key = (1 - null_rank, value, pk, rank)
+        yield key, media_type, value, pk
+
+
+def _decode_positions(raw: str, ordering: str, types: list[str]) -> dict:
+    payload = decode_cursor(raw)
+    positions = payload.get("p")
+    valid = payload.get("o") == ordering and isinstance(positions, dict) and all(
+        positions.get(t) is None or (isinstance(positions[t], list) and len(positions[t]) == 2) for t in types
+    )
+    if not valid:
+        raise NotFound("Invalid cursor")
+    return {t: positions.get(t) for t in types}
 
 
 @api_view(["GET"])
@@ -89,43 +150,64 @@ def all_media(request):
     types_param = request.GET.get("types", "movies,tvshows,books,games,people")
     types = [t.strip() for t in types_param.split(",") if t.strip() in TYPE_VIEWSETS]
     if not types:
-        return Response({"results": [], "count": 0})
+        return Response({"results": [], "next": None})
 
-    ordering = request.GET.get("ordering", "-rating")
+    ordering = request.GET.get("ordering", DEFAULT_ORDERING)
+    if ordering.lstrip("-") not in _allowed_sort_keys(types):
+        ordering = DEFAULT_ORDERING
     descending = ordering.startswith("-")
     sort_key = ordering.lstrip("-")
 
     try:
-        page = max(1, int(request.GET.get("page", "1")))
-        page_size = min(200, max(1, int(request.GET.get("page_size", "48"))))
+        page_size = min(MAX_PAGE_SIZE, max(1, int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))))
     except ValueError:
-        page = 1
-        page_size = 48
-
-    merged: list[dict] = []
-    for media_type in types:
-        viewset = _instantiate(TYPE_VIEWSETS[media_type], request)
-        queryset = viewset.filter_queryset(viewset.get_queryset())
-        # per-type slice — bounded so we don't over-fetch
-        slice_qs = queryset[:ALL_MEDIA_MAX_PER_TYPE]
-        serializer = viewset.get_serializer(slice_qs, many=True)
-        merged.extend(serializer.data)
-
-    merged.sort(key=lambda it: _sort_key(it, sort_key, descending))
-
-    total = len(merged)
-    start = (page - 1) * page_size
-    end = start + page_size
-
-    return Response(
-        {
-            "count": total,
-            "page": page,
-            "page_size": page_size,
-            "num_pages": max(1, (total + page_size - 1) // page_size),
-            "types": types,
-            "ordering": ordering,
-            "results": merged[start:end],
-            "note": "All-Media pagination is a merge over the top slice per type; deep pages are approximate.",
-        }
-    )
+        page_size = DEFAULT_PAGE_SIZE
+
+    raw_cursor = request.GET.get(CURSOR_QUERY_PARAM)
+    positions = _decode_positions(raw_cursor, ordering, types) if raw_cursor else dict.fromkeys(types)
+
+    views, querysets, streams = {}, {}, []
+    for rank, media_type in enumerate(types):
+        view = _instantiate(TYPE_VIEWSETS[media_type], request)
+        queryset = _filtered_queryset(view)
+        views[media_type] = view
+        querysets[media_type] = queryset
+        # page_size + 1 per type is enough to fill the page and detect a next one
+        streams.append(
+            _key_stream(queryset, media_type, sort_key, rank, descending, positions[media_type], page_size + 1)
+        )
+
+    merged = list(islice(heapq.merge(*streams, key=lambda row: row[0], reverse=descending), page_size + 1))
+    has_next = len(merged) > page_size
+    page = merged[:page_size]
+
+    pks_by_type: dict[str, list] = {}
+    for _, media_type, value, pk in page:
+        pks_by_type.setdefault(media_type, []).append(pk)
+        positions[media_type] = [value, pk]
+
+    serialized = {}
+    for media_type, pks in pks_by_type.items():
+        view = views[media_type]
+        objects = querysets[media_type].filter(pk__in=pks)
+        for item in view.get_serializer(objects, many=True).data:
+            item["media_type"] = media_type
+            serialized[(media_type, item["id"])] = item
+    results = [serialized[(media_type, pk)] for _, media_type, _, pk in page if (media_type, pk) in serialized]
+
+    next_url = None
+    if has_next:
+        next_url = replace_query_param(
+            request.build_absolute_uri(), CURSOR_QUERY_PARAM, encode_cursor({"o": ordering, "p": positions})
+        )
+    response = {
+        "next": next_url,
+        "page_size": page_size,
+        "types": types,
+        "ordering": ordering,
+        "results": results,
+    }
+    if not raw_cursor:
+        # Totals only on the first page; later pages stay keyset-cheap.
+        response["count"] = sum(querysets[t].count() for t in types)
+    return Response(response)
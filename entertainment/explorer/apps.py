@@ -5,3 +5,32 @@ class ExplorerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "explorer"
     verbose_name = "File Explorer"
+
+    def ready(self):
+        # Same post_migrate pattern as custom_auth/apps.py: no DB access
+        # during worker boot.
+        from django.db.models.signals import post_migrate
+        post_migrate.connect(_setup_explorer_schedules, sender=self)
+
+
+def _setup_explorer_schedules(sender, **kwargs):
+    from django.db.utils import OperationalError, ProgrammingError
+    from django.utils import timezone
+    from django_q.models import Schedule
+
+    try:
+        # Daily reconcile of the folder-tree counts (signals cover single
+        # saves; bulk imports skip them).
+        Schedule.objects.get_or_create(
+            func='explorer.tasks.rebuild_explorer_tree',
+            defaults={
+                'name': 'Rebuild Explorer Tree Counts',
+                'schedule_type': Schedule.DAILY,
+                'repeats': -1,
+                # The scheduler only picks rows due before now
+                'next_run': timezone.now(),
+            },
+        )
+    except (OperationalError, ProgrammingError):
+        # DB not ready yet (first-ever migrate) — the next boot will register.
+        pass
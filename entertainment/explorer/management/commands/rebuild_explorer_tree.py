@@ -0,0 +1,33 @@
+"""Backfill (or reconcile) the explorer folder-tree counts.
+
+Each media type is also built lazily on its first tree request; the daily
+`rebuild_explorer_tree` task re-derives them to absorb drift from paths
+that skip signals (bulk_create, queryset.update()).
+
+    python manage.py rebuild_explorer_tree
+    python manage.py rebuild_explorer_tree --media-type movies
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from explorer.tree_counts import TREE_SPECS, rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute explorer folder counts from the media tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--media-type",
+            choices=sorted(TREE_SPECS),
+            default=None,
+            help="Only rebuild one media type (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        media_types = [options["media_type"]] if options["media_type"] else list(TREE_SPECS)
+        written = sum(rebuild(media_type) for media_type in media_types)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} folder count rows for {', '.join(media_types)}.")
+        )
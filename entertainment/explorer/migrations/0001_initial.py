@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FolderCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('media_type', models.CharField(max_length=16)),
+                ('folder', models.CharField(max_length=16)),
+                ('value', models.CharField(blank=True, default='', max_length=64)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('media_type', 'folder', 'value'), name='unique_explorer_folder_count')],
+            },
+        ),
+    ]
@@ -0,0 +1,134 @@
+"""Explorer folder-tree count store and the signals that maintain it.
+
+See `explorer/tree_counts.py` for how the counts are read and rebuilt.
+Receivers are global (like `custom_auth.models.remove_from_watchlist`)
+because the tracked models live in other apps; the label lookup keeps them
+cheap for everything else.
+"""
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+
+class FolderCount(models.Model):
+    """Number of items in one explorer folder, e.g. ("movies", "genres", "12").
+
+    The media type's total is stored under folder ``"all"`` with an empty
+    value.
+    """
+
+    media_type = models.CharField(max_length=16)
+    folder = models.CharField(max_length=16)
+    value = models.CharField(max_length=64, blank=True, default="")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["media_type", "folder", "value"],
+                name="unique_explorer_folder_count",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.media_type}/{self.folder}/{self.value}: {self.count}"
+
+
+# --- Global folder counts ------------------------------------------------------
+
+@receiver(pre_save)
+def remember_tree_folders(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Load the stored folder fields of an existing row before it changes."""
+    from .tree_counts import media_type_for, stored_values, tracked_fields
+
+    media_type = media_type_for(sender)
+    if media_type is None or raw or instance._state.adding or instance.pk is None:
+        return
+    fields = tracked_fields(media_type)
+    if not fields or (update_fields is not None and not set(fields) & set(update_fields)):
+        return
+    instance._explorer_tree_values = stored_values(media_type, instance.pk)
+
+
+@receiver(post_save)
+def update_tree_counts_on_save(sender, instance, created, raw=False, **kwargs):
+    from .tree_counts import media_type_for, record_changed, record_created
+
+    media_type = media_type_for(sender)
+    if media_type is None or raw:
+        return
+    if created:
+        record_created(media_type, instance)
+    elif hasattr(instance, "_explorer_tree_values"):
+        record_changed(media_type, instance.__dict__.pop("_explorer_tree_values"), instance)
+
+
+@receiver(pre_delete)
+def remember_tree_relations(sender, instance, **kwargs):
+    """Collect folder M2M ids; the through rows are cascaded without m2m_changed."""
+    from .tree_counts import m2m_ids, media_type_for
+
+    media_type = media_type_for(sender)
+    if media_type is not None:
+        instance._explorer_tree_m2m = m2m_ids(media_type, instance)
+
+
+@receiver(post_delete)
+def update_tree_counts_on_delete(sender, instance, **kwargs):
+    from .tree_counts import media_type_for, record_deleted
+
+    media_type = media_type_for(sender)
+    if media_type is not None:
+        record_deleted(media_type, instance, instance.__dict__.pop("_explorer_tree_m2m", {}))
+
+
+@receiver(m2m_changed)
+def update_tree_counts_on_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    from .tree_counts import TREE_SPECS, media_type_for, record_m2m
+
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+    media_model = model if reverse else type(instance)
+    media_type = media_type_for(media_model)
+    if media_type is None:
+        return
+    folder = next(
+        (f for f in TREE_SPECS[media_type].m2m_folders
+         if media_model._meta.get_field(f).remote_field.through is sender),
+        None,
+    )
+    if folder is None:
+        return
+
+    field = media_model._meta.get_field(folder)
+    sign = 1 if action == "post_add" else -1
+    if action == "pre_clear":
+        # pk_set is empty for clear(); remember what is about to go.
+        folder_column = field.m2m_reverse_field_name()
+        column = folder_column if reverse else field.m2m_field_name()
+        links = sender.objects.filter(**{column: instance.pk})
+        if reverse:
+            instance._explorer_tree_cleared = {instance.pk: links.count()}
+        else:
+            instance._explorer_tree_cleared = dict.fromkeys(links.values_list(folder_column, flat=True), 1)
+        return
+    if action == "post_clear":
+        counts = {pk: -n for pk, n in instance.__dict__.pop("_explorer_tree_cleared", {}).items()}
+    elif reverse:
+        # instance is the genre / country / platform; pk_set holds media ids
+        counts = {instance.pk: sign * len(pk_set or ())}
+    else:
+        counts = {pk: sign for pk in pk_set or ()}
+    if counts:
+        record_m2m(media_type, folder, counts)
+
+
+# --- Per-user folder counts ----------------------------------------------------
+
+@receiver(post_save, sender="custom_auth.Watchlist")
+@receiver(post_delete, sender="custom_auth.Watchlist")
+@receiver(post_save, sender="custom_auth.Review")
+@receiver(post_delete, sender="custom_auth.Review")
+def invalidate_user_tree_counts(sender, instance, **kwargs):
+    from .tree_counts import invalidate_user
+    invalidate_user(instance.user_id)
@@ -1,9 +1,9 @@
 """Custom DRF ordering filter with NULL-tolerant sorting.
 
-`user_rating` is a Subquery / RawSQL annotation that is NULL for items
-nobody has reviewed. Vanilla PostgreSQL sorts NULLs FIRST on DESC and
-LAST on ASC, so `?ordering=-user_rating` would surface the *unrated*
-items at the top — the opposite of what a "best rated first" sort
+`user_rating` aliases the denormalised `review_rating_avg` column, which is
+NULL for items nobody has reviewed. Vanilla PostgreSQL sorts NULLs FIRST
+on DESC and LAST on ASC, so `?ordering=-user_rating` would surface the
+*unrated* items at the top — the opposite of what a "best rated first" sort
 should do.
 
 This filter intercepts any ordering key that ends in `user_rating`
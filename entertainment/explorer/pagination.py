@@ -1,22 +1,233 @@
-"""Pagination shared by all explorer list endpoints."""
-from rest_framework.pagination import CursorPagination, PageNumberPagination
+"""Pagination shared by all explorer list endpoints.
 
+`ExplorerPagination` has three modes, chosen per request:
 
-class ExplorerPagination(PageNumberPagination):
-    page_size = 48
-    page_size_query_param = "page_size"
-    max_page_size = 200
+* page numbers (default) — ``?page=N`` with an exact ``count``;
+* page numbers with ``?count=approx`` — the count comes from planner
+  statistics (`pg_class.reltuples` for an unfiltered table, the EXPLAIN row
+  estimate otherwise) instead of a ``COUNT(*)`` over the annotated queryset;
+* seek — ``?seek=1`` for the first page, then the returned ``next`` link
+  (``?cursor=…``). Rows are read in ``(ordering field, pk)`` order and each
+  page resumes after the last row of the previous one, so page N costs the
+  same index range scan as page 1. Meant for infinite-scroll clients (the
+  explorer grid itself still pages by number). The count is always
+  approximate; it is estimated for the first page only and carried forward
+  in the cursor.
+
+Seek ordering keeps NULLs last in both directions. Each model carries
+``(field, id)`` composite indexes for its `ordering_fields` (plus a
+``DESC NULLS LAST`` variant for nullable columns) so both directions are
+index scans.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# Estimates below this are replaced by an exact COUNT(*), which is cheap
+# at that size and keeps small result sets exact.
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+# ========================================
+# SHARED SEEK HELPERS
+# ========================================
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision (DjangoJSONEncoder truncates to ms,
+    which would skip rows that share a millisecond)."""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, cls=_CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(raw: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(raw.encode()))
+    except (ValueError, TypeError):
+        payload = None
+    if not isinstance(payload, dict):
+        raise NotFound("Invalid cursor")
+    return payload
+
+
+def seek_order(queryset, key: str, descending: bool, nullable: bool = True):
+    """Order by ``(key, pk)``, NULLs last when the column can be NULL.
+
+    NOT NULL columns keep PostgreSQL's default NULLS placement so a single
+    ascending ``(key, id)`` index serves both directions.
+    """
+    sort = F(key)
+    if nullable:
+        sort = sort.desc(nulls_last=True) if descending else sort.asc(nulls_last=True)
+    else:
+        sort = sort.desc() if descending else sort.asc()
+    return queryset.order_by(sort, "-pk" if descending else "pk")
 
 
-class PeopleCursorPagination(CursorPagination):
-    """Opt-in cursor pagination for very deep People pages.
+def seek_rows(queryset, key: str, descending: bool, position, limit: int, nullable: bool = True) -> list:
+    """Up to ``limit`` rows of ``queryset`` after ``position`` in seek order.
 
-    Frontend switches to this when the numbered result set exceeds ~5000
-    entries; falls back to `ExplorerPagination` for typical browsing.
+    ``position`` is the ``[value, pk]`` of the last row already returned, or
+    None for the first page. The non-NULL run is read with a range bound on
+    ``key`` (so the index seeks straight to it); NULL rows are read in a
+    second query only once that run is exhausted.
     """
+    ordered = seek_order(queryset, key, descending, nullable)
+    past = "lt" if descending else "gt"
 
+    if position is not None and position[0] is None:
+        return list(ordered.filter(**{f"{key}__isnull": True, f"pk__{past}": position[1]})[:limit])
+
+    rows = ordered
+    if position is not None:
+        value, pk = position
+        bound = "lte" if descending else "gte"
+        rows = rows.filter(**{f"{key}__{bound}": value}).filter(
+            Q(**{f"{key}__{past}": value}) | Q(**{f"pk__{past}": pk})
+        )
+    if not nullable:
+        return list(rows[:limit])
+
+    rows = list(rows.filter(**{f"{key}__isnull": False})[:limit])
+    if len(rows) < limit:
+        rows += list(ordered.filter(**{f"{key}__isnull": True})[:limit - len(rows)])
+    return rows
+
+
+def approximate_count(queryset) -> int:
+    """Row count from planner statistics, exact when the estimate is small."""
+    estimate = -1
+    if not queryset.query.where.children:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+    if estimate < 0:
+        # Never analysed, or filtered: ask the planner about the filtered set.
+        plan = json.loads(queryset.order_by().values("pk").explain(format="json"))
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < EXACT_COUNT_THRESHOLD:
+        return queryset.count()
+    return estimate
+
+
+def _is_nullable(queryset, key: str) -> bool:
+    try:
+        field = queryset.model._meta.get_field(key)
+    except FieldDoesNotExist:
+        # Annotations (e.g. `user_rating`) may be NULL.
+        return key != "pk"
+    return field.null
+
+
+# ========================================
+# PAGINATION CLASS
+# ========================================
+
+class ApproximateCountPaginator(DjangoPaginator):
+    @cached_property
+    def count(self):
+        return approximate_count(self.object_list)
+
+
+class ExplorerPagination(PageNumberPagination):
     page_size = 48
-    max_page_size = 200
-    ordering = "-date_of_birth"
     page_size_query_param = "page_size"
+    max_page_size = 200
     cursor_query_param = "cursor"
+    seek_query_param = "seek"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.approximate = request.query_params.get(self.count_query_param) == "approx"
+        self.seek = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.seek_query_param) in ("1", "true")
+        )
+        if self.seek:
+            return self._paginate_seek(queryset, request, view)
+        self.django_paginator_class = ApproximateCountPaginator if self.approximate else DjangoPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def _ordering_term(self, request, queryset, view) -> str:
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return ordering[0]
+        return "-pk"
+
+    def _paginate_seek(self, queryset, request, view):
+        page_size = self.get_page_size(request)
+        term = self._ordering_term(request, queryset, view)
+        descending = term.startswith("-")
+        key = term.lstrip("-")
+
+        position = count = None
+        raw = request.query_params.get(self.cursor_query_param)
+        if raw:
+            payload = decode_cursor(raw)
+            position = payload.get("p")
+            count = payload.get("c")
+            if payload.get("o") != term or not isinstance(position, list) or len(position) != 2:
+                raise NotFound(self.invalid_cursor_message)
+        if count is None:
+            count = approximate_count(queryset)
+
+        rows = seek_rows(queryset, key, descending, position, page_size + 1, _is_nullable(queryset, key))
+        self.next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            self.next_cursor = encode_cursor({"o": term, "p": [getattr(last, key), last.pk], "c": count})
+        self.seek_count = count
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.seek:
+            response = super().get_paginated_response(data)
+            if self.approximate:
+                response.data["count_is_approximate"] = True
+            return response
+
+        next_url = None
+        if self.next_cursor:
+            next_url = replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor
+            )
+        return Response(
+            {
+                "count": self.seek_count,
+                "count_is_approximate": True,
+                "next": next_url,
+                "previous": None,
+                "results": data,
+            }
+        )
@@ -0,0 +1,25 @@
+"""
+Background tasks for the explorer using Django Q2.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild_explorer_tree():
+    """Daily re-derivation of the explorer folder-tree counts.
+
+    Save / delete / m2m_changed signals keep `FolderCount` current, but
+    imports through `bulk_create` or `queryset.update()` skip them. Runs
+    the `rebuild_explorer_tree` management command so counts converge.
+
+    Registered as a DAILY Django Q schedule in `explorer/apps.py`.
+    """
+    from django.core.management import call_command
+    from io import StringIO
+
+    out = StringIO()
+    call_command("rebuild_explorer_tree", stdout=out)
+    summary = out.getvalue().strip()
+    logger.info("rebuild_explorer_tree: %s", summary)
+    return summary
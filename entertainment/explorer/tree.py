@@ -1,18 +1,19 @@
-"""Folder-tree endpoint for the file explorer.
+"""Folder-tree endpoints for the file explorer.
 
-Returns a hierarchical listing of "folders" for a given media type. Folders
-are virtual (Genre, Country, Year decade, Collection, My Watchlist, My
+Returns a hierarchical listing of "folders" for each media type. Folders
+are virtual (Genre, Country, Year decade, Platform, Role, My Watchlist, My
 Reviews) and clicking one applies the corresponding filter to the list view.
 
-Cached for 5 minutes per user (watchlist counts vary per user); non-user
-folders like Genre counts share a longer 30-minute cache under a distinct
-key so the anonymous case reuses it.
+Counts come from the signal-maintained store in `tree_counts.py`, never
+from live Count() joins. `api/tree/` returns every media type with its
+leaf folders; group folders (By Genre, By Decade, …) are marked ``lazy``
+unless their media type is listed in ``?expand=``. The client loads a
+collapsed group on demand from `api/tree/<media_type>/<folder>/`.
 """
 from __future__ import annotations
 
-from django.contrib.contenttypes.models import ContentType
-from django.core.cache import cache
-from django.db.models import Count
+from django.apps import apps
+from django.http import Http404
 from rest_framework.decorators import (
     api_view,
     authentication_classes,
@@ -25,220 +26,127 @@ from rest_framework.authentication import (
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from books.models import Book, BookGenre
-from custom_auth.models import Country, Genre, Person, Review, Watchlist
-from games.models import Game, GameGenre, Platform
-from movies.models import Movie
-from tvshows.models import TVShow
-
-from .utils import content_type_id
-
+from .tree_counts import TREE_SPECS, read_counts, user_folder_counts
+
+
+BRANCHES = {
+    "movies": {"label": "Movies", "icon": "camera_vid", "all_label": "All Movies"},
+    "tvshows": {"label": "TV Shows", "icon": "network_television", "all_label": "All Shows"},
+    "books": {"label": "Books", "icon": "document", "all_label": "All Books"},
+    "games": {"label": "Games", "icon": "solitaire", "all_label": "All Games"},
+    "people": {"label": "People", "icon": "users", "all_label": "All People"},
+}
+
+# group folder key -> (label, icon)
+GROUP_FOLDERS = {
+    "genres": ("By Genre", "directory_closed"),
+    "countries": ("By Country", "world"),
+    "platforms": ("By Platform", "computer"),
+    "decades": ("By Decade", "calendar"),
+    "roles": ("By Role", "user_card"),
+}
+
+ROLE_LABELS = {
+    "is_actor": "Actors",
+    "is_director": "Directors",
+    "is_screenwriter": "Screenwriters",
+    "is_musician": "Musicians",
+    "is_book_author": "Authors",
+    "is_original_music_composer": "Composers",
+    "is_tv_creator": "TV Creators",
+    "is_comic_artist": "Comic Artists",
+    "is_graphic_novelist": "Graphic Novelists",
+}
+
+
+def _group_keys(media_type: str) -> list[str]:
+    spec = TREE_SPECS[media_type]
+    keys = list(spec.m2m_folders)
+    if spec.date_field:
+        keys.append("decades")
+    if spec.role_fields:
+        keys.append("roles")
+    return keys
+
+
+def _group_children(media_type: str, folder: str, counts: dict[str, int]) -> list[dict]:
+    """Child folders of one group, built from stored counts."""
+    counts = {value: n for value, n in counts.items() if n > 0}
+    if folder == "decades":
+        return [
+            {"label": f"{d}s", "value": d, "count": counts[str(d)]}
+            for d in sorted((int(v) for v in counts), reverse=True)
+        ]
+    if folder == "roles":
+        return [
+            {"key": attr, "label": label, "count": counts.get(attr, 0)}
+            for attr, label in ROLE_LABELS.items()
+        ]
 
-TREE_CACHE_TTL = 60 * 5
-GLOBAL_CACHE_TTL = 60 * 30
+    # M2M folders: names from the (small) target table
+    model = apps.get_model(TREE_SPECS[media_type].model)
+    target = model._meta.get_field(folder).related_model
+    names = target.objects.filter(pk__in=[int(pk) for pk in counts]).order_by("name").values_list("id", "name")
+    return [{"id": pk, "name": name, "count": counts[str(pk)]} for pk, name in names]
 
 
-def _decade_buckets(qs, date_field: str):
-    """Return [{'label': '2010s', 'value': 2010, 'count': N}, ...]."""
-    year_expr = f"{date_field}__year"
-    rows = (
-        qs.exclude(**{f"{date_field}__isnull": True})
-        .values(year_expr)
-        .annotate(n=Count("id"))
-    )
-    buckets: dict[int, int] = {}
-    for row in rows:
-        year = row[year_expr]
-        if year is None:
-            continue
-        decade = (year // 10) * 10
-        buckets[decade] = buckets.get(decade, 0) + row["n"]
-    return [
-        {"label": f"{d}s", "value": d, "count": buckets[d]}
-        for d in sorted(buckets, reverse=True)
-    ]
-
-
-def _user_folder_counts(user, model_cls) -> dict[str, int]:
-    if not user or not user.is_authenticated:
-        return {"watchlist": 0, "reviewed": 0}
-    ct = content_type_id(model_cls)
-    return {
-        "watchlist": Watchlist.objects.filter(user=user, content_type_id=ct).count(),
-        "reviewed": Review.objects.filter(user=user, content_type_id=ct).count(),
-    }
+def _branch(media_type: str, user_counts: dict | None, expand: bool) -> dict:
+    counts = read_counts(media_type) if expand else read_counts(media_type, folder="all")
+    total = counts["all"][""]
+    meta = BRANCHES[media_type]
 
-
-def _movies_tree(user):
-    total = Movie.objects.count()
-    genres = list(
-        Genre.objects.annotate(count=Count("movie"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    countries = list(
-        Country.objects.annotate(count=Count("movie"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    user_counts = _user_folder_counts(user, Movie)
-    return {
-        "media_type": "movies",
-        "label": "Movies",
-        "icon": "camera_vid",
-        "total": total,
-        "children": [
-            {"key": "all", "label": "All Movies", "count": total, "icon": "directory_open"},
+    children = [{"key": "all", "label": meta["all_label"], "count": total, "icon": "directory_open"}]
+    if user_counts is not None:
+        children += [
             {"key": "watchlist", "label": "On My Watchlist", "count": user_counts["watchlist"], "icon": "star"},
             {"key": "reviewed", "label": "Reviewed by Me", "count": user_counts["reviewed"], "icon": "notepad_file"},
-            {"key": "genres", "label": "By Genre", "icon": "directory_closed", "children": genres},
-            {"key": "countries", "label": "By Country", "icon": "world", "children": countries},
-            {"key": "decades", "label": "By Decade", "icon": "calendar",
-             "children": _decade_buckets(Movie.objects, "release_date")},
-        ],
-    }
-
+        ]
+    for key in _group_keys(media_type):
+        label, icon = GROUP_FOLDERS[key]
+        group = {"key": key, "label": label, "icon": icon}
+        if expand:
+            group["children"] = _group_children(media_type, key, counts.get(key, {}))
+        else:
+            group["lazy"] = True
+        children.append(group)
 
-def _tvshows_tree(user):
-    total = TVShow.objects.count()
-    genres = list(
-        Genre.objects.annotate(count=Count("tvshow"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    countries = list(
-        Country.objects.annotate(count=Count("tvshow"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    user_counts = _user_folder_counts(user, TVShow)
     return {
-        "media_type": "tvshows",
-        "label": "TV Shows",
-        "icon": "network_television",
+        "media_type": media_type,
+        "label": meta["label"],
+        "icon": meta["icon"],
         "total": total,
-        "children": [
-            {"key": "all", "label": "All Shows", "count": total, "icon": "directory_open"},
-            {"key": "watchlist", "label": "On My Watchlist", "count": user_counts["watchlist"], "icon": "star"},
-            {"key": "reviewed", "label": "Reviewed by Me", "count": user_counts["reviewed"], "icon": "notepad_file"},
-            {"key": "genres", "label": "By Genre", "icon": "directory_closed", "children": genres},
-            {"key": "countries", "label": "By Country", "icon": "world", "children": countries},
-            {"key": "decades", "label": "By Decade", "icon": "calendar",
-             "children": _decade_buckets(TVShow.objects, "first_air_date")},
-        ],
+        "children": children,
     }
 
 
-def _books_tree(user):
-    total = Book.objects.count()
-    genres = list(
-        BookGenre.objects.annotate(count=Count("books"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    user_counts = _user_folder_counts(user, Book)
-    return {
-        "media_type": "books",
-        "label": "Books",
-        "icon": "document",
-        "total": total,
-        "children": [
-            {"key": "all", "label": "All Books", "count": total, "icon": "directory_open"},
-            {"key": "watchlist", "label": "On My Watchlist", "count": user_counts["watchlist"], "icon": "star"},
-            {"key": "reviewed", "label": "Reviewed by Me", "count": user_counts["reviewed"], "icon": "notepad_file"},
-            {"key": "genres", "label": "By Genre", "icon": "directory_closed", "children": genres},
-            {"key": "decades", "label": "By Decade", "icon": "calendar",
-             "children": _decade_buckets(Book.objects, "published_date")},
-        ],
-    }
-
-
-def _games_tree(user):
-    total = Game.objects.count()
-    genres = list(
-        GameGenre.objects.annotate(count=Count("game"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
-    )
-    platforms = list(
-        Platform.objects.annotate(count=Count("game"))
-        .filter(count__gt=0)
-        .order_by("name")
-        .values("id", "name", "count")
+@api_view(["GET"])
+@authentication_classes([SessionAuthentication, BasicAuthentication])
+@permission_classes([IsAuthenticated])
+def tree(request):
+    expand_param = request.GET.get("expand", "")
+    expand = set(BRANCHES) if expand_param == "all" else {t.strip() for t in expand_param.split(",")}
+    user_counts = user_folder_counts(request.user)
+    return Response(
+        {
+            "media_types": [
+                _branch(media_type, user_counts.get(media_type), media_type in expand)
+                for media_type in BRANCHES
+            ]
+        }
     )
-    user_counts = _user_folder_counts(user, Game)
-    return {
-        "media_type": "games",
-        "label": "Games",
-        "icon": "solitaire",
-        "total": total,
-        "children": [
-            {"key": "all", "label": "All Games", "count": total, "icon": "directory_open"},
-            {"key": "watchlist", "label": "On My Watchlist", "count": user_counts["watchlist"], "icon": "star"},
-            {"key": "reviewed", "label": "Reviewed by Me", "count": user_counts["reviewed"], "icon": "notepad_file"},
-            {"key": "genres", "label": "By Genre", "icon": "directory_closed", "children": genres},
-            {"key": "platforms", "label": "By Platform", "icon": "computer", "children": platforms},
-            {"key": "decades", "label": "By Decade", "icon": "calendar",
-             "children": _decade_buckets(Game.objects, "release_date")},
-        ],
-    }
-
-
-def _people_tree():
-    total = Person.objects.count()
-    role_folders = [
-        ("is_actor", "Actors"),
-        ("is_director", "Directors"),
-        ("is_screenwriter", "Screenwriters"),
-        ("is_musician", "Musicians"),
-        ("is_book_author", "Authors"),
-        ("is_original_music_composer", "Composers"),
-        ("is_tv_creator", "TV Creators"),
-        ("is_comic_artist", "Comic Artists"),
-        ("is_graphic_novelist", "Graphic Novelists"),
-    ]
-    roles = [
-        {"key": attr, "label": label, "count": Person.objects.filter(**{attr: True}).count()}
-        for attr, label in role_folders
-    ]
-    return {
-        "media_type": "people",
-        "label": "People",
-        "icon": "users",
-        "total": total,
-        "children": [
-            {"key": "all", "label": "All People", "count": total, "icon": "directory_open"},
-            {"key": "roles", "label": "By Role", "icon": "user_card", "children": roles},
-        ],
-    }
-
-
-def _build_full_tree(user):
-    return {
-        "media_types": [
-            _movies_tree(user),
-            _tvshows_tree(user),
-            _books_tree(user),
-            _games_tree(user),
-            _people_tree(),
-        ]
-    }
 
 
 @api_view(["GET"])
 @authentication_classes([SessionAuthentication, BasicAuthentication])
 @permission_classes([IsAuthenticated])
-def tree(request):
-    user = request.user
-    cache_key = f"explorer:tree:{user.pk}"
-    payload = cache.get(cache_key)
-    if payload is None:
-        payload = _build_full_tree(user)
-        cache.set(cache_key, payload, TREE_CACHE_TTL)
-    return Response(payload)
+def tree_folder(request, media_type: str, folder: str):
+    if media_type not in BRANCHES or folder not in _group_keys(media_type):
+        raise Http404("Unknown folder")
+    counts = read_counts(media_type, folder=folder)
+    return Response(
+        {
+            "media_type": media_type,
+            "key": folder,
+            "children": _group_children(media_type, folder, counts.get(folder, {})),
+        }
+    )
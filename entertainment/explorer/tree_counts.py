@@ -0,0 +1,315 @@
+"""Folder-tree count store.
+
+Global folder counts (per genre / country / platform / decade / role, plus
+each media type's total) live in `FolderCount` rows that are adjusted in
+place by signals — post_save / post_delete on the media models and `Person`,
+m2m_changed on their folder relations — so reading a tree is one indexed
+query per media type instead of a Count() over every M2M join.
+
+A media type's store is built from scratch (one GROUP BY per folder group)
+the first time it is read and by the daily `rebuild_explorer_tree` task,
+which also absorbs drift from bulk_create / queryset.update() paths.
+
+Per-user "On My Watchlist" / "Reviewed by Me" counts are a small per-user
+hash in the cache, recomputed with two GROUP BYs on a miss and dropped
+whenever one of that user's Watchlist / Review rows changes.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import ExtractYear
+from django.utils.dateparse import parse_date
+
+from .models import FolderCount
+
+
+USER_COUNTS_TTL = 60 * 60 * 24
+TOTAL_FOLDER = "all"
+
+
+class TreeSpec(NamedTuple):
+    model: str
+    date_field: Optional[str] = None
+    m2m_folders: Tuple[str, ...] = ()
+    role_fields: Tuple[str, ...] = ()
+
+
+ROLE_FIELDS = (
+    "is_actor",
+    "is_director",
+    "is_screenwriter",
+    "is_musician",
+    "is_book_author",
+    "is_original_music_composer",
+    "is_tv_creator",
+    "is_comic_artist",
+    "is_graphic_novelist",
+)
+
+# Folder keys double as the M2M field names on each model.
+TREE_SPECS: Dict[str, TreeSpec] = {
+    "movies": TreeSpec("movies.Movie", "release_date", ("genres", "countries")),
+    "tvshows": TreeSpec("tvshows.TVShow", "first_air_date", ("genres", "countries")),
+    "books": TreeSpec("books.Book", "published_date", ("genres",)),
+    "games": TreeSpec("games.Game", "release_date", ("genres", "platforms")),
+    "people": TreeSpec("custom_auth.Person", role_fields=ROLE_FIELDS),
+}
+
+# Media types with per-user watchlist / review folders.
+USER_FOLDER_TYPES = ("movies", "tvshows", "books", "games")
+
+_MEDIA_TYPE_BY_LABEL = {spec.model: media_type for media_type, spec in TREE_SPECS.items()}
+
+Delta = Tuple[str, str, int]  # (folder, value, delta)
+
+
+def media_type_for(model) -> Optional[str]:
+    return _MEDIA_TYPE_BY_LABEL.get(model._meta.label)
+
+
+def tree_model(media_type: str):
+    return apps.get_model(TREE_SPECS[media_type].model)
+
+
+# ========================================
+# INCREMENTAL UPDATES
+# ========================================
+
+def _apply(media_type: str, deltas: Iterable[Delta]) -> None:
+    """Add deltas to the store in one statement.
+
+    Folder rows are upserted. The total row is only ever updated: its
+    absence marks a store that has not been built yet, which the next read
+    builds from scratch.
+    """
+    merged: Dict[Tuple[str, str], int] = {}
+    for folder, value, delta in deltas:
+        merged[(folder, value)] = merged.get((folder, value), 0) + delta
+    total = merged.pop((TOTAL_FOLDER, ""), 0)
+    rows = [(media_type, folder, value, delta) for (folder, value), delta in merged.items() if delta]
+
+    if total:
+        FolderCount.objects.filter(media_type=media_type, folder=TOTAL_FOLDER, value="").update(
+            count=F("count") + total
+        )
+    if not rows:
+        return
+    table = connection.ops.quote_name(FolderCount._meta.db_table)
+    placeholders = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (media_type, folder, value, count)
+            VALUES {placeholders}
+            ON CONFLICT (media_type, folder, value)
+            DO UPDATE SET count = {table}.count + EXCLUDED.count
+            """,
+            [param for row in rows for param in row],
+        )
+
+
+def _decade(value) -> Optional[str]:
+    # Freshly parsed instances still hold TMDB's 'YYYY-MM-DD' strings
+    if isinstance(value, str):
+        try:
+            value = parse_date(value)
+        except ValueError:
+            value = None
+    year = getattr(value, "year", None)
+    return str((year // 10) * 10) if year else None
+
+
+def tracked_fields(media_type: str) -> Tuple[str, ...]:
+    """Scalar fields whose value places a row in a folder."""
+    spec = TREE_SPECS[media_type]
+    return ((spec.date_field,) if spec.date_field else ()) + spec.role_fields
+
+
+def scalar_folders(media_type: str, values: Dict) -> List[Tuple[str, str]]:
+    """(folder, value) pairs a row with these field values belongs to."""
+    spec = TREE_SPECS[media_type]
+    folders = []
+    if spec.date_field:
+        decade = _decade(values.get(spec.date_field))
+        if decade:
+            folders.append(("decades", decade))
+    folders.extend(("roles", field) for field in spec.role_fields if values.get(field))
+    return folders
+
+
+def current_values(media_type: str, instance) -> Dict:
+    """Tracked values loaded on `instance` (deferred fields are skipped)."""
+    return {field: instance.__dict__[field] for field in tracked_fields(media_type) if field in instance.__dict__}
+
+
+def stored_values(media_type: str, pk) -> Dict:
+    fields = tracked_fields(media_type)
+    if not fields:
+        return {}
+    return tree_model(media_type).objects.filter(pk=pk).values(*fields).first() or {}
+
+
+def m2m_ids(media_type: str, instance) -> Dict[str, List[int]]:
+    """Folder ids per M2M folder for `instance` (one query per folder)."""
+    return {
+        folder: list(getattr(instance, folder).values_list("pk", flat=True))
+        for folder in TREE_SPECS[media_type].m2m_folders
+    }
+
+
+def record_created(media_type: str, instance) -> None:
+    values = current_values(media_type, instance)
+    deltas = [(TOTAL_FOLDER, "", 1)]
+    deltas += [(folder, value, 1) for folder, value in scalar_folders(media_type, values)]
+    _apply(media_type, deltas)
+
+
+def record_changed(media_type: str, old_values: Dict, instance) -> None:
+    new_values = {**old_values, **current_values(media_type, instance)}
+    old = set(scalar_folders(media_type, old_values))
+    new = set(scalar_folders(media_type, new_values))
+    if old == new:
+        return
+    deltas = [(folder, value, -1) for folder, value in old - new]
+    deltas += [(folder, value, 1) for folder, value in new - old]
+    _apply(media_type, deltas)
+
+
+def record_deleted(media_type: str, instance, m2m: Dict[str, List[int]]) -> None:
+    values = current_values(media_type, instance)
+    deltas = [(TOTAL_FOLDER, "", -1)]
+    deltas += [(folder, value, -1) for folder, value in scalar_folders(media_type, values)]
+    deltas += [(folder, str(pk), -1) for folder, pks in m2m.items() for pk in pks]
+    _apply(media_type, deltas)
+
+
+def record_m2m(media_type: str, folder: str, counts: Dict[int, int]) -> None:
+    """Apply ``{folder id: delta}`` for one M2M folder group."""
+    _apply(media_type, [(folder, str(pk), delta) for pk, delta in counts.items()])
+
+
+# ========================================
+# FULL BUILD / READ
+# ========================================
+
+def _count_rows(media_type: str) -> List[Tuple[str, str, int]]:
+    spec = TREE_SPECS[media_type]
+    model = tree_model(media_type)
+    rows = [(TOTAL_FOLDER, "", model.objects.count())]
+
+    for folder in spec.m2m_folders:
+        field = model._meta.get_field(folder)
+        target = field.m2m_reverse_field_name()
+        grouped = (
+            field.remote_field.through.objects.values(target)
+            .annotate(n=Count("pk"))
+            .values_list(target, "n")
+            .order_by()
+        )
+        rows += [(folder, str(pk), n) for pk, n in grouped]
+
+    if spec.date_field:
+        decades: Dict[str, int] = {}
+        years = (
+            model.objects.exclude(**{f"{spec.date_field}__isnull": True})
+            .annotate(year=ExtractYear(spec.date_field))
+            .values("year")
+            .annotate(n=Count("pk"))
+            .values_list("year", "n")
+            .order_by()
+        )
+        for year, n in years:
+            decade = str((year // 10) * 10)
+            decades[decade] = decades.get(decade, 0) + n
+        rows += [("decades", decade, n) for decade, n in decades.items()]
+
+    if spec.role_fields:
+        roles = model.objects.aggregate(
+            **{field: Count("pk", filter=Q(**{field: True})) for field in spec.role_fields}
+        )
+        rows += [("roles", field, n) for field, n in roles.items()]
+    return rows
+
+
+def rebuild(media_type: str) -> int:
+    """Recompute one media type's store from the source tables."""
+    rows = _count_rows(media_type)
+    with transaction.atomic():
+        FolderCount.objects.filter(media_type=media_type).delete()
+        FolderCount.objects.bulk_create(
+            FolderCount(media_type=media_type, folder=folder, value=value, count=n)
+            for folder, value, n in rows
+        )
+    return len(rows)
+
+
+def rebuild_all() -> Dict[str, int]:
+    return {media_type: rebuild(media_type) for media_type in TREE_SPECS}
+
+
+def read_counts(media_type: str, folder: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """``{folder: {value: count}}`` for a media type, building it if needed.
+
+    The total is always included under ``"all"`` so a missing store can be
+    detected from the same query.
+    """
+    rows = FolderCount.objects.filter(media_type=media_type)
+    if folder is not None:
+        rows = rows.filter(folder__in=[folder, TOTAL_FOLDER])
+    counts: Dict[str, Dict[str, int]] = {}
+    for row_folder, value, n in rows.values_list("folder", "value", "count"):
+        counts.setdefault(row_folder, {})[value] = n
+    if TOTAL_FOLDER not in counts:
+        rebuild(media_type)
+        return read_counts(media_type, folder)
+    return counts
+
+
+# ========================================
+# PER-USER COUNTS
+# ========================================
+
+def _user_key(user_id: int) -> str:
+    return f"explorer:tree:user:{user_id}"
+
+
+def user_folder_counts(user) -> Dict[str, Dict[str, int]]:
+    """``{media_type: {"watchlist": n, "reviewed": n}}`` for one user."""
+    empty = {media_type: {"watchlist": 0, "reviewed": 0} for media_type in USER_FOLDER_TYPES}
+    if not user or not user.is_authenticated:
+        return empty
+
+    key = _user_key(user.pk)
+    counts = cache.get(key)
+    if counts is not None:
+        return counts
+
+    from django.contrib.contenttypes.models import ContentType
+    from custom_auth.models import Review, Watchlist
+
+    media_type_by_ct = {
+        ContentType.objects.get_for_model(tree_model(media_type)).pk: media_type
+        for media_type in USER_FOLDER_TYPES
+    }
+    counts = empty
+    for folder, model in (("watchlist", Watchlist), ("reviewed", Review)):
+        grouped = (
+            model.objects.filter(user=user, content_type_id__in=media_type_by_ct)
+            .values("content_type_id")
+            .annotate(n=Count("pk"))
+            .values_list("content_type_id", "n")
+            .order_by()
+        )
+        for content_type_id, n in grouped:
+            counts[media_type_by_ct[content_type_id]][folder] = n
+    cache.set(key, counts, USER_COUNTS_TTL)
+    return counts
+
+
+def invalidate_user(user_id: int) -> None:
+    cache.delete(_user_key(user_id))
@@ -8,7 +8,7 @@ from movies.explorer_views import MovieExplorerViewSet
 from tvshows.explorer_views import TVShowExplorerViewSet
 
 from .all_media import all_media
-from .tree import tree
+from .tree import tree, tree_folder
 from .views import explorer_page
 
 
@@ -23,6 +23,7 @@ router.register(r"people", PersonExplorerViewSet, basename="explorer-people")
 urlpatterns = [
     path("", explorer_page, name="explorer_page"),
     path("api/tree/", tree, name="explorer_tree"),
+    path("api/tree/<str:media_type>/<str:folder>/", tree_folder, name="explorer_tree_folder"),
     path("api/all/", all_media, name="explorer_all_media"),
     path("api/", include(router.urls)),
 ]
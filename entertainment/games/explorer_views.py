@@ -48,6 +48,6 @@ class GameExplorerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 Prefetch("platforms", queryset=Platform.objects.only("id", "name")),
             )
         )
-        qs = annotate_user_rating(qs, Game)
+        qs = annotate_user_rating(qs)
         qs = annotate_user_context(qs, Game, getattr(self.request, "user", None))
         return qs
@@ -36,7 +36,7 @@ class GameFilter(UserContextFilterMixin):
         fields: list[str] = []
 
     def _filter_q(self, queryset, name, value):
-        return text_search(queryset, ["title", "original_title"], value)
+        return text_search(queryset, ["title", "original_title"], value, vector_field="search_vector")
 
     def _filter_user_rating_min(self, queryset, name, value):
         if value is None:
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 from custom_auth.models import CustomUser, Media, Keyword
 
 # Create your models here.
@@ -78,6 +79,30 @@ class Game(Media):
     added_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, related_name='added_games', blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True, db_index=True)
     date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='game_search_vector_idx'),
+            # Explorer seek pagination: (sort column, id) for each ordering field,
+            # plus DESC NULLS LAST variants for nullable columns.
+            models.Index(
+                models.F('review_rating_avg').desc(nulls_last=True), models.F('id').desc(),
+                name='game_review_rating_idx',
+            ),
+            models.Index(fields=['review_rating_avg', 'id'], name='game_rating_asc_seek_idx'),
+            models.Index(fields=['title', 'id'], name='game_title_seek_idx'),
+            models.Index(fields=['release_date', 'id'], name='game_release_seek_idx'),
+            models.Index(
+                models.F('release_date').desc(nulls_last=True), models.F('id').desc(),
+                name='game_release_desc_seek_idx',
+            ),
+            models.Index(fields=['metacritic', 'id'], name='game_metacritic_seek_idx'),
+            models.Index(
+                models.F('metacritic').desc(nulls_last=True), models.F('id').desc(),
+                name='game_metacritic_desc_seek_idx',
+            ),
+            models.Index(fields=['date_added', 'id'], name='game_added_seek_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -53,6 +53,6 @@ class MovieExplorerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 Prefetch("genres", queryset=Genre.objects.only("id", "name")),
             )
         )
-        qs = annotate_user_rating(qs, Movie)
+        qs = annotate_user_rating(qs)
         qs = annotate_user_context(qs, Movie, getattr(self.request, "user", None))
         return qs
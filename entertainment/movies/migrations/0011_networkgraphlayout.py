@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0010_movie_digital_and_physical_release_dates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetworkGraphLayout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_key', models.CharField(max_length=64, unique=True)),
+                ('positions', models.JSONField(default=dict)),
+                ('node_count', models.PositiveIntegerField(default=0)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
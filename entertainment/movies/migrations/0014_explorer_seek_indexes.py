@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0029_person_review_rating'),
+        ('movies', '0013_movie_review_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='movie',
+            name='movie_review_rating_idx',
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(models.OrderBy(models.F('review_rating_avg'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='movie_review_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['review_rating_avg', 'id'], name='movie_rating_asc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['title', 'id'], name='movie_title_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['release_date', 'id'], name='movie_release_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(models.OrderBy(models.F('release_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='movie_release_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['runtime', 'id'], name='movie_runtime_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['date_added', 'id'], name='movie_added_seek_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
 
 # Import these from custom_auth app
 from custom_auth.models import *
@@ -59,6 +60,22 @@ class Movie(Media):
             models.Index(fields=['status', 'release_date']),
             models.Index(fields=['date_updated']),
             models.Index(fields=['collection', 'release_date']),
+            GinIndex(fields=['search_vector'], name='movie_search_vector_idx'),
+            # Explorer seek pagination: (sort column, id) for each ordering field,
+            # plus DESC NULLS LAST variants for nullable columns.
+            models.Index(
+                models.F('review_rating_avg').desc(nulls_last=True), models.F('id').desc(),
+                name='movie_review_rating_idx',
+            ),
+            models.Index(fields=['review_rating_avg', 'id'], name='movie_rating_asc_seek_idx'),
+            models.Index(fields=['title', 'id'], name='movie_title_seek_idx'),
+            models.Index(fields=['release_date', 'id'], name='movie_release_seek_idx'),
+            models.Index(
+                models.F('release_date').desc(nulls_last=True), models.F('id').desc(),
+                name='movie_release_desc_seek_idx',
+            ),
+            models.Index(fields=['runtime', 'id'], name='movie_runtime_seek_idx'),
+            models.Index(fields=['date_added', 'id'], name='movie_added_seek_idx'),
         ]
 
     def __str__(self):
@@ -220,3 +237,18 @@ class MovieOfWeekPick(models.Model):
     @property
     def watched_count(self):
         return self.watched_by.count()
+
+
+class NetworkGraphLayout(models.Model):
+    """Server-side ForceAtlas2 coordinates for one network graph configuration.
+
+    Raw (unscaled) positions keyed by node id; used to warm-start the next
+    layout of the same configuration when the graph only changed slightly.
+    """
+    config_key = models.CharField(max_length=64, unique=True)
+    positions = models.JSONField(default=dict)
+    node_count = models.PositiveIntegerField(default=0)
+    date_updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Layout {self.config_key} ({self.node_count} nodes)"
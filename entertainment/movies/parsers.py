@@ -1,8 +1,17 @@
 from .models import *
 from api.services.movies import MoviesService
+from custom_auth.services import ingest
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
 from datetime import datetime
 
+# Crew jobs stored as credits, by TMDB department
+CREW_JOBS = {
+    'Directing': ['Director'],
+    'Writing': ['Original Story', 'Screenplay', 'Writer', 'Story', 'Novel', 'Comic Book', 'Graphic Novel', 'Book'],
+    'Sound': ['Original Music Composer'],
+}
+
 
 def extract_release_date(movie_details, release_type, preferred_country='US'):
     """Return the earliest release date for a TMDB release type."""
@@ -67,213 +76,47 @@ def extract_movie_data(movie_details, movie_poster=None, movie_backdrop=None, is
     }
 
 def process_genres_countries_keywords(movie_details):
-    """Process and create genre, country and keyword instances"""
-    # Process genres
-    genres = movie_details.get('genres', [])
-    genre_instances = []
-    for genre in genres:
-        genre_instance, _ = Genre.objects.get_or_create(
-            tmdb_id=genre.get('id'),
-            defaults={'name': genre.get('name')}
-        )
-        genre_instances.append(genre_instance)
-
-    # Process countries
-    countries = movie_details.get('production_countries', [])
-    country_instances = []
-    for country in countries:
-        country_instance, _ = Country.objects.get_or_create(
-            iso_3166_1=country.get('iso_3166_1'),
-            defaults={'name': country.get('name')}
-        )
-        country_instances.append(country_instance)
-
-    # Process keywords
-    keywords = movie_details.get('keywords', {}).get('keywords', [])
-    keyword_instances = []
-    for keyword_data in keywords:
-        keyword_name = keyword_data.get('name')
-        keyword_id = keyword_data.get('id')
-        
-        if not keyword_name:
-            continue
-            
-        # Try to find by TMDB ID first
-        keyword_instance = Keyword.objects.filter(tmdb_id=keyword_id).first()
-        
-        if not keyword_instance:
-            # Try to find by name (case insensitive)
-            keyword_instance = Keyword.objects.filter(name__iexact=keyword_name).first()
-            if keyword_instance:
-                # Update TMDB ID if found by name and missing
-                if not keyword_instance.tmdb_id:
-                    keyword_instance.tmdb_id = keyword_id
-                    keyword_instance.save(update_fields=['tmdb_id'])
-            else:
-                # Create new if not found
-                keyword_instance = Keyword.objects.create(
-                    name=keyword_name,
-                    tmdb_id=keyword_id
-                )
-                
-        keyword_instances.append(keyword_instance)
-
+    """Resolve genre, country and keyword instances with one query per type"""
+    genre_instances = ingest.resolve_genres(movie_details.get('genres', []))
+    country_instances = ingest.resolve_countries(movie_details.get('production_countries', []))
+    keyword_instances = ingest.resolve_keywords(movie_details.get('keywords', {}).get('keywords', []))
     return genre_instances, country_instances, keyword_instances
 
 def process_production_companies(movie_details):
-    """Process and create production company instances"""
-    companies = movie_details.get('production_companies', [])
-    company_instances = []
-    
-    for company in companies:
-        origin_country = None
-        if company.get('origin_country') and company.get('origin_country') != "":
-            try:
-                origin_country = Country.objects.get(iso_3166_1=company.get('origin_country'))
-            except Country.DoesNotExist:
-                # If country doesn't exist, we can skip it or create it
-                pass
-                
-        logo_path = company.get('logo_path')
-        company_instance, _ = ProductionCompany.objects.get_or_create(
-            tmdb_id=company.get('id'),
-            defaults={
-                'name': company.get('name'),
-                'country': origin_country,
-                'logo_path': f"https://image.tmdb.org/t/p/original{logo_path}" if logo_path else None
-            }
-        )
-        company_instances.append(company_instance)
-    
-    return company_instances
+    """Resolve production company instances, creating the missing ones in bulk"""
+    return ingest.resolve_companies(movie_details.get('production_companies', []))
 
-def process_collection(movie, movie_details, movies_service):
-    """Process and associate collection if applicable"""
+def fetch_collection(movie_details, movies_service):
+    """Fetch collection details if the movie belongs to one"""
     belongs_to_collection = movie_details.get('belongs_to_collection')
     collection_id = belongs_to_collection.get('id') if belongs_to_collection else None
-    
-    if collection_id:
-        collection_details = movies_service.get_collection_details(collection_id)
-        if collection_details:
-            collection, _ = Collection.objects.get_or_create(
-                tmdb_id=collection_details.get('id'),
-                defaults={
-                    'name': collection_details.get('name'),
-                    'description': collection_details.get('overview'),
-                    'poster': f"https://image.tmdb.org/t/p/original{collection_details.get('poster_path')}" if collection_details.get('poster_path') else None,
-                    'backdrop': f"https://image.tmdb.org/t/p/original{collection_details.get('backdrop_path')}" if collection_details.get('backdrop_path') else None
-                }
-            )
-            movie.collection = collection
-            movie.save()
+    return movies_service.get_collection_details(collection_id) if collection_id else None
 
-def process_cast(movie, cast, movies_service):
-    """Process cast members from movie credits"""
-    movie_content_type = ContentType.objects.get_for_model(movie)
-    
-    for index, person in enumerate(cast):
-        # Check if the person already exists in the database
-        person_instance = Person.objects.filter(tmdb_id=person.get('id')).first()
-        
-        if not person_instance:
-            # Fetch person details and create if not found
-            person_details = movies_service.get_person_details(person.get('id'))
-            external_ids = movies_service.get_person_external_ids(person.get('id'))
-            person_instance, _ = Person.objects.get_or_create(
-                tmdb_id=person_details.get('id'),
-                defaults={
-                    'name': person_details.get('name'),
-                    'profile_picture': f"https://image.tmdb.org/t/p/original{person_details.get('profile_path')}" if person_details.get('profile_path') else None,
-                    'date_of_birth': person_details.get('birthday'),
-                    'date_of_death': person_details.get('deathday'),
-                    'bio': person_details.get('biography'),
-                    'imdb_id': person_details.get('imdb_id'),
-                    'wikidata_id': external_ids.get('wikidata_id') if external_ids else None,
-                }
-            )
-            person_instance.is_actor = True
-            person_instance.save()
-        elif not person_instance.wikidata_id:
-            external_ids = movies_service.get_person_external_ids(person.get('id'))
-            if external_ids and external_ids.get('wikidata_id'):
-                person_instance.wikidata_id = external_ids.get('wikidata_id')
-                person_instance.save(update_fields=['wikidata_id'])
-        
-        # Create MediaPerson entry
-        MediaPerson.objects.create(
-            content_type=movie_content_type,
-            object_id=movie.id,
-            person=person_instance,
-            role="Actor",
-            character_name=person.get('character'),
-            order=person.get('order', index)
-        )
-
-def process_crew(movie, crew, movies_service):
-    """Process crew members from movie credits"""
-    movie_content_type = ContentType.objects.get_for_model(movie)
-    relevant_crew = [person for person in crew if person.get('department') in ['Directing', 'Writing', 'Sound']]
-    
-    for person in relevant_crew:
-        job = person.get('job')
-        department = person.get('department')
-        
-        # Skip if not one of our supported roles
-        if (department == 'Directing' and job != 'Director') or \
-           (department == 'Writing' and job not in ['Original Story', 'Screenplay', 'Writer', 'Story', 'Novel', 'Comic Book', 'Graphic Novel', 'Book']) or \
-           (department == 'Sound' and job != 'Original Music Composer'):
-            continue
-        
-        person_details = movies_service.get_person_details(person.get('id'))
-        external_ids = movies_service.get_person_external_ids(person.get('id'))
-        person_instance, created = Person.objects.get_or_create(
-            tmdb_id=person_details.get('id'),
-            defaults={
-                'name': person_details.get('name'),
-                'profile_picture': f"https://image.tmdb.org/t/p/original{person_details.get('profile_path')}" if person_details.get('profile_path') else None,
-                'date_of_birth': person_details.get('birthday'),
-                'date_of_death': person_details.get('deathday'),
-                'bio': person_details.get('biography'),
-                'imdb_id': person_details.get('imdb_id'),
-                'wikidata_id': external_ids.get('wikidata_id') if external_ids else None,
-            }
-        )
-        if not created and not person_instance.wikidata_id and external_ids and external_ids.get('wikidata_id'):
-            person_instance.wikidata_id = external_ids.get('wikidata_id')
-            person_instance.save(update_fields=['wikidata_id'])
-
-        # Set the appropriate role
-        role = job
-        if job == 'Director':
-            person_instance.is_director = True
-        elif job in ['Original Story', 'Screenplay', 'Writer', 'Story', 'Novel', 'Comic Book', 'Graphic Novel','Book']:
-            if job == 'Book':
-                person_instance.is_book = True
-            if job == 'Writer':
-                person_instance.is_writer = True
-            if job == 'Story':
-                person_instance.is_story = True
-            if job == 'Original Story':
-                person_instance.is_original_story = True
-            if job == 'Screenplay':
-                person_instance.is_screenwriter = True
-            if job == 'Novel':
-                person_instance.is_novelist = True
-            if job == 'Comic Book':
-                person_instance.is_comic_artist = True
-            if job == 'Graphic Novel':
-                person_instance.is_graphic_novelist = True
-        elif job == 'Original Music Composer':
-            person_instance.is_original_music_composer = True
-        
-        person_instance.save()
-        
-        MediaPerson.objects.create(
-            content_type=movie_content_type,
-            object_id=movie.id,
-            person=person_instance,
-            role=role
-        )
+def process_collection(collection_details):
+    """Get or create the collection instance for fetched collection details"""
+    if not collection_details:
+        return None
+    collection, _ = Collection.objects.get_or_create(
+        tmdb_id=collection_details.get('id'),
+        defaults={
+            'name': collection_details.get('name'),
+            'description': collection_details.get('overview'),
+            'poster': f"https://image.tmdb.org/t/p/original{collection_details.get('poster_path')}" if collection_details.get('poster_path') else None,
+            'backdrop': f"https://image.tmdb.org/t/p/original{collection_details.get('backdrop_path')}" if collection_details.get('backdrop_path') else None
+        }
+    )
+    return collection
+
+def extract_credits(credits):
+    """Build credit rows for the cast and the crew jobs we track"""
+    rows = [
+        ingest.Credit(person.get('id'), 'Actor', person.get('character'), person.get('order', index))
+        for index, person in enumerate(credits.get('cast', []))
+    ]
+    for person in credits.get('crew', []):
+        if person.get('job') in CREW_JOBS.get(person.get('department'), ()):
+            rows.append(ingest.Credit(person.get('id'), person.get('job')))
+    return rows
 
 def add_to_movie_watchlist(movie, user_id):
     """Add movie to watchlist"""
@@ -295,18 +138,19 @@ def create_movie_basic(movie_id, movie_poster=None, movie_backdrop=None, is_anim
     # Extract basic movie data
     movie_dict = extract_movie_data(movie_details, movie_poster, movie_backdrop, is_anime)
     
-    # Process only essential metadata (genres, countries, keywords - quick operations)
-    genre_instances, country_instances, keyword_instances = process_genres_countries_keywords(movie_details)
-    
-    # Create the movie instance with basic information
-    movie = Movie.objects.create(**movie_dict, added_by=CustomUser.objects.filter(id=user_id).first() if user_id else None)
-    movie.genres.set(genre_instances)
-    movie.countries.set(country_instances)
-    movie.keywords.set(keyword_instances)
-    
-    # Add to watchlist if specified
-    if add_to_watchlist:
-        add_to_movie_watchlist(movie, user_id)
+    with transaction.atomic():
+        # Process only essential metadata (genres, countries, keywords - quick operations)
+        genre_instances, country_instances, keyword_instances = process_genres_countries_keywords(movie_details)
+
+        # Create the movie instance with basic information
+        movie = Movie.objects.create(**movie_dict, added_by=CustomUser.objects.filter(id=user_id).first() if user_id else None)
+        movie.genres.set(genre_instances)
+        movie.countries.set(country_instances)
+        movie.keywords.set(keyword_instances)
+
+        # Add to watchlist if specified
+        if add_to_watchlist:
+            add_to_movie_watchlist(movie, user_id)
     
     return movie
 
@@ -322,28 +166,34 @@ def create_movie(movie_id, movie_poster=None, movie_backdrop=None, is_anime=Fals
     # Extract basic movie data
     movie_dict = extract_movie_data(movie_details, movie_poster, movie_backdrop, is_anime)
     
-    # Process metadata
-    genre_instances, country_instances, keyword_instances = process_genres_countries_keywords(movie_details)
-    company_instances = process_production_companies(movie_details)
-    
-    # Create the movie instance
-    movie = Movie.objects.create(**movie_dict, added_by=CustomUser.objects.filter(id=user_id).first() if user_id else None)
-    movie.genres.set(genre_instances)
-    movie.countries.set(country_instances)
-    movie.keywords.set(keyword_instances)
-    movie.production_companies.set(company_instances)
-    
-    # Handle collection
-    process_collection(movie, movie_details, movies_service)
-    
-    # Add to watchlist if specified
-    if add_to_watchlist:
-        add_to_movie_watchlist(movie, user_id)
-    
-    # Process cast and crew
-    credits = movie_details.get('credits', {})
-    process_cast(movie, credits.get('cast', []), movies_service)
-    process_crew(movie, credits.get('crew', []), movies_service)
+    # Fetch everything else from the API before writing: credited people
+    # not in the database yet and the collection
+    credits = extract_credits(movie_details.get('credits', {}))
+    people = ingest.prepare_people({credit.tmdb_id for credit in credits}, movies_service)
+    collection_details = fetch_collection(movie_details, movies_service)
+
+    with transaction.atomic():
+        # Process metadata
+        genre_instances, country_instances, keyword_instances = process_genres_countries_keywords(movie_details)
+        company_instances = process_production_companies(movie_details)
+
+        # Create the movie instance
+        movie = Movie.objects.create(
+            **movie_dict,
+            collection=process_collection(collection_details),
+            added_by=CustomUser.objects.filter(id=user_id).first() if user_id else None,
+        )
+        movie.genres.set(genre_instances)
+        movie.countries.set(country_instances)
+        movie.keywords.set(keyword_instances)
+        movie.production_companies.set(company_instances)
+
+        # Add to watchlist if specified
+        if add_to_watchlist:
+            add_to_movie_watchlist(movie, user_id)
+
+        # Process cast and crew
+        ingest.write_credits(movie, credits, people)
     
     return movie
 
@@ -358,18 +208,23 @@ def enrich_movie_with_details(movie_id):
         if not movie_details:
             return movie
         
-        # Process production companies
-        company_instances = process_production_companies(movie_details)
-        movie.production_companies.set(company_instances)
-        
-        # Handle collection
-        process_collection(movie, movie_details, movies_service)
-        
-        # Process cast and crew
-        credits = movie_details.get('credits', {})
-        if credits:
-            process_cast(movie, credits.get('cast', []), movies_service)
-            process_crew(movie, credits.get('crew', []), movies_service)
+        credits = extract_credits(movie_details.get('credits', {}))
+        people = ingest.prepare_people({credit.tmdb_id for credit in credits}, movies_service)
+        collection_details = fetch_collection(movie_details, movies_service)
+
+        with transaction.atomic():
+            # Process production companies
+            company_instances = process_production_companies(movie_details)
+            movie.production_companies.set(company_instances)
+
+            # Handle collection
+            collection = process_collection(collection_details)
+            if collection:
+                movie.collection = collection
+                movie.save()
+
+            # Process cast and crew
+            ingest.write_credits(movie, credits, people)
         
         return movie
         
@@ -8,7 +8,7 @@ from .models import Movie
 class MovieSerializer(serializers.ModelSerializer):
     class Meta:
         model = Movie
-        fields = '__all__'
+        exclude = ['search_vector']
 
 
 class MovieListSerializer(serializers.ModelSerializer):
@@ -138,6 +138,10 @@ from .analytics import (
 # These wrap the legacy functions with caching, memory management, and monitoring
 from .graph_builder import (
     build_network_graph,
+    build_network_graph_core,
+    build_network_graph_analytics,
+    calculate_graph_analytics,
+    iter_network_graph_chunks,
     build_movie_analytics_graph_context,
     build_graph,
 )
@@ -152,6 +156,10 @@ __all__ = [
     'build_network_graph',
     'build_movie_analytics_graph_context',
     'build_graph',  # Alias for build_network_graph
+    'build_network_graph_core',
+    'build_network_graph_analytics',
+    'calculate_graph_analytics',
+    'iter_network_graph_chunks',
     
     # Algorithms - Similarity
     'cosine_similarity',
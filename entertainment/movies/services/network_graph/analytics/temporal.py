@@ -2,17 +2,23 @@
 
 Tracks how the network evolves over time, detects trend changes,
 and identifies seasonal patterns in movie watching behavior.
+
+Review counts and ratings are computed from `ReviewDailyRollup` rows (one
+query per call) instead of aggregating the Review table once per period.
+Distinct user / movie counts cannot be summed from daily rows, so they come
+from one filtered ``COUNT(DISTINCT)`` per period, all in a single query.
 """
 
 import logging
+import math
 from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 from collections import defaultdict
 import statistics
 
-from django.db.models import Count, Avg, Q
 from django.contrib.contenttypes.models import ContentType
-from custom_auth.models import Review
+from django.utils import timezone
+from custom_auth.services.review_rollups import get_daily_rollups, get_distinct_counts
 from movies.models import Movie
 
 from ..constants import (
@@ -25,6 +31,20 @@ from ..utils import _safe_divide
 logger = logging.getLogger(__name__)
 
 
+def _sum_rollups(rollups: Dict[date, Dict], start_day: date, end_day: date) -> Dict[str, float]:
+    """Sum daily review counts and ratings over ``[start_day, end_day)``."""
+    totals = {'review_count': 0, 'rating_sum': 0.0, 'rating_sq_sum': 0.0}
+    day = start_day
+    while day < end_day:
+        row = rollups.get(day)
+        if row:
+            totals['review_count'] += row['review_count']
+            totals['rating_sum'] += row['rating_sum']
+            totals['rating_sq_sum'] += row['rating_sq_sum']
+        day += timedelta(days=1)
+    return totals
+
+
 def analyze_graph_evolution(
     *,
     days_back: int = 365,
@@ -46,6 +66,7 @@ def analyze_graph_evolution(
         - movie_count: Movies reviewed in period
         - review_count: Total reviews in period
         - average_rating: Average rating in period
+        - rating_stddev: Standard deviation of ratings in period
         - growth_rate: % growth from previous period
     
     Example:
@@ -62,39 +83,36 @@ def analyze_graph_evolution(
     """
     logger.info(f"Analyzing graph evolution over {days_back} days with {interval_days}-day intervals")
     
-    # Calculate time periods
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
+    # Calculate time periods (local calendar days, today inclusive)
+    end_day = timezone.localdate() + timedelta(days=1)
+    start_day = end_day - timedelta(days=days_back)
     
     periods = []
-    current_date = start_date
+    current_day = start_day
     
-    while current_date < end_date:
-        period_end = min(current_date + timedelta(days=interval_days), end_date)
-        periods.append((current_date, period_end))
-        current_date = period_end
+    while current_day < end_day:
+        period_end = min(current_day + timedelta(days=interval_days), end_day)
+        periods.append((current_day, period_end))
+        current_day = period_end
     
     logger.info(f"Analyzing {len(periods)} time periods")
     
-    # Get movie content type
+    # Single query for the whole window
     movie_ct = ContentType.objects.get_for_model(Movie)
+    rollups = get_daily_rollups(movie_ct.id, start_day, end_day)
+    distinct_counts = get_distinct_counts(movie_ct.id, periods)
     
     # Analyze each period
     results = []
     previous_review_count = 0
     
-    for period_start, period_end in periods:
-        # Get reviews in this period
-        reviews = Review.objects.filter(
-            content_type=movie_ct,
-            date_added__gte=period_start,
-            date_added__lt=period_end
-        )
+    for (period_start, period_end), distinct in zip(periods, distinct_counts):
+        totals = _sum_rollups(rollups, period_start, period_end)
+        review_count = totals['review_count']
         
-        review_count = reviews.count()
-        user_count = reviews.values('user').distinct().count()
-        movie_count = reviews.values('object_id').distinct().count()
-        avg_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0.0
+        avg_rating = _safe_divide(totals['rating_sum'], review_count)
+        variance = _safe_divide(totals['rating_sq_sum'], review_count) - avg_rating ** 2
+        rating_stddev = math.sqrt(variance) if variance > 0 else 0.0
         
         # Calculate growth rate
         growth_rate = 0.0
@@ -105,10 +123,11 @@ def analyze_graph_evolution(
             'timestamp': period_start.strftime('%Y-%m-%d'),
             'period_start': period_start,
             'period_end': period_end,
-            'user_count': user_count,
-            'movie_count': movie_count,
+            'user_count': distinct['reviewer_count'],
+            'movie_count': distinct['item_count'],
             'review_count': review_count,
             'average_rating': round(avg_rating, 2),
+            'rating_stddev': round(rating_stddev, 2),
             'growth_rate': round(growth_rate, 3),
         })
         
@@ -338,38 +357,27 @@ def calculate_growth_rate(
     """
     logger.info(f"Calculating growth rate for '{metric}'")
     
-    now = datetime.now()
-    current_start = now - timedelta(days=period_days)
+    if metric not in ('review_count', 'user_count', 'movie_count'):
+        logger.error(f"Unknown metric: {metric}")
+        return {'error': f'Unknown metric: {metric}'}
+    
+    end_day = timezone.localdate() + timedelta(days=1)
+    current_start = end_day - timedelta(days=period_days)
     previous_start = current_start - timedelta(days=comparison_period_days)
     
     movie_ct = ContentType.objects.get_for_model(Movie)
     
-    # Current period
-    current_reviews = Review.objects.filter(
-        content_type=movie_ct,
-        date_added__gte=current_start
-    )
-    
-    # Previous period
-    previous_reviews = Review.objects.filter(
-        content_type=movie_ct,
-        date_added__gte=previous_start,
-        date_added__lt=current_start
-    )
-    
     # Calculate metrics
     if metric == 'review_count':
-        current_value = current_reviews.count()
-        previous_value = previous_reviews.count()
-    elif metric == 'user_count':
-        current_value = current_reviews.values('user').distinct().count()
-        previous_value = previous_reviews.values('user').distinct().count()
-    elif metric == 'movie_count':
-        current_value = current_reviews.values('object_id').distinct().count()
-        previous_value = previous_reviews.values('object_id').distinct().count()
+        rollups = get_daily_rollups(movie_ct.id, previous_start, end_day)
+        current_value = _sum_rollups(rollups, current_start, end_day)[metric]
+        previous_value = _sum_rollups(rollups, previous_start, current_start)[metric]
     else:
-        logger.error(f"Unknown metric: {metric}")
-        return {'error': f'Unknown metric: {metric}'}
+        field = 'reviewer_count' if metric == 'user_count' else 'item_count'
+        current, previous = get_distinct_counts(
+            movie_ct.id, [(current_start, end_day), (previous_start, current_start)]
+        )
+        current_value, previous_value = current[field], previous[field]
     
     # Calculate growth
     absolute_growth = current_value - previous_value
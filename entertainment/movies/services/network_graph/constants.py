@@ -127,6 +127,18 @@ LAYOUT_PARAMS = {
     'hub_anti_clustering': 1.5,
 }
 
+# Server-side ForceAtlas2 (layout/force_atlas2.py)
+FA2_ITERATIONS = 300  # Cold-start iterations
+FA2_WARM_ITERATIONS = 60  # Iterations when most positions come from the store
+FA2_WARM_START_MIN_OVERLAP = 0.8  # Share of known nodes required for a warm start
+FA2_SCALING_RATIO = 2.0  # Repulsion strength (kr)
+FA2_GRAVITY = 1.0  # Pull towards the origin (kg)
+FA2_JITTER_TOLERANCE = 1.0
+FA2_GRID_THRESHOLD = 500  # Above this node count repulsion uses the grid approximation
+FA2_GRID_NODES_PER_CELL = 8
+FA2_DISPLAY_RADIUS_PER_NODE = 45  # Display radius grows with sqrt(node count)
+FA2_RANDOM_STATE = 42
+
 # Performance Thresholds
 SUPER_HUB_THRESHOLD = 30  # Nodes with >30 connections
 HUB_THRESHOLD = 15  # Nodes with >15 connections
@@ -7,14 +7,15 @@ optimizations applied:
 - Performance monitoring and logging
 - Intelligent graph reduction
 
-Use build_network_graph() as a drop-in replacement for the legacy function.
+Use build_network_graph() as a drop-in replacement for the legacy function,
+or iter_network_graph_chunks() to stream large graphs chunk by chunk.
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from django.contrib.auth import get_user_model
 
-from .cache import cached, CacheLevel
+from .cache import cached, CacheLevel, _hash_args
 from .performance import timed, get_memory_usage
 from .memory import process_with_memory_management
 from .analytics import (
@@ -25,14 +26,15 @@ from .analytics import (
     get_comprehensive_metrics,
 )
 from .builders.core import build_network_graph_refactored
+from .layout import apply_precomputed_layout
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
 @timed
-@cached(timeout=CacheLevel.MEDIUM, key_prefix='network_graph')
-def build_network_graph(
+@cached(timeout=CacheLevel.MEDIUM, key_prefix='network_graph_core')
+def build_network_graph_core(
     current_user: User,
     *,
     min_reviews: int = 2,
@@ -49,45 +51,18 @@ def build_network_graph(
     show_actors: bool = False,
     show_crew: bool = False
 ) -> Dict[str, Any]:
-    """Build network graph with all Phase 2A performance optimizations.
+    """Build the graph itself: nodes, edges, stats, layout and performance.
     
-    This is a drop-in replacement for the legacy build_network_graph function
-    that adds:
-    - Execution timing and logging
-    - 1-hour result caching
-    - Memory tracking and management
-    - Automatic graph sampling for large datasets
-    - Performance statistics in response
+    This is build_network_graph without the Phase 2B analytics, so callers
+    that stream the response can flush the graph before the (slower)
+    analytics are computed. Cached separately for 1 hour per
+    user/parameter combination.
     
     Args:
-        current_user: The user requesting the graph
-        min_reviews: Minimum reviews for user/movie inclusion (default: 2)
-        rating_threshold: Minimum rating for connections (default: 7.0)
-        max_nodes: Maximum nodes before sampling kicks in (default: 500)
-        chaos_mode: Random layout vs structured (default: False)
-        show_countries: Include country nodes (default: True)
-        show_genres: Include genre nodes (default: True)
-        show_directors: Include director nodes (default: True)
-        show_predictions: Include prediction nodes (default: True)
-        predictions_limit: Max predictions to show (default: 10)
-        movie_limit: Max movies to include (default: 100)
-        show_similarity: Show similarity edges (default: True)
-        show_actors: Include actor nodes (default: False)
-        show_crew: Include crew nodes (default: False)
+        Same as build_network_graph
     
     Returns:
-        Dict containing:
-        - nodes: List of node dicts
-        - edges: List of edge dicts
-        - stats: Graph statistics
-        - performance: Performance metrics (memory, timing, sampling)
-        - layout_config: MultiGravity Force Atlas configuration
-    
-    Performance Notes:
-        - Results cached for 1 hour per user/parameter combination
-        - Memory usage tracked and logged
-        - Auto-sampling applied if graph exceeds memory limits
-        - Execution time logged for monitoring
+        Dict containing nodes, edges, stats, layout_config and performance
     """
     # Track initial memory
     initial_memory = get_memory_usage()
@@ -139,6 +114,35 @@ def build_network_graph(
     result['nodes'] = nodes
     result['edges'] = edges
     
+    # Precompute node positions server-side (warm-started per configuration)
+    # so the client can skip its stabilisation phase
+    layout_stats = {}
+    try:
+        layout_key = _hash_args(
+            min_reviews=min_reviews,
+            rating_threshold=rating_threshold,
+            max_nodes=max_nodes,
+            chaos_mode=chaos_mode,
+            show_countries=show_countries,
+            show_genres=show_genres,
+            show_directors=show_directors,
+            show_predictions=show_predictions,
+            predictions_limit=predictions_limit,
+            movie_limit=movie_limit,
+            show_similarity=show_similarity,
+            show_actors=show_actors,
+            show_crew=show_crew,
+        )
+        layout_stats = apply_precomputed_layout(nodes, edges, config_key=layout_key)
+        result['layout_config'] = {
+            **result.get('layout_config', {}),
+            'precomputed': True,
+            'stabilization_iterations': 0,
+        }
+    except Exception as e:
+        # Fall back to client-side stabilisation from the community hints
+        logger.error(f"Server-side layout failed: {e}", exc_info=True)
+    
     # Track final memory
     final_memory = get_memory_usage()
     
@@ -150,26 +154,47 @@ def build_network_graph(
         'memory_delta_mb': final_memory - initial_memory,
         'nodes_count': len(nodes),
         'edges_count': len(edges),
+        'layout': layout_stats,
     }
     
-    # ========== Phase 2B: Add Analytics ==========
+    logger.info(
+        f"Completed build_network_graph_core: {len(nodes)} nodes, {len(edges)} edges, "
+        f"memory Δ: {final_memory - initial_memory:.1f}MB"
+    )
+    
+    return result
+
+
+def calculate_graph_analytics(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compute the Phase 2B analytics attached to a network graph response.
+    
+    Args:
+        nodes: Final (post-sampling) node list
+        edges: Final (post-sampling) edge list
+    
+    Returns:
+        Dict with analytics, health, top_influencers, temporal_metrics and
+        engagement (or analytics_error if computation failed)
+    """
+    analytics: Dict[str, Any] = {}
+    
     logger.info("Calculating analytics metrics...")
     
     try:
         # Get comprehensive metrics (includes communities, centrality, etc.)
         comprehensive = get_comprehensive_metrics(nodes, edges)
-        result['analytics'] = comprehensive
+        analytics['analytics'] = comprehensive
         logger.info(f"Analytics calculated: {comprehensive.get('summary', {})}")
         
         # Calculate network health
         health = calculate_network_health(nodes, edges)
-        result['health'] = health
+        analytics['health'] = health
         logger.info(f"Network health: {health.get('overall_health', 'N/A')}/100 ({health.get('status', 'Unknown')})")
         
         # Get top influencers
         top_users = get_top_influencers(nodes, edges, node_type='user', top_n=10)
         top_movies = get_top_influencers(nodes, edges, node_type='movie', top_n=10)
-        result['top_influencers'] = {
+        analytics['top_influencers'] = {
             'users': top_users,
             'movies': top_movies,
         }
@@ -177,27 +202,177 @@ def build_network_graph(
         
         # Get temporal metrics (last 90 days)
         temporal = get_temporal_metrics(days_back=90, include_forecasts=True)
-        result['temporal_metrics'] = temporal
+        analytics['temporal_metrics'] = temporal
         logger.info(f"Temporal trend: {temporal.get('trend', 'Unknown')}")
         
         # Get user engagement (platform-wide, not node-based)
         engagement = calculate_user_engagement(days_back=30)
-        result['engagement'] = engagement
+        analytics['engagement'] = engagement
         logger.info(f"User engagement: {engagement.get('engagement_score', 'N/A')}/100")
         
     except Exception as e:
         logger.error(f"Error calculating analytics: {e}", exc_info=True)
         # Don't fail the whole request if analytics fail
-        result['analytics_error'] = str(e)
+        analytics['analytics_error'] = str(e)
+    
+    return analytics
+
+
+@cached(timeout=CacheLevel.MEDIUM, key_prefix='network_graph_analytics')
+def build_network_graph_analytics(current_user: User, **graph_kwargs) -> Dict[str, Any]:
+    """`calculate_graph_analytics` of the (cached) core graph, cached for 1 hour.
+    
+    Shared by `build_network_graph` and the streaming mode, so streamed
+    requests reuse the analytics instead of recomputing them every time.
+    
+    Args:
+        current_user: The user requesting the graph
+        **graph_kwargs: Same keyword arguments as build_network_graph
+    """
+    core = build_network_graph_core(current_user, **graph_kwargs)
+    return calculate_graph_analytics(core['nodes'], core['edges'])
+
+
+@timed
+@cached(timeout=CacheLevel.MEDIUM, key_prefix='network_graph')
+def build_network_graph(
+    current_user: User,
+    *,
+    min_reviews: int = 2,
+    rating_threshold: float = 7.0,
+    max_nodes: int = 500,
+    chaos_mode: bool = False,
+    show_countries: bool = True,
+    show_genres: bool = True,
+    show_directors: bool = True,
+    show_predictions: bool = True,
+    predictions_limit: int = 10,
+    movie_limit: int = 100,
+    show_similarity: bool = True,
+    show_actors: bool = False,
+    show_crew: bool = False
+) -> Dict[str, Any]:
+    """Build network graph with all Phase 2A performance optimizations.
+    
+    This is a drop-in replacement for the legacy build_network_graph function
+    that adds:
+    - Execution timing and logging
+    - 1-hour result caching
+    - Memory tracking and management
+    - Automatic graph sampling for large datasets
+    - Performance statistics in response
+    
+    Args:
+        current_user: The user requesting the graph
+        min_reviews: Minimum reviews for user/movie inclusion (default: 2)
+        rating_threshold: Minimum rating for connections (default: 7.0)
+        max_nodes: Maximum nodes before sampling kicks in (default: 500)
+        chaos_mode: Random layout vs structured (default: False)
+        show_countries: Include country nodes (default: True)
+        show_genres: Include genre nodes (default: True)
+        show_directors: Include director nodes (default: True)
+        show_predictions: Include prediction nodes (default: True)
+        predictions_limit: Max predictions to show (default: 10)
+        movie_limit: Max movies to include (default: 100)
+        show_similarity: Show similarity edges (default: True)
+        show_actors: Include actor nodes (default: False)
+        show_crew: Include crew nodes (default: False)
+    
+    Returns:
+        Dict containing:
+        - nodes: List of node dicts
+        - edges: List of edge dicts
+        - stats: Graph statistics
+        - performance: Performance metrics (memory, timing, sampling)
+        - layout_config: MultiGravity Force Atlas configuration
+    
+    Performance Notes:
+        - Results cached for 1 hour per user/parameter combination
+        - Memory usage tracked and logged
+        - Auto-sampling applied if graph exceeds memory limits
+        - Execution time logged for monitoring
+    """
+    graph_kwargs = dict(
+        min_reviews=min_reviews,
+        rating_threshold=rating_threshold,
+        max_nodes=max_nodes,
+        chaos_mode=chaos_mode,
+        show_countries=show_countries,
+        show_genres=show_genres,
+        show_directors=show_directors,
+        show_predictions=show_predictions,
+        predictions_limit=predictions_limit,
+        movie_limit=movie_limit,
+        show_similarity=show_similarity,
+        show_actors=show_actors,
+        show_crew=show_crew
+    )
+    result = dict(build_network_graph_core(current_user, **graph_kwargs))
+    
+    result.update(build_network_graph_analytics(current_user, **graph_kwargs))
     
     logger.info(
-        f"Completed build_network_graph: {len(nodes)} nodes, {len(edges)} edges, "
-        f"memory Δ: {final_memory - initial_memory:.1f}MB"
+        f"Completed build_network_graph: {len(result['nodes'])} nodes, {len(result['edges'])} edges"
     )
     
     return result
 
 
+def _to_vis_edge(edge: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an edge with vis.js `from`/`to` keys instead of `source`/`target`."""
+    vis_edge = {key: value for key, value in edge.items() if key not in ('source', 'target')}
+    vis_edge['from'] = edge.get('source', edge.get('from'))
+    vis_edge['to'] = edge.get('target', edge.get('to'))
+    return vis_edge
+
+
+def iter_network_graph_chunks(
+    current_user: User,
+    *,
+    chunk_size: int = 500,
+    **graph_kwargs
+) -> Iterator[Dict[str, Any]]:
+    """Yield a network graph as a sequence of small, independently encodable chunks.
+    
+    Used by the NDJSON streaming mode of the graph endpoint. Chunk order:
+    
+    1. ``meta``: stats, layout_config, performance and node/edge totals
+    2. ``nodes``: up to `chunk_size` nodes per chunk
+    3. ``edges``: up to `chunk_size` edges per chunk, already in vis.js
+       from/to form (converted per chunk, the cached graph is not mutated)
+    4. ``analytics``: the Phase 2B analytics, computed (or read from the
+       cache shared with build_network_graph) only after the graph has
+       been flushed
+    5. ``end``
+    
+    Args:
+        current_user: The user requesting the graph
+        chunk_size: Max nodes/edges per chunk (default: 500)
+        **graph_kwargs: Same keyword arguments as build_network_graph
+    """
+    core = build_network_graph_core(current_user, **graph_kwargs)
+    nodes = core['nodes']
+    edges = core['edges']
+    
+    yield {
+        'type': 'meta',
+        'stats': core.get('stats', {}),
+        'layout_config': core.get('layout_config', {}),
+        'performance': core.get('performance', {}),
+        'node_count': len(nodes),
+        'edge_count': len(edges),
+    }
+    
+    for start in range(0, len(nodes), chunk_size):
+        yield {'type': 'nodes', 'items': nodes[start:start + chunk_size]}
+    
+    for start in range(0, len(edges), chunk_size):
+        yield {'type': 'edges', 'items': [_to_vis_edge(edge) for edge in edges[start:start + chunk_size]]}
+    
+    yield {'type': 'analytics', **build_network_graph_analytics(current_user, **graph_kwargs)}
+    yield {'type': 'end'}
+
+
 @timed
 @cached(timeout=CacheLevel.SHORT, key_prefix='analytics_graph')
 def build_movie_analytics_graph_context(max_nodes: int = 300) -> Dict[str, Any]:
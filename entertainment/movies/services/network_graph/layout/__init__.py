@@ -9,8 +9,20 @@ from .edge_optimization import (
     calculate_smart_edge_lengths,
 )
 
+from .force_atlas2 import (
+    compute_force_atlas2_layout,
+    to_display_positions,
+)
+
+from .position_store import (
+    apply_precomputed_layout,
+)
+
 __all__ = [
     'calculate_multigravity_forces',
     'enhance_graph_layout',
     'calculate_smart_edge_lengths',
+    'compute_force_atlas2_layout',
+    'to_display_positions',
+    'apply_precomputed_layout',
 ]
@@ -0,0 +1,347 @@
+"""Vectorised ForceAtlas2 layout engine.
+
+Runs the ForceAtlas2 algorithm (Jacomy et al., 2014) server-side with NumPy so
+the client receives ready-to-render coordinates instead of stabilising the
+physics simulation in the browser.
+
+- Repulsion: kr * (deg1 + 1) * (deg2 + 1) / d, exact (row-blocked) for small
+  graphs and a grid approximation (per-cell centroids for far nodes, exact
+  pairs within a cell) above FA2_GRID_THRESHOLD nodes.
+- Attraction: linear in distance, scaled by edge weight.
+- Gravity: constant pull towards the origin scaled by node mass.
+- Adaptive global/local speed from swinging vs. traction, as in Gephi.
+
+Coordinates returned by `compute_force_atlas2_layout` are in raw ForceAtlas2
+units; use `to_display_positions` to scale them for vis.js.
+"""
+
+import logging
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from ..types import NodeDict, EdgeDict
+from ..constants import (
+    FA2_ITERATIONS,
+    FA2_WARM_ITERATIONS,
+    FA2_WARM_START_MIN_OVERLAP,
+    FA2_SCALING_RATIO,
+    FA2_GRAVITY,
+    FA2_JITTER_TOLERANCE,
+    FA2_GRID_THRESHOLD,
+    FA2_GRID_NODES_PER_CELL,
+    FA2_DISPLAY_RADIUS_PER_NODE,
+    FA2_RANDOM_STATE,
+)
+
+logger = logging.getLogger(__name__)
+
+Positions = Dict[str, Tuple[float, float]]
+
+_MIN_DIST2 = 1e-4
+_BLOCK_SIZE = 256
+
+
+def _intern_graph(
+    nodes: List[NodeDict],
+    edges: List[EdgeDict]
+) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """Map node ids to dense indices and edges to endpoint/weight arrays."""
+    ids = [node['id'] for node in nodes]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+
+    src, dst, weight = [], [], []
+    for edge in edges:
+        s = index.get(edge.get('source', edge.get('from')))
+        t = index.get(edge.get('target', edge.get('to')))
+        if s is None or t is None or s == t:
+            continue
+        src.append(s)
+        dst.append(t)
+        weight.append(float(edge.get('weight') or 1.0))
+
+    return (
+        ids,
+        np.asarray(src, dtype=np.int64),
+        np.asarray(dst, dtype=np.int64),
+        np.asarray(weight, dtype=np.float64),
+    )
+
+
+def _repulsion_exact(pos: np.ndarray, mass: np.ndarray, kr: float) -> np.ndarray:
+    """All-pairs repulsion, computed in row blocks to bound memory."""
+    n = len(pos)
+    x, y = pos[:, 0], pos[:, 1]
+    forces = np.empty_like(pos)
+    for start in range(0, n, _BLOCK_SIZE):
+        end = min(start + _BLOCK_SIZE, n)
+        dx = x[start:end, None] - x[None, :]
+        dy = y[start:end, None] - y[None, :]
+        factor = dx * dx
+        factor += dy * dy
+        np.maximum(factor, _MIN_DIST2, out=factor)
+        np.divide(np.outer(kr * mass[start:end], mass), factor, out=factor)
+        # No self-repulsion
+        factor[np.arange(end - start), np.arange(start, end)] = 0.0
+        forces[start:end, 0] = np.einsum('ij,ij->i', dx, factor)
+        forces[start:end, 1] = np.einsum('ij,ij->i', dy, factor)
+    return forces
+
+
+def _repulsion_grid(pos: np.ndarray, mass: np.ndarray, kr: float) -> np.ndarray:
+    """Grid-approximated repulsion.
+
+    Nodes are bucketed into a uniform grid. Each node is repelled exactly by
+    the nodes sharing its cell and by the mass-weighted centroid of every
+    other cell.
+    """
+    n = len(pos)
+    lo = pos.min(axis=0)
+    extent = max(float((pos.max(axis=0) - lo).max()), 1e-6)
+    cells_per_side = max(1, int(np.sqrt(n / FA2_GRID_NODES_PER_CELL)))
+    cell_size = extent / cells_per_side + 1e-9
+
+    cx = np.minimum(((pos[:, 0] - lo[0]) / cell_size).astype(np.int64), cells_per_side - 1)
+    cy = np.minimum(((pos[:, 1] - lo[1]) / cell_size).astype(np.int64), cells_per_side - 1)
+    _, cell_of = np.unique(cy * cells_per_side + cx, return_inverse=True)
+    num_cells = int(cell_of.max()) + 1
+
+    cell_mass = np.bincount(cell_of, weights=mass, minlength=num_cells)
+    centroids = np.stack([
+        np.bincount(cell_of, weights=mass * pos[:, 0], minlength=num_cells) / cell_mass,
+        np.bincount(cell_of, weights=mass * pos[:, 1], minlength=num_cells) / cell_mass,
+    ], axis=1)
+
+    # Far field: node vs. every other cell's centroid
+    forces = np.empty_like(pos)
+    for start in range(0, n, _BLOCK_SIZE):
+        end = min(start + _BLOCK_SIZE, n)
+        dx = pos[start:end, 0, None] - centroids[None, :, 0]
+        dy = pos[start:end, 1, None] - centroids[None, :, 1]
+        factor = dx * dx
+        factor += dy * dy
+        np.maximum(factor, _MIN_DIST2, out=factor)
+        np.divide(np.outer(kr * mass[start:end], cell_mass), factor, out=factor)
+        factor[np.arange(end - start), cell_of[start:end]] = 0.0
+        forces[start:end, 0] = np.einsum('ij,ij->i', dx, factor)
+        forces[start:end, 1] = np.einsum('ij,ij->i', dy, factor)
+
+    # Near field: exact pairs inside each cell
+    order = np.argsort(cell_of, kind='stable')
+    boundaries = np.flatnonzero(np.diff(cell_of[order])) + 1
+    for members in np.split(order, boundaries):
+        if len(members) > 1:
+            forces[members] += _repulsion_exact(pos[members], mass[members], kr)
+
+    return forces
+
+
+def _attraction(pos: np.ndarray, src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """Linear spring attraction along edges."""
+    n = len(pos)
+    pull = (pos[dst] - pos[src]) * weight[:, None]
+    forces = np.empty_like(pos)
+    for axis in (0, 1):
+        forces[:, axis] = (
+            np.bincount(src, weights=pull[:, axis], minlength=n)
+            - np.bincount(dst, weights=pull[:, axis], minlength=n)
+        )
+    return forces
+
+
+def _gravity(pos: np.ndarray, mass: np.ndarray, kg: float) -> np.ndarray:
+    """Constant-magnitude pull towards the origin."""
+    dist = np.maximum(np.sqrt((pos ** 2).sum(axis=1)), 1e-9)
+    return -(kg * mass / dist)[:, None] * pos
+
+
+def run_force_atlas2(
+    pos: np.ndarray,
+    mass: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray,
+    *,
+    iterations: int = FA2_ITERATIONS,
+    scaling_ratio: float = FA2_SCALING_RATIO,
+    gravity: float = FA2_GRAVITY,
+    jitter_tolerance: float = FA2_JITTER_TOLERANCE,
+) -> np.ndarray:
+    """Iterate ForceAtlas2 on dense arrays.
+
+    Args:
+        pos: (n, 2) starting coordinates (modified copy is returned)
+        mass: (n,) node masses, conventionally degree + 1
+        src, dst: (m,) edge endpoint indices
+        weight: (m,) edge weights
+        iterations: Number of simulation steps
+        scaling_ratio: Repulsion strength (kr)
+        gravity: Pull towards the origin (kg)
+        jitter_tolerance: Allowed swinging before the global speed drops
+
+    Returns:
+        (n, 2) array of final coordinates
+    """
+    n = len(pos)
+    pos = pos.astype(np.float64, copy=True)
+    if n < 2:
+        return pos
+
+    repulsion = _repulsion_grid if n > FA2_GRID_THRESHOLD else _repulsion_exact
+    previous = np.zeros_like(pos)
+    speed = 1.0
+    speed_efficiency = 1.0
+
+    for _ in range(iterations):
+        forces = repulsion(pos, mass, scaling_ratio)
+        forces += _attraction(pos, src, dst, weight)
+        forces += _gravity(pos, mass, gravity)
+
+        # Adaptive speed (Gephi's ForceAtlas2 auto-tuning)
+        swinging = mass * np.sqrt(((forces - previous) ** 2).sum(axis=1))
+        traction = mass * np.sqrt(((forces + previous) ** 2).sum(axis=1)) / 2.0
+        total_swinging = float(swinging.sum())
+        total_traction = float(traction.sum())
+
+        estimated_jitter = 0.05 * np.sqrt(n)
+        jitter = jitter_tolerance * max(
+            np.sqrt(estimated_jitter),
+            min(10.0, estimated_jitter * total_traction / (n * n)),
+        )
+        if total_traction > 0 and total_swinging / total_traction > 2.0:
+            if speed_efficiency > 0.05:
+                speed_efficiency *= 0.5
+            jitter = max(jitter, jitter_tolerance)
+
+        if total_swinging > 0:
+            target_speed = jitter * speed_efficiency * total_traction / total_swinging
+        else:
+            target_speed = speed * 1.5
+
+        if total_swinging > jitter * total_traction:
+            if speed_efficiency > 0.05:
+                speed_efficiency *= 0.7
+        elif speed < 1000:
+            speed_efficiency *= 1.3
+
+        speed = speed + min(target_speed - speed, 0.5 * speed)
+
+        factor = speed / (1.0 + np.sqrt(speed * swinging))
+        pos += forces * factor[:, None]
+        previous = forces
+
+    return pos
+
+
+def _initial_positions(
+    ids: List[str],
+    nodes: List[NodeDict],
+    src: np.ndarray,
+    dst: np.ndarray,
+    known: Positions,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Seed coordinates: stored positions first, then neighbours, then hints."""
+    n = len(ids)
+    pos = np.zeros((n, 2))
+    placed = np.zeros(n, dtype=bool)
+
+    for i, node_id in enumerate(ids):
+        if node_id in known:
+            pos[i] = known[node_id]
+            placed[i] = True
+
+    if placed.any() and not placed.all():
+        # New nodes start at the centroid of their already-placed neighbours
+        both_src = np.concatenate([src, dst])
+        both_dst = np.concatenate([dst, src])
+        usable = placed[both_dst] & ~placed[both_src]
+        counts = np.bincount(both_src[usable], minlength=n)
+        sums_x = np.bincount(both_src[usable], weights=pos[both_dst[usable], 0], minlength=n)
+        sums_y = np.bincount(both_src[usable], weights=pos[both_dst[usable], 1], minlength=n)
+        has_neighbours = (counts > 0) & ~placed
+        pos[has_neighbours, 0] = sums_x[has_neighbours] / counts[has_neighbours]
+        pos[has_neighbours, 1] = sums_y[has_neighbours] / counts[has_neighbours]
+        pos[has_neighbours] += rng.uniform(-1.0, 1.0, size=(int(has_neighbours.sum()), 2))
+        placed |= has_neighbours
+
+    remaining = ~placed
+    if remaining.any():
+        # Community hints from calculate_multigravity_forces, rescaled to
+        # ForceAtlas2 units; otherwise a random disc.
+        spread = 10.0 * np.sqrt(n)
+        hints = np.array([
+            (node.get('x', np.nan), node.get('y', np.nan)) for node in nodes
+        ], dtype=np.float64)
+        hinted = remaining & ~np.isnan(hints).any(axis=1)
+        if hinted.any():
+            radius = np.abs(hints[hinted]).max() or 1.0
+            pos[hinted] = hints[hinted] / radius * spread
+        random_nodes = remaining & ~hinted
+        pos[random_nodes] = rng.uniform(-spread, spread, size=(int(random_nodes.sum()), 2))
+
+    return pos
+
+
+def compute_force_atlas2_layout(
+    nodes: List[NodeDict],
+    edges: List[EdgeDict],
+    *,
+    initial_positions: Optional[Positions] = None,
+    iterations: Optional[int] = None,
+) -> Tuple[Positions, Dict[str, Any]]:
+    """Compute ForceAtlas2 coordinates for a graph.
+
+    Args:
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries (source/target or from/to)
+        initial_positions: Previously computed raw coordinates by node id.
+            When they cover at least FA2_WARM_START_MIN_OVERLAP of the nodes
+            the layout is warm-started and runs FA2_WARM_ITERATIONS steps.
+        iterations: Override the iteration count
+
+    Returns:
+        Tuple of (raw positions by node id, layout statistics)
+    """
+    started = time.perf_counter()
+    known = initial_positions or {}
+    ids, src, dst, weight = _intern_graph(nodes, edges)
+    n = len(ids)
+
+    known_ratio = (sum(1 for node_id in ids if node_id in known) / n) if n else 0.0
+    warm_start = known_ratio >= FA2_WARM_START_MIN_OVERLAP
+    if iterations is None:
+        iterations = FA2_WARM_ITERATIONS if warm_start else FA2_ITERATIONS
+
+    rng = np.random.default_rng(FA2_RANDOM_STATE)
+    pos = _initial_positions(ids, nodes, src, dst, known, rng)
+    degree = np.bincount(np.concatenate([src, dst]), minlength=n).astype(np.float64)
+
+    pos = run_force_atlas2(pos, degree + 1.0, src, dst, weight, iterations=iterations)
+
+    stats = {
+        'engine': 'force_atlas2',
+        'approximation': 'grid' if n > FA2_GRID_THRESHOLD else 'exact',
+        'iterations': iterations,
+        'warm_start': warm_start,
+        'known_ratio': round(known_ratio, 3),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(
+        f"ForceAtlas2 layout: {n} nodes, {len(src)} edges, {iterations} iterations "
+        f"(warm_start={warm_start}, {stats['elapsed_ms']}ms)"
+    )
+    return {node_id: (float(x), float(y)) for node_id, (x, y) in zip(ids, pos)}, stats
+
+
+def to_display_positions(positions: Positions) -> Positions:
+    """Center raw coordinates and scale them to the vis.js canvas."""
+    if not positions:
+        return {}
+    ids = list(positions.keys())
+    pos = np.array([positions[node_id] for node_id in ids], dtype=np.float64)
+    pos -= pos.mean(axis=0)
+    radius = float(np.sqrt((pos ** 2).sum(axis=1)).max()) or 1.0
+    pos *= FA2_DISPLAY_RADIUS_PER_NODE * np.sqrt(len(ids)) / radius
+    return {node_id: (round(float(x), 1), round(float(y), 1)) for node_id, (x, y) in zip(ids, pos)}
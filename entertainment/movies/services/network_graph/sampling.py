@@ -6,15 +6,185 @@ that would otherwise be too large to process or visualize efficiently.
 
 import logging
 import random
-from typing import List, Set, Dict, Any, Tuple
+from typing import List, Set, Dict, Any, Optional, Sequence, Tuple
 from collections import defaultdict
 
+import numpy as np
+
 from .types import NodeDict, EdgeDict
 from .constants import MAX_NODES_DEFAULT
 
 logger = logging.getLogger(__name__)
 
 
+# Relative importance of node types (some types are more central)
+NODE_TYPE_WEIGHTS = {
+    'user': 1.0,
+    'movie': 1.2,      # Movies slightly more important
+    'genre': 0.8,
+    'country': 0.7,
+    'director': 0.9,
+    'actor': 0.6,
+    'crew': 0.5,
+}
+DEFAULT_NODE_TYPE_WEIGHT = 0.5
+
+# Boost added to an edge's weight when ranking edges to keep
+EDGE_TYPE_BOOSTS = {
+    'review': 0.3,
+    'similarity': 0.3,
+    'prediction': 0.2,
+    'directed_by': 0.2,
+}
+
+
+# ========================================
+# ARRAY HELPERS
+# ========================================
+
+def _edge_endpoints(edge: EdgeDict) -> Tuple[Any, Any]:
+    return edge.get('source', edge.get('from')), edge.get('target', edge.get('to'))
+
+
+def _intern_edges(
+    edges: Sequence[EdgeDict],
+    index: Dict[Any, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Map edge endpoints to dense node indices (-1 for unknown ids)."""
+    lookup = index.get
+    pairs = np.fromiter(
+        (lookup(endpoint, -1) for edge in edges for endpoint in _edge_endpoints(edge)),
+        dtype=np.int64,
+        count=2 * len(edges),
+    )
+    return pairs[0::2], pairs[1::2]
+
+
+def _degree_vector(src: np.ndarray, dst: np.ndarray, n: int) -> np.ndarray:
+    """Per-node edge count from interned endpoints."""
+    endpoints = np.concatenate([src, dst])
+    return np.bincount(endpoints[endpoints >= 0], minlength=n)
+
+
+def _lookup_vector(keys: Sequence[str], table: Dict[str, float], default: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Factorize ``keys`` and map them through ``table``.
+
+    Returns:
+        Tuple of (per-key codes, per-key looked-up values)
+    """
+    uniques, codes = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    weights = np.array([table.get(key, default) for key in uniques], dtype=np.float64)
+    return codes, weights[codes]
+
+
+def _top_k(scores: np.ndarray, k: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """Indices of the ``k`` highest scores, in descending score order.
+
+    Ties are broken by original position so sampling stays deterministic.
+    """
+    if candidates is None:
+        candidates = np.arange(len(scores))
+    if k <= 0 or len(candidates) == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(candidates):
+        # Keep every candidate tied with the k-th score so the cut is stable
+        candidate_scores = scores[candidates]
+        kth = -np.partition(-candidate_scores, k - 1)[k - 1]
+        candidates = candidates[candidate_scores >= kth]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order[:k]]
+
+
+def _node_importance_vector(nodes: Sequence[NodeDict], degree: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized `calculate_node_importance` over all nodes.
+
+    Returns:
+        Tuple of (importance scores, per-node type codes)
+    """
+    n = len(nodes)
+    type_codes, type_score = _lookup_vector(
+        [node.get('type', 'unknown') for node in nodes],
+        NODE_TYPE_WEIGHTS,
+        DEFAULT_NODE_TYPE_WEIGHT,
+    )
+    degree_score = np.minimum(degree / 10.0, 5.0)
+
+    # Metadata and centrality live in sparse per-node dicts; gather them once
+    review_count = np.zeros(n)
+    movie_count = np.zeros(n)
+    centrality_score = np.zeros(n)
+    for i, node in enumerate(nodes):
+        if 'review_count' in node:
+            review_count[i] = node['review_count'] or 0
+        if 'movie_count' in node:
+            movie_count[i] = node['movie_count'] or 0
+        centrality = node.get('centrality')
+        if centrality:
+            centrality_score[i] = (
+                centrality.get('degree_centrality', 0) * 2.0 +
+                centrality.get('betweenness_centrality', 0) * 3.0 +
+                centrality.get('pagerank', 0) * 2.0
+            )
+
+    metadata_score = np.minimum(review_count / 10.0, 2.0) + np.minimum(movie_count / 5.0, 1.5)
+    return degree_score + type_score + metadata_score + centrality_score, type_codes
+
+
+def _select_nodes(
+    importance: np.ndarray,
+    type_codes: np.ndarray,
+    max_nodes: int,
+    preserve_types: bool
+) -> np.ndarray:
+    """Pick node indices to keep, optionally with stratified per-type quotas."""
+    if not preserve_types:
+        return _top_k(importance, max_nodes)
+
+    # Reserve slots for each type, proportional to its presence (at least one)
+    n = len(importance)
+    type_totals = np.bincount(type_codes)
+    quotas = np.maximum(1, (max_nodes * type_totals / n).astype(np.int64))
+    by_type = np.argsort(type_codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(type_totals)])
+    reserved = np.concatenate([
+        _top_k(importance, int(quotas[t]), by_type[bounds[t]:bounds[t + 1]])
+        for t in range(len(type_totals))
+    ])
+    # Many small types can overshoot the budget; keep the strongest reservations
+    reserved = _top_k(importance, max_nodes, reserved)
+
+    # Fill remaining slots with the highest-importance nodes overall
+    remaining = max_nodes - len(reserved)
+    if remaining > 0:
+        free = np.ones(n, dtype=bool)
+        free[reserved] = False
+        reserved = np.concatenate([reserved, _top_k(importance, remaining, np.flatnonzero(free))])
+    return _top_k(importance, max_nodes, reserved)
+
+
+def _edge_importance_vector(edges: Sequence[EdgeDict]) -> np.ndarray:
+    """Edge weight (default 0.5) plus a per-type boost."""
+    weights = np.fromiter(
+        (edge.get('weight', 0.5) for edge in edges), dtype=np.float64, count=len(edges)
+    )
+    _, boosts = _lookup_vector([edge.get('type', '') for edge in edges], EDGE_TYPE_BOOSTS, 0.0)
+    return weights + boosts
+
+
+def _filter_edges(
+    edges: List[EdgeDict],
+    keep_mask: np.ndarray,
+    max_edges: Optional[int]
+) -> List[EdgeDict]:
+    """Apply an edge mask and, if needed, keep the ``max_edges`` most important."""
+    kept = np.flatnonzero(keep_mask)
+    if max_edges is not None and len(kept) > max_edges:
+        logger.info(f"Further sampling {len(kept)} edges down to {max_edges}")
+        candidates = [edges[i] for i in kept]
+        kept = kept[_top_k(_edge_importance_vector(candidates), max_edges)]
+    return [edges[i] for i in kept]
+
+
 # ========================================
 # IMPORTANCE-BASED SAMPLING
 # ========================================
@@ -24,56 +194,33 @@ def calculate_node_importance(
     edges: List[EdgeDict],
     node_connections: Dict[Any, int]
 ) -> float:
-    """Calculate importance score for a node.
+    """Calculate importance score for a single node.
+
+    Kept for callers scoring one node at a time; the samplers below use the
+    vectorized equivalent. ``edges`` is unused and kept for compatibility.
     
     Args:
         node: Node dictionary
-        edges: List of all edges
+        edges: Unused
         node_connections: Dictionary mapping node IDs to connection counts
     
     Returns:
         Importance score (higher = more important)
     """
-    node_id = node['id']
-    
-    # Factors affecting importance:
-    # 1. Degree (number of connections)
-    degree = node_connections.get(node_id, 0)
-    degree_score = min(degree / 10.0, 5.0)  # Cap at 5.0
-    
-    # 2. Node type importance (some types are more central)
-    type_weights = {
-        'user': 1.0,
-        'movie': 1.2,      # Movies slightly more important
-        'genre': 0.8,
-        'country': 0.7,
-        'director': 0.9,
-        'actor': 0.6,
-        'crew': 0.5,
-    }
-    type_score = type_weights.get(node.get('type', 'unknown'), 0.5)
-    
-    # 3. Metadata indicators
-    metadata_score = 0.0
-    if 'review_count' in node:
-        metadata_score += min(node['review_count'] / 10.0, 2.0)
-    if 'movie_count' in node:
-        metadata_score += min(node['movie_count'] / 5.0, 1.5)
-    
-    # 4. Centrality if available
-    centrality_score = 0.0
-    if 'centrality' in node:
-        centrality = node['centrality']
-        centrality_score = (
-            centrality.get('degree_centrality', 0) * 2.0 +
-            centrality.get('betweenness_centrality', 0) * 3.0 +
-            centrality.get('pagerank', 0) * 2.0
-        )
-    
-    # Combined score
-    importance = degree_score + type_score + metadata_score + centrality_score
-    
-    return importance
+    degree = np.array([node_connections.get(node['id'], 0)], dtype=np.float64)
+    importance, _ = _node_importance_vector([node], degree)
+    return float(importance[0])
+
+
+def _sample_node_indices(
+    nodes: List[NodeDict],
+    src: np.ndarray,
+    dst: np.ndarray,
+    max_nodes: int,
+    preserve_types: bool
+) -> np.ndarray:
+    importance, type_codes = _node_importance_vector(nodes, _degree_vector(src, dst, len(nodes)))
+    return _select_nodes(importance, type_codes, max_nodes, preserve_types)
 
 
 def sample_nodes_by_importance(
@@ -97,64 +244,13 @@ def sample_nodes_by_importance(
         return nodes, {node['id'] for node in nodes}
     
     logger.info(f"Sampling {len(nodes)} nodes down to {max_nodes}")
-    
-    # Calculate node connections
-    node_connections = defaultdict(int)
-    for edge in edges:
-        source = edge.get('source', edge.get('from'))
-        target = edge.get('target', edge.get('to'))
-        if source:
-            node_connections[source] += 1
-        if target:
-            node_connections[target] += 1
-    
-    # Calculate importance for each node
-    node_importance = [
-        (node, calculate_node_importance(node, edges, node_connections))
-        for node in nodes
-    ]
-    
-    # Sort by importance
-    node_importance.sort(key=lambda x: x[1], reverse=True)
-    
-    if preserve_types:
-        # Ensure we keep some nodes of each type
-        sampled = []
-        sampled_ids = set()
-        nodes_by_type = defaultdict(list)
-        
-        for node, importance in node_importance:
-            node_type = node.get('type', 'unknown')
-            nodes_by_type[node_type].append((node, importance))
-        
-        # Reserve slots for each type (proportional to their presence)
-        type_counts = {t: len(nodes_list) for t, nodes_list in nodes_by_type.items()}
-        total_count = sum(type_counts.values())
-        
-        for node_type, nodes_list in nodes_by_type.items():
-            # Allocate proportional number of slots
-            proportion = type_counts[node_type] / total_count
-            type_limit = max(1, int(max_nodes * proportion))
-            
-            # Take top nodes of this type
-            for node, importance in nodes_list[:type_limit]:
-                if len(sampled) < max_nodes:
-                    sampled.append(node)
-                    sampled_ids.add(node['id'])
-        
-        # Fill remaining slots with highest importance nodes
-        if len(sampled) < max_nodes:
-            for node, importance in node_importance:
-                if node['id'] not in sampled_ids:
-                    sampled.append(node)
-                    sampled_ids.add(node['id'])
-                    if len(sampled) >= max_nodes:
-                        break
-    else:
-        # Simple importance-based sampling
-        sampled = [node for node, _ in node_importance[:max_nodes]]
-        sampled_ids = {node['id'] for node in sampled}
-    
+
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    src, dst = _intern_edges(edges, index)
+    kept = _sample_node_indices(nodes, src, dst, max_nodes, preserve_types)
+
+    sampled = [nodes[i] for i in kept]
+    sampled_ids = {node['id'] for node in sampled}
     logger.info(f"Sampled {len(sampled)} nodes ({len(sampled)/len(nodes)*100:.1f}% of original)")
     return sampled, sampled_ids
 
@@ -174,35 +270,9 @@ def sample_edges_for_nodes(
     Returns:
         List of filtered edges
     """
-    # Filter edges to only include those between kept nodes
-    filtered_edges = []
-    for edge in edges:
-        source = edge.get('source', edge.get('from'))
-        target = edge.get('target', edge.get('to'))
-        
-        if source in kept_node_ids and target in kept_node_ids:
-            filtered_edges.append(edge)
-    
-    # If max_edges is set and we have too many edges, prioritize by weight/importance
-    if max_edges is not None and len(filtered_edges) > max_edges:
-        logger.info(f"Further sampling {len(filtered_edges)} edges down to {max_edges}")
-        
-        # Sort by weight (if available) or edge type importance
-        edge_importance = []
-        for edge in filtered_edges:
-            importance = edge.get('weight', 0.5)
-            
-            # Boost certain edge types
-            edge_type = edge.get('type', '')
-            if edge_type in ['review', 'similarity']:
-                importance += 0.3
-            elif edge_type in ['prediction', 'directed_by']:
-                importance += 0.2
-            
-            edge_importance.append((edge, importance))
-        
-        edge_importance.sort(key=lambda x: x[1], reverse=True)
-        filtered_edges = [edge for edge, _ in edge_importance[:max_edges]]
+    index = {node_id: i for i, node_id in enumerate(kept_node_ids)}
+    src, dst = _intern_edges(edges, index)
+    filtered_edges = _filter_edges(edges, (src >= 0) & (dst >= 0), max_edges)
     
     logger.info(f"Kept {len(filtered_edges)} edges")
     return filtered_edges
@@ -216,6 +286,9 @@ def sample_graph(
     preserve_types: bool = True
 ) -> Tuple[List[NodeDict], List[EdgeDict], Dict[str, Any]]:
     """Sample a graph to a manageable size.
+
+    Edge endpoints are interned once and shared by node scoring and edge
+    filtering.
     
     Args:
         nodes: List of all nodes
@@ -229,14 +302,22 @@ def sample_graph(
     """
     original_nodes = len(nodes)
     original_edges = len(edges)
+
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    src, dst = _intern_edges(edges, index)
     
     # Sample nodes
-    sampled_nodes, kept_node_ids = sample_nodes_by_importance(
-        nodes, edges, max_nodes, preserve_types
-    )
+    if original_nodes > max_nodes:
+        logger.info(f"Sampling {original_nodes} nodes down to {max_nodes}")
+        kept = _sample_node_indices(nodes, src, dst, max_nodes, preserve_types)
+    else:
+        kept = np.arange(original_nodes)
+    kept_mask = np.zeros(original_nodes + 1, dtype=bool)  # last slot absorbs -1
+    kept_mask[kept] = True
+    sampled_nodes = [nodes[i] for i in kept]
     
     # Sample edges
-    sampled_edges = sample_edges_for_nodes(edges, kept_node_ids, max_edges)
+    sampled_edges = _filter_edges(edges, kept_mask[src] & kept_mask[dst], max_edges)
     
     # Generate statistics
     stats = {
@@ -297,27 +378,32 @@ def prune_redundant_edges(
     Returns:
         List of unique edges
     """
-    # Group edges by node pair
-    edge_groups = defaultdict(list)
+    if not edges:
+        return []
+
+    # Intern every endpoint id, then key each undirected pair as lo * n + hi
+    index: Dict[Any, int] = {}
     for edge in edges:
-        source = edge.get('source', edge.get('from'))
-        target = edge.get('target', edge.get('to'))
-        
-        # Normalize edge direction (undirected)
-        pair = tuple(sorted([source, target]))
-        edge_groups[pair].append(edge)
-    
-    # Keep one edge per pair
-    pruned = []
-    for pair, group_edges in edge_groups.items():
-        if keep_strongest:
-            # Keep edge with highest weight
-            best_edge = max(group_edges, key=lambda e: e.get('weight', 0))
-        else:
-            # Keep first edge
-            best_edge = group_edges[0]
-        
-        pruned.append(best_edge)
+        for endpoint in _edge_endpoints(edge):
+            index.setdefault(endpoint, len(index))
+    src, dst = _intern_edges(edges, index)
+    pair_keys = np.minimum(src, dst) * len(index) + np.maximum(src, dst)
+    positions = np.arange(len(edges))
+
+    if keep_strongest:
+        # Highest weight first within each pair, earliest edge on ties
+        weights = np.fromiter(
+            (edge.get('weight', 0) for edge in edges), dtype=np.float64, count=len(edges)
+        )
+        order = np.lexsort((positions, -weights, pair_keys))
+    else:
+        order = np.lexsort((positions, pair_keys))
+
+    _, first = np.unique(pair_keys[order], return_index=True)
+    best = order[first]
+    # Emit pairs in the order they first appear in the input
+    _, first_seen = np.unique(pair_keys, return_index=True)
+    pruned = [edges[i] for i in best[np.argsort(first_seen, kind='stable')]]
     
     removed = len(edges) - len(pruned)
     if removed > 0:
@@ -23,9 +23,9 @@ import numpy as np
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Avg, Count
 
 from custom_auth.models import Review
+from custom_auth.services.rating_aggregates import ranked_ids
 from movies.models import Movie
 from movies.services.recommender.cold_start import (
     ColdStartHead,
@@ -497,14 +497,6 @@ class MovieRecommender:
         return self._rerank_mmr(predictions[: max_recommendations * 3], max_recommendations)
 
     def _get_popular_movies(self, limit: int = 10, exclude_movie_ids: Optional[set] = None) -> list:
-        qs = Review.objects.filter(content_type=self.movie_content_type)
-        if exclude_movie_ids:
-            qs = qs.exclude(object_id__in=exclude_movie_ids)
-        popular = (
-            qs.values("object_id")
-            .annotate(avg_rating=Avg("rating"), rating_count=Count("id"))
-            .filter(rating_count__gte=1)
-            .order_by("-avg_rating")[:limit]
-        )
-        ids = [m["object_id"] for m in popular]
-        return list(Movie.objects.filter(id__in=ids))
+        ids = ranked_ids(Movie.objects.all(), exclude_ids=exclude_movie_ids or set(), limit=limit)
+        movies = Movie.objects.in_bulk(ids)
+        return [movies[pk] for pk in ids if pk in movies]
@@ -6,6 +6,8 @@ from django_q.models import Schedule
 from django_q.tasks import async_task, schedule
 
 from api.services.movies import MoviesService
+from custom_auth.services.payload_digests import PayloadDigests
+from custom_auth.services.task_queue import enqueue_once
 
 from movies.models import *
 
@@ -155,7 +157,7 @@ def update_unreleased_movies():
         try:
             # Schedule individual movie updates as separate tasks
             # This allows for better error isolation and parallel processing
-            async_task(update_single_movie, movie.id)
+            enqueue_once(update_single_movie, movie.id)
         except Exception as e:
             logger.error(f"Error scheduling update for movie {movie.title} (ID: {movie.id}): {e}")
     
@@ -182,7 +184,7 @@ def update_random_movies():
             # Schedule individual movie updates as separate tasks
             # This allows for better error isolation and parallel processing
             # Pass update_people=True as positional arg since async_task doesn't handle kwargs well
-            async_task(update_single_movie, movie.id, True)
+            enqueue_once(update_single_movie, movie.id, True)
             updates_count += 1
         except Exception as e:
             logger.error(f"Error scheduling update for movie {movie.title} (ID: {movie.id}): {e}")
@@ -214,211 +216,215 @@ def update_single_movie(movie_id, update_people=False):
         # Update movie fields if they've changed
         updates = {}
         
-        # Check and update basic fields
-        if data.get('status') != movie.status:
-            updates['status'] = data.get('status')
+        # Skip the field comparisons when the details are what we applied last time
+        digests = PayloadDigests([movie])
+        details = {key: value for key, value in data.items() if key != 'credits'}
+        if not digests.unchanged(movie, 'details', details):
+            # Check and update basic fields
+            if data.get('status') != movie.status:
+                updates['status'] = data.get('status')
             
-        if data.get('overview') and data.get('overview') != movie.description:
-            updates['description'] = data.get('overview')
+            if data.get('overview') and data.get('overview') != movie.description:
+                updates['description'] = data.get('overview')
             
-        if data.get('vote_average') and data.get('vote_average') != movie.rating:
-            updates['rating'] = data.get('vote_average')
+            if data.get('vote_average') and data.get('vote_average') != movie.rating:
+                updates['rating'] = data.get('vote_average')
         
-        # Update trailer if available
-        if 'videos' in data and data['videos'].get('results'):
-            trailers = [v for v in data['videos']['results'] 
-                       if v['type'] == 'Trailer' and v['site'] == 'YouTube']
-            if trailers:
-                newest_trailer = sorted(trailers, key=lambda x: x['published_at'], reverse=True)[0]
-                trailer_url = f"https://www.youtube.com/embed/{newest_trailer['key']}"
-                if trailer_url != movie.trailer:
-                    updates['trailer'] = trailer_url
+            # Update trailer if available
+            if 'videos' in data and data['videos'].get('results'):
+                trailers = [v for v in data['videos']['results'] 
+                           if v['type'] == 'Trailer' and v['site'] == 'YouTube']
+                if trailers:
+                    newest_trailer = sorted(trailers, key=lambda x: x['published_at'], reverse=True)[0]
+                    trailer_url = f"https://www.youtube.com/embed/{newest_trailer['key']}"
+                    if trailer_url != movie.trailer:
+                        updates['trailer'] = trailer_url
         
-        if not movie.poster and data.get('poster_path'):
-            movie.poster = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
-            updates['poster'] = movie.poster
+            if not movie.poster and data.get('poster_path'):
+                movie.poster = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
+                updates['poster'] = movie.poster
         
-        if not movie.backdrop and data.get('backdrop_path'):
-            movie.backdrop = f"https://image.tmdb.org/t/p/original{data['backdrop_path']}"
-            updates['backdrop'] = movie.backdrop
+            if not movie.backdrop and data.get('backdrop_path'):
+                movie.backdrop = f"https://image.tmdb.org/t/p/original{data['backdrop_path']}"
+                updates['backdrop'] = movie.backdrop
 
-        if data.get('title') and data.get('title') != movie.title:
-            updates['title'] = data.get('title')
+            if data.get('title') and data.get('title') != movie.title:
+                updates['title'] = data.get('title')
         
-        if data.get('original_title') and data.get('original_title') != movie.original_title:
-            updates['original_title'] = data.get('original_title')
+            if data.get('original_title') and data.get('original_title') != movie.original_title:
+                updates['original_title'] = data.get('original_title')
         
-        # if the release date is not set, set the release date to None
-        if data.get('release_date'):
-            if data['release_date'] == '':
-                updates['release_date'] = None
-            elif data['release_date'] != str(movie.release_date):
-                try:
-                    # Parse and validate the date format (YYYY-MM-DD)
-                    new_date = date.fromisoformat(data['release_date'])
-                    updates['release_date'] = new_date
-                except (ValueError, TypeError):
-                    logger.error(f"Invalid release date format for movie {movie.title}: {data['release_date']}")
+            # if the release date is not set, set the release date to None
+            if data.get('release_date'):
+                if data['release_date'] == '':
                     updates['release_date'] = None
+                elif data['release_date'] != str(movie.release_date):
+                    try:
+                        # Parse and validate the date format (YYYY-MM-DD)
+                        new_date = date.fromisoformat(data['release_date'])
+                        updates['release_date'] = new_date
+                    except (ValueError, TypeError):
+                        logger.error(f"Invalid release date format for movie {movie.title}: {data['release_date']}")
+                        updates['release_date'] = None
 
-        if 'release_dates' in data:
-            from movies.parsers import extract_release_date
-            for field_name, release_type in (
-                ('digital_release_date', 4),
-                ('physical_release_date', 5),
-            ):
-                new_release_date = extract_release_date(data, release_type)
-                if new_release_date != getattr(movie, field_name):
-                    updates[field_name] = new_release_date
+            if 'release_dates' in data:
+                from movies.parsers import extract_release_date
+                for field_name, release_type in (
+                    ('digital_release_date', 4),
+                    ('physical_release_date', 5),
+                ):
+                    new_release_date = extract_release_date(data, release_type)
+                    if new_release_date != getattr(movie, field_name):
+                        updates[field_name] = new_release_date
         
-        if data.get('belongs_to_collection'):
-            print(f"Collection data: {data['belongs_to_collection']}")
-            collection_id = data['belongs_to_collection'].get('id')
-            if collection_id and movie.collection is None:
-                try:
-                    collection = Collection.objects.get(tmdb_id=collection_id)
-                    print(f"Found existing collection: {collection.name}")
-                    updates['collection'] = collection
-                except Collection.DoesNotExist:
-                    # create collection
-                    movies_service = MoviesService()
-                    collection_data = movies_service.get_collection_details(collection_id)
-                    if collection_data:
-                        poster_path = collection_data.get('poster_path')
-                        backdrop_path = collection_data.get('backdrop_path')
+            if data.get('belongs_to_collection'):
+                print(f"Collection data: {data['belongs_to_collection']}")
+                collection_id = data['belongs_to_collection'].get('id')
+                if collection_id and movie.collection is None:
+                    try:
+                        collection = Collection.objects.get(tmdb_id=collection_id)
+                        print(f"Found existing collection: {collection.name}")
+                        updates['collection'] = collection
+                    except Collection.DoesNotExist:
+                        # create collection
+                        movies_service = MoviesService()
+                        collection_data = movies_service.get_collection_details(collection_id)
+                        if collection_data:
+                            poster_path = collection_data.get('poster_path')
+                            backdrop_path = collection_data.get('backdrop_path')
                         
-                        collection = Collection.objects.create(
-                            name=collection_data.get('name'),
-                            description=collection_data.get('overview'),
-                            tmdb_id=collection_data.get('id'),
-                            poster=f"https://image.tmdb.org/t/p/original{poster_path}" if poster_path else None,
-                            backdrop=f"https://image.tmdb.org/t/p/original{backdrop_path}" if backdrop_path else None,
-                        )
-                        updates['collection'] = collection.id
+                            collection = Collection.objects.create(
+                                name=collection_data.get('name'),
+                                description=collection_data.get('overview'),
+                                tmdb_id=collection_data.get('id'),
+                                poster=f"https://image.tmdb.org/t/p/original{poster_path}" if poster_path else None,
+                                backdrop=f"https://image.tmdb.org/t/p/original{backdrop_path}" if backdrop_path else None,
+                            )
+                            updates['collection'] = collection.id
 
-        # Update release date if it changed
-        if data.get('release_date') and data.get('release_date') != str(movie.release_date):
-            try:
-                # Parse and validate the date format (YYYY-MM-DD)
-                new_date = date.fromisoformat(data.get('release_date'))
-                updates['release_date'] = new_date
-            except (ValueError, TypeError):
-                logger.error(f"Invalid release date format for movie {movie.title}: {data.get('release_date')}")
+            # Update release date if it changed
+            if data.get('release_date') and data.get('release_date') != str(movie.release_date):
+                try:
+                    # Parse and validate the date format (YYYY-MM-DD)
+                    new_date = date.fromisoformat(data.get('release_date'))
+                    updates['release_date'] = new_date
+                except (ValueError, TypeError):
+                    logger.error(f"Invalid release date format for movie {movie.title}: {data.get('release_date')}")
 
-        # update keywords
-        if 'keywords' in data and data['keywords'].get('keywords', []):
-            # Get keyword names from current movie for comparison
-            current_keyword_names = set(movie.keywords.values_list('name', flat=True))
-            # Get keyword names from API data
-            new_keyword_names = {k['name'] for k in data['keywords']['keywords']}
+            # update keywords
+            if 'keywords' in data and data['keywords'].get('keywords', []):
+                # Get keyword names from current movie for comparison
+                current_keyword_names = set(movie.keywords.values_list('name', flat=True))
+                # Get keyword names from API data
+                new_keyword_names = {k['name'] for k in data['keywords']['keywords']}
             
-            if current_keyword_names != new_keyword_names:
-                # Get or create keyword instances
-                keyword_instances = []
-                for keyword_data in data['keywords']['keywords']:
-                    keyword_name = keyword_data.get('name')
-                    keyword_id = keyword_data.get('id')
+                if current_keyword_names != new_keyword_names:
+                    # Get or create keyword instances
+                    keyword_instances = []
+                    for keyword_data in data['keywords']['keywords']:
+                        keyword_name = keyword_data.get('name')
+                        keyword_id = keyword_data.get('id')
                     
-                    if not keyword_name:
-                        continue
+                        if not keyword_name:
+                            continue
                         
-                    # Try to find by TMDB ID first
-                    keyword_instance = Keyword.objects.filter(tmdb_id=keyword_id).first()
+                        # Try to find by TMDB ID first
+                        keyword_instance = Keyword.objects.filter(tmdb_id=keyword_id).first()
                     
-                    if not keyword_instance:
-                        # Try to find by name (case insensitive)
-                        keyword_instance = Keyword.objects.filter(name__iexact=keyword_name).first()
-                        if keyword_instance:
-                            # Update TMDB ID if found by name and missing
-                            if not keyword_instance.tmdb_id:
-                                keyword_instance.tmdb_id = keyword_id
-                                keyword_instance.save(update_fields=['tmdb_id'])
-                        else:
-                            # Create new if not found
-                            keyword_instance = Keyword.objects.create(
-                                name=keyword_name,
-                                tmdb_id=keyword_id
-                            )
+                        if not keyword_instance:
+                            # Try to find by name (case insensitive)
+                            keyword_instance = Keyword.objects.filter(name__iexact=keyword_name).first()
+                            if keyword_instance:
+                                # Update TMDB ID if found by name and missing
+                                if not keyword_instance.tmdb_id:
+                                    keyword_instance.tmdb_id = keyword_id
+                                    keyword_instance.save(update_fields=['tmdb_id'])
+                            else:
+                                # Create new if not found
+                                keyword_instance = Keyword.objects.create(
+                                    name=keyword_name,
+                                    tmdb_id=keyword_id
+                                )
                             
-                    keyword_instances.append(keyword_instance)
+                        keyword_instances.append(keyword_instance)
                 
-                # Set new keywords directly on the movie
-                movie.keywords.set(keyword_instances)
-                logger.info(f"Updated keywords for {movie.title}")
+                    # Set new keywords directly on the movie
+                    movie.keywords.set(keyword_instances)
+                    logger.info(f"Updated keywords for {movie.title}")
         
-        # update genres
-        if 'genres' in data and data['genres']:
-            # Get genre names from current movie for comparison
-            current_genre_names = set(movie.genres.values_list('name', flat=True))
-            # Get genre names from API data
-            new_genre_names = {g['name'] for g in data['genres']}
+            # update genres
+            if 'genres' in data and data['genres']:
+                # Get genre names from current movie for comparison
+                current_genre_names = set(movie.genres.values_list('name', flat=True))
+                # Get genre names from API data
+                new_genre_names = {g['name'] for g in data['genres']}
             
-            if current_genre_names != new_genre_names:
-                # Get or create genre instances
-                genre_instances = []
-                for genre in data['genres']:
-                    genre_instance, _ = Genre.objects.get_or_create(
-                        tmdb_id=genre.get('id'),
-                        defaults={'name': genre.get('name')}
-                    )
-                    genre_instances.append(genre_instance)
+                if current_genre_names != new_genre_names:
+                    # Get or create genre instances
+                    genre_instances = []
+                    for genre in data['genres']:
+                        genre_instance, _ = Genre.objects.get_or_create(
+                            tmdb_id=genre.get('id'),
+                            defaults={'name': genre.get('name')}
+                        )
+                        genre_instances.append(genre_instance)
                 
-                # Set new genres directly on the movie
-                movie.genres.set(genre_instances)
-                logger.info(f"Updated genres for {movie.title}")
+                    # Set new genres directly on the movie
+                    movie.genres.set(genre_instances)
+                    logger.info(f"Updated genres for {movie.title}")
         
-        # update production countries
-        if 'production_countries' in data and data['production_countries']:
-            # Get country names from current movie for comparison
-            current_country_codes = set(movie.countries.values_list('iso_3166_1', flat=True))
-            # Get country codes from API data
-            new_country_codes = {c['iso_3166_1'] for c in data['production_countries']}
+            # update production countries
+            if 'production_countries' in data and data['production_countries']:
+                # Get country names from current movie for comparison
+                current_country_codes = set(movie.countries.values_list('iso_3166_1', flat=True))
+                # Get country codes from API data
+                new_country_codes = {c['iso_3166_1'] for c in data['production_countries']}
             
-            if current_country_codes != new_country_codes:
-                # Get or create country instances
-                country_instances = []
-                for country in data['production_countries']:
-                    country_instance, _ = Country.objects.get_or_create(
-                        iso_3166_1=country.get('iso_3166_1'),
-                        defaults={'name': country.get('name')}
-                    )
-                    country_instances.append(country_instance)
+                if current_country_codes != new_country_codes:
+                    # Get or create country instances
+                    country_instances = []
+                    for country in data['production_countries']:
+                        country_instance, _ = Country.objects.get_or_create(
+                            iso_3166_1=country.get('iso_3166_1'),
+                            defaults={'name': country.get('name')}
+                        )
+                        country_instances.append(country_instance)
                 
-                # Set new countries directly on the movie
-                movie.countries.set(country_instances)
-                logger.info(f"Updated countries for {movie.title}")
+                    # Set new countries directly on the movie
+                    movie.countries.set(country_instances)
+                    logger.info(f"Updated countries for {movie.title}")
             
-        if 'production_companies' in data and data['production_companies']:
-            # Get company names from current movie for comparison
-            current_company_names = set(movie.production_companies.values_list('name', flat=True))
-            # Get company names from API data
-            new_company_names = {c['name'] for c in data['production_companies']}
+            if 'production_companies' in data and data['production_companies']:
+                # Get company names from current movie for comparison
+                current_company_names = set(movie.production_companies.values_list('name', flat=True))
+                # Get company names from API data
+                new_company_names = {c['name'] for c in data['production_companies']}
             
-            if current_company_names != new_company_names:
-                # Get or create company instances
-                company_instances = []
-                for company in data['production_companies']:
-                    origin_country = None
-                    if company.get('origin_country') and company.get('origin_country') != "":
-                        try:
-                            origin_country = Country.objects.get(iso_3166_1=company.get('origin_country'))
-                        except Country.DoesNotExist:
-                            logger.warning(f"Country with code {company.get('origin_country')} not found")
+                if current_company_names != new_company_names:
+                    # Get or create company instances
+                    company_instances = []
+                    for company in data['production_companies']:
+                        origin_country = None
+                        if company.get('origin_country') and company.get('origin_country') != "":
+                            try:
+                                origin_country = Country.objects.get(iso_3166_1=company.get('origin_country'))
+                            except Country.DoesNotExist:
+                                logger.warning(f"Country with code {company.get('origin_country')} not found")
                             
-                    logo_path = company.get('logo_path')
-                    company_instance, _ = ProductionCompany.objects.get_or_create(
-                        tmdb_id=company.get('id'),
-                        defaults={
-                            'name': company.get('name'),
-                            'country': origin_country,
-                            'logo_path': f"https://image.tmdb.org/t/p/original{logo_path}" if logo_path else None
-                        }
-                    )
-                    company_instances.append(company_instance)
+                        logo_path = company.get('logo_path')
+                        company_instance, _ = ProductionCompany.objects.get_or_create(
+                            tmdb_id=company.get('id'),
+                            defaults={
+                                'name': company.get('name'),
+                                'country': origin_country,
+                                'logo_path': f"https://image.tmdb.org/t/p/original{logo_path}" if logo_path else None
+                            }
+                        )
+                        company_instances.append(company_instance)
                 
-                # Set new companies directly on the movie
-                movie.production_companies.set(company_instances)
-                logger.info(f"Updated production companies for {movie.title}")
+                    # Set new companies directly on the movie
+                    movie.production_companies.set(company_instances)
+                    logger.info(f"Updated production companies for {movie.title}")
         
         # Apply updates if there are any
         if updates:
@@ -430,9 +436,9 @@ def update_single_movie(movie_id, update_people=False):
             # Only update collection if we're working with one
             if 'collection' in updates and updates['collection'] is not None:
                 if isinstance(updates['collection'], Collection):
-                    async_task(update_single_collection, updates['collection'].id)
+                    enqueue_once(update_single_collection, updates['collection'].id)
                 elif isinstance(updates['collection'], int):
-                    async_task(update_single_collection, updates['collection'])
+                    enqueue_once(update_single_collection, updates['collection'])
         else:
             # Even when no content changes, update the date_updated field
             # This ensures rotation in the update_random_movies function
@@ -445,7 +451,7 @@ def update_single_movie(movie_id, update_people=False):
         
         logger.info(f"update_people={update_people}, 'credits' in data={'credits' in data}")
         
-        if update_people and 'credits' in data:
+        if update_people and 'credits' in data and not digests.unchanged(movie, 'credits', data['credits']):
             from custom_auth.models import MediaPerson, Person
             from django.contrib.contenttypes.models import ContentType
             
@@ -479,7 +485,7 @@ def update_single_movie(movie_id, update_people=False):
             for tmdb_id in persons_to_update:
                 try:
                     person = Person.objects.get(tmdb_id=tmdb_id)
-                    async_task(update_single_person, person.id)
+                    enqueue_once(update_single_person, person.id)
                     people_updated += 1
                 except Person.DoesNotExist:
                     pass
@@ -668,7 +674,8 @@ def update_single_movie(movie_id, update_people=False):
                         logger.info(f"Added {person.name} as {job} in {movie.title}")
             
             logger.info(f"For {movie.title}: {people_updated} people scheduled for update, {media_persons_updated} entries updated, {media_persons_added} entries added")
-        
+
+        digests.save()
         if updates:
             return f"Updated movie {movie.title} with {len(updates)} changes. {people_updated} people scheduled, {media_persons_updated} updated, {media_persons_added} added."
         else:
@@ -702,6 +709,11 @@ def update_single_person(person_id):
         if not data:
             logger.error(f"TMDB API error for person {person.name} (ID: {person_id}): Failed to retrieve data")
             return f"Failed to update person {person_id}"
+
+        digests = PayloadDigests([person])
+        if digests.unchanged(person, 'details', data):
+            digests.save()
+            return f"No updates needed for person {person.name} (payload unchanged)"
         
         updates = {}
         
@@ -742,8 +754,10 @@ def update_single_person(person_id):
             for field, value in updates.items():
                 setattr(person, field, value)
             person.save()
+            digests.save()
             return f"Updated person {person.name} with {len(updates)} changes"
         else:
+            digests.save()
             return f"No updates needed for person {person.name}"
     
     except Person.DoesNotExist:
@@ -767,7 +781,7 @@ def update_movie_collections():
     for collection in collections:
         try:
             # Schedule individual collection updates as separate tasks
-            async_task(update_single_collection, collection.id)
+            enqueue_once(update_single_collection, collection.id)
             updates_count += 1
         except Exception as e:
             logger.error(f"Error scheduling update for collection {collection.name} (ID: {collection.id}): {e}")
@@ -796,7 +810,7 @@ def update_single_collection(collection_id):
             if movie_data['id'] not in existing_movie_tmdb_ids:
                 try:
                     # Add this movie to our database
-                    async_task(add_movie_from_collection, movie_data['id'], collection.id)
+                    enqueue_once(add_movie_from_collection, movie_data['id'], collection.id)
                     added_count += 1
                 except Exception as e:
                     logger.error(f"Error adding movie {movie_data.get('title', 'Unknown')} (TMDB ID: {movie_data['id']}) to collection: {e}")
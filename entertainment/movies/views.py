@@ -1416,8 +1416,13 @@ def network_graph_page(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def network_graph_data(request):
-    """Parse query params and delegate heavy graph building to service layer."""
-    from .services.network_graph import build_network_graph
+    """Parse query params and delegate heavy graph building to service layer.
+
+    With ``?stream=1`` the graph is returned as NDJSON chunks (meta, nodes,
+    edges, trailing analytics) so the client can render before analytics
+    are computed and the server never holds the full JSON body in memory.
+    """
+    from .services.network_graph import build_network_graph, iter_network_graph_chunks
 
     def _get_flag(param, default=True):
         val = request.GET.get(param)
@@ -1453,9 +1458,7 @@ def network_graph_data(request):
     show_actors = chaos_mode and _get_flag('actors', True)
     show_crew = chaos_mode and _get_flag('crew', True)
 
-    # Build network graph using MultiGravity Force Atlas (only layout supported)
-    data = build_network_graph(
-        request.user if request.user.is_authenticated else None,
+    graph_kwargs = dict(
         min_reviews=min_reviews,
         rating_threshold=rating_threshold,
         max_nodes=max_nodes,
@@ -1470,6 +1473,24 @@ def network_graph_data(request):
         show_actors=show_actors,
         show_crew=show_crew
     )
+    current_user = request.user if request.user.is_authenticated else None
+
+    if _get_flag('stream', False):
+        from django.http import StreamingHttpResponse
+        from rest_framework.utils.encoders import JSONEncoder
+
+        encoder = JSONEncoder(separators=(',', ':'))
+        chunks = iter_network_graph_chunks(current_user, **graph_kwargs)
+        response = StreamingHttpResponse(
+            (encoder.encode(chunk) + '\n' for chunk in chunks),
+            content_type='application/x-ndjson',
+        )
+        # Let nginx/traefik pass chunks through instead of buffering the body
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    # Build network graph using MultiGravity Force Atlas (only layout supported)
+    data = build_network_graph(current_user, **graph_kwargs)
     
     # Convert edges from source/target to from/to for vis.js
     if 'edges' in data:
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0027_person_search_vector'),
+        ('music', '0002_alter_album_original_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='album',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', 'original_title', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='album',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='album_search_vector_idx'),
+        ),
+    ]
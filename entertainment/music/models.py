@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 
 from custom_auth.models import *
 from tvshows.models import TVShow
@@ -32,6 +33,12 @@ class Album(Media):
     
     # Genre relations - reusing the same Genre model as movies
     genres = models.ManyToManyField(Genre, blank=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='album_search_vector_idx'),
+            models.Index(models.F('review_rating_avg').desc(nulls_last=True), name='album_review_rating_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.primary_artist.name}"
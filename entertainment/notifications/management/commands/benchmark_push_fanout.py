@@ -0,0 +1,115 @@
+"""
+Management command to time the Web Push fan-out against a local fake push service.
+Usage: python manage.py benchmark_push_fanout --pushes 1000 --workers 1,8,16 --latency 100
+
+Starts an HTTP server on 127.0.0.1 that answers every push with 201 after
+``--latency`` milliseconds (every ``--expired-every``-th subscription gets 410
+instead), creates a throwaway user with real subscription keys, and runs
+`notifications.fanout.deliver` once per worker count. Everything it writes
+is rolled back.
+"""
+import base64
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from py_vapid import Vapid
+
+from notifications.fanout import Push, deliver
+from notifications.models import NotificationLog, PushSubscription
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _client_keys():
+    """``(p256dh, auth)`` of a browser-side subscription."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    public = key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+    )
+    return _b64(public), _b64(os.urandom(16))
+
+
+def _fake_push_service(latency, expired_every):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            time.sleep(latency)
+            index = int(self.path.rsplit('/', 1)[-1])
+            self.send_response(410 if expired_every and index % expired_every == 0 else 201)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent Web Push delivery against a local fake push service'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pushes', type=int, default=500, help='Subscriptions to push to')
+        parser.add_argument('--workers', type=str, default='1,8', help='Comma-separated worker counts to compare')
+        parser.add_argument('--latency', type=int, default=50, help='Fake push service latency (ms)')
+        parser.add_argument('--expired-every', type=int, default=0, help='Answer 410 for every Nth subscription')
+
+    def handle(self, *args, **options):
+        server = _fake_push_service(options['latency'] / 1000, options['expired_every'])
+        host, port = server.server_address
+        vapid = Vapid()
+        vapid.generate_keys()
+        keys = [_client_keys() for _ in range(options['pushes'])]
+
+        try:
+            for workers in [int(value) for value in options['workers'].split(',')]:
+                try:
+                    with transaction.atomic():
+                        user = User.objects.create(username='push-benchmark', email='push-benchmark@example.com')
+                        subscriptions = PushSubscription.objects.bulk_create([
+                            PushSubscription(
+                                user=user,
+                                endpoint=f'http://{host}:{port}/push/{index}',
+                                p256dh=p256dh,
+                                auth=auth,
+                            )
+                            for index, (p256dh, auth) in enumerate(keys, start=1)
+                        ])
+                        pushes = [
+                            Push(subscription, 'Benchmark', 'Push fan-out benchmark', {'notification_type': 'system'})
+                            for subscription in subscriptions
+                        ]
+
+                        started = time.monotonic()
+                        result = deliver(pushes, workers=workers, vapid_private_key=vapid)
+                        elapsed = time.monotonic() - started
+
+                        logged = NotificationLog.objects.filter(user=user).count()
+                        self.stdout.write(
+                            f"workers={workers:<3} {len(pushes)} pushes in {elapsed:.2f}s "
+                            f"({len(pushes) / elapsed:.0f}/s): {result['success']} sent, "
+                            f"{result['failed']} failed, {result['deactivated']} deactivated, {logged} logged"
+                        )
+                        raise _Rollback
+                except _Rollback:
+                    pass
+        finally:
+            server.shutdown()
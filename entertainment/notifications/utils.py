@@ -1,16 +1,16 @@
 """
 Utility functions for sending push notifications.
-Uses Django Q2 for background processing.
+Uses Django Q2 for background processing; pushes go out through
+`notifications.fanout`.
 """
-from pywebpush import webpush, WebPushException
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Prefetch
 from django.utils import timezone
-import json
 import logging
 import uuid
 
+from .fanout import Push, deliver
 from .models import PushSubscription, NotificationLog, NotificationPreference, QueuedNotification
 
 User = get_user_model()
@@ -36,85 +36,7 @@ def send_push_notification(subscription_id, title, body, **kwargs):
         logger.warning(f"Subscription {subscription_id} not found or inactive")
         return False
     
-    # Build notification payload
-    notification_data = {
-        'title': title,
-        'body': body,
-        'icon': kwargs.get('icon', '/static/favicon/web-app-manifest-192x192.png'),
-        'badge': kwargs.get('badge', '/static/favicon/favicon-96x96.png'),
-        'vibrate': kwargs.get('vibrate', [200, 100, 200]),
-        'tag': kwargs.get('tag', str(uuid.uuid4())),
-        'url': kwargs.get('url', '/'),
-        'requireInteraction': kwargs.get('require_interaction', False),
-    }
-    
-    # Add action buttons if provided
-    if 'actions' in kwargs:
-        notification_data['actions'] = kwargs['actions']
-    
-    # Prepare subscription info for pywebpush
-    subscription_info = {
-        'endpoint': subscription.endpoint,
-        'keys': {
-            'p256dh': subscription.p256dh,
-            'auth': subscription.auth
-        }
-    }
-    
-    # VAPID claims
-    vapid_claims = {
-        'sub': f'mailto:{settings.WEBPUSH_VAPID_ADMIN_EMAIL}'
-    }
-    
-    success = False
-    error_message = None
-    
-    try:
-        # Send the push notification
-        # TTL=86400 (24h): FCM stores the message and delivers when device wakes up.
-        # Without this (default ttl=0), FCM discards messages if the device isn't
-        # immediately reachable (screen off, Doze mode, brief network gap).
-        webpush(
-            subscription_info=subscription_info,
-            data=json.dumps(notification_data),
-            vapid_private_key=settings.WEBPUSH_VAPID_PRIVATE_KEY,
-            vapid_claims=vapid_claims,
-            ttl=86400,
-            headers={'urgency': 'high'},
-        )
-        success = True
-        logger.info(f"Push notification sent to subscription {subscription_id}")
-        
-    except WebPushException as e:
-        error_message = str(e)
-        logger.error(f"WebPushException for subscription {subscription_id}: {e}")
-        
-        # Deactivate subscriptions with invalid/expired endpoints
-        if e.response and e.response.status_code in (401, 404, 410):
-            subscription.is_active = False
-            subscription.save()
-            logger.info(f"Deactivated invalid subscription {subscription_id} (HTTP {e.response.status_code})")
-    
-    except Exception as e:
-        error_message = str(e)
-        logger.error(f"Error sending push notification to subscription {subscription_id}: {e}")
-    
-    # Log the notification
-    NotificationLog.objects.create(
-        user=subscription.user,
-        subscription=subscription,
-        notification_type=kwargs.get('notification_type', 'system'),
-        title=title,
-        body=body,
-        icon=notification_data['icon'],
-        url=notification_data['url'],
-        content_type=kwargs.get('content_type'),
-        object_id=kwargs.get('object_id'),
-        was_successful=success,
-        error_message=error_message
-    )
-    
-    return success
+    return deliver([Push(subscription, title, body, kwargs)])['success'] == 1
 
 
 def send_notification_to_user(user_id, title, body, **kwargs):
@@ -154,16 +76,11 @@ def send_notification_to_user(user_id, title, body, **kwargs):
         logger.info(f"Queued notification for user {user_id} (quiet hours)")
         return {'success': 0, 'failed': 0, 'queued': True}
     
-    # Get all active subscriptions
+    # Send to all active subscriptions at once
     subscriptions = PushSubscription.objects.filter(user=user, is_active=True)
     
-    results = {'success': 0, 'failed': 0}
-    
-    for subscription in subscriptions:
-        if send_push_notification(subscription.id, title, body, **kwargs):
-            results['success'] += 1
-        else:
-            results['failed'] += 1
+    sent = deliver([Push(subscription, title, body, kwargs) for subscription in subscriptions])
+    results = {'success': sent['success'], 'failed': sent['failed']}
     
     logger.info(f"Sent notifications to user {user_id}: {results}")
     return results
@@ -236,7 +153,13 @@ def queue_notification(user, title, body, notification_type, **kwargs):
         notification_type: Type of notification
         **kwargs: Additional notification data
     """
-    QueuedNotification.objects.create(
+    _queued_notification(user, title, body, notification_type, **kwargs).save()
+    logger.info(f"Queued notification for {user.username}: {title}")
+
+
+def _queued_notification(user, title, body, notification_type, **kwargs):
+    """Unsaved `QueuedNotification` for `queue_notification` and bulk sends."""
+    return QueuedNotification(
         user=user,
         notification_type=notification_type,
         title=title,
@@ -252,7 +175,6 @@ def queue_notification(user, title, body, notification_type, **kwargs):
             'actions': kwargs.get('actions'),
         }
     )
-    logger.info(f"Queued notification for {user.username}: {title}")
 
 
 def should_send_notification(user, notification_type):
@@ -287,23 +209,89 @@ def send_notification_to_all_users(title, body, **kwargs):
     notification_type = kwargs.get('notification_type', 'system')
     
     # Get all users who have system notifications enabled
-    users = User.objects.filter(
+    user_ids = list(User.objects.filter(
         notification_preferences__system_notifications=True,
         push_subscriptions__is_active=True
-    ).distinct()
+    ).distinct().values_list('id', flat=True))
     
-    results = {'success': 0, 'failed': 0, 'queued': 0, 'total_users': users.count()}
+    logger.info(f"Broadcasting notification to {len(user_ids)} users: {title}")
     
-    logger.info(f"Broadcasting notification to {users.count()} users: {title}")
+    options = {key: value for key, value in kwargs.items() if key != 'notification_type'}
+    sent = send_notifications_to_users(
+        {user_id: {'title': title, 'body': body, **options} for user_id in user_ids},
+        notification_type=notification_type,
+    )
+    results = {
+        'success': sent['success'],
+        'failed': sent['failed'],
+        'queued': sent['queued'],
+        'total_users': len(user_ids),
+    }
+    
+    logger.info(f"Broadcast complete: {results}")
+    return results
+
+
+def send_notifications_to_users(notifications, notification_type='system'):
+    """
+    Send one notification per user, loading users, preferences and
+    subscriptions in bulk instead of once per user and delivering every
+    push in one concurrent fan-out (`notifications.fanout.deliver`).
+    Queues notifications for users in quiet hours, like `send_notification_to_user`.
+    
+    Args:
+        notifications: ``{user_id: {'title': ..., 'body': ..., **kwargs}}``
+        notification_type: Type of notification, shared by all of them
+    
+    Returns:
+        dict: Counts of successful/failed sends, queued and skipped users,
+        and the ids of the users reached (sent or queued)
+    """
+    users = User.objects.filter(id__in=list(notifications)).select_related(
+        'notification_preferences'
+    ).prefetch_related(
+        Prefetch(
+            'push_subscriptions',
+            queryset=PushSubscription.objects.filter(is_active=True),
+            to_attr='active_subscriptions',
+        )
+    )
+    
+    results = {'success': 0, 'failed': 0, 'queued': 0, 'skipped': 0, 'user_ids': set()}
+    queued = []
+    pushes = []
     
     for user in users:
-        user_result = send_notification_to_user(user.id, title, body, **kwargs)
-        results['success'] += user_result.get('success', 0)
-        results['failed'] += user_result.get('failed', 0)
-        if user_result.get('queued'):
-            results['queued'] += 1
+        kwargs = dict(notifications[user.id])
+        title = kwargs.pop('title')
+        body = kwargs.pop('body')
+        
+        if not is_notification_type_enabled(user, notification_type):
+            results['skipped'] += 1
+            continue
+        
+        if is_in_quiet_hours(user):
+            queued.append(_queued_notification(user, title, body, notification_type, **kwargs))
+            results['user_ids'].add(user.id)
+            continue
+        
+        kwargs['notification_type'] = notification_type
+        pushes.extend(Push(subscription, title, body, kwargs) for subscription in user.active_subscriptions)
     
-    logger.info(f"Broadcast complete: {results}")
+    QueuedNotification.objects.bulk_create(queued)
+    results['queued'] = len(queued)
+    
+    sent = deliver(pushes)
+    results['success'] = sent['success']
+    results['failed'] = sent['failed']
+    results['user_ids'].update(
+        push.subscription.user_id for push, ok in zip(pushes, sent['delivered']) if ok
+    )
+    
+    logger.info(
+        f"Sent {notification_type} notifications to {len(notifications)} users: "
+        f"{ {key: value for key, value in results.items() if key != 'user_ids'} }"
+    )
     return results
 
 
@@ -39,7 +39,10 @@ function qs(params) {
 }
 
 export const api = {
-    tree: () => jsonGet("/explorer/api/tree/"),
+    tree: (params) => jsonGet(`/explorer/api/tree/${qs(params)}`),
+
+    treeFolder: (mediaType, key) =>
+        jsonGet(`/explorer/api/tree/${mediaType}/${key}/`),
 
     list: (mediaType, params) =>
         jsonGet(`/explorer/api/${mediaType}/${qs(params)}`),
@@ -2,7 +2,7 @@
 
 import { api } from "./api.js";
 import { initState, getState, setState, subscribe, toApiParams } from "./state.js";
-import { renderTree } from "./tree.js";
+import { loadFolder, renderTree } from "./tree.js";
 import { renderFilters, SORT_FIELDS } from "./filters.js";
 import { renderResults } from "./grid.js";
 
@@ -112,7 +112,20 @@ function updateStatus(response, elapsedMs) {
 
 // ---- data flow --------------------------------------------------------------
 async function loadTree() {
-    treePayload = await api.tree();
+    treePayload = await api.tree({ expand: getState().mediaType });
+    renderTree(treePayload, treeEl);
+    renderFilters(filtersEl, treePayload);
+    updateBreadcrumbs();
+}
+
+// The filter pane and breadcrumbs read the active type's group folders;
+// fetch any that are still lazy, then redraw.
+async function ensureBranchFolders(mediaType) {
+    const branch = findBranch(mediaType);
+    const lazy = (branch?.children || []).filter((c) => c.lazy);
+    if (lazy.length === 0) return;
+    await Promise.all(lazy.map((group) => loadFolder(branch, group)));
+    if (getState().mediaType !== mediaType) return;
     renderTree(treePayload, treeEl);
     renderFilters(filtersEl, treePayload);
     updateBreadcrumbs();
@@ -144,6 +157,7 @@ function applyStateChange() {
     renderFilters(filtersEl, treePayload);
     updateBreadcrumbs();
     loadResults();
+    ensureBranchFolders(getState().mediaType).catch(console.error);
 }
 
 // ---- toolbar wiring ---------------------------------------------------------
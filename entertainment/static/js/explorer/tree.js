@@ -1,5 +1,8 @@
 // Tree pane renderer. Expects the payload from /explorer/api/tree/.
+// Group folders marked `lazy` are fetched from /explorer/api/tree/<type>/<key>/
+// the first time they are expanded.
 
+import { api } from "./api.js";
 import { getState, setState } from "./state.js";
 
 const ICONS_BASE = document.getElementById("explorer-app").dataset.iconsBase;
@@ -54,6 +57,33 @@ function makeNode({ label, icon, count, active, hasChildren, onClick, onToggle,
     return node;
 }
 
+// Fill a lazy group's `children` in place. Concurrent callers share one request.
+export function loadFolder(branch, group) {
+    if (!group.lazy) return Promise.resolve(group);
+    if (!group.pending) {
+        group.pending = api.treeFolder(branch.media_type, group.key)
+            .then((response) => {
+                group.children = response.children;
+                delete group.lazy;
+                return group;
+            })
+            .finally(() => {
+                delete group.pending;
+            });
+    }
+    return group.pending;
+}
+
+function toggleGroup(branch, group, groupKey) {
+    if (expandedSet.has(groupKey)) {
+        expandedSet.delete(groupKey);
+    } else {
+        expandedSet.add(groupKey);
+        if (group.lazy) loadFolder(branch, group).then(rerender, console.error);
+    }
+    rerender();
+}
+
 function renderChildrenList(children, buildRow) {
     const container = document.createElement("div");
     container.className = "tree-children";
@@ -92,7 +122,7 @@ function renderMediaTypeBranch(root, container, state, expandedSet) {
     childrenEl.style.display = "block";
 
     for (const child of root.children || []) {
-        if (Array.isArray(child.children) && child.children.length > 0) {
+        if (child.lazy || (Array.isArray(child.children) && child.children.length > 0)) {
             const groupKey = `${root.media_type}:${child.key}`;
             const groupExpanded = expandedSet.has(groupKey);
             const groupActive = isActiveType && state.folderKey === child.key && !state.folderValue;
@@ -102,23 +132,18 @@ function renderMediaTypeBranch(root, container, state, expandedSet) {
                 active: groupActive,
                 hasChildren: true,
                 expanded: groupExpanded,
-                onToggle: () => {
-                    if (groupExpanded) expandedSet.delete(groupKey);
-                    else expandedSet.add(groupKey);
-                    rerender();
-                },
-                onClick: () => {
-                    if (groupExpanded) expandedSet.delete(groupKey);
-                    else expandedSet.add(groupKey);
-                    rerender();
-                },
+                onToggle: () => toggleGroup(root, child, groupKey),
+                onClick: () => toggleGroup(root, child, groupKey),
             });
             childrenEl.appendChild(groupNode);
             if (groupExpanded) {
                 const subEl = document.createElement("div");
                 subEl.className = "tree-children";
                 subEl.style.display = "block";
-                for (const leaf of child.children) {
+                if (child.lazy) {
+                    subEl.appendChild(makeNode({ label: "Loading…", icon: "hourglass", hasChildren: false }));
+                }
+                for (const leaf of child.children || []) {
                     const isLeafActive =
                         isActiveType &&
                         state.folderKey === child.key &&
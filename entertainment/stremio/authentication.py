@@ -1,10 +1,23 @@
 import base64
 import json
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 from django.http import JsonResponse
 from custom_auth.models import CustomUser
 
 
+# In-process API key -> user lookups. Stremio polls many URLs per screen, all
+# carrying the same key; a short TTL bounds how long a regenerated key keeps
+# working in a given worker.
+API_KEY_CACHE_SIZE = 512
+API_KEY_CACHE_TTL = 60  # seconds
+
+_api_key_users: OrderedDict = OrderedDict()
+_api_key_lock = threading.Lock()
+
+
 def decode_config(encoded_config: str) -> dict:
     """Decode base64 encoded config from Stremio URL."""
     try:
@@ -26,11 +39,29 @@ def get_user_from_config(encoded_config: str) -> CustomUser | None:
     if not api_key:
         return None
     
-    try:
-        return CustomUser.objects.get(api_key=api_key)
-    except CustomUser.DoesNotExist:
+    return get_user_by_api_key(api_key)
+
+
+def get_user_by_api_key(api_key: str) -> CustomUser | None:
+    """Resolve an API key through a small TTL'd LRU (unknown keys are not cached)."""
+    now = time.monotonic()
+    with _api_key_lock:
+        hit = _api_key_users.get(api_key)
+        if hit is not None and hit[0] > now:
+            _api_key_users.move_to_end(api_key)
+            return hit[1]
+
+    user = CustomUser.objects.filter(api_key=api_key).first()
+    if user is None:
         return None
 
+    with _api_key_lock:
+        _api_key_users[api_key] = (now + API_KEY_CACHE_TTL, user)
+        _api_key_users.move_to_end(api_key)
+        while len(_api_key_users) > API_KEY_CACHE_SIZE:
+            _api_key_users.popitem(last=False)
+    return user
+
 
 def require_stremio_auth(view_func):
     """Decorator to require valid API key in Stremio config."""
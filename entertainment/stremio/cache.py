@@ -0,0 +1,70 @@
+"""Response cache for the Stremio addon endpoints.
+
+Stremio clients poll catalog and meta URLs constantly, and every response
+is built from several watchlist / review / episode queries. The serialised
+JSON body is cached in Redis per user and request (catalog id, skip,
+genre, …) together with an ETag derived from the body, so a repeat poll
+is one cache read and a client revalidating with ``If-None-Match`` gets an
+empty 304.
+
+Entries are namespaced by a per-user generation number. The user's
+Watchlist / Review / WatchedEpisode signals bump it (see `stremio/models.py`),
+which orphans all of that user's entries at once without touching anyone
+else's; the orphans expire with `RESPONSE_TTL`. Catalogs that also depend
+on other users' activity (Movie of the Week, Top Rated) are only as fresh
+as that TTL.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import urllib.parse
+from typing import Callable, Iterable, Tuple
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+RESPONSE_TTL = 60 * 15  # seconds a body stays in Redis
+CLIENT_MAX_AGE = 60 * 5  # Cache-Control max-age sent to Stremio
+
+
+def _generation_key(user_id: int) -> str:
+    return f"stremio:gen:{user_id}"
+
+
+def _generation(user_id: int) -> int:
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter can never come back at a
+        # value whose entries are still cached.
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _response_key(user_id: int, parts: Iterable) -> str:
+    path = ":".join(urllib.parse.quote(str(part), safe="") for part in parts)
+    return f"stremio:resp:{user_id}:{_generation(user_id)}:{path}"
+
+
+def get_or_build(user_id: int, parts: Iterable, build: Callable[[], dict]) -> Tuple[str, bytes]:
+    """Return ``(etag, json body)`` for a request, building it on a miss."""
+    key = _response_key(user_id, parts)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    body = json.dumps(build(), cls=DjangoJSONEncoder).encode()
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    cache.set(key, (etag, body), RESPONSE_TTL)
+    return etag, body
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop every cached response for one user."""
+    key = _generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
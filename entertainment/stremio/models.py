@@ -0,0 +1,17 @@
+"""Signal receivers that keep the Stremio response cache per-user fresh.
+
+The addon has no models of its own; see `stremio/cache.py`.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender="custom_auth.Watchlist")
+@receiver(post_delete, sender="custom_auth.Watchlist")
+@receiver(post_save, sender="custom_auth.Review")
+@receiver(post_delete, sender="custom_auth.Review")
+@receiver(post_save, sender="tvshows.WatchedEpisode")
+@receiver(post_delete, sender="tvshows.WatchedEpisode")
+def invalidate_stremio_responses(sender, instance, **kwargs):
+    from .cache import invalidate_user
+    invalidate_user(instance.user_id)
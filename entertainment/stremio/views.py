@@ -2,18 +2,22 @@ import base64
 import json
 import urllib.parse
 
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Avg, Q, Count
+from django.db.models import Q
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 
+from . import cache as response_cache
 from .authentication import require_stremio_auth
 from .formatters import to_stremio_meta, to_stremio_catalog_item
 
 from movies.models import Movie, MovieOfWeekPick
 from tvshows.models import TVShow, Season
 from custom_auth.models import Watchlist, Review, Genre
+from custom_auth.services.rating_aggregates import ranked_ids
 from movies.services.recommendation import MovieRecommender
 
 
@@ -22,21 +26,37 @@ PAGE_SIZE = 100
 RECOMMENDATIONS_SIZE = 20
 
 
-def cors_response(data: dict, status: int = 200) -> JsonResponse:
-    """Create a JsonResponse with CORS headers for Stremio."""
-    response = JsonResponse(data, status=status)
+def add_cors_headers(response: HttpResponse) -> HttpResponse:
+    """Add the CORS headers Stremio needs to any response."""
     response['Access-Control-Allow-Origin'] = '*'
     response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
     response['Access-Control-Allow-Headers'] = 'Content-Type'
     return response
 
 
+def cors_response(data: dict, status: int = 200) -> JsonResponse:
+    """Create a JsonResponse with CORS headers for Stremio."""
+    return add_cors_headers(JsonResponse(data, status=status))
+
+
+def cached_cors_response(request, user, parts: tuple, build) -> HttpResponse:
+    """
+    Serve a per-user response from the Stremio response cache.
+    `build` is only called on a cache miss; a matching If-None-Match gets a 304.
+    """
+    etag, body = response_cache.get_or_build(user.pk, parts, build)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, max_age=response_cache.CLIENT_MAX_AGE)
+    return add_cors_headers(response)
+
+
 def cors_preflight_response() -> HttpResponse:
     """Handle CORS preflight OPTIONS request."""
-    response = HttpResponse()
-    response['Access-Control-Allow-Origin'] = '*'
-    response['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
-    response['Access-Control-Allow-Headers'] = 'Content-Type'
+    response = add_cors_headers(HttpResponse())
     response['Access-Control-Max-Age'] = '86400'
     return response
 
@@ -201,8 +221,11 @@ def catalog(request, config: str, media_type: str, catalog_id: str, extra: str =
     if not handler:
         return cors_response({'metas': []})
     
-    metas = handler()
-    return cors_response({'metas': metas})
+    return cached_cors_response(
+        request, user,
+        ('catalog', media_type, catalog_id, skip, genre or ''),
+        lambda: {'metas': handler()},
+    )
 
 
 def get_watchlist_movies(user, skip: int = 0, genre: str = None) -> list[dict]:
@@ -266,93 +289,36 @@ def get_watchlist_movies(user, skip: int = 0, genre: str = None) -> list[dict]:
 
 
 def get_continue_watching(user, skip: int = 0) -> list[dict]:
-    """Get TV shows that user has started but not finished watching."""
-    from tvshows.models import Episode, WatchedEpisode
-    
+    """Get TV shows on the user's watchlist that they have started but not finished."""
+    from tvshows.services.progress import continue_watching
+
     tvshow_ct = ContentType.objects.get_for_model(TVShow)
-    
-    # Get all TV shows from user's watchlist
-    watchlist_items = Watchlist.objects.filter(
+    watchlist_show_ids = Watchlist.objects.filter(
         user=user,
         content_type=tvshow_ct
-    ).order_by('-date_added')
-    
-    tvshow_ids = [item.object_id for item in watchlist_items]
-    
-    if not tvshow_ids:
-        return []
-    
-    # Get total aired episodes count per show
-    from django.utils import timezone
-    total_episodes = Episode.objects.filter(
-        season__show_id__in=tvshow_ids,
-        season__season_number__gt=0,
-        air_date__isnull=False,
-        air_date__lte=timezone.now()
-    ).values('season__show_id').annotate(
-        count=Count('id')
-    )
-    
-    # Get watched episodes count per show for this user
-    watched_episodes = WatchedEpisode.objects.filter(
-        user=user,
-        episode__season__show_id__in=tvshow_ids,
-        episode__season__season_number__gt=0
-    ).values('episode__season__show_id').annotate(
-        count=Count('id')
+    ).values('object_id')
+
+    # Closest to completion first
+    show_ids = list(
+        continue_watching(user, watchlist_show_ids).exclude(
+            Q(show__imdb_id__isnull=True) | Q(show__imdb_id='')
+        ).values_list('show_id', flat=True)[skip:skip + PAGE_SIZE]
     )
-    
-    # Create mappings for fast lookup
-    total_episodes_map = {item['season__show_id']: item['count'] for item in total_episodes}
-    watched_episodes_map = {item['episode__season__show_id']: item['count'] for item in watched_episodes}
-    
-    # Find shows in progress (0 < progress < 100)
-    in_progress_ids = []
-    progress_map = {}
-    
-    for tvshow_id in tvshow_ids:
-        total = total_episodes_map.get(tvshow_id, 0)
-        watched = watched_episodes_map.get(tvshow_id, 0)
-        
-        if total > 0:
-            progress = (watched / total * 100)
-            if 0 < progress < 100:
-                in_progress_ids.append(tvshow_id)
-                progress_map[tvshow_id] = progress
-    
-    if not in_progress_ids:
-        return []
-    
-    # Get TV shows and sort by most recently watched
-    tvshows = TVShow.objects.filter(
-        id__in=in_progress_ids
-    ).exclude(
-        Q(imdb_id__isnull=True) | Q(imdb_id='')
-    ).prefetch_related('genres')
-    
-    # Sort by progress (most recently active - higher progress first) and apply pagination
-    tvshow_dict = {t.id: t for t in tvshows}
-    
-    # Sort in_progress_ids by progress descending (shows closer to completion first)
-    sorted_ids = sorted(in_progress_ids, key=lambda x: progress_map.get(x, 0), reverse=True)
-    
+
+    tvshows = TVShow.objects.prefetch_related('genres').in_bulk(show_ids)
     metas = []
-    for idx, tvshow_id in enumerate(sorted_ids):
-        if idx < skip:
-            continue
-        if len(metas) >= PAGE_SIZE:
-            break
-        
-        if tvshow_id in tvshow_dict:
-            item = to_stremio_catalog_item(tvshow_dict[tvshow_id], 'series')
-            if item:
-                metas.append(item)
-    
+    for tvshow_id in show_ids:
+        item = to_stremio_catalog_item(tvshows[tvshow_id], 'series') if tvshow_id in tvshows else None
+        if item:
+            metas.append(item)
+
     return metas
 
 
 def get_watchlist_series(user, skip: int = 0, genre: str = None) -> list[dict]:
     """Get TV shows from user's watchlist that are not fully watched."""
+    from tvshows.services.progress import progress_map
+
     tvshow_ct = ContentType.objects.get_for_model(TVShow)
     
     if genre:
@@ -367,17 +333,18 @@ def get_watchlist_series(user, skip: int = 0, genre: str = None) -> list[dict]:
             genres__name=genre
         ).exclude(
             Q(imdb_id__isnull=True) | Q(imdb_id='')
-        ).prefetch_related('genres', 'seasons__episodes')
+        ).prefetch_related('genres')
 
         # Sort by date added
         tvshows_sorted = sorted(tvshows, key=lambda t: date_map.get(t.id), reverse=True)
+        watch_progress_map = progress_map(user, date_map.keys())
         
         metas = []
         skipped = 0
         
         for tvshow in tvshows_sorted:
             # Check if show is fully watched (100% progress)
-            watch_progress = user.get_watch_progress(tvshow)
+            watch_progress = watch_progress_map.get(tvshow.id, 0)
             if watch_progress >= 100:
                 continue
             
@@ -404,10 +371,11 @@ def get_watchlist_series(user, skip: int = 0, genre: str = None) -> list[dict]:
             id__in=tvshow_ids
         ).exclude(
             Q(imdb_id__isnull=True) | Q(imdb_id='')
-        ).prefetch_related('genres', 'seasons__episodes')
+        ).prefetch_related('genres')
         
         # Build dict for ordering
         tvshow_dict = {t.id: t for t in tvshows}
+        watch_progress_map = progress_map(user, tvshow_ids)
         
         # Filter out fully watched shows and apply pagination
         metas = []
@@ -420,7 +388,7 @@ def get_watchlist_series(user, skip: int = 0, genre: str = None) -> list[dict]:
             tvshow = tvshow_dict[tvshow_id]
             
             # Check if show is fully watched (100% progress)
-            watch_progress = user.get_watch_progress(tvshow)
+            watch_progress = watch_progress_map.get(tvshow.id, 0)
             if watch_progress >= 100:
                 continue  # Skip fully watched shows
             
@@ -501,103 +469,39 @@ def get_recommendations(user) -> list[dict]:
 
 def get_top_rated(user, skip: int = 0, genre: str = None) -> list[dict]:
     """Get highest rated movies that the user hasn't reviewed."""
-    movie_ct = ContentType.objects.get_for_model(Movie)
-    
-    # Get user's reviewed movie IDs
-    user_reviewed_ids = set(
-        Review.objects.filter(
-            user=user,
-            content_type=movie_ct
-        ).values_list('object_id', flat=True)
-    )
-    
-    # Base query for reviews
-    reviews_query = Review.objects.filter(
-        content_type=movie_ct
-    ).exclude(
-        object_id__in=user_reviewed_ids
-    )
-
-    if genre:
-        # Restrict to movies with the specific genre
-        movie_ids_with_genre = Movie.objects.filter(genres__name=genre).values_list('id', flat=True)
-        reviews_query = reviews_query.filter(object_id__in=movie_ids_with_genre)
-
-    # Get movies with average ratings
-    rated_movies = reviews_query.values('object_id').annotate(
-        avg_rating=Avg('rating')
-    ).order_by('-avg_rating')[skip:skip + PAGE_SIZE]
-    
-    movie_ids = [r['object_id'] for r in rated_movies]
-    
-    movies = Movie.objects.filter(
-        id__in=movie_ids
-    ).exclude(
-        Q(imdb_id__isnull=True) | Q(imdb_id='')
-    ).prefetch_related('genres')
-    
-    # Preserve rating order
-    movie_dict = {m.id: m for m in movies}
-    metas = []
-    for movie_id in movie_ids:
-        if movie_id in movie_dict:
-            item = to_stremio_catalog_item(movie_dict[movie_id], 'movie')
-            if item:
-                metas.append(item)
-    
-    return metas
+    return _top_rated_metas(Movie, 'movie', user, skip, genre)
 
 
 def get_top_rated_series(user, skip: int = 0, genre: str = None) -> list[dict]:
     """Get highest rated TV shows that the user hasn't reviewed."""
-    tvshow_ct = ContentType.objects.get_for_model(TVShow)
-    
-    # Get user's reviewed show IDs
-    # Reviews for shows can be on 'series', 'season', etc., but top-rated usually aggregates show-level id reviews or similar.
-    # The requirement says: "Aggregation based on `object_id` (Show ID) is correct as finding average rating across all seasons."
-    # We should exclude shows if the user has reviewed them.
-    
+    # Show-level averages include season / subgroup reviews, which share the
+    # show's object_id; any review of a show hides it from the user.
+    return _top_rated_metas(TVShow, 'series', user, skip, genre)
+
+
+def _top_rated_metas(model, stremio_type: str, user, skip: int, genre: str = None) -> list[dict]:
+    """Walk the precomputed community ranking (see `rating_aggregates.ranked_ids`)."""
+    content_type = ContentType.objects.get_for_model(model)
     user_reviewed_ids = set(
         Review.objects.filter(
             user=user,
-            content_type=tvshow_ct
+            content_type=content_type
         ).values_list('object_id', flat=True)
     )
-    
-    # Base query for reviews
-    reviews_query = Review.objects.filter(
-        content_type=tvshow_ct
-    ).exclude(
-        object_id__in=user_reviewed_ids
-    )
 
+    candidates = model.objects.exclude(Q(imdb_id__isnull=True) | Q(imdb_id=''))
     if genre:
-        # Restrict to shows with the specific genre
-        show_ids_with_genre = TVShow.objects.filter(genres__name=genre).values_list('id', flat=True)
-        reviews_query = reviews_query.filter(object_id__in=show_ids_with_genre)
-
-    # Get shows with average ratings
-    rated_shows = reviews_query.values('object_id').annotate(
-        avg_rating=Avg('rating')
-    ).order_by('-avg_rating')[skip:skip + PAGE_SIZE]
-    
-    show_ids = [r['object_id'] for r in rated_shows]
-    
-    shows = TVShow.objects.filter(
-        id__in=show_ids
-    ).exclude(
-        Q(imdb_id__isnull=True) | Q(imdb_id='')
-    ).prefetch_related('genres')
-    
+        candidates = candidates.filter(genres__name=genre)
+    ids = ranked_ids(candidates, exclude_ids=user_reviewed_ids, skip=skip, limit=PAGE_SIZE)
+
     # Preserve rating order
-    show_dict = {s.id: s for s in shows}
+    items = model.objects.prefetch_related('genres').in_bulk(ids)
     metas = []
-    for show_id in show_ids:
-        if show_id in show_dict:
-            item = to_stremio_catalog_item(show_dict[show_id], 'series')
-            if item:
-                metas.append(item)
-    
+    for item_id in ids:
+        item = to_stremio_catalog_item(items[item_id], stremio_type) if item_id in items else None
+        if item:
+            metas.append(item)
+
     return metas
 
 
@@ -617,17 +521,19 @@ def meta(request, config: str, media_type: str, imdb_id: str):
     if imdb_id.endswith('.json'):
         imdb_id = imdb_id[:-5]
     
-    if media_type == 'movie':
-        meta_data = get_movie_meta(user, imdb_id)
-    elif media_type == 'series':
-        meta_data = get_series_meta(user, imdb_id)
-    else:
-        return cors_response({'meta': None})
-    
-    if not meta_data:
+    meta_builders = {
+        'movie': get_movie_meta,
+        'series': get_series_meta,
+    }
+    builder = meta_builders.get(media_type)
+    if not builder:
         return cors_response({'meta': None})
     
-    return cors_response({'meta': meta_data})
+    return cached_cors_response(
+        request, user,
+        ('meta', media_type, imdb_id),
+        lambda: {'meta': builder(user, imdb_id) or None},
+    )
 
 
 def get_movie_meta(user, imdb_id: str) -> dict | None:
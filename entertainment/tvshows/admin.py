@@ -178,10 +178,12 @@ class TVShowAdmin(admin.ModelAdmin):
         return custom_urls + super().get_urls()
     
     def update_from_tmdb_view(self, request, tvshow_id):
+        from api.response_cache import uncached
         from .tasks import update_single_tvshow
         try:
             tvshow = TVShow.objects.get(id=tvshow_id)
-            async_task(update_single_tvshow, tvshow.id, True)
+            # Explicit refresh: skip cached TMDB responses
+            async_task(uncached, update_single_tvshow, tvshow.id, True)
             messages.success(request, f"Scheduled TMDB update for \"{tvshow.title}\".")
         except TVShow.DoesNotExist:
             messages.error(request, f"TV show with ID {tvshow_id} not found.")
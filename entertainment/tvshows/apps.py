@@ -17,6 +17,7 @@ def _setup_tvshow_schedules(sender, **kwargs):
     """
     from django_q.models import Schedule
     from django.db.utils import OperationalError, ProgrammingError
+    from django.utils import timezone
 
     try:
         # Create scheduled task to check for new episodes daily at 9 AM
@@ -29,5 +30,15 @@ def _setup_tvshow_schedules(sender, **kwargs):
                 'next_run': None,  # Will calculate based on schedule
             }
         )
+        Schedule.objects.get_or_create(
+            func='tvshows.tasks.refresh_show_progress',
+            defaults={
+                'name': 'Refresh Show Progress',
+                'schedule_type': Schedule.DAILY,
+                'repeats': -1,
+                # The scheduler only picks rows due before now
+                'next_run': timezone.now(),
+            }
+        )
     except (OperationalError, ProgrammingError):
         pass
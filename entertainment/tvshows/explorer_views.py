@@ -51,6 +51,6 @@ class TVShowExplorerViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
                 Prefetch("genres", queryset=Genre.objects.only("id", "name")),
             )
         )
-        qs = annotate_user_rating(qs, TVShow)
+        qs = annotate_user_rating(qs)
         qs = annotate_user_context(qs, TVShow, getattr(self.request, "user", None))
         return qs
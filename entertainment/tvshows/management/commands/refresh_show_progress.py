@@ -0,0 +1,20 @@
+"""Backfill (or reconcile) the `ShowProgress` table.
+
+Run once after applying the migration that adds the table, and daily so
+aired totals pick up episodes whose air date has arrived.
+
+    python manage.py refresh_show_progress
+"""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from tvshows.services.progress import refresh_show_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute per-(user, show) watch progress from watched episodes."
+
+    def handle(self, *args, **options):
+        changed = refresh_show_progress()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed show progress: {changed} rows changed."))
@@ -1,4 +1,8 @@
+from contextlib import nullcontext
+
 from django.core.management.base import BaseCommand
+
+from api.response_cache import bypass
 from tvshows.tasks import update_ongoing_tvshows, update_random_tvshows, update_episode_groups, setup_scheduled_tasks
 
 class Command(BaseCommand):
@@ -30,8 +34,27 @@ class Command(BaseCommand):
             type=int,
             help='Update a specific TV show by TMDB ID',
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Refresh all ongoing TV shows in this process with concurrent API calls',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Concurrent API requests for --bulk',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Ignore cached API responses (forced refresh)',
+        )
 
     def handle(self, *args, **options):
+        with bypass() if options['no_cache'] else nullcontext():
+            self._update(options)
+
+    def _update(self, options):
         if options['setup']:
             result = setup_scheduled_tasks()
             self.stdout.write(self.style.SUCCESS(result))
@@ -48,6 +71,19 @@ class Command(BaseCommand):
                 except Exception as e:
                     self.stdout.write(self.style.ERROR(f"Error updating groups for {tvshow.title}: {e}"))
             self.stdout.write(self.style.SUCCESS(f"Episode groups update process complete for {count} TV shows"))
+        elif options['bulk']:
+            from tvshows.models import TVShow
+            from tvshows.services.bulk_refresh import refresh_tvshows
+            tvshow_ids = list(TVShow.objects.filter(
+                status__in=['Returning Series', 'In Production', 'Planned']
+            ).values_list('id', flat=True))
+            stats = refresh_tvshows(
+                tvshow_ids,
+                update_people=True,
+                workers=options['workers'],
+                progress=lambda stage, done, total: self.stdout.write(f"{stage}: {done}/{total}"),
+            )
+            self.stdout.write(self.style.SUCCESS(f"Bulk update of {len(tvshow_ids)} TV shows complete in {stats['elapsed']:.0f}s: {stats['stages']}"))
         elif options['id']:
             from tvshows.tasks import update_single_tvshow
             result = update_single_tvshow(options['id'], update_people=True)
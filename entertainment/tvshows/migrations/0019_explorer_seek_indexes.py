@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0029_person_review_rating'),
+        ('tvshows', '0018_tvshow_review_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tvshow',
+            name='tvshow_review_rating_idx',
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(models.OrderBy(models.F('review_rating_avg'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='tvshow_review_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(fields=['review_rating_avg', 'id'], name='tvshow_rating_asc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(fields=['title', 'id'], name='tvshow_title_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(fields=['first_air_date', 'id'], name='tvshow_first_air_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(models.OrderBy(models.F('first_air_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='tvshow_first_air_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(fields=['last_air_date', 'id'], name='tvshow_last_air_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(models.OrderBy(models.F('last_air_date'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='tvshow_last_air_desc_seek_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tvshow',
+            index=models.Index(fields=['date_added', 'id'], name='tvshow_added_seek_idx'),
+        ),
+    ]
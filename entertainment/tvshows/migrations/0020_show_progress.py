@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_show_progress(apps, schema_editor):
+    # Raw-SQL refresh over WatchedEpisode / Episode; no model state involved
+    from tvshows.services.progress import refresh_show_progress
+
+    refresh_show_progress()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tvshows', '0019_explorer_seek_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShowProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('watched_count', models.PositiveIntegerField(default=0)),
+                ('aired_count', models.PositiveIntegerField(default=0)),
+                ('last_watched_at', models.DateTimeField(blank=True, null=True)),
+                ('date_updated', models.DateTimeField(auto_now=True)),
+                ('next_episode', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tvshows.episode')),
+                ('show', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_progress', to='tvshows.tvshow')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='show_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'show'), name='unique_user_show_progress')],
+            },
+        ),
+        migrations.RunPython(backfill_show_progress, migrations.RunPython.noop),
+    ]
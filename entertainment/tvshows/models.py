@@ -1,5 +1,8 @@
 from django.db import models
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
 
 from custom_auth.models import *
@@ -38,6 +41,26 @@ class TVShow(Media):
     class Meta:
         indexes = [
             models.Index(fields=['status', 'date_updated']),
+            GinIndex(fields=['search_vector'], name='tvshow_search_vector_idx'),
+            # Explorer seek pagination: (sort column, id) for each ordering field,
+            # plus DESC NULLS LAST variants for nullable columns.
+            models.Index(
+                models.F('review_rating_avg').desc(nulls_last=True), models.F('id').desc(),
+                name='tvshow_review_rating_idx',
+            ),
+            models.Index(fields=['review_rating_avg', 'id'], name='tvshow_rating_asc_seek_idx'),
+            models.Index(fields=['title', 'id'], name='tvshow_title_seek_idx'),
+            models.Index(fields=['first_air_date', 'id'], name='tvshow_first_air_seek_idx'),
+            models.Index(
+                models.F('first_air_date').desc(nulls_last=True), models.F('id').desc(),
+                name='tvshow_first_air_desc_seek_idx',
+            ),
+            models.Index(fields=['last_air_date', 'id'], name='tvshow_last_air_seek_idx'),
+            models.Index(
+                models.F('last_air_date').desc(nulls_last=True), models.F('id').desc(),
+                name='tvshow_last_air_desc_seek_idx',
+            ),
+            models.Index(fields=['date_added', 'id'], name='tvshow_added_seek_idx'),
         ]
     
     def __str__(self):
@@ -296,4 +319,83 @@ class WatchedEpisode(models.Model):
         ]
         
     def __str__(self):
-        return f"{self.user.username} watched {self.episode}"
\ No newline at end of file
+        return f"{self.user.username} watched {self.episode}"
+
+class ShowProgress(models.Model):
+    """Per-(user, show) watch progress, maintained by signals.
+
+    Counts cover regular seasons only (season_number > 0); `aired_count` is
+    the number of those episodes that have aired. `next_episode` is the
+    first aired regular episode the user hasn't watched. A row exists while
+    the user has watched at least one episode of the show; see
+    `tvshows/services/progress.py`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='show_progress')
+    show = models.ForeignKey(TVShow, on_delete=models.CASCADE, related_name='user_progress')
+
+    watched_count = models.PositiveIntegerField(default=0)
+    aired_count = models.PositiveIntegerField(default=0)
+    last_watched_at = models.DateTimeField(blank=True, null=True)
+    next_episode = models.ForeignKey(Episode, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+
+    date_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'show'], name='unique_user_show_progress'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} on {self.show_id}: {self.watched_count}/{self.aired_count}"
+
+    @property
+    def percentage(self):
+        if not self.aired_count:
+            return 0
+        return (self.watched_count / self.aired_count) * 100
+
+    @property
+    def in_progress(self):
+        return 0 < self.watched_count < self.aired_count
+
+
+# --- Show progress maintenance -----------------------------------------------
+
+@receiver(post_save, sender=WatchedEpisode)
+def update_progress_on_watch(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        from tvshows.services.progress import refresh_progress_for_episode
+        refresh_progress_for_episode(instance.user_id, instance.episode_id)
+
+
+@receiver(post_delete, sender=WatchedEpisode)
+def update_progress_on_unwatch(sender, instance, **kwargs):
+    from tvshows.services.progress import refresh_progress_for_episode
+    refresh_progress_for_episode(instance.user_id, instance.episode_id)
+
+
+@receiver(pre_save, sender=Episode)
+def remember_episode_airing(sender, instance, raw=False, **kwargs):
+    """Load the stored air date / season so post_save can tell if totals moved."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._progress_airing = (
+        Episode.objects.filter(pk=instance.pk).values_list('air_date', 'season_id').first()
+    )
+
+
+@receiver(post_save, sender=Episode)
+def update_progress_on_episode_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = instance.__dict__.pop('_progress_airing', None)
+    if not created and previous == (instance.air_date, instance.season_id):
+        return
+    from tvshows.services.progress import refresh_progress_for_seasons
+    refresh_progress_for_seasons({instance.season_id, previous[1] if previous else instance.season_id})
+
+
+@receiver(post_delete, sender=Episode)
+def update_progress_on_episode_delete(sender, instance, **kwargs):
+    from tvshows.services.progress import refresh_progress_for_seasons
+    refresh_progress_for_seasons({instance.season_id})
@@ -8,7 +8,7 @@ from .models import TVShow
 class TVShowSerializer(serializers.ModelSerializer):
     class Meta:
         model = TVShow
-        fields = '__all__'
+        exclude = ['search_vector']
 
 
 class TVShowListSerializer(serializers.ModelSerializer):
@@ -0,0 +1,271 @@
+"""Bulk refresh of many TV shows with concurrent upstream fetches.
+
+The per-object refresh tasks (`update_single_tvshow` → `update_tvshow_seasons`
+→ `update_single_season`, `update_episode_groups` → `update_episode_subgroups`,
+`update_episodes_from_tvdb`, per-person `update_single_person`) each queue
+their follow-ups as separate django-q tasks and make strictly serial API
+calls. Refreshing a thousand shows meant tens of thousands of tiny queued
+tasks with the rate budget mostly idle.
+
+`refresh_tvshows` runs the same functions in-process, stage by stage:
+
+* each function gets a ``followups`` list instead of queueing, so the next
+  stage is known up front and deduplicated (a person who appears in fifty
+  shows is refreshed once). Follow-ups are claimed like queued tasks
+  (`custom_auth.services.task_queue.claim`), so work already queued or run
+  elsewhere within the dedup window is skipped, and later duplicates
+  coalesce into this run;
+* a stage is cut into batches. For each batch the upstream calls the
+  functions are about to make are fetched concurrently on a thread pool
+  (sharing the cluster rate budget) while the previous batch is applied,
+  landing in the response cache (`api.response_cache`) where the
+  functions then find them;
+* each object is applied in its own transaction, so a failing object only
+  loses its own writes and no transaction is held open across the upstream
+  calls a function still makes on a cache miss;
+* progress is logged per batch and reported through ``progress``, and the
+  payload digest hits (work skipped because nothing changed upstream, see
+  `custom_auth.services.payload_digests`) at the end.
+
+TVDB episode updates run last, once every new episode exists.
+"""
+import logging
+import time
+from functools import partial
+
+from django.db import transaction
+
+from api.concurrency import executor, gather, submit_all
+from api.services.movies import MoviesService
+from api.services.tvdb import TVDBService
+from api.services.tvshows import TVShowsService
+from custom_auth.models import Person
+from custom_auth.services import payload_digests
+from custom_auth.services.task_queue import claim
+from movies.tasks import update_single_person
+from tvshows import tasks
+from tvshows.models import Season, TVShow
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+
+# Functions that take ``followups`` (see `tasks._dispatch`)
+_COLLECTS_FOLLOWUPS = {
+    tasks.update_single_tvshow,
+    tasks.update_tvshow_seasons,
+    tasks.update_episode_groups,
+}
+
+# Deferred until no other work is left
+_RUN_LAST = {tasks.update_episodes_from_tvdb}
+
+_CREDIT_DEPARTMENTS = ('Directing', 'Writing', 'Sound')
+
+
+class _Services:
+    def __init__(self):
+        self.tmdb = TVShowsService()
+        self.people = MoviesService()
+        self._tvdb = None
+
+    @property
+    def tvdb(self):
+        if self._tvdb is None:
+            self._tvdb = TVDBService()
+            # Log in once here rather than racing from every fetch thread.
+            self._tvdb.login()
+        return self._tvdb
+
+
+# ---------------------------------------------------------------------------
+# Upstream calls each stage will make, keyed for deduplication
+# ---------------------------------------------------------------------------
+
+def _show_tmdb_ids(items):
+    return dict(TVShow.objects.filter(pk__in=[args[0] for args in items]).values_list('id', 'tmdb_id'))
+
+
+def _show_calls(services, items):
+    tmdb_ids = _show_tmdb_ids(items)
+    calls = {}
+    for args in items:
+        tmdb_id = tmdb_ids.get(args[0])
+        update_people = args[1] if len(args) > 1 else False
+        if tmdb_id:
+            append = tasks.show_details_append(update_people)
+            calls[('tv', tmdb_id, append)] = partial(services.tmdb.get_show_details, tmdb_id, append_to_response=append)
+    return calls
+
+
+def _new_people_calls(services, results):
+    """Cast / crew the show refresh will create (it fetches each one serially)."""
+    tmdb_ids = set()
+    for data in results.values():
+        if not data or 'credits' not in data:
+            continue
+        tmdb_ids.update(p.get('id') for p in data['credits'].get('cast', []))
+        tmdb_ids.update(p.get('id') for p in data['credits'].get('crew', []) if p.get('department') in _CREDIT_DEPARTMENTS)
+        tmdb_ids.update(p.get('id') for p in data.get('created_by', []))
+    tmdb_ids.discard(None)
+    known = set(Person.objects.filter(tmdb_id__in=tmdb_ids).values_list('tmdb_id', flat=True))
+    return {('person', tmdb_id): partial(services.people.get_person_details, tmdb_id) for tmdb_id in tmdb_ids - known}
+
+
+def _season_list_calls(services, items):
+    return {
+        ('tv', tmdb_id): partial(services.tmdb.get_show_details, tmdb_id)
+        for tmdb_id in _show_tmdb_ids(items).values() if tmdb_id
+    }
+
+
+def _new_season_calls(services, results):
+    """Seasons the seasons refresh will create (it fetches each one serially)."""
+    wanted = {
+        (data['id'], season['season_number'])
+        for data in results.values() if data and data.get('id')
+        for season in data.get('seasons', [])
+    }
+    if not wanted:
+        return {}
+    known = set(
+        Season.objects.filter(show__tmdb_id__in={tmdb_id for tmdb_id, _ in wanted})
+        .values_list('show__tmdb_id', 'season_number')
+    )
+    return {
+        ('season', tmdb_id, number): partial(services.tmdb.get_season_details, tmdb_id, number)
+        for tmdb_id, number in wanted - known
+    }
+
+
+def _season_calls(services, items):
+    rows = Season.objects.filter(pk__in=[args[0] for args in items]).values_list('show__tmdb_id', 'season_number')
+    return {
+        ('season', tmdb_id, number): partial(services.tmdb.get_season_details, tmdb_id, number)
+        for tmdb_id, number in rows if tmdb_id
+    }
+
+
+def _episode_groups_calls(services, items):
+    return {
+        ('episode_groups', tmdb_id): partial(services.tmdb.get_episode_groups, tmdb_id)
+        for tmdb_id in _show_tmdb_ids(items).values() if tmdb_id
+    }
+
+
+def _episode_group_calls(services, items):
+    group_ids = {args[1] for args in items}
+    return {('episode_group', group_id): partial(services.tmdb.get_episode_group_details, group_id) for group_id in group_ids}
+
+
+def _tvdb_calls(services, items):
+    tvdb_ids = TVShow.objects.filter(pk__in=[args[0] for args in items], tvdb_id__isnull=False).values_list('tvdb_id', flat=True)
+    return {('tvdb', tvdb_id): partial(services.tvdb.get_series_extended, tvdb_id) for tvdb_id in tvdb_ids if tvdb_id}
+
+
+def _person_calls(services, items):
+    tmdb_ids = Person.objects.filter(pk__in=[args[0] for args in items], tmdb_id__isnull=False).values_list('tmdb_id', flat=True)
+    return {('person', tmdb_id): partial(services.people.get_person_details, tmdb_id) for tmdb_id in tmdb_ids}
+
+
+# func -> (calls for a batch, optional calls derived from those results)
+_FETCH_PLANS = {
+    tasks.update_single_tvshow: (_show_calls, _new_people_calls),
+    tasks.update_tvshow_seasons: (_season_list_calls, _new_season_calls),
+    tasks.update_single_season: (_season_calls, None),
+    tasks.update_episode_groups: (_episode_groups_calls, None),
+    tasks.update_episode_subgroups: (_episode_group_calls, None),
+    tasks.update_episodes_from_tvdb: (_tvdb_calls, None),
+    update_single_person: (_person_calls, None),
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _failed(result):
+    return isinstance(result, str) and result.startswith(('Error', 'Failed'))
+
+
+def _apply(func, batch, followups):
+    """Run ``func`` over a batch, one transaction per object; returns the error count."""
+    errors = 0
+    kwargs = {'followups': followups} if func in _COLLECTS_FOLLOWUPS else {}
+    for args in batch:
+        try:
+            with transaction.atomic():
+                if _failed(func(*args, **kwargs)):
+                    errors += 1
+        except Exception as e:
+            logger.error(f"Bulk refresh: {func.__name__}{args} failed: {e}")
+            errors += 1
+    return errors
+
+
+def _run_stage(pool, services, func, items, followups, progress):
+    plan, derived = _FETCH_PLANS.get(func, (None, None))
+    batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    pending = submit_all(pool, plan(services, batches[0])) if plan else {}
+    done = errors = 0
+    for index, batch in enumerate(batches):
+        results = gather(pending)
+        if derived:
+            gather(submit_all(pool, derived(services, results)))
+        # Fetch the next batch while this one is written.
+        if plan and index + 1 < len(batches):
+            pending = submit_all(pool, plan(services, batches[index + 1]))
+        errors += _apply(func, batch, followups)
+        done += len(batch)
+        logger.info(f"Bulk refresh: {func.__name__} {done}/{len(items)} ({errors} errors)")
+        if progress:
+            progress(func.__name__, done, len(items))
+    return done, errors
+
+
+def refresh_tvshows(tvshow_ids, update_people=False, workers=None, progress=None):
+    """Refresh ``tvshow_ids`` and every follow-up update they trigger.
+
+    ``progress(stage, done, total)`` is called after each batch. Returns
+    ``{'stages': {name: {'done': n, 'errors': n}}, 'elapsed': seconds}``.
+    """
+    started = time.monotonic()
+    digests_before = payload_digests.stats()
+    services = _Services()
+    stats = {}
+    wave = [(tasks.update_single_tvshow, (tvshow_id, update_people)) for tvshow_id in tvshow_ids]
+    deferred = []
+    # The shows themselves are claimed (if at all) by whoever queued this refresh
+    roots = True
+
+    with executor(workers) as pool:
+        while wave or deferred:
+            final = not wave
+            if final:
+                wave, deferred = deferred, []
+            # Group by function, dropping duplicates, in first-seen order
+            stages = {}
+            for func, args in wave:
+                if func in _RUN_LAST and not final:
+                    deferred.append((func, args))
+                else:
+                    stages.setdefault(func, {})[args] = None
+            wave = []
+            for func, items in stages.items():
+                items = list(items) if roots else claim(func, items)
+                if not items:
+                    continue
+                done, errors = _run_stage(pool, services, func, items, wave, progress)
+                counts = stats.setdefault(func.__name__, {'done': 0, 'errors': 0})
+                counts['done'] += done
+                counts['errors'] += errors
+            roots = False
+
+    elapsed = time.monotonic() - started
+    logger.info(f"Bulk refresh of {len(tvshow_ids)} TV shows finished in {elapsed:.0f}s: {stats}")
+    digests = {
+        resource: {kind: count - digests_before[resource][kind] for kind, count in counts.items()}
+        for resource, counts in payload_digests.stats().items()
+    }
+    logger.info(f"Bulk refresh payload digests (unchanged = skipped): {digests}")
+    return {'stages': stats, 'elapsed': elapsed}
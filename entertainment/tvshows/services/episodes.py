@@ -0,0 +1,273 @@
+"""Bulk season / episode writes for TV shows.
+
+Seasons and episodes used to be created with one `create()` each, and TVDB
+air dates were applied with one `save()` per episode while re-reading the
+show's countries and re-parsing its air time for every episode. Here:
+
+* `create_seasons` inserts a new show's seasons and episodes with one
+  `bulk_create` each (season details are fetched concurrently first);
+* `sync_episodes` diffs a season's stored episodes against the TMDB payload;
+* `apply_tvdb_episodes` loads every episode of a show in one query and diffs
+  it against the TVDB payload, with the show's timezone and air time worked
+  out once.
+
+Changed rows are written with `bulk_update`, grouped by the set of fields
+that changed so every UPDATE touches only those columns. That skips the
+Episode save signals, so show progress is refreshed once per call for the
+seasons whose episodes were added or changed air date.
+"""
+
+import logging
+import zoneinfo
+from datetime import date, datetime
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+from django.db.models import F
+from django.utils import timezone
+
+from api.concurrency import executor, fetch_all
+from tvshows.models import Episode, Season
+from tvshows.services.progress import refresh_progress_for_seasons
+
+logger = logging.getLogger(__name__)
+
+# Rows per UPDATE / INSERT statement
+BATCH_SIZE = 500
+
+AIR_TIME_FORMATS = ["%H:%M", "%I:%M %p"]
+
+# Manual map for major countries to ensure capital/most populous city is used
+MANUAL_TIMEZONES = {
+    'US': 'America/New_York',
+    'GB': 'Europe/London',
+    'JP': 'Asia/Tokyo',
+    'KR': 'Asia/Seoul',
+    'CN': 'Asia/Shanghai',
+    'IN': 'Asia/Kolkata',
+    'CA': 'America/Toronto',
+    'AU': 'Australia/Sydney',
+    'FR': 'Europe/Paris',
+    'DE': 'Europe/Berlin',
+    'IT': 'Europe/Rome',
+    'ES': 'Europe/Madrid',
+    'BR': 'America/Sao_Paulo',
+    'RU': 'Europe/Moscow',
+}
+
+
+def _image(path: Optional[str]) -> Optional[str]:
+    return f"https://image.tmdb.org/t/p/original{path}" if path else None
+
+
+def _parse_date(value) -> Optional[date]:
+    try:
+        return date.fromisoformat(value) if value else None
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_air_time(value: Optional[str]):
+    """Time of day from a TVDB ``airsTime`` ("21:00" or "9:00 PM"), or None."""
+    if not value:
+        return None
+    for fmt in AIR_TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def show_timezone(tvshow) -> str:
+    """Timezone name for a show's air times, from its origin countries."""
+    countries = list(tvshow.countries.values_list('iso_3166_1', flat=True))
+    for code in countries:
+        if code in MANUAL_TIMEZONES:
+            return MANUAL_TIMEZONES[code]
+    if countries:
+        # Use the first country
+        timezones = pytz.country_timezones.get(countries[0], [])
+        if timezones:
+            return timezones[0]
+    return "UTC"
+
+
+def _write(new: List[Episode], changed: Dict[Tuple[str, ...], List[Episode]]) -> None:
+    """Insert ``new`` and update ``{fields: episodes}``, then refresh progress once."""
+    if new:
+        Episode.objects.bulk_create(new, batch_size=BATCH_SIZE)
+    for fields, episodes in changed.items():
+        Episode.objects.bulk_update(episodes, fields, batch_size=BATCH_SIZE)
+    season_ids = {episode.season_id for episode in new}
+    season_ids.update(episode.season_id for fields, episodes in changed.items() if 'air_date' in fields for episode in episodes)
+    if season_ids:
+        refresh_progress_for_seasons(season_ids)
+
+
+def _track(changed, episode, fields):
+    if fields:
+        changed.setdefault(tuple(sorted(fields)), []).append(episode)
+
+
+def new_episode(season, episode_data) -> Episode:
+    """Unsaved Episode for a TMDB season payload entry."""
+    episode_number = episode_data.get('episode_number')
+    return Episode(
+        season=season,
+        episode_number=episode_number,
+        title=episode_data.get('name') or f"Episode {episode_number}",
+        overview=episode_data.get('overview', ''),
+        still=_image(episode_data.get('still_path')),
+        air_date=_parse_date(episode_data.get('air_date')),
+        rating=episode_data.get('vote_average', 0),
+        runtime=episode_data.get('runtime'),
+        tmdb_id=episode_data.get('id'),
+    )
+
+
+def create_seasons(tvshow, seasons_data: Iterable[Dict], tvshows_service, workers: Optional[int] = None) -> List[Season]:
+    """Create the seasons (and their episodes) of a new show.
+
+    Season details are fetched concurrently; seasons and episodes are then
+    inserted with one `bulk_create` each. Seasons whose details cannot be
+    fetched are skipped.
+    """
+    numbers = [season_data.get('season_number') for season_data in seasons_data]
+    calls = {number: partial(tvshows_service.get_season_details, tvshow.tmdb_id, number) for number in numbers}
+    if not calls:
+        return []
+    with executor(workers) as pool:
+        details = fetch_all(pool, calls)
+
+    seasons, episodes_data = [], []
+    for number in dict.fromkeys(numbers):
+        season_details = details.get(number)
+        if not season_details:
+            continue
+        seasons.append(Season(
+            show=tvshow,
+            title=season_details.get('name'),
+            season_number=number,
+            air_date=season_details.get('air_date') or None,
+            overview=season_details.get('overview'),
+            poster=_image(season_details.get('poster_path')),
+            tmdb_id=season_details.get('id'),
+        ))
+        episodes_data.append(season_details.get('episodes', []))
+    Season.objects.bulk_create(seasons)
+
+    new = []
+    for season, season_episodes in zip(seasons, episodes_data):
+        # TMDB occasionally lists an episode twice
+        unique = {episode_data.get('episode_number'): episode_data for episode_data in season_episodes}
+        new.extend(new_episode(season, episode_data) for episode_data in unique.values())
+    _write(new, {})
+    return seasons
+
+
+def sync_episodes(season, episodes_data: List[Dict]) -> Tuple[int, int, int]:
+    """Bring a season's episodes in line with its TMDB payload.
+
+    Removed episodes are deleted, new ones inserted and existing ones
+    updated only where TMDB has a (different) value. Returns
+    ``(added, updated, deleted)``.
+    """
+    existing = {episode.episode_number: episode for episode in Episode.objects.filter(season=season)}
+    api_numbers = {episode_data['episode_number'] for episode_data in episodes_data}
+
+    deleted = 0
+    removed = set(existing) - api_numbers
+    if removed:
+        deleted = Episode.objects.filter(season=season, episode_number__in=removed).delete()[0]
+
+    new, changed, added = [], {}, set()
+    for episode_data in episodes_data:
+        episode_number = episode_data['episode_number']
+        episode = existing.get(episode_number)
+        if episode is None:
+            if episode_number not in added:
+                added.add(episode_number)
+                new.append(new_episode(season, episode_data))
+            continue
+
+        fields = set()
+        if episode_data.get('name') and episode_data['name'] != episode.title:
+            episode.title = episode_data['name']
+            fields.add('title')
+        if episode_data.get('overview') and episode_data['overview'] != episode.overview:
+            episode.overview = episode_data['overview']
+            fields.add('overview')
+        if episode_data.get('still_path') and not episode.still:
+            episode.still = _image(episode_data['still_path'])
+            fields.add('still')
+        air_date = _parse_date(episode_data.get('air_date'))
+        if air_date and air_date != episode.air_date:
+            episode.air_date = air_date
+            fields.add('air_date')
+        if episode_data.get('vote_average') and episode_data['vote_average'] != episode.rating:
+            episode.rating = episode_data['vote_average']
+            fields.add('rating')
+        if episode_data.get('runtime') and episode_data['runtime'] != episode.runtime:
+            episode.runtime = episode_data['runtime']
+            fields.add('runtime')
+        _track(changed, episode, fields)
+
+    _write(new, changed)
+    return len(new), sum(len(episodes) for episodes in changed.values()), deleted
+
+
+def apply_tvdb_episodes(tvshow, series: Dict) -> int:
+    """Apply TVDB ids, air dates and air times to every episode of ``tvshow``.
+
+    ``series`` is the ``data`` of a TVDB extended series response. Returns
+    the number of episodes updated.
+    """
+    tvdb_map = {}
+    for tvdb_episode in series.get('episodes', []):
+        season_number, episode_number = tvdb_episode.get('seasonNumber'), tvdb_episode.get('number')
+        if season_number is not None and episode_number is not None:
+            tvdb_map[(season_number, episode_number)] = tvdb_episode
+
+    tz = None
+    air_time = parse_air_time(series.get('airsTime'))
+    if air_time:
+        tz_name = show_timezone(tvshow)
+        try:
+            tz = zoneinfo.ZoneInfo(tz_name)
+        except Exception as e:
+            logger.error(f"Error setting timezone {tz_name} for {tvshow.title}: {e}")
+
+    changed = {}
+    episodes = Episode.objects.filter(season__show=tvshow).annotate(season_number=F('season__season_number'))
+    for episode in episodes:
+        tvdb_episode = tvdb_map.get((episode.season_number, episode.episode_number))
+        if not tvdb_episode:
+            continue
+        fields = set()
+        if not episode.tvdb_id and tvdb_episode.get('id'):
+            episode.tvdb_id = tvdb_episode['id']
+            fields.add('tvdb_id')
+
+        # Trust TVDB for air dates
+        aired = _parse_date(tvdb_episode.get('aired'))
+        if aired:
+            if episode.air_date != aired:
+                episode.air_date = aired
+                fields.add('air_date')
+            if tz is not None:
+                aired_at = timezone.make_aware(datetime.combine(aired, air_time), timezone=tz)
+                if episode.air_time != aired_at:
+                    episode.air_time = aired_at
+                    fields.add('air_time')
+        _track(changed, episode, fields)
+
+    _write([], changed)
+    return sum(len(episodes) for episodes in changed.values())
+
+
+def episode_index(tvshow) -> Dict[Tuple[int, int], Episode]:
+    """``{(season_number, episode_number): episode}`` for every episode of a show, in one query."""
+    episodes = Episode.objects.filter(season__show=tvshow).annotate(season_number=F('season__season_number'))
+    return {(episode.season_number, episode.episode_number): episode for episode in episodes}
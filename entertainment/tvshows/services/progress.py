@@ -0,0 +1,185 @@
+"""Per-(user, show) watch progress in `ShowProgress`.
+
+Continue-watching lists, Stremio catalogs and the episode-toggle endpoint
+used to count aired episodes and watched episodes with GROUP BYs through
+Episode → Season → TVShow on every call. Those numbers now live in one row
+per (user, show), so continue watching is a single indexed read.
+
+Rows are recomputed from WatchedEpisode / Episode rather than adjusted by
+deltas:
+
+* WatchedEpisode post_save / post_delete refresh that user's row;
+* Episode saves that change the air date or season, and Episode deletes,
+  refresh every row of the show;
+* the daily `refresh_show_progress` task recomputes everything, which picks
+  up episodes whose air date has simply arrived and absorbs drift from bulk
+  writes that skip signals.
+
+Only regular seasons (season_number > 0) are counted. A row is deleted once
+the user has no watched episodes of the show left.
+"""
+
+import logging
+from typing import Iterable, Optional
+
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from tvshows.models import Episode, Season, ShowProgress
+
+logger = logging.getLogger(__name__)
+
+_UPSERT_SQL = """
+    WITH watched AS (
+        SELECT we.user_id, s.show_id,
+               COUNT(*) FILTER (WHERE s.season_number > 0) AS watched_count,
+               MAX(we.watched_date) AS last_watched_at
+        FROM tvshows_watchedepisode we
+        JOIN tvshows_episode e ON e.id = we.episode_id
+        JOIN tvshows_season s ON s.id = e.season_id
+        WHERE {where}
+        GROUP BY we.user_id, s.show_id
+    ),
+    aired AS (
+        SELECT s.show_id, COUNT(*) AS aired_count
+        FROM tvshows_episode e
+        JOIN tvshows_season s ON s.id = e.season_id
+        WHERE s.season_number > 0
+          AND e.air_date <= %(today)s
+          AND s.show_id IN (SELECT show_id FROM watched)
+        GROUP BY s.show_id
+    ),
+    upserted AS (
+        INSERT INTO tvshows_showprogress
+            (user_id, show_id, watched_count, aired_count, last_watched_at, next_episode_id, date_updated)
+        SELECT w.user_id, w.show_id, w.watched_count, COALESCE(a.aired_count, 0), w.last_watched_at,
+               (
+                   SELECT e.id
+                   FROM tvshows_episode e
+                   JOIN tvshows_season s ON s.id = e.season_id
+                   WHERE s.show_id = w.show_id
+                     AND s.season_number > 0
+                     AND e.air_date <= %(today)s
+                     AND NOT EXISTS (
+                         SELECT 1 FROM tvshows_watchedepisode x
+                         WHERE x.user_id = w.user_id AND x.episode_id = e.id
+                     )
+                   ORDER BY s.season_number, e.episode_number
+                   LIMIT 1
+               ),
+               %(now)s
+        FROM watched w
+        LEFT JOIN aired a ON a.show_id = w.show_id
+        ON CONFLICT (user_id, show_id) DO UPDATE SET
+            watched_count = EXCLUDED.watched_count,
+            aired_count = EXCLUDED.aired_count,
+            last_watched_at = EXCLUDED.last_watched_at,
+            next_episode_id = EXCLUDED.next_episode_id,
+            date_updated = EXCLUDED.date_updated
+        WHERE (tvshows_showprogress.watched_count, tvshows_showprogress.aired_count,
+               tvshows_showprogress.last_watched_at, tvshows_showprogress.next_episode_id)
+              IS DISTINCT FROM
+              (EXCLUDED.watched_count, EXCLUDED.aired_count,
+               EXCLUDED.last_watched_at, EXCLUDED.next_episode_id)
+        RETURNING 1
+    )
+    SELECT COUNT(*) FROM upserted
+"""
+
+_PRUNE_SQL = """
+    DELETE FROM tvshows_showprogress p
+    WHERE {where}
+      AND NOT EXISTS (
+          SELECT 1
+          FROM tvshows_watchedepisode we
+          JOIN tvshows_episode e ON e.id = we.episode_id
+          JOIN tvshows_season s ON s.id = e.season_id
+          WHERE we.user_id = p.user_id AND s.show_id = p.show_id
+      )
+"""
+
+
+def _refresh(watched_where: str, progress_where: str, params: dict) -> int:
+    """Upsert rows in scope and drop the ones with nothing watched.
+
+    Returns the number of rows inserted, changed or deleted.
+    """
+    params = {**params, 'today': timezone.localdate(), 'now': timezone.now()}
+    with connection.cursor() as cursor:
+        cursor.execute(_UPSERT_SQL.format(where=watched_where), params)
+        changed = cursor.fetchone()[0]
+        cursor.execute(_PRUNE_SQL.format(where=progress_where), params)
+        return changed + cursor.rowcount
+
+
+def refresh_progress(user_id: int, show_id: int) -> int:
+    """Recompute one user's row for one show."""
+    return _refresh(
+        'we.user_id = %(user_id)s AND s.show_id = %(show_id)s',
+        'p.user_id = %(user_id)s AND p.show_id = %(show_id)s',
+        {'user_id': user_id, 'show_id': show_id},
+    )
+
+
+def refresh_show_progress(show_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute every user's row for the given shows (all shows if None)."""
+    if show_ids is None:
+        return _refresh('TRUE', 'TRUE', {})
+    show_ids = list(show_ids)
+    if not show_ids:
+        return 0
+    return _refresh('s.show_id = ANY(%(show_ids)s)', 'p.show_id = ANY(%(show_ids)s)', {'show_ids': show_ids})
+
+
+def refresh_progress_for_episode(user_id: int, episode_id: int) -> None:
+    """Signal entry point: a user marked or unmarked an episode."""
+    try:
+        show_id = Episode.objects.filter(pk=episode_id).values_list('season__show_id', flat=True).first()
+        if show_id is not None:
+            refresh_progress(user_id, show_id)
+    except Exception as e:
+        # Never fail the watch toggle because of the progress table; the
+        # daily refresh repairs it.
+        logger.error(f"Failed to refresh show progress for user {user_id}, episode {episode_id}: {e}")
+
+
+def refresh_progress_for_seasons(season_ids: Iterable[int]) -> None:
+    """Signal entry point: episodes of these seasons changed air date or were added / removed."""
+    try:
+        show_ids = set(Season.objects.filter(pk__in=season_ids).values_list('show_id', flat=True))
+        # Nobody has watched anything of a show without rows (e.g. during an import).
+        if show_ids and ShowProgress.objects.filter(show_id__in=show_ids).exists():
+            refresh_show_progress(show_ids)
+    except Exception as e:
+        logger.error(f"Failed to refresh show progress for seasons {season_ids}: {e}")
+
+
+def continue_watching(user, show_ids=None):
+    """In-progress rows for `user`, most-complete first.
+
+    `show_ids` (ids or a values() subquery, e.g. the user's watchlist)
+    restricts the shows considered.
+    """
+    rows = ShowProgress.objects.filter(
+        user=user,
+        watched_count__gt=0,
+        watched_count__lt=F('aired_count'),
+    )
+    if show_ids is not None:
+        rows = rows.filter(show_id__in=show_ids)
+    return rows.annotate(
+        progress=Cast('watched_count', FloatField()) * 100 / F('aired_count'),
+    ).order_by('-progress', '-last_watched_at')
+
+
+def progress_map(user, show_ids) -> dict:
+    """``{show_id: percentage}`` for the given shows (missing = nothing watched)."""
+    return {
+        row.show_id: row.percentage
+        for row in ShowProgress.objects.filter(user=user, show_id__in=show_ids).only(
+            'show_id', 'watched_count', 'aired_count'
+        )
+    }
+
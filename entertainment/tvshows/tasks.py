@@ -1,90 +1,239 @@
 from django_q.tasks import async_task, schedule
 from .parsers import create_tvshow
 import logging
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from django.conf import settings
 from django_q.models import Schedule
 
+from api.response_cache import bypassed, uncached
 from api.services.tvshows import TVShowsService
 from api.services.tvdb import TVDBService
 from api.services.movies import MoviesService
 from .models import TVShow, Season, Episode, EpisodeGroup, EpisodeSubGroup, Keyword, Genre, Country, ProductionCompany
+from .services.episodes import apply_tvdb_episodes, sync_episodes
+from custom_auth.services.payload_digests import PayloadDigests
+from custom_auth.services.task_queue import claim, enqueue_once
 
 logger = logging.getLogger(__name__)
 
+# Ongoing / random refreshes queue one bulk task per this many shows
+BULK_REFRESH_CHUNK = 100
+
+# Release notifications for episodes airing within the same bucket go out together
+RELEASE_BUCKET_MINUTES = 15
+
+# Show details keys that change whenever a season or episode is added or moved
+SEASON_SUMMARY_KEYS = ('seasons', 'last_episode_to_air', 'next_episode_to_air', 'number_of_episodes', 'number_of_seasons')
+
+
+def _dispatch(followups, func, *args):
+    """Queue follow-up work, or hand it to a bulk refresh collecting it.
+
+    Queued follow-ups already pending are coalesced (`enqueue_once`).
+    Follow-ups of an explicit (uncached) refresh are explicit too: they are
+    always queued and do not skip work on unchanged payload digests.
+    """
+    if followups is None and bypassed():
+        async_task(uncached, func, *args)
+    elif followups is None:
+        enqueue_once(func, *args)
+    else:
+        followups.append((func, args))
+
+
+def _season_summary(data):
+    return {key: data.get(key) for key in SEASON_SUMMARY_KEYS}
+
+
+def show_details_append(update_people=False):
+    """``append_to_response`` used by `update_single_tvshow`."""
+    return "videos,keywords,external_ids,credits" if update_people else "videos,keywords,external_ids"
+
+
+def refresh_show_progress():
+    """Daily refresh of the `ShowProgress` table.
+
+    WatchedEpisode and Episode signals keep rows current for ordinary
+    writes, but an episode simply reaching its air date changes nobody's
+    row (and so ``aired_count`` would never advance), and bulk writes skip
+    signals. Runs the `refresh_show_progress` command; migration 0020
+    does the initial backfill.
+
+    Registered as a DAILY Django Q schedule in `tvshows/apps.py`.
+    """
+    from django.core.management import call_command
+    from io import StringIO
+
+    out = StringIO()
+    call_command("refresh_show_progress", stdout=out)
+    summary = out.getvalue().strip()
+    logger.info("refresh_show_progress: %s", summary)
+    return summary
+
+
+def _release_bucket(air_time, now):
+    """When to notify about an episode airing at ``air_time``.
+
+    Air times are grouped into ``RELEASE_BUCKET_MINUTES`` buckets, notified
+    at the end of the bucket; unknown or past air times are notified now.
+    """
+    if not air_time or air_time <= now:
+        return now
+    bucket = timedelta(minutes=RELEASE_BUCKET_MINUTES)
+    start = air_time.replace(second=0, microsecond=0)
+    start -= timedelta(minutes=start.minute % RELEASE_BUCKET_MINUTES)
+    return start + bucket if start < air_time else start
+
 
 def check_new_episodes_today():
     """
     Scheduled task to check for new episodes airing today and notify users.
     Should be run daily (e.g., at 9 AM).
+    
+    Schedules one `send_release_notifications` job per air-time bucket
+    rather than one per show.
     """
     from django.utils import timezone
     from collections import defaultdict
     
     logger.info("Starting daily new episode check")
     
-    check_date = timezone.now().date()
+    now = timezone.now()
+    check_date = now.date()
     
-    # Get all episodes airing today
-    episodes_today = Episode.objects.filter(
-        air_date=check_date
-    ).select_related('season', 'season__show').order_by('season__show', 'season__season_number', 'episode_number')
+    # Earliest known air time per show, in one query
+    episodes_today = list(
+        Episode.objects.filter(air_date=check_date)
+        .values_list('id', 'season__show_id', 'air_time')
+        .order_by('season__show_id', 'season__season_number', 'episode_number')
+    )
     
-    if not episodes_today.exists():
+    if not episodes_today:
         logger.info(f'No episodes found for {check_date}')
         return {'notified_users': 0, 'episodes_count': 0}
     
-    logger.info(f'Found {episodes_today.count()} episode(s) airing today')
+    logger.info(f'Found {len(episodes_today)} episode(s) airing today')
     
-    # Group episodes by show
     episodes_by_show = defaultdict(list)
-    for episode in episodes_today:
-        episodes_by_show[episode.season.show].append(episode)
+    air_times = {}
+    for episode_id, show_id, air_time in episodes_today:
+        episodes_by_show[show_id].append(episode_id)
+        if air_time and show_id not in air_times:
+            air_times[show_id] = air_time
     
-    scheduled_count = 0
+    buckets = defaultdict(list)
+    for show_id, episode_ids in episodes_by_show.items():
+        buckets[_release_bucket(air_times.get(show_id), now)].extend(episode_ids)
     
-    # For each show with episodes today
-    for show, episodes in episodes_by_show.items():
-        logger.info(f'Scheduling notification for: {show.title} ({len(episodes)} episode(s))')
-        
-        # Determine air time
-        air_time = None
-        for ep in episodes:
-            if ep.air_time:
-                air_time = ep.air_time
-                break # Use the first one found
-        
-        run_at = timezone.now()
-        if air_time:
-            # air_time is now a DateTimeField, so it's already a full datetime
-            if air_time > timezone.now():
-                run_at = air_time
-                logger.info(f"  Scheduled for {run_at}")
-            else:
-                logger.info(f"  Air time {air_time} passed, sending immediately")
-        
-        # Schedule the task
+    for run_at, episode_ids in sorted(buckets.items()):
+        logger.info(f'Scheduling release notifications for {len(episode_ids)} episode(s) at {run_at}')
         schedule(
-            'tvshows.tasks.send_show_notification',
-            show.id,
-            [ep.id for ep in episodes],
+            'tvshows.tasks.send_release_notifications',
+            episode_ids,
             schedule_type=Schedule.ONCE,
             next_run=run_at
         )
-        scheduled_count += 1
     
     result = {
-        'scheduled_notifications': scheduled_count,
+        'scheduled_notifications': len(buckets),
         'shows_with_episodes': len(episodes_by_show),
-        'total_episodes': episodes_today.count()
+        'total_episodes': len(episodes_today)
     }
     
     logger.info(f'Episode notification scheduling complete: {result}')
     return result
 
+
+def _release_message(show, episodes):
+    """Title and body of a release notification for one show."""
+    if len(episodes) == 1:
+        episode = episodes[0]
+        title = f"📺 New Episode: {show.title}"
+        body = f"S{episode.season.season_number:02d}E{episode.episode_number:02d} - {episode.title} is now available!"
+    else:
+        title = f"📺 New Episodes: {show.title}"
+        episode_list = ", ".join([
+            f"S{ep.season.season_number:02d}E{ep.episode_number:02d}"
+            for ep in episodes
+        ])
+        body = f"{len(episodes)} new episodes are now available: {episode_list}"
+    return title, body
+
+
+def send_release_notifications(episode_ids):
+    """
+    Task to notify watchlisting users about the episodes of one air-time
+    bucket, with one coalesced notification per user.
+    """
+    from collections import defaultdict
+    from django.contrib.contenttypes.models import ContentType
+    from django.urls import reverse
+    from custom_auth.models import Watchlist
+    from notifications.utils import send_notifications_to_users
+    
+    episodes_by_show = defaultdict(list)
+    shows = {}
+    for episode in Episode.objects.filter(id__in=episode_ids).select_related('season__show').order_by(
+        'season__season_number', 'episode_number'
+    ):
+        shows[episode.season.show_id] = episode.season.show
+        episodes_by_show[episode.season.show_id].append(episode)
+    
+    if not shows:
+        return {'notified_users': 0, 'shows': 0}
+    
+    tvshow_content_type = ContentType.objects.get_for_model(TVShow)
+    
+    # user -> shows they watchlisted, in one query
+    shows_by_user = defaultdict(list)
+    for user_id, show_id in Watchlist.objects.filter(
+        content_type=tvshow_content_type,
+        object_id__in=list(shows)
+    ).values_list('user_id', 'object_id').order_by('object_id'):
+        shows_by_user[user_id].append(show_id)
+    
+    notifications = {}
+    for user_id, show_ids in shows_by_user.items():
+        if len(show_ids) == 1:
+            show = shows[show_ids[0]]
+            title, body = _release_message(show, episodes_by_show[show.id])
+            notifications[user_id] = {
+                'title': title,
+                'body': body,
+                'url': show.get_absolute_url(),
+                'icon': show.poster or '/static/favicon/web-app-manifest-192x192.png',
+                'content_type': tvshow_content_type,
+                'object_id': show.id,
+            }
+        else:
+            notifications[user_id] = {
+                'title': f"📺 New Episodes: {len(show_ids)} shows",
+                'body': ", ".join(
+                    f"{shows[show_id].title} ({len(episodes_by_show[show_id])})"
+                    if len(episodes_by_show[show_id]) > 1 else shows[show_id].title
+                    for show_id in show_ids
+                ) + " have new episodes available!",
+                'url': reverse('release_calendar'),
+                'icon': '/static/favicon/web-app-manifest-192x192.png',
+            }
+    
+    results = send_notifications_to_users(notifications, notification_type='new_release')
+    result = {
+        'notified_users': len(results['user_ids']),
+        'shows': len(shows),
+        'success': results['success'],
+        'failed': results['failed'],
+        'queued': results['queued'],
+    }
+    logger.info(f"Release notifications for {len(episode_ids)} episode(s): {result}")
+    return result
+
 def send_show_notification(show_id, episode_ids):
     """
     Task to send notifications for a specific show's episodes.
+    
+    Superseded by `send_release_notifications`; kept for schedules created
+    before it.
     """
     from django.contrib.contenttypes.models import ContentType
     from custom_auth.models import Watchlist
@@ -110,17 +259,7 @@ def send_show_notification(show_id, episode_ids):
             return
             
         # Create notification message
-        if episodes.count() == 1:
-            episode = episodes.first()
-            title = f"📺 New Episode: {show.title}"
-            body = f"S{episode.season.season_number:02d}E{episode.episode_number:02d} - {episode.title} is now available!"
-        else:
-            title = f"📺 New Episodes: {show.title}"
-            episode_list = ", ".join([
-                f"S{ep.season.season_number:02d}E{ep.episode_number:02d}"
-                for ep in episodes
-            ])
-            body = f"{episodes.count()} new episodes are now available: {episode_list}"
+        title, body = _release_message(show, list(episodes.select_related('season')))
         
         url = show.get_absolute_url()
         
@@ -194,6 +333,17 @@ def task_complete_hook(task):
         # Task failed
         print(f"TV show creation failed: {task.result}")
 
+def _claim_refreshes(tvshow_ids, update_people):
+    """Shows whose refresh is not already queued, claimed for a bulk refresh.
+
+    Claims the same keys `enqueue_once(update_single_tvshow, ...)` does, so
+    overlapping schedules (ongoing and random) refresh each show once.
+    """
+    claimed = claim(update_single_tvshow, [(tvshow_id, update_people) for tvshow_id in tvshow_ids])
+    if len(claimed) < len(tvshow_ids):
+        logger.info(f"{len(tvshow_ids) - len(claimed)} TV show refreshes already queued")
+    return [tvshow_id for tvshow_id, _ in claimed]
+
 def update_ongoing_tvshows():
     """Update information for all TV shows that are currently airing or will air soon."""
     today = date.today()
@@ -203,18 +353,20 @@ def update_ongoing_tvshows():
         status__in=['Returning Series', 'In Production', 'Planned']
     )
     
-    # Log how many shows will be updated
-    logger.info(f"Updating {ongoing_tvshows.count()} ongoing/upcoming TV shows")
+    tvshow_ids = list(ongoing_tvshows.order_by('id').values_list('id', flat=True))
+    tvshow_ids = _claim_refreshes(tvshow_ids, True)
+    logger.info(f"Updating {len(tvshow_ids)} ongoing/upcoming TV shows")
     
-    # Update each TV show
-    for tvshow in ongoing_tvshows:
+    # One bulk refresh task per chunk rather than one task per show (and per
+    # season, person, ...); each chunk pipelines its API calls concurrently.
+    for start in range(0, len(tvshow_ids), BULK_REFRESH_CHUNK):
+        chunk = tvshow_ids[start:start + BULK_REFRESH_CHUNK]
         try:
-            # Schedule individual TV show updates as separate tasks
-            async_task(update_single_tvshow, tvshow.id, True)
+            async_task(refresh_tvshows_bulk, chunk, True)
         except Exception as e:
-            logger.error(f"Error scheduling update for TV show {tvshow.title} (ID: {tvshow.id}): {e}")
+            logger.error(f"Error scheduling bulk update for TV shows {chunk[0]}..{chunk[-1]}: {e}")
     
-    return f"Scheduled updates for {ongoing_tvshows.count()} TV shows"
+    return f"Scheduled updates for {len(tvshow_ids)} TV shows"
 
 def update_random_tvshows():
     """Update information for 10 oldest updated TV shows in the database."""
@@ -224,25 +376,38 @@ def update_random_tvshows():
     # Log how many shows will be updated
     logger.info(f"Updating {len(tvshows)} TV shows with oldest update dates")
     
-    # Update each TV show
+    # Pass True for update_people to also update associated cast/crew
+    tvshow_ids = _claim_refreshes([tvshow.id for tvshow in tvshows], True)
     updates_count = 0
-    for tvshow in tvshows:
-        try:
-            # Schedule individual TV show updates as separate tasks
-            # Pass True for update_people to also update associated cast/crew
-            async_task(update_single_tvshow, tvshow.id, True)
-            updates_count += 1
-        except Exception as e:
-            logger.error(f"Error scheduling update for TV show {tvshow.title} (ID: {tvshow.id}): {e}")
+    if not tvshow_ids:
+        return "Scheduled updates for 0 TV shows with oldest update dates"
+    try:
+        async_task(refresh_tvshows_bulk, tvshow_ids, True)
+        updates_count = len(tvshow_ids)
+    except Exception as e:
+        logger.error(f"Error scheduling bulk update for TV shows {tvshow_ids}: {e}")
     
     return f"Scheduled updates for {updates_count} TV shows with oldest update dates"
 
-def update_single_tvshow(tvshow_id, update_people=False):
+def refresh_tvshows_bulk(tvshow_ids, update_people=False):
+    """Task: refresh many shows and all their follow-up updates in one go.
+
+    See `tvshows.services.bulk_refresh`.
+    """
+    from .services.bulk_refresh import refresh_tvshows
+
+    stats = refresh_tvshows(tvshow_ids, update_people=update_people)
+    summary = ", ".join(f"{name} {counts['done']} ({counts['errors']} errors)" for name, counts in stats['stages'].items())
+    return f"Bulk refreshed {len(tvshow_ids)} TV shows in {stats['elapsed']:.0f}s: {summary}"
+
+def update_single_tvshow(tvshow_id, update_people=False, followups=None):
     """Update a single TV show from TMDB.
     
     Args:
         tvshow_id: The database ID of the TV show to update
         update_people: If True, also update/create Person and MediaPerson entries for cast/crew
+        followups: If a list, follow-up updates (seasons, people, ...) are appended
+            to it as ``(func, args)`` instead of being queued (see `bulk_refresh`)
     """
     try:
         tvshow = TVShow.objects.get(id=tvshow_id)
@@ -250,7 +415,7 @@ def update_single_tvshow(tvshow_id, update_people=False):
         # Use TVShowsService instead of direct requests
         tvshows_service = TVShowsService()
         # Include credits in API request if we need to update people
-        append_to_response = "videos,keywords,external_ids,credits" if update_people else "videos,keywords,external_ids"
+        append_to_response = show_details_append(update_people)
         data = tvshows_service.get_show_details(tvshow.tmdb_id, append_to_response=append_to_response)
         
         if not data:
@@ -260,156 +425,160 @@ def update_single_tvshow(tvshow_id, update_people=False):
         # Update TV show fields if they've changed
         updates = {}
         
-        # Check and update basic fields
-        if 'external_ids' in data:
-            tvdb_id = data['external_ids'].get('tvdb_id')
-            if tvdb_id and tvdb_id != tvshow.tvdb_id:
-                updates['tvdb_id'] = tvdb_id
-
-        if data.get('status') != tvshow.status:
-            updates['status'] = data.get('status')
+        # Skip the field comparisons when the details are what we applied last time
+        digests = PayloadDigests([tvshow])
+        details = {key: value for key, value in data.items() if key != 'credits'}
+        if not digests.unchanged(tvshow, 'details', details):
+            # Check and update basic fields
+            if 'external_ids' in data:
+                tvdb_id = data['external_ids'].get('tvdb_id')
+                if tvdb_id and tvdb_id != tvshow.tvdb_id:
+                    updates['tvdb_id'] = tvdb_id
+
+            if data.get('status') != tvshow.status:
+                updates['status'] = data.get('status')
             
-        if data.get('overview') and data.get('overview') != tvshow.description:
-            updates['description'] = data.get('overview')
+            if data.get('overview') and data.get('overview') != tvshow.description:
+                updates['description'] = data.get('overview')
             
-        if data.get('vote_average') and data.get('vote_average') != tvshow.rating:
-            updates['rating'] = data.get('vote_average')
+            if data.get('vote_average') and data.get('vote_average') != tvshow.rating:
+                updates['rating'] = data.get('vote_average')
         
-        # Update trailer if available
-        if 'videos' in data and data['videos'].get('results'):
-            trailers = [v for v in data['videos']['results'] 
-                       if v['type'] == 'Trailer' and v['site'] == 'YouTube']
-            if trailers:
-                newest_trailer = sorted(trailers, key=lambda x: x['published_at'], reverse=True)[0]
-                trailer_url = f"https://www.youtube.com/embed/{newest_trailer['key']}"
-                if trailer_url != tvshow.trailer:
-                    updates['trailer'] = trailer_url
+            # Update trailer if available
+            if 'videos' in data and data['videos'].get('results'):
+                trailers = [v for v in data['videos']['results'] 
+                           if v['type'] == 'Trailer' and v['site'] == 'YouTube']
+                if trailers:
+                    newest_trailer = sorted(trailers, key=lambda x: x['published_at'], reverse=True)[0]
+                    trailer_url = f"https://www.youtube.com/embed/{newest_trailer['key']}"
+                    if trailer_url != tvshow.trailer:
+                        updates['trailer'] = trailer_url
         
-        if not tvshow.poster and data.get('poster_path'):
-            updates['poster'] = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
+            if not tvshow.poster and data.get('poster_path'):
+                updates['poster'] = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
         
-        if not tvshow.backdrop and data.get('backdrop_path'):
-            updates['backdrop'] = f"https://image.tmdb.org/t/p/original{data['backdrop_path']}"
+            if not tvshow.backdrop and data.get('backdrop_path'):
+                updates['backdrop'] = f"https://image.tmdb.org/t/p/original{data['backdrop_path']}"
 
-        if data.get('name') and data.get('name') != tvshow.title:
-            updates['title'] = data.get('name')
+            if data.get('name') and data.get('name') != tvshow.title:
+                updates['title'] = data.get('name')
         
-        if data.get('original_name') and data.get('original_name') != tvshow.original_title:
-            updates['original_title'] = data.get('original_name')
+            if data.get('original_name') and data.get('original_name') != tvshow.original_title:
+                updates['original_title'] = data.get('original_name')
         
-        if data.get('first_air_date'):
-            if data['first_air_date'] == '':
-                updates['first_air_date'] = None
-            elif data['first_air_date'] != str(tvshow.first_air_date):
-                try:
-                    new_date = date.fromisoformat(data['first_air_date'])
-                    updates['first_air_date'] = new_date
-                except (ValueError, TypeError):
-                    logger.error(f"Invalid first air date format for TV show {tvshow.title}: {data['first_air_date']}")
+            if data.get('first_air_date'):
+                if data['first_air_date'] == '':
                     updates['first_air_date'] = None
+                elif data['first_air_date'] != str(tvshow.first_air_date):
+                    try:
+                        new_date = date.fromisoformat(data['first_air_date'])
+                        updates['first_air_date'] = new_date
+                    except (ValueError, TypeError):
+                        logger.error(f"Invalid first air date format for TV show {tvshow.title}: {data['first_air_date']}")
+                        updates['first_air_date'] = None
         
-        if data.get('last_air_date'):
-            if data['last_air_date'] == '':
-                updates['last_air_date'] = None
-            elif data['last_air_date'] != str(tvshow.last_air_date):
-                try:
-                    new_date = date.fromisoformat(data['last_air_date'])
-                    updates['last_air_date'] = new_date
-                except (ValueError, TypeError):
-                    logger.error(f"Invalid last air date format for TV show {tvshow.title}: {data['last_air_date']}")
+            if data.get('last_air_date'):
+                if data['last_air_date'] == '':
                     updates['last_air_date'] = None
+                elif data['last_air_date'] != str(tvshow.last_air_date):
+                    try:
+                        new_date = date.fromisoformat(data['last_air_date'])
+                        updates['last_air_date'] = new_date
+                    except (ValueError, TypeError):
+                        logger.error(f"Invalid last air date format for TV show {tvshow.title}: {data['last_air_date']}")
+                        updates['last_air_date'] = None
         
-        # Update keywords
-        if 'keywords' in data and data['keywords'].get('results', []):
-            current_keyword_names = set(tvshow.keywords.values_list('name', flat=True))
-            new_keyword_names = {k['name'] for k in data['keywords']['results']}
-
-            if current_keyword_names != new_keyword_names:
-                keyword_instances = []
-                for keyword_data in data['keywords']['results']:
-                    keyword_name = keyword_data.get('name')
-                    keyword_id = keyword_data.get('id')
+            # Update keywords
+            if 'keywords' in data and data['keywords'].get('results', []):
+                current_keyword_names = set(tvshow.keywords.values_list('name', flat=True))
+                new_keyword_names = {k['name'] for k in data['keywords']['results']}
+
+                if current_keyword_names != new_keyword_names:
+                    keyword_instances = []
+                    for keyword_data in data['keywords']['results']:
+                        keyword_name = keyword_data.get('name')
+                        keyword_id = keyword_data.get('id')
                     
-                    if not keyword_name:
-                        continue
+                        if not keyword_name:
+                            continue
                         
-                    # Try to find by TMDB ID first
-                    keyword_instance = Keyword.objects.filter(tmdb_id=keyword_id).first()
+                        # Try to find by TMDB ID first
+                        keyword_instance = Keyword.objects.filter(tmdb_id=keyword_id).first()
                     
-                    if not keyword_instance:
-                        # Try to find by name (case insensitive)
-                        keyword_instance = Keyword.objects.filter(name__iexact=keyword_name).first()
-                        if keyword_instance:
-                            # Update TMDB ID if found by name and missing
-                            if not keyword_instance.tmdb_id:
-                                keyword_instance.tmdb_id = keyword_id
-                                keyword_instance.save(update_fields=['tmdb_id'])
-                        else:
-                            # Create new if not found
-                            keyword_instance = Keyword.objects.create(
-                                name=keyword_name,
-                                tmdb_id=keyword_id
-                            )
+                        if not keyword_instance:
+                            # Try to find by name (case insensitive)
+                            keyword_instance = Keyword.objects.filter(name__iexact=keyword_name).first()
+                            if keyword_instance:
+                                # Update TMDB ID if found by name and missing
+                                if not keyword_instance.tmdb_id:
+                                    keyword_instance.tmdb_id = keyword_id
+                                    keyword_instance.save(update_fields=['tmdb_id'])
+                            else:
+                                # Create new if not found
+                                keyword_instance = Keyword.objects.create(
+                                    name=keyword_name,
+                                    tmdb_id=keyword_id
+                                )
                             
-                    keyword_instances.append(keyword_instance)
-
-                tvshow.keywords.set(keyword_instances)
-                logger.info(f"Updated keywords for {tvshow.title}")
-
-        # Update genres
-        if 'genres' in data and data['genres']:
-            current_genre_names = set(tvshow.genres.values_list('name', flat=True))
-            new_genre_names = {g['name'] for g in data['genres']}
-
-            if current_genre_names != new_genre_names:
-                genre_instances = []
-                for genre in data['genres']:
-                    genre_instance, _ = Genre.objects.get_or_create(
-                        tmdb_id=genre.get('id'),
-                        defaults={'name': genre.get('name')}
-                    )
-                    genre_instances.append(genre_instance)
-
-                tvshow.genres.set(genre_instances)
-                logger.info(f"Updated genres for {tvshow.title}")
-
-        # Update production countries
-        if 'production_countries' in data and data['production_countries']:
-            current_country_codes = set(tvshow.countries.values_list('iso_3166_1', flat=True))
-            new_country_codes = {c['iso_3166_1'] for c in data['production_countries']}
-
-            if current_country_codes != new_country_codes:
-                country_instances = []
-                for country in data['production_countries']:
-                    country_instance, _ = Country.objects.get_or_create(
-                        iso_3166_1=country.get('iso_3166_1'),
-                        defaults={'name': country.get('name')}
-                    )
-                    country_instances.append(country_instance)
-
-                tvshow.countries.set(country_instances)
-                logger.info(f"Updated countries for {tvshow.title}")
-
-        # Update production companies
-        if 'production_companies' in data and data['production_companies']:
-            current_company_names = set(tvshow.production_companies.values_list('name', flat=True))
-            new_company_names = {c['name'] for c in data['production_companies']}
-
-            if current_company_names != new_company_names:
-                company_instances = []
-                for company in data['production_companies']:
-                    logo_path = company.get('logo_path')
-                    company_instance, _ = ProductionCompany.objects.get_or_create(
-                        tmdb_id=company.get('id'),
-                        defaults={
-                            'name': company.get('name'),
-                            'logo_path': f"https://image.tmdb.org/t/p/original{logo_path}" if logo_path else None
-                        }
-                    )
-                    company_instances.append(company_instance)
+                        keyword_instances.append(keyword_instance)
+
+                    tvshow.keywords.set(keyword_instances)
+                    logger.info(f"Updated keywords for {tvshow.title}")
+
+            # Update genres
+            if 'genres' in data and data['genres']:
+                current_genre_names = set(tvshow.genres.values_list('name', flat=True))
+                new_genre_names = {g['name'] for g in data['genres']}
+
+                if current_genre_names != new_genre_names:
+                    genre_instances = []
+                    for genre in data['genres']:
+                        genre_instance, _ = Genre.objects.get_or_create(
+                            tmdb_id=genre.get('id'),
+                            defaults={'name': genre.get('name')}
+                        )
+                        genre_instances.append(genre_instance)
+
+                    tvshow.genres.set(genre_instances)
+                    logger.info(f"Updated genres for {tvshow.title}")
 
-                tvshow.production_companies.set(company_instances)
-                logger.info(f"Updated production companies for {tvshow.title}")
+            # Update production countries
+            if 'production_countries' in data and data['production_countries']:
+                current_country_codes = set(tvshow.countries.values_list('iso_3166_1', flat=True))
+                new_country_codes = {c['iso_3166_1'] for c in data['production_countries']}
+
+                if current_country_codes != new_country_codes:
+                    country_instances = []
+                    for country in data['production_countries']:
+                        country_instance, _ = Country.objects.get_or_create(
+                            iso_3166_1=country.get('iso_3166_1'),
+                            defaults={'name': country.get('name')}
+                        )
+                        country_instances.append(country_instance)
+
+                    tvshow.countries.set(country_instances)
+                    logger.info(f"Updated countries for {tvshow.title}")
+
+            # Update production companies
+            if 'production_companies' in data and data['production_companies']:
+                current_company_names = set(tvshow.production_companies.values_list('name', flat=True))
+                new_company_names = {c['name'] for c in data['production_companies']}
+
+                if current_company_names != new_company_names:
+                    company_instances = []
+                    for company in data['production_companies']:
+                        logo_path = company.get('logo_path')
+                        company_instance, _ = ProductionCompany.objects.get_or_create(
+                            tmdb_id=company.get('id'),
+                            defaults={
+                                'name': company.get('name'),
+                                'logo_path': f"https://image.tmdb.org/t/p/original{logo_path}" if logo_path else None
+                            }
+                        )
+                        company_instances.append(company_instance)
+
+                    tvshow.production_companies.set(company_instances)
+                    logger.info(f"Updated production companies for {tvshow.title}")
 
         # Update associated people and MediaPerson entries if requested
         people_updated = 0
@@ -418,7 +587,8 @@ def update_single_tvshow(tvshow_id, update_people=False):
         
         logger.info(f"update_people={update_people}, 'credits' in data={'credits' in data}")
         
-        if update_people and 'credits' in data:
+        credits = {'credits': data.get('credits'), 'created_by': data.get('created_by', [])}
+        if update_people and 'credits' in data and not digests.unchanged(tvshow, 'credits', credits):
             from custom_auth.models import MediaPerson, Person
             from django.contrib.contenttypes.models import ContentType
             from movies.tasks import update_single_person
@@ -459,7 +629,7 @@ def update_single_tvshow(tvshow_id, update_people=False):
             for tmdb_id in persons_to_update:
                 try:
                     person = Person.objects.get(tmdb_id=tmdb_id)
-                    async_task(update_single_person, person.id)
+                    _dispatch(followups, update_single_person, person.id)
                     people_updated += 1
                 except Person.DoesNotExist:
                     pass
@@ -673,34 +843,42 @@ def update_single_tvshow(tvshow_id, update_people=False):
                        f"{media_persons_updated} MediaPerson entries updated, "
                        f"{media_persons_added} MediaPerson entries added")
 
+        # Seasons only need a look when the show's season list moved
+        # (`update_tvshow_seasons` records the digest once it has looked)
+        seasons_changed = not digests.unchanged(tvshow, 'seasons', _season_summary(data), record=False)
+
         # Apply updates if there are any
         if updates:
             logger.info(f"Updating TV show {tvshow.title} (ID: {tvshow_id}) with: {updates}")
             for field, value in updates.items():
                 setattr(tvshow, field, value)
             tvshow.save()
+            digests.save()
             
             # After updating the show's basic info, check for new seasons and episode groups
-            async_task(update_tvshow_seasons, tvshow.id)
+            if seasons_changed:
+                _dispatch(followups, update_tvshow_seasons, tvshow.id)
             if tvshow.is_anime:
-                async_task(update_episode_groups, tvshow.id)
+                _dispatch(followups, update_episode_groups, tvshow.id)
             
             # Update episodes from TVDB if we have a TVDB ID
             if tvshow.tvdb_id:
-                async_task(update_episodes_from_tvdb, tvshow.id)
+                _dispatch(followups, update_episodes_from_tvdb, tvshow.id)
             
             return f"Updated TV show {tvshow.title} with {len(updates)} changes: {', '.join([f'{k}={v}' for k, v in updates.items()])}"
         else:
             # Even if no basic show details changed, we should still check for new episodes and episode groups
             # Update the date_updated field to ensure rotation in the update queue
             tvshow.save(update_fields=['date_updated'])
-            async_task(update_tvshow_seasons, tvshow.id)
+            digests.save()
+            if seasons_changed:
+                _dispatch(followups, update_tvshow_seasons, tvshow.id)
             if tvshow.is_anime:
-                async_task(update_episode_groups, tvshow.id)
+                _dispatch(followups, update_episode_groups, tvshow.id)
             
             # Update episodes from TVDB if we have a TVDB ID
             if tvshow.tvdb_id:
-                async_task(update_episodes_from_tvdb, tvshow.id)
+                _dispatch(followups, update_episodes_from_tvdb, tvshow.id)
 
             return f"No basic updates needed for TV show {tvshow.title}, checking for new episodes and episode groups"
             
@@ -711,7 +889,7 @@ def update_single_tvshow(tvshow_id, update_people=False):
         logger.error(f"Error updating TV show {tvshow_id}: {e}")
         return f"Error updating TV show {tvshow_id}: {str(e)}"
 
-def update_tvshow_seasons(tvshow_id):
+def update_tvshow_seasons(tvshow_id, followups=None):
     """Update all seasons for a TV show, adding any new seasons/episodes."""
     try:
         tvshow = TVShow.objects.get(id=tvshow_id)
@@ -723,6 +901,11 @@ def update_tvshow_seasons(tvshow_id):
         if not data or 'seasons' not in data:
             logger.error(f"TMDB API error for TV show {tvshow.title} (ID: {tvshow_id}): Failed to retrieve data")
             return f"Failed to update seasons for TV show {tvshow_id}"
+
+        digests = PayloadDigests([tvshow])
+        if digests.unchanged(tvshow, 'seasons', _season_summary(data)):
+            digests.save()
+            return f"Seasons of TV show {tvshow.title} unchanged"
             
         # Get all seasons in our database for this TV show
         existing_seasons = {s.season_number: s for s in Season.objects.filter(show=tvshow)}
@@ -743,7 +926,7 @@ def update_tvshow_seasons(tvshow_id):
             if season_number in existing_seasons:
                 # Season exists, check if it needs updates
                 season = existing_seasons[season_number]
-                async_task(update_single_season, season.id)
+                _dispatch(followups, update_single_season, season.id)
             else:
                 # New season, add it
                 try:
@@ -761,10 +944,11 @@ def update_tvshow_seasons(tvshow_id):
                             tmdb_id=season_details.get('id')
                         )
                         # Add episodes for this new season
-                        async_task(update_single_season, season.id)
+                        _dispatch(followups, update_single_season, season.id)
                 except Exception as e:
                     logger.error(f"Error adding season {season_number} for TV show {tvshow.title}: {e}")
         
+        digests.save()
         return f"Updated seasons for TV show {tvshow.title}"
         
     except TVShow.DoesNotExist:
@@ -784,85 +968,24 @@ def update_single_season(season_id):
         tvshows_service = TVShowsService()
         data = tvshows_service.get_season_details(tvshow.tmdb_id, season.season_number)
 
-        if not season.poster and data.get('poster_path'):
-            season.poster = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
-            season.save(update_fields=['poster'])
-        
         if not data or 'episodes' not in data:
             logger.error(f"TMDB API error for season {season.season_number} of {tvshow.title}: Failed to retrieve data")
             return f"Failed to update season {season_id}"
+
+        digests = PayloadDigests([season])
+        if digests.unchanged(season, 'details', data):
+            digests.save()
+            return f"Season {season.season_number} of {tvshow.title} unchanged"
+
+        if not season.poster and data.get('poster_path'):
+            season.poster = f"https://image.tmdb.org/t/p/original{data['poster_path']}"
+            season.save(update_fields=['poster'])
             
-        # Get all episodes in our database for this season
-        existing_episodes = {e.episode_number: e for e in Episode.objects.filter(season=season)}
-        
-        # Collect episode numbers from the API response
-        api_episode_numbers = {ep['episode_number'] for ep in data['episodes']}
-        
-        # Delete episodes that no longer exist in the API
-        episodes_to_delete = set(existing_episodes.keys()) - api_episode_numbers
-        if episodes_to_delete:
-            deleted_count = Episode.objects.filter(season=season, episode_number__in=episodes_to_delete).delete()[0]
-            logger.info(f"Deleted {deleted_count} removed episodes (numbers: {episodes_to_delete}) for {tvshow.title} season {season.season_number}")
-        
-        # Check for new or updated episodes
-        added_count = 0
-        updated_count = 0
-        
-        for episode_data in data['episodes']:
-            episode_number = episode_data['episode_number']
-            
-            if episode_number in existing_episodes:
-                # Episode exists, check if it needs updates
-                episode = existing_episodes[episode_number]
-                updates = {}
-                
-                if episode_data.get('name') and episode_data['name'] != episode.title:
-                    updates['title'] = episode_data['name']
-                    
-                if episode_data.get('overview') and episode_data['overview'] != episode.overview:
-                    updates['overview'] = episode_data['overview']
-                    
-                if episode_data.get('still_path') and not episode.still:
-                    updates['still'] = f"https://image.tmdb.org/t/p/original{episode_data['still_path']}"
-                    
-                if episode_data.get('air_date'):
-                    try:
-                        new_air_date = date.fromisoformat(episode_data['air_date'])
-                        if new_air_date != episode.air_date:
-                            updates['air_date'] = new_air_date
-                    except (ValueError, TypeError):
-                        # Invalid date format, don't update
-                        pass
-                        
-                if episode_data.get('vote_average') and episode_data['vote_average'] != episode.rating:
-                    updates['rating'] = episode_data['vote_average']
-                    
-                if episode_data.get('runtime') and episode_data['runtime'] != episode.runtime:
-                    updates['runtime'] = episode_data['runtime']
-                
-                if updates:
-                    for field, value in updates.items():
-                        setattr(episode, field, value)
-                    episode.save()
-                    updated_count += 1
-                    
-            else:
-                # New episode, add it
-                try:
-                    Episode.objects.create(
-                        season=season,
-                        episode_number=episode_number,
-                        title=episode_data.get('name', f"Episode {episode_number}"),
-                        overview=episode_data.get('overview', ''),
-                        still=f"https://image.tmdb.org/t/p/original{episode_data['still_path']}" if episode_data.get('still_path') else None,
-                        air_date=date.fromisoformat(episode_data['air_date']) if episode_data.get('air_date') else None,
-                        rating=episode_data.get('vote_average', 0),
-                        runtime=episode_data.get('runtime'),
-                        tmdb_id=episode_data.get('id')
-                    )
-                    added_count += 1
-                except Exception as e:
-                    logger.error(f"Error adding episode {episode_number} for season {season.season_number} of {tvshow.title}: {e}")
+        # Diff against the episodes in our database for this season
+        added_count, updated_count, deleted_count = sync_episodes(season, data['episodes'])
+        if deleted_count:
+            logger.info(f"Deleted {deleted_count} removed episodes for {tvshow.title} season {season.season_number}")
+        digests.save()
         
         return f"Added {added_count} new episodes and updated {updated_count} existing episodes for season {season.season_number} of {tvshow.title}"
         
@@ -873,7 +996,7 @@ def update_single_season(season_id):
         logger.error(f"Error updating season {season_id}: {e}")
         return f"Error updating season {season_id}: {str(e)}"
 
-def update_episode_groups(tvshow_id):
+def update_episode_groups(tvshow_id, followups=None):
     """Update episode groups and subgroups for a TV show."""
     try:
         tvshow = TVShow.objects.get(id=tvshow_id)
@@ -885,6 +1008,13 @@ def update_episode_groups(tvshow_id):
         if not data or 'results' not in data:
             # Some shows might not have episode groups, this is normal
             return f"No episode groups found for TV show {tvshow.title}"
+
+        # Subgroups link local episodes, so new episodes count as a change
+        digests = PayloadDigests([tvshow])
+        episode_count = Episode.objects.filter(season__show=tvshow).count()
+        if digests.unchanged(tvshow, 'episode_groups', {'groups': data, 'episode_count': episode_count}):
+            digests.save()
+            return f"Episode groups of TV show {tvshow.title} unchanged"
             
         # Get existing episode groups
         existing_groups = {group.tmdb_id: group for group in EpisodeGroup.objects.filter(show=tvshow)}
@@ -928,7 +1058,7 @@ def update_episode_groups(tvshow_id):
                     updated_groups += 1
                     
                 # Check subgroups for this group regardless of whether the main group was updated
-                async_task(update_episode_subgroups, group.id, group_id)
+                _dispatch(followups, update_episode_subgroups, group.id, group_id)
                 
             else:
                 # New group, add it
@@ -943,11 +1073,12 @@ def update_episode_groups(tvshow_id):
                     added_groups += 1
                     
                     # Get detailed subgroups for this new group
-                    async_task(update_episode_subgroups, group.id, group_id)
+                    _dispatch(followups, update_episode_subgroups, group.id, group_id)
                     
                 except Exception as e:
                     logger.error(f"Error adding episode group {group_data.get('name')} for {tvshow.title}: {e}")
         
+        digests.save()
         return f"Added {added_groups} new episode groups and updated {updated_groups} existing groups for {tvshow.title}"
         
     except TVShow.DoesNotExist:
@@ -970,6 +1101,12 @@ def update_episode_subgroups(group_id, tmdb_group_id):
         if not data or 'groups' not in data:
             logger.error(f"TMDB API error for episode group {group.name} of {tvshow.title}: Failed to retrieve data")
             return f"Failed to update subgroups for episode group {group_id}"
+
+        digests = PayloadDigests([group])
+        episode_count = Episode.objects.filter(season__show=tvshow).count()
+        if digests.unchanged(group, 'details', {'group': data, 'episode_count': episode_count}):
+            digests.save()
+            return f"Subgroups of episode group {group.name} unchanged"
             
         # Get existing subgroups
         existing_subgroups = {subgroup.tmdb_id: subgroup for subgroup in EpisodeSubGroup.objects.filter(parent_group=group) if subgroup.tmdb_id}
@@ -1062,6 +1199,7 @@ def update_episode_subgroups(group_id, tmdb_group_id):
                 except Exception as e:
                     logger.error(f"Error adding episode subgroup {subgroup_data.get('name')} for group {group.name}: {e}")
         
+        digests.save()
         return f"Added {added_subgroups} new episode subgroups and updated {updated_subgroups} existing subgroups for group {group.name}"
         
     except EpisodeGroup.DoesNotExist:
@@ -1121,114 +1259,7 @@ def update_episodes_from_tvdb(tvshow_id):
         if not series_extended or 'data' not in series_extended or 'episodes' not in series_extended['data']:
             return "No episodes found in TVDB response"
 
-        tvdb_episodes = series_extended['data']['episodes']
-        
-        # Get series air time
-        series_air_time = series_extended['data'].get('airsTime')
-        
-        # Create a map for faster lookup: (season_number, episode_number) -> tvdb_episode
-        tvdb_map = {}
-        for ep in tvdb_episodes:
-            s_num = ep.get('seasonNumber')
-            e_num = ep.get('number')
-            if s_num is not None and e_num is not None:
-                tvdb_map[(s_num, e_num)] = ep
-
-        updated_count = 0
-        # Iterate over all episodes of the show
-        for season in tvshow.seasons.all():
-            for episode in season.episodes.all():
-                tvdb_ep = tvdb_map.get((season.season_number, episode.episode_number))
-                if tvdb_ep:
-                    updated = False
-                    # Update TVDB ID
-                    if not episode.tvdb_id:
-                        episode.tvdb_id = tvdb_ep.get('id')
-                        updated = True
-                    
-                    # Update air date if missing or different (trusting TVDB for air dates)
-                    if tvdb_ep.get('aired'):
-                        try:
-                            tvdb_date = date.fromisoformat(tvdb_ep.get('aired'))
-                            if episode.air_date != tvdb_date:
-                                episode.air_date = tvdb_date
-                                updated = True
-                            
-                            # Update air time (datetime)
-                            if series_air_time:
-                                from django.utils import timezone
-                                import zoneinfo
-                                import pytz
-                                
-                                # Try parsing common formats
-                                parsed_time = None
-                                for fmt in ["%H:%M", "%I:%M %p"]:
-                                    try:
-                                        parsed_time = datetime.strptime(series_air_time, fmt).time()
-                                        break
-                                    except ValueError:
-                                        continue
-                                
-                                if parsed_time:
-                                    # Determine timezone
-                                    tz_name = "UTC"
-                                    
-                                    # Manual map for major countries to ensure capital/most populous city is used
-                                    MANUAL_TIMEZONES = {
-                                        'US': 'America/New_York',
-                                        'GB': 'Europe/London',
-                                        'JP': 'Asia/Tokyo',
-                                        'KR': 'Asia/Seoul',
-                                        'CN': 'Asia/Shanghai',
-                                        'IN': 'Asia/Kolkata',
-                                        'CA': 'America/Toronto',
-                                        'AU': 'Australia/Sydney',
-                                        'FR': 'Europe/Paris',
-                                        'DE': 'Europe/Berlin',
-                                        'IT': 'Europe/Rome',
-                                        'ES': 'Europe/Madrid',
-                                        'BR': 'America/Sao_Paulo',
-                                        'RU': 'Europe/Moscow',
-                                    }
-
-                                    # Get countries
-                                    countries = list(tvshow.countries.values_list('iso_3166_1', flat=True))
-                                    
-                                    # Check for manual overrides first
-                                    found_manual = False
-                                    for code in countries:
-                                        if code in MANUAL_TIMEZONES:
-                                            tz_name = MANUAL_TIMEZONES[code]
-                                            found_manual = True
-                                            break
-                                    
-                                    # If no manual override, try pytz
-                                    if not found_manual and countries:
-                                        try:
-                                            # Use the first country
-                                            country_code = countries[0]
-                                            timezones = pytz.country_timezones.get(country_code, [])
-                                            if timezones:
-                                                tz_name = timezones[0]
-                                        except Exception:
-                                            pass
-                                    
-                                    try:
-                                        tz = zoneinfo.ZoneInfo(tz_name)
-                                        dt = datetime.combine(tvdb_date, parsed_time)
-                                        dt_aware = timezone.make_aware(dt, timezone=tz)
-                                        
-                                        if episode.air_time != dt_aware:
-                                            episode.air_time = dt_aware
-                                            updated = True
-                                    except Exception as e:
-                                        logger.error(f"Error setting timezone {tz_name} for {tvshow.title}: {e}")
-                        except (ValueError, TypeError):
-                            pass
-                    
-                    if updated:
-                        episode.save()
-                        updated_count += 1
+        updated_count = apply_tvdb_episodes(tvshow, series_extended['data'])
         
         return f"Updated {updated_count} episodes from TVDB for {tvshow.title}"
 
@@ -950,20 +950,27 @@ class EpisodeWatchedView(APIView):
                 episode=episode
             ).delete()
         
-        # Calculate season progress
+        # Calculate season progress (one grouped query each for totals and watched)
+        show = episode.season.show
+        season_totals = dict(
+            Episode.objects.filter(season__show=show)
+            .values('season_id').annotate(n=Count('id')).values_list('season_id', 'n').order_by()
+        )
+        season_watched = dict(
+            WatchedEpisode.objects.filter(user=request.user, episode__season__show=show)
+            .values('episode__season_id').annotate(n=Count('id'))
+            .values_list('episode__season_id', 'n').order_by()
+        )
         season_progress = {}
-        for user_season in episode.season.show.seasons.all():
-            total_episodes = user_season.episodes.count()
-            watched_episodes = WatchedEpisode.objects.filter(
-                user=request.user,
-                episode__season=user_season
-            ).count()
+        for season_id in show.seasons.values_list('id', flat=True):
+            total_episodes = season_totals.get(season_id, 0)
+            watched_episodes = season_watched.get(season_id, 0)
             
             percentage = 0
             if total_episodes > 0:
                 percentage = (watched_episodes / total_episodes) * 100
                 
-            season_progress[user_season.id] = {
+            season_progress[season_id] = {
                 'total': total_episodes,
                 'watched': watched_episodes,
                 'percentage': percentage
@@ -988,21 +995,13 @@ class EpisodeWatchedView(APIView):
                     'percentage': percentage
                 }
         
-        # Calculate overall show progress
-        total_episodes = episode.season.show.episodes_count
-        watched_episodes = WatchedEpisode.objects.filter(
-            user=request.user,
-            episode__season__show=episode.season.show
-        ).count()
-        
-        show_percentage = 0
-        if total_episodes > 0:
-            show_percentage = (watched_episodes / total_episodes) * 100
-            
+        # Overall show progress (aired regular-season episodes), kept current
+        # by the WatchedEpisode signals that just fired
+        progress = ShowProgress.objects.filter(user=request.user, show=show).first()
         show_progress = {
-            'total': total_episodes,
-            'watched': watched_episodes,
-            'percentage': show_percentage
+            'total': progress.aired_count if progress else 0,
+            'watched': progress.watched_count if progress else 0,
+            'percentage': progress.percentage if progress else 0,
         }
         
         return Response({